@@ -0,0 +1,284 @@
+"""
+Persistent store for topic aggregate data models, per test run.
+
+The data of a finished test run does not change, so a topic's data for one
+run only needs to be computed once. The store keeps each run's partial
+(unfinalized) model in the report_aggregates collection, keyed by topic
+name, the topic's version, the test run and whether the report reads only
+the latest result of each URL. A report merges the stored partial models of
+its runs with those it has to compute (see TopicAggregate.merge) and
+finalizes the result, so a report after a new run only computes the new
+run. Bumping a TopicAggregate's version makes its stored models unused.
+
+When the report reads only the latest result of each URL, a run's stored
+model is only used while none of its URLs has a newer result in another
+run, which is checked by counting the run's pages in the report's view. A
+run whose URLs were all tested again later adds nothing; a run that was
+partly superseded is computed from the view and not stored.
+
+Only the models of runs with a finished status are stored (see
+finished_statuses). Sampled reports do not use the store, because a run's
+sampled pages depend on the report's other runs. When a run's page results
+are re-imported, invalidate its stored models with invalidate_runs (or:
+python aggregate_store.py --invalidate RUN_ID).
+
+Models are written with model_codec as compressed JSON, never pickled, so
+loading a stored model cannot run code.
+"""
+import click
+from datetime import datetime
+import threading
+import zlib
+
+from bson.binary import Binary
+
+from connection_profile import ConnectionProfile
+from db import AccessibilityDB
+from model_codec import encode_model, decode_model
+from report_context import get_report_context
+from section_scheduler import BudgetExceeded, check_budget
+from spill import report_memory_budget
+
+AGGREGATES_COLLECTION = 'report_aggregates'
+
+# Statuses of test runs whose page results are complete, unless the
+# connection sets finished_statuses (main.py --finished-status). Runs with
+# any other status are never stored; list the statuses the crawler has
+# written with: python aggregate_store.py --statuses
+DEFAULT_FINISHED_STATUSES = ('completed',)
+
+# Stored documents must stay under MongoDB's 16MB document limit
+MAX_MODEL_BYTES = 15 * 1024 * 1024
+
+# Bytes of a stored model decompressed at a time while loading it
+DECOMPRESS_CHUNK = 1024 * 1024
+
+# Collections whose indexes this process has already created
+_indexed = set()
+_indexed_lock = threading.Lock()
+
+
+def ensure_indexes(collection, indexes):
+    """Create a collection's indexes, once per process"""
+    key = (id(collection.database.client), collection.full_name)
+    with _indexed_lock:
+        if key in _indexed:
+            return
+        for index in indexes:
+            collection.create_index(index)
+        _indexed.add(key)
+
+
+def aggregates_collection(db_connection):
+    """Get the report_aggregates collection in the connection's database"""
+    collection = db_connection.test_runs.database[AGGREGATES_COLLECTION]
+    ensure_indexes(collection, [[('topic', 1), ('version', 1), ('latest_only', 1), ('test_run_id', 1)],
+                                'test_run_id'])
+    return collection
+
+
+def finished_statuses(db_connection):
+    """Test run statuses whose page results are complete"""
+    return tuple(getattr(db_connection, 'finished_statuses', None) or DEFAULT_FINISHED_STATUSES)
+
+
+def run_finished(db_connection, test_run):
+    """True if a test run's page results are complete"""
+    return test_run.get('status') in finished_statuses(db_connection)
+
+
+def _store_used(db_connection, aggregate):
+    """True if the current report reads and writes stored models of the topic"""
+    context = get_report_context(db_connection)
+    return (getattr(db_connection, 'use_aggregate_store', True) and aggregate.can_merge()
+            and bool(context.test_runs) and context.sample is None)
+
+
+def _run_url_count(all_page_results, test_run_id):
+    """Number of distinct URLs a run has results for"""
+    counted = list(all_page_results.aggregate([
+        {'$match': {'test_run_id': test_run_id}},
+        {'$group': {'_id': '$url'}},
+        {'$count': 'urls'}
+    ]))
+    return counted[0]['urls'] if counted else 0
+
+
+def load_run_model(db_connection, document):
+    """Decode a stored partial model, decompressing it a chunk at a time"""
+    def lines():
+        decompressor = zlib.decompressobj()
+        data = document['model']
+        pending = b''
+        while data:
+            pending += decompressor.decompress(data, DECOMPRESS_CHUNK)
+            data = decompressor.unconsumed_tail
+            *complete, pending = pending.split(b'\n')
+            for line in complete:
+                yield line.decode('utf-8')
+        pending += decompressor.flush()
+        for line in pending.split(b'\n'):
+            yield line.decode('utf-8')
+
+    return decode_model(lines(), report_memory_budget(db_connection))
+
+
+def save_run_model(db_connection, aggregate, key, model, url_count):
+    """Store a run's partial model under key"""
+    try:
+        compressor = zlib.compressobj()
+        chunks = []
+        size = 0
+        for line in encode_model(model):
+            chunk = compressor.compress(line.encode('utf-8'))
+            size += len(chunk)
+            if size > MAX_MODEL_BYTES:
+                print(f"Warning: Aggregate for {aggregate.name} of run {key['test_run_id']} is too large to store")
+                return
+            chunks.append(chunk)
+        chunks.append(compressor.flush())
+        document = dict(key, url_count=url_count, model=Binary(b''.join(chunks)), created=datetime.now())
+        aggregates_collection(db_connection).replace_one(key, document, upsert=True)
+    except Exception as e:
+        print(f"Warning: Could not store aggregate for {aggregate.name}: {e}")
+
+
+def accumulate_by_run(db_connection, aggregate, accumulate, check=None):
+    """
+    Build a topic's unfinalized model from the partial models of the report's test runs.
+
+    Stored partial models are reused; the others are computed with
+    accumulate and stored when their run is finished.
+
+    Args:
+        db_connection: Database connection
+        aggregate: TopicAggregate implementing merge()
+        accumulate: Called with a filter restricting the topic's queries (for
+            example to one test run); returns the unfinalized model of the
+            matching pages
+        check: Called between runs; stops by raising BudgetExceeded. By
+            default it enforces the running section's time budget.
+
+    Returns:
+        The merged unfinalized model, or None when the report does not use
+        the store (the caller then computes the topic over every page)
+    """
+    if not _store_used(db_connection, aggregate):
+        return None
+    if check is None:
+        check = lambda: check_budget(db_connection)
+    context = get_report_context(db_connection)
+    # The latest-results view only holds the report's runs (see latest_results)
+    view = context.all_page_results is not None
+    # Oldest run first, the order their results were written in
+    test_runs = sorted(context.test_runs, key=lambda run: (run.get('timestamp_start') is not None,
+                                                           run.get('timestamp_start')))
+    test_run_ids = [str(run['_id']) for run in test_runs]
+    key = {'topic': aggregate.name, 'version': aggregate.version, 'latest_only': view}
+
+    try:
+        stored = {document['test_run_id']: document for document in aggregates_collection(db_connection).find(
+            dict(key, test_run_id={'$in': test_run_ids}))}
+    except Exception as e:
+        print(f"Warning: Could not read stored aggregates for {aggregate.name}: {e}")
+        stored = {}
+
+    state = aggregate.empty()
+    aggregate.prepare(db_connection, state)
+    reused = 0
+    try:
+        for done, (test_run, test_run_id) in enumerate(zip(test_runs, test_run_ids)):
+            check()
+            document = stored.get(test_run_id)
+            pages = db_connection.page_results.count_documents({'test_run_id': test_run_id}) if view else None
+            if pages == 0:
+                # Every URL of the run has a newer result in another run
+                continue
+
+            part = None
+            if document is not None and (not view or pages == document['url_count']):
+                try:
+                    part = load_run_model(db_connection, document)
+                    reused += 1
+                except Exception as e:
+                    print(f"Warning: Could not load stored aggregate for {aggregate.name}: {e}")
+            if part is None:
+                part = accumulate({'test_run_id': test_run_id})
+                if document is None and run_finished(db_connection, test_run):
+                    # Only a run none of whose URLs was superseded is stored
+                    url_count = _run_url_count(context.all_page_results, test_run_id) if view else None
+                    if not view or url_count == pages:
+                        save_run_model(db_connection, aggregate, dict(key, test_run_id=test_run_id), part,
+                                       url_count)
+            state = aggregate.merge(state, part)
+    except BudgetExceeded as e:
+        raise BudgetExceeded(aggregate.name, [f"{done} of {len(test_runs)} test runs aggregated before the "
+                                              f"time budget ran out"] + aggregate.describe_partial(state)) from e
+
+    if not view:
+        # Without the view the report also reads results of runs it does not list
+        state = aggregate.merge(state, accumulate({'test_run_id': {'$nin': test_run_ids}}))
+    if reused:
+        print(f"Using stored aggregates for {aggregate.name} ({reused} of {len(test_runs)} test runs)")
+    return state
+
+
+def invalidate_runs(db_connection, test_run_ids):
+    """
+    Delete the stored models of the given test runs.
+
+    Call this when a run's page results are re-imported or changed. The
+    runs' stored structure analyses are deleted along with them.
+
+    Returns:
+        Number of stored models deleted
+    """
+    # Imported here: structure_provider reads this module's run statuses
+    from structure_provider import invalidate_structure_analyses
+
+    invalidate_structure_analyses(db_connection, test_run_ids)
+    result = aggregates_collection(db_connection).delete_many(
+        {'test_run_id': {'$in': [str(run_id) for run_id in test_run_ids]}}
+    )
+    return result.deleted_count
+
+
+def clear_aggregates(db_connection, topic=None):
+    """Delete all stored models, or only those of one topic. Returns the number deleted"""
+    query = {'topic': topic} if topic else {}
+    return aggregates_collection(db_connection).delete_many(query).deleted_count
+
+
+@click.command()
+@click.option('--database', '-db',
+              default=None,
+              help='MongoDB database name to use (default: accessibility_tests)')
+@click.option('--invalidate', '-i', multiple=True,
+              help='Test run ID whose stored aggregates should be deleted (repeatable)')
+@click.option('--clear', is_flag=True,
+              default=False,
+              help='Delete all stored aggregates')
+@click.option('--topic', default=None,
+              help='With --clear, only delete the stored aggregates of this topic')
+@click.option('--statuses', is_flag=True,
+              default=False,
+              help='List the test run statuses in the database and whether their runs are stored')
+def main(database, invalidate, clear, topic, statuses):
+    """Invalidate stored report aggregates."""
+    if not invalidate and not clear and not statuses:
+        click.echo("Nothing to do: pass --invalidate RUN_ID, --clear or --statuses")
+        return
+
+    db = AccessibilityDB(db_name=database, profile=ConnectionProfile.from_environment())
+    if statuses:
+        for status in db.test_runs.aggregate([{'$group': {'_id': '$status', 'runs': {'$sum': 1}}},
+                                              {'$sort': {'_id': 1}}]):
+            stored = 'stored' if status['_id'] in finished_statuses(db) else 'not stored'
+            click.echo(f"{status['_id']}: {status['runs']} test runs ({stored})")
+    if invalidate:
+        click.echo(f"Deleted {invalidate_runs(db, invalidate)} stored aggregates")
+    if clear:
+        click.echo(f"Deleted {clear_aggregates(db, topic)} stored aggregates")
+
+if __name__ == "__main__":
+    main()
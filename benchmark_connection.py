@@ -0,0 +1,102 @@
+"""
+Benchmark connection profiles on the fetch that dominates remote reports.
+
+Streams the test results of every page (results.accessibility.tests, the
+details subtrees included) with each connection profile and prints the
+best wall time of a few runs, the pages read and, where the server
+reports it, the bytes it sent.
+
+Compression and bulk fetching only pay off over a slow link, so run it
+against a mongod behind simulated latency. With toxiproxy:
+
+    toxiproxy-cli create -l localhost:27018 -u localhost:27017 mongo
+    toxiproxy-cli toxic add -t latency -a latency=20 mongo
+    python benchmark_connection.py --uri mongodb://localhost:27018/ -db accessibility_tests
+
+or with netem on the loopback interface (Linux, as root; this slows every
+local connection until removed):
+
+    tc qdisc add dev lo root netem delay 10ms rate 100mbit
+    python benchmark_connection.py -db accessibility_tests
+    tc qdisc del dev lo root
+"""
+import click
+import time
+
+from connection_profile import ConnectionProfile, COMPRESSORS, DEFAULT_MONGO_URI
+
+# Profiles compared, by name: ConnectionProfile arguments besides the URI
+PROFILES = {
+    'default': {},
+    'zlib': {'compressors': 'zlib'},
+    'snappy': {'compressors': 'snappy'},
+    'zstd': {'compressors': 'zstd'},
+    'bulk': {'bulk_fetch': True},
+    'zstd+bulk': {'compressors': 'zstd', 'bulk_fetch': True}
+}
+
+FETCH_PROJECTION = {'url': 1, 'results.accessibility.tests': 1, '_id': 0}
+
+
+def bytes_sent(client):
+    """Bytes the server has sent on the wire so far, or None if it does not say"""
+    try:
+        network = client.admin.command('serverStatus').get('network', {})
+    except Exception:
+        return None
+    return network.get('physicalBytesOut', network.get('bytesOut'))
+
+
+def time_fetch(profile, database, limit):
+    """
+    Stream the page results once with a profile.
+
+    Returns:
+        (seconds, pages read, bytes sent by the server or None)
+    """
+    client = profile.create_client()
+    try:
+        client.server_info()
+        page_results = client[database]['page_results']
+        sent_before = bytes_sent(client)
+        started = time.perf_counter()
+        pages = 0
+        for _ in page_results.find({}, FETCH_PROJECTION, limit=limit, **profile.cursor_options()):
+            pages += 1
+        seconds = time.perf_counter() - started
+        sent_after = bytes_sent(client)
+        sent = sent_after - sent_before if sent_before is not None and sent_after is not None else None
+        return seconds, pages, sent
+    finally:
+        client.close()
+
+
+@click.command()
+@click.option('--uri', default=DEFAULT_MONGO_URI,
+              help='MongoDB connection string')
+@click.option('--database', '-db', default='accessibility_tests',
+              help='MongoDB database name to use (default: accessibility_tests)')
+@click.option('--profile', 'profile_names', multiple=True, type=click.Choice(list(PROFILES)),
+              help='Profile to benchmark (repeatable; default: all)')
+@click.option('--batch-size', type=click.IntRange(min=1), default=None,
+              help='Batch size for every profile (default: the server\'s, or the bulk fetch size)')
+@click.option('--runs', type=click.IntRange(min=1), default=3,
+              help='Runs per profile; the fastest is reported')
+@click.option('--limit', type=click.IntRange(min=0), default=0,
+              help='Pages to read per run (0 for all)')
+def main(uri, database, profile_names, batch_size, runs, limit):
+    """Compare connection profiles for streaming page results."""
+    for name in profile_names or PROFILES:
+        settings = PROFILES[name]
+        compressor = settings.get('compressors')
+        if compressor and not COMPRESSORS[compressor]:
+            click.echo(f"{name}: skipped, the {compressor} compressor's package is not installed")
+            continue
+        profile = ConnectionProfile(uri, batch_size=batch_size, **settings)
+        results = [time_fetch(profile, database, limit) for _ in range(runs)]
+        seconds, pages, sent = min(results, key=lambda result: result[0])
+        sent_text = f", {sent / 1024 / 1024:.1f} MB sent" if sent is not None else ""
+        click.echo(f"{name}: {seconds:.2f}s for {pages} pages{sent_text}")
+
+if __name__ == "__main__":
+    main()
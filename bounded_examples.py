@@ -0,0 +1,169 @@
+"""
+Bounded example selection for report sections.
+
+Sections usually show a handful of examples (the first 5 violations, the top
+10 affected pages, ...) out of everything they read. Instead of collecting and
+sorting the whole result set and then slicing it, a BoundedExamples collector
+keeps only the best K items while the results stream past, together with a
+count of everything it was offered.
+"""
+import heapq
+import itertools
+
+
+class _HeapEntry:
+    """Heap entry ordered in reverse, so the heap root is the worst kept item"""
+    __slots__ = ('rank', 'item')
+
+    def __init__(self, rank, item):
+        self.rank = rank
+        self.item = item
+
+    def __lt__(self, other):
+        return self.rank > other.rank
+
+
+def _unique_key(rank, item):
+    """What a unique collector compares: the item's sort key, or the item itself when it has none"""
+    return rank[0] if len(rank) == 2 else item
+
+
+class BoundedExamples:
+    """
+    Keep the K smallest items by key while streaming.
+
+    Ordering is deterministic: items with equal keys are kept in the order in
+    which they were added, so BoundedExamples(5) with no key returns exactly
+    what list(stream)[:5] would.
+
+    Args:
+        limit: Maximum number of examples to keep
+        key: Optional function mapping an item to its sort key. Without a key,
+            items are kept in insertion order.
+        unique: Skip items whose key is already among the kept examples. Without
+            a key, the items themselves are compared (they must be hashable).
+    """
+
+    def __init__(self, limit, key=None, unique=False):
+        self.limit = limit
+        self.key = key
+        self.unique = unique
+        self.total = 0
+        self._heap = []
+        self._keys = set()
+        self._sequence = itertools.count()
+
+    def add(self, item, sort_key=None):
+        """
+        Offer an item to the collector.
+
+        Args:
+            item: The example
+            sort_key: Explicit sort key, overriding the collector's key function
+
+        Returns:
+            True if the item is currently among the kept examples
+        """
+        self.total += 1
+        if sort_key is None and self.key is not None:
+            sort_key = self.key(item)
+        rank = (sort_key, next(self._sequence)) if sort_key is not None else (next(self._sequence),)
+        if self.unique and _unique_key(rank, item) in self._keys:
+            return False
+
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, _HeapEntry(rank, item))
+            if self.unique:
+                self._keys.add(_unique_key(rank, item))
+            return True
+
+        if not self._heap or not rank < self._heap[0].rank:
+            return False
+
+        evicted = heapq.heapreplace(self._heap, _HeapEntry(rank, item))
+        if self.unique:
+            self._keys.discard(_unique_key(evicted.rank, evicted.item))
+            self._keys.add(_unique_key(rank, item))
+        return True
+
+    def extend(self, items):
+        """Offer every item in an iterable"""
+        for item in items:
+            self.add(item)
+
+    def merge(self, other):
+        """
+        Fold another collector with the same limit and key into this one.
+
+        Items of other with equal keys rank after this collector's, as if
+        other's stream had been added after this one's.
+        """
+        total = self.total + other.total
+        for entry in sorted(other._heap, key=lambda entry: entry.rank):
+            sort_key = entry.rank[0] if len(entry.rank) == 2 else None
+            self.add(entry.item, sort_key=sort_key)
+        self.total = total
+        return self
+
+    def items(self):
+        """Return the kept examples in sort order"""
+        return [entry.item for entry in sorted(self._heap, key=lambda entry: entry.rank)]
+
+    @property
+    def remaining(self):
+        """Number of offered items that are not among the kept examples"""
+        return self.total - len(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def __iter__(self):
+        return iter(self.items())
+
+
+class BucketedExamples:
+    """
+    A BoundedExamples collector per bucket (issue type, domain, section, ...).
+
+    Args:
+        limit: Maximum number of examples to keep in each bucket
+        key: Optional sort key function shared by every bucket
+        unique: Skip duplicate keys within a bucket
+    """
+
+    def __init__(self, limit, key=None, unique=False):
+        self.limit = limit
+        self.key = key
+        self.unique = unique
+        self._buckets = {}
+
+    def add(self, bucket, item, sort_key=None):
+        """Offer an item to the given bucket"""
+        if bucket not in self._buckets:
+            self._buckets[bucket] = BoundedExamples(self.limit, key=self.key, unique=self.unique)
+        return self._buckets[bucket].add(item, sort_key=sort_key)
+
+    def get(self, bucket):
+        """Return the collector for a bucket, or None if nothing was added to it"""
+        return self._buckets.get(bucket)
+
+    def __contains__(self, bucket):
+        return bucket in self._buckets
+
+    def __getitem__(self, bucket):
+        return self._buckets[bucket]
+
+    def items(self):
+        return self._buckets.items()
+
+    def merge(self, other):
+        """Fold another BucketedExamples into this one, bucket by bucket"""
+        for bucket, examples in other._buckets.items():
+            if bucket in self._buckets:
+                self._buckets[bucket].merge(examples)
+            else:
+                self._buckets[bucket] = examples
+        return self
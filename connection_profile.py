@@ -0,0 +1,167 @@
+"""
+How the report generator connects to MongoDB.
+
+Reports used to connect to a MongoDB on localhost with the client's
+default settings. When the database is on another host, most of a report's
+time goes into moving page results over the network. A ConnectionProfile
+says where the server is and how to talk to it:
+
+- uri: the server (or replica set) to connect to
+- compressors: wire compression to offer the server, in order of
+  preference (zstd, snappy, zlib). Compression trades a little CPU for much
+  less data on a slow link; the server picks the first one it supports.
+- batch_size: documents per round trip when streaming page results
+- read_preference: which replica set members may serve reads (e.g.
+  secondaryPreferred to read from a nearby secondary)
+- bulk_fetch: stream page results with large batches and exhaust cursors,
+  so the server sends batch after batch without waiting for a getMore
+  request for each. Exhaust cursors are not supported through mongos, so
+  leave this off for sharded clusters.
+
+zstd needs the zstandard package and snappy the python-snappy package.
+Compressors whose package is missing are left out with a warning.
+
+Every setting can also come from the environment (see from_environment),
+so tools that do not take connection options still reach a remote server.
+"""
+import os
+
+from pymongo import CursorType, MongoClient
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import snappy
+except ImportError:
+    snappy = None
+
+DEFAULT_MONGO_URI = 'mongodb://localhost:27017/'
+
+# Compressors pymongo supports, and whether the package each needs is installed
+COMPRESSORS = {
+    'zstd': zstandard is not None,
+    'snappy': snappy is not None,
+    'zlib': True
+}
+
+READ_PREFERENCES = ('primary', 'primaryPreferred', 'secondary', 'secondaryPreferred', 'nearest')
+
+# Documents per batch in bulk fetch mode, unless the profile sets batch_size
+BULK_FETCH_BATCH_SIZE = 5000
+
+# Milliseconds to wait for a server before giving up on the connection
+SERVER_SELECTION_TIMEOUT_MS = 5000
+
+# Environment variables read by from_environment
+ENVIRONMENT_PREFIX = 'ACCESSIBILITY_MONGO_'
+
+
+def available_compressors(names):
+    """
+    Keep the compressors that can be used here, in order.
+
+    Args:
+        names: Compressor names, as a list or a comma-separated string
+
+    Returns:
+        List of usable compressor names
+    """
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(',') if name.strip()]
+    usable = []
+    for name in names:
+        if name not in COMPRESSORS:
+            print(f"Warning: Unknown wire compressor '{name}' ignored (use {', '.join(COMPRESSORS)})")
+        elif not COMPRESSORS[name]:
+            print(f"Warning: Wire compressor '{name}' needs the "
+                  f"{'zstandard' if name == 'zstd' else 'python-snappy'} package; it is not used")
+        else:
+            usable.append(name)
+    return usable
+
+
+class ConnectionProfile:
+    """
+    Connection settings for the report's MongoDB.
+
+    Args:
+        uri: MongoDB connection string
+        compressors: Wire compressors to offer, in order of preference (None for none)
+        batch_size: Documents per batch when streaming page results (None for the server default)
+        read_preference: Read preference mode name (None for the connection string's, or primary)
+        bulk_fetch: Stream page results with large batches and exhaust cursors
+    """
+
+    def __init__(self, uri=DEFAULT_MONGO_URI, compressors=None, batch_size=None, read_preference=None,
+                 bulk_fetch=False):
+        if read_preference is not None and read_preference not in READ_PREFERENCES:
+            raise ValueError(f"Unknown read preference '{read_preference}' (use {', '.join(READ_PREFERENCES)})")
+        self.uri = uri
+        self.compressors = available_compressors(compressors) if compressors else []
+        self.batch_size = batch_size
+        self.read_preference = read_preference
+        self.bulk_fetch = bulk_fetch
+
+    @classmethod
+    def from_environment(cls):
+        """
+        Build a profile from ACCESSIBILITY_MONGO_* environment variables.
+
+        ACCESSIBILITY_MONGO_URI, ACCESSIBILITY_MONGO_COMPRESSORS (comma-separated),
+        ACCESSIBILITY_MONGO_BATCH_SIZE, ACCESSIBILITY_MONGO_READ_PREFERENCE and
+        ACCESSIBILITY_MONGO_BULK_FETCH (1 to enable). Unset variables keep the defaults.
+        """
+        environment = {name[len(ENVIRONMENT_PREFIX):].lower(): value
+                       for name, value in os.environ.items() if name.startswith(ENVIRONMENT_PREFIX)}
+        batch_size = environment.get('batch_size')
+        return cls(
+            uri=environment.get('uri') or DEFAULT_MONGO_URI,
+            compressors=environment.get('compressors'),
+            batch_size=int(batch_size) if batch_size else None,
+            read_preference=environment.get('read_preference') or None,
+            bulk_fetch=environment.get('bulk_fetch', '').lower() in ('1', 'true', 'yes')
+        )
+
+    def client_options(self):
+        """Keyword arguments for MongoClient"""
+        options = {'serverSelectionTimeoutMS': SERVER_SELECTION_TIMEOUT_MS}
+        if self.compressors:
+            options['compressors'] = list(self.compressors)
+        if self.read_preference is not None:
+            options['readPreference'] = self.read_preference
+        return options
+
+    def create_client(self):
+        """Open a MongoClient with this profile's settings"""
+        return MongoClient(self.uri, **self.client_options())
+
+    def cursor_options(self):
+        """Keyword arguments for find() when streaming page results"""
+        options = {}
+        batch_size = self.batch_size
+        if self.bulk_fetch:
+            options['cursor_type'] = CursorType.EXHAUST
+            batch_size = batch_size or BULK_FETCH_BATCH_SIZE
+        if batch_size:
+            options['batch_size'] = batch_size
+        return options
+
+    def describe(self):
+        """One-line summary for the log"""
+        parts = [f"compression: {', '.join(self.compressors) or 'none'}"]
+        if self.read_preference:
+            parts.append(f"read preference: {self.read_preference}")
+        if self.bulk_fetch:
+            parts.append("bulk fetch")
+        if self.batch_size:
+            parts.append(f"batch size: {self.batch_size}")
+        return '; '.join(parts)
+
+
+def cursor_options(db_connection):
+    """find() options for streaming page results over the connection's profile"""
+    profile = getattr(db_connection, 'profile', None)
+    return profile.cursor_options() if profile is not None else {}
@@ -1,14 +1,22 @@
-from pymongo import MongoClient
 from bson import ObjectId
 import json
 
+from connection_profile import ConnectionProfile
+
 DEFAULT_DB_NAME = 'accessibility_tests'
 
 class AccessibilityDB:
-    def __init__(self, db_name=None):
+    def __init__(self, db_name=None, raw_documents=False, profile=None):
+        # When True, report sections read page results as lazily-decoded
+        # RawBSONDocuments (see page_access.page_collection)
+        self.raw_documents = raw_documents
+        # Server, wire compression, read preference and cursor settings
+        # (ACCESSIBILITY_MONGO_* environment variables when not given)
+        self.profile = profile if profile is not None else ConnectionProfile.from_environment()
+        # Also used by worker processes to open their own connections
+        self.mongo_uri = self.profile.uri
         try:
-            self.client = MongoClient('mongodb://localhost:27017/',
-                                    serverSelectionTimeoutMS=5000)
+            self.client = self.profile.create_client()
             self.client.server_info()
             
             # Use the specified database name or default
@@ -26,9 +34,10 @@ class AccessibilityDB:
             # Create indexes
             self.page_results.create_index([('url', 1), ('test_run_id', 1)])
             self.page_results.create_index('timestamp')
+            self.page_results.create_index('test_run_id')
             self.test_runs.create_index('timestamp')
             
-            print(f"Report Generator connected to database: '{db_name}'")
+            print(f"Report Generator connected to database: '{db_name}' ({self.profile.describe()})")
         except Exception as e:
             print(f"Failed to connect to MongoDB: {e}")
             raise
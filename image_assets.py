@@ -0,0 +1,157 @@
+"""
+Image asset pipeline for embedding pictures in reports.
+
+Images used to be embedded as-is: a 2000 pixel wide photo shown at page
+width, or a full-page screenshot shown a few inches wide, went into the
+.docx at full resolution. prepared_image scales each image down to the
+pixels needed for its display width (at DISPLAY_DPI) and recompresses it.
+Prepared images are cached on disk by a hash of their content and target
+size, so they are only processed once across reports.
+
+python-docx stores images with the same SHA1 as one image part. Preparing
+an image is deterministic, so an image embedded several times at the same
+width is still stored once.
+
+Pillow is optional. Without it images are embedded unchanged.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import threading
+
+from docx.shared import Inches, Length
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+ASSET_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'accessibility_report_images')
+
+# Bump whenever the scaling or compression changes
+PIPELINE_VERSION = 1
+
+# Pixels per inch of display width kept in embedded images
+DISPLAY_DPI = 150
+
+JPEG_QUALITY = 85
+
+# Widest an image is shown when no width is given (the page's text width)
+MAX_DISPLAY_WIDTH = Inches(6.5)
+
+# Prepared images of this process, keyed by (path, size, mtime, display width)
+_prepared = {}
+
+
+def target_pixels(width):
+    """Pixels needed to show an image at a display width (a docx Length or EMUs)"""
+    return max(1, int(round(Length(width).inches * DISPLAY_DPI)))
+
+
+def _native_width(image):
+    """Display width python-docx would give an image without an explicit width"""
+    dpi = image.info.get('dpi', (72, 72))[0] or 72
+    return Inches(image.width / float(dpi))
+
+
+def scale_image(data, width=None):
+    """
+    Scale and recompress image bytes for display at a width.
+
+    Args:
+        data: The original image file's bytes
+        width: Display width (None for the image's own size, capped at
+            MAX_DISPLAY_WIDTH)
+
+    Returns:
+        (bytes, display width); the original bytes when they are already
+        small enough or Pillow is not installed
+    """
+    if Image is None:
+        return data, width
+    with Image.open(io.BytesIO(data)) as original:
+        if width is None:
+            width = min(_native_width(original), MAX_DISPLAY_WIDTH)
+        pixels = target_pixels(width)
+        if original.width <= pixels and original.format in ('JPEG', 'PNG'):
+            return data, width
+
+        image = ImageOps.exif_transpose(original)
+        if image.width > pixels:
+            height = max(1, int(round(image.height * pixels / image.width)))
+            image = image.resize((pixels, height), Image.LANCZOS)
+
+        output = io.BytesIO()
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image.save(output, format='PNG', optimize=True)
+        else:
+            image.convert('RGB').save(output, format='JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    prepared = output.getvalue()
+    return (prepared if len(prepared) < len(data) else data), width
+
+
+def _cache_path(key):
+    return os.path.join(ASSET_CACHE_DIR, key)
+
+
+def prepared_image(path, width=None):
+    """
+    Get an image file prepared for display at a width, using the disk cache.
+
+    Args:
+        path: Image file
+        width: Display width (None for the image's own size, capped at the page width)
+
+    Returns:
+        (bytes, display width to embed it at)
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime, width)
+    if memo_key in _prepared:
+        return _prepared[memo_key]
+
+    with open(path, 'rb') as image_file:
+        data = image_file.read()
+    if Image is None:
+        result = (data, width)
+    else:
+        digest = hashlib.sha1(data)
+        digest.update(f"{PIPELINE_VERSION}:{DISPLAY_DPI}:{JPEG_QUALITY}:{width}".encode())
+        cache_path = _cache_path(digest.hexdigest())
+        result = None
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as cached:
+                    cached_width, prepared = cached.read().split(b'\n', 1)
+                result = (prepared, Length(int(cached_width)) if cached_width else None)
+            except (OSError, ValueError):
+                result = None
+        if result is None:
+            result = scale_image(data, width)
+            try:
+                os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+                partial = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(partial, 'wb') as cached:
+                    cached.write(str(int(result[1]) if result[1] is not None else '').encode() + b'\n' + result[0])
+                os.replace(partial, cache_path)
+            except OSError as e:
+                print(f"Warning: Could not cache prepared image {path}: {e}")
+    _prepared[memo_key] = result
+    return result
+
+
+def add_picture(container, path, width=None):
+    """
+    Embed a prepared image.
+
+    Args:
+        container: Document or Run to add the picture to
+        path: Image file
+        width: Display width (None for the image's own size, capped at the page width)
+
+    Returns:
+        The added picture (as returned by add_picture)
+    """
+    data, display_width = prepared_image(path, width)
+    return container.add_picture(io.BytesIO(data), width=display_width)
@@ -0,0 +1,351 @@
+"""
+Incremental regeneration of a report.
+
+Re-crawling a handful of pages into a run used to mean rebuilding the whole
+document. With incremental regeneration every scheduled section records the
+page results that fed it:
+
+- the queries it reads (declared with declare_section_inputs, directly or
+  through the topic aggregates it uses),
+- the fields those queries fetch,
+- the number of pages they returned,
+- and a hash of the returned pages' ids, URLs and crawl timestamps.
+
+The pages themselves are not read: re-crawling a page writes a new result
+(or at least a new timestamp), which changes the hash. Hashing the full
+documents meant downloading every page a section reads just to decide
+whether to read it again.
+
+The hashes and the position of each section's fragment of the document are
+written to a manifest next to the report (REPORT.manifest.json). When the
+report is regenerated from that previous output, the section hashes are
+computed again. Sections whose inputs are unchanged are not rendered: their
+fragment is copied from the previous document. Only the dirty sections are
+recomputed, and only their topic aggregates are prefetched. The table
+attachments of copied fragments (see table_overflow) are copied along.
+
+Sections without declared inputs, and sections that were truncated or
+skipped because of their time budget, are always rebuilt.
+"""
+from copy import deepcopy
+from datetime import datetime
+import hashlib
+import io
+import json
+import os
+import shutil
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
+
+from page_access import RAW_CODEC_OPTIONS
+from report_context import get_report_context
+from table_overflow import attachments_folder
+from topic_aggregates import TOPICS
+
+# Bump whenever the manifest format or the hashing changes
+MANIFEST_VERSION = 2
+
+# Fields that identify a version of a page result
+PAGE_VERSION_PROJECTION = {'_id': 1, 'url': 1, 'timestamp': 1}
+
+# Declared inputs, keyed by section title: {'topics': (...), 'queries': (...)}
+SECTION_INPUTS = {}
+
+# Attributes of document XML that refer to a relationship of the document part
+RELATIONSHIP_ATTRIBUTES = (qn('r:id'), qn('r:embed'), qn('r:link'))
+
+
+def declare_section_inputs(title, topics=(), queries=()):
+    """
+    Declare the page results a scheduled section reads.
+
+    Args:
+        title: Section title, as passed to SectionScheduler.run
+        topics: Names of the topic aggregates the section uses
+        queries: Other queries the section runs, as {'filter': ..., 'projection': ...}
+    """
+    SECTION_INPUTS[title] = {'topics': tuple(topics), 'queries': tuple(queries)}
+
+
+def section_queries(title):
+    """
+    Get every query a section reads, including those of its topic aggregates.
+
+    Returns:
+        List of queries, or None if the section did not declare its inputs
+    """
+    if title not in SECTION_INPUTS:
+        return None
+    inputs = SECTION_INPUTS[title]
+    queries = []
+    for name in inputs['topics']:
+        queries.extend(TOPICS[name].queries().values())
+    queries.extend(inputs['queries'])
+    return queries
+
+
+def manifest_path(report_file):
+    """Path of the manifest kept next to a report file"""
+    return f"{os.path.splitext(report_file)[0]}.manifest.json"
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as report:
+        for block in iter(lambda: report.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PreviousReport:
+    """A report generated earlier, with the manifest of its sections"""
+
+    def __init__(self, doc, manifest, report_file=None):
+        self.doc = doc
+        self.manifest = manifest
+        self.report_file = report_file
+        self.sections = {section['title']: section for section in manifest['sections']}
+
+
+def load_previous_report(report_file):
+    """
+    Load a previous report and its manifest.
+
+    Returns:
+        PreviousReport, or None if there is no usable manifest for the file
+    """
+    path = manifest_path(report_file)
+    try:
+        with open(path) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get('version') != MANIFEST_VERSION:
+            print(f"Warning: {path} was written by a different version; regenerating every section")
+            return None
+        if manifest.get('report_sha1') != _file_digest(report_file):
+            print(f"Warning: {report_file} changed since its manifest was written; regenerating every section")
+            return None
+        return PreviousReport(Document(report_file), manifest, report_file)
+    except Exception as e:
+        print(f"Warning: Could not load previous report {report_file}: {e}")
+        return None
+
+
+def copy_fragment(source_part, target_part, elements):
+    """
+    Copy body elements from one document to another.
+
+    Relationship references (hyperlinks, images) are re-created in the target
+    document's part, so the copies do not point at the source's relationships.
+
+    Returns:
+        List of copied elements, not yet inserted anywhere
+    """
+    copies = []
+    for element in elements:
+        copy = deepcopy(element)
+        for node in copy.iter():
+            for attribute in RELATIONSHIP_ATTRIBUTES:
+                r_id = node.get(attribute)
+                if r_id is None or r_id not in source_part.rels:
+                    continue
+                rel = source_part.rels[r_id]
+                if rel.is_external:
+                    new_r_id = target_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+                elif rel.reltype == RT.IMAGE:
+                    new_r_id, _ = target_part.get_or_add_image(io.BytesIO(rel.target_part.blob))
+                else:
+                    new_r_id = target_part.relate_to(rel.target_part, rel.reltype)
+                node.set(attribute, new_r_id)
+        copies.append(copy)
+    return copies
+
+
+class IncrementalBuild:
+    """
+    Tracks the inputs and fragments of a report's sections.
+
+    Args:
+        db_connection: Database connection (reading the report's page results)
+        previous: PreviousReport whose unchanged fragments are reused (None to
+            build every section and only write a manifest)
+    """
+
+    def __init__(self, db_connection, previous=None):
+        self.db_connection = db_connection
+        self.previous = previous
+        # Hash of what every section depends on besides its page results
+        self.report_key = ''
+        # Section title -> {'hash', 'fields', 'pages'} for the current page results
+        self.inputs = {}
+        # Manifest entries of the report being built, in document order
+        self.sections = []
+        self.reused = []
+        self._fragments = []
+        self._query_digests = {}
+        # Table attachments (see table_overflow) already assigned to a section
+        self._attachments_recorded = 0
+
+    def _query_digest(self, query):
+        """Hash the ids, URLs and timestamps of the pages a query returns"""
+        key = json.dumps(query['filter'], sort_keys=True, default=str)
+        if key not in self._query_digests:
+            collection = self.db_connection.page_results.with_options(codec_options=RAW_CODEC_OPTIONS)
+            digest = hashlib.sha1(key.encode())
+            pages = 0
+            for page in collection.find(query['filter'], PAGE_VERSION_PROJECTION).sort([('url', 1), ('_id', 1)]):
+                digest.update(page.raw)
+                pages += 1
+            self._query_digests[key] = (digest.hexdigest(), pages)
+        return self._query_digests[key]
+
+    def plan(self, titles, report_key=''):
+        """
+        Hash the inputs of the given sections.
+
+        Args:
+            titles: Titles of the sections the report will run
+            report_key: Anything else the sections' output depends on (test
+                runs, sampling, ...), as a string
+
+        Returns:
+            Titles of the sections that must be rebuilt
+        """
+        self.report_key = report_key
+        for title in titles:
+            queries = section_queries(title)
+            if queries is None:
+                continue
+            digest = hashlib.sha1(f"{MANIFEST_VERSION}:{title}:{report_key}".encode())
+            for name in SECTION_INPUTS[title]['topics']:
+                digest.update(f"{name}:{TOPICS[name].version}".encode())
+            pages = 0
+            fields = set()
+            for query in queries:
+                query_digest, query_pages = self._query_digest(query)
+                digest.update(query_digest.encode())
+                pages += query_pages
+                fields.update(path for path in query['projection'] if path != '_id')
+            self.inputs[title] = {'hash': digest.hexdigest(), 'fields': sorted(fields), 'pages': pages}
+        return [title for title in titles if not self.is_clean(title)]
+
+    def is_clean(self, title):
+        """True if the section's fragment can be copied from the previous report"""
+        if self.previous is None or title not in self.inputs:
+            return False
+        previous = self.previous.sections.get(title)
+        return previous is not None and previous.get('hash') == self.inputs[title]['hash']
+
+    def inputs_changed(self):
+        """
+        True if a section's page results changed while the report's test runs did not.
+
+        That happens when pages are re-crawled into an existing run, so
+        anything stored for those runs (see aggregate_store) is stale.
+        """
+        if self.previous is None or self.previous.manifest.get('report_key') != self.report_key:
+            return False
+        return any(
+            title in self.previous.sections and self.previous.sections[title].get('hash') not in (None, inputs['hash'])
+            for title, inputs in self.inputs.items()
+        )
+
+    def needed_topics(self, titles):
+        """
+        Topic aggregates the dirty sections among titles use.
+
+        Returns:
+            Set of topic names, or None if a dirty section did not declare its inputs
+        """
+        topics = set()
+        for title in titles:
+            if self.is_clean(title):
+                continue
+            if title not in SECTION_INPUTS:
+                return None
+            topics.update(SECTION_INPUTS[title]['topics'])
+        return topics
+
+    def reuse(self, doc, title):
+        """
+        Copy a clean section's fragment from the previous report into doc.
+
+        Returns:
+            True if the fragment was copied, False if the section must be rendered
+        """
+        if not self.is_clean(title):
+            return False
+        previous = self.previous.sections[title]
+        body = self.previous.doc.element.body
+        elements = list(body)[previous['start']:previous['start'] + previous['count']]
+        copies = copy_fragment(self.previous.doc.part, doc.part, elements)
+        target = doc.element.body
+        section_properties = target.find(qn('w:sectPr'))
+        for copy in copies:
+            if section_properties is not None:
+                section_properties.addprevious(copy)
+            else:
+                target.append(copy)
+        self._copy_attachments(previous.get('attachments', []))
+        self.record(doc, title, copies, complete=True)
+        self.reused.append(title)
+        return True
+
+    def _copy_attachments(self, file_names):
+        """Copy the table attachments a reused fragment refers to into this report's folder"""
+        context = get_report_context(self.db_connection)
+        if not file_names or context.attachments_folder is None or self.previous.report_file is None:
+            return
+        source = attachments_folder(self.previous.report_file)
+        os.makedirs(context.attachments_folder, exist_ok=True)
+        for file_name in file_names:
+            try:
+                shutil.copyfile(os.path.join(source, file_name), os.path.join(context.attachments_folder, file_name))
+                context.table_attachments.append(file_name)
+            except OSError as e:
+                print(f"Warning: Could not copy table attachment {file_name} of the previous report: {e}")
+
+    def record(self, doc, title, elements, complete):
+        """
+        Record the fragment a section added to doc.
+
+        Args:
+            doc: The report document
+            title: Section title
+            elements: The body elements the section added, in order
+            complete: False if the section was truncated or skipped; its
+                fragment is then never reused
+        """
+        entry = {'title': title, 'start': None, 'count': len(elements), 'hash': None}
+        if complete and title in self.inputs:
+            entry.update(self.inputs[title])
+        # Table attachments written (or copied) since the previous section
+        context = get_report_context(self.db_connection)
+        entry['attachments'] = context.table_attachments[self._attachments_recorded:]
+        self._attachments_recorded = len(context.table_attachments)
+        self.sections.append(entry)
+        # Positions are only resolved when the manifest is saved, because
+        # content added before the section later (such as the table of
+        # contents entries) moves it
+        self._fragments.append((entry, doc, elements[0] if elements else None))
+
+    def save(self, report_file):
+        """Write the manifest for a saved report"""
+        positions = {}
+        for entry, doc, first_element in self._fragments:
+            body = doc.element.body
+            if body not in positions:
+                positions[body] = {element: i for i, element in enumerate(body)}
+            entry['start'] = positions[body].get(first_element, 0)
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'created': datetime.now().isoformat(),
+            'report_sha1': _file_digest(report_file),
+            'report_key': self.report_key,
+            'sections': self.sections
+        }
+        with open(manifest_path(report_file), 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        if self.previous is not None:
+            print(f"Reused {len(self.reused)} of {len(self.sections)} sections from the previous report")
@@ -0,0 +1,375 @@
+"""
+Index advisor for the queries the report issues.
+
+Generates a report against the database with the collections wrapped in
+recorders. Each distinct query shape (filter structure and sort) is then
+explained, and any shape answered with a collection scan or an in-memory
+sort is listed together with the index that would support it. With --create
+the recommended indexes are built.
+
+Recommendations follow the equality-sort order: equality and $in fields
+first, then sort fields. $exists conditions become the partial filter of
+the index rather than index keys, so large subdocuments such as
+responsive_testing are never indexed themselves. Each branch of an $or gets
+its own index, because MongoDB can only use indexes for an $or when every
+branch has one.
+
+The server and connection settings come from the ACCESSIBILITY_MONGO_*
+environment variables (see connection_profile).
+"""
+import click
+from datetime import datetime
+import hashlib
+import json
+
+from connection_profile import ConnectionProfile
+from db import AccessibilityDB
+from report_generator import create_report_template
+
+# Plan stages that mean a query is not index-backed
+PROBLEM_STAGES = ('COLLSCAN', 'SORT')
+
+_LOGICAL_OPERATORS = ('$or', '$and', '$nor')
+
+
+def query_shape(value):
+    """Reduce a filter to its structure, replacing values with '?' (except $exists flags)"""
+    if isinstance(value, dict):
+        shape = {}
+        for key, item in value.items():
+            if key in _LOGICAL_OPERATORS:
+                shape[key] = [query_shape(branch) for branch in item]
+            elif key == '$exists':
+                shape[key] = bool(item)
+            elif isinstance(item, dict):
+                shape[key] = query_shape(item)
+            else:
+                shape[key] = '?'
+        return shape
+    return '?'
+
+
+def _sort_spec(key_or_list, direction=None):
+    """Normalize the arguments of Cursor.sort / find(sort=...) to a list of (field, direction)"""
+    if key_or_list is None:
+        return []
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction if direction is not None else 1)]
+    return [tuple(item) for item in key_or_list]
+
+
+class QueryRecorder:
+    """Collects the distinct query shapes issued against the wrapped collections"""
+
+    def __init__(self):
+        # (collection name, shape key) -> query details
+        self.queries = {}
+
+    def record(self, collection, kind, query, projection=None, sort=None):
+        """Record a query, returning its (mutable) entry so a later sort can be added"""
+        entry = {
+            'collection': collection,
+            'kind': kind,
+            'filter': query or {},
+            'projection': projection,
+            'sort': sort or [],
+            'count': 1
+        }
+        key = self._key(entry)
+        if key in self.queries:
+            self.queries[key]['count'] += 1
+            return self.queries[key]
+        self.queries[key] = entry
+        return entry
+
+    def resort(self, entry, sort):
+        """Move an entry to the shape that includes a sort applied to its cursor"""
+        key = self._key(entry)
+        if self.queries.get(key) is entry:
+            entry['count'] -= 1
+            if entry['count'] == 0:
+                del self.queries[key]
+        return self.record(entry['collection'], entry['kind'], entry['filter'], entry['projection'], sort)
+
+    @staticmethod
+    def _key(entry):
+        return (entry['collection'].name,
+                json.dumps(query_shape(entry['filter']), sort_keys=True),
+                json.dumps(entry['sort']))
+
+
+class RecordingCursor:
+    """Cursor wrapper that records a sort applied after find()"""
+
+    def __init__(self, cursor, recorder, entry):
+        self._cursor = cursor
+        self._recorder = recorder
+        self._entry = entry
+
+    def sort(self, key_or_list, direction=None):
+        self._entry = self._recorder.resort(self._entry, _sort_spec(key_or_list, direction))
+        if direction is None:
+            self._cursor = self._cursor.sort(key_or_list)
+        else:
+            self._cursor = self._cursor.sort(key_or_list, direction)
+        return self
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class RecordingCollection:
+    """Collection wrapper that records find, find_one, count_documents and distinct queries"""
+
+    def __init__(self, collection, recorder):
+        self._collection = collection
+        self._recorder = recorder
+
+    def find(self, filter=None, projection=None, *args, **kwargs):
+        entry = self._recorder.record(self._collection, 'find', filter, projection,
+                                      _sort_spec(kwargs.get('sort')))
+        return RecordingCursor(self._collection.find(filter, projection, *args, **kwargs),
+                               self._recorder, entry)
+
+    def find_one(self, filter=None, *args, **kwargs):
+        self._recorder.record(self._collection, 'find_one', filter, kwargs.get('projection'),
+                              _sort_spec(kwargs.get('sort')))
+        return self._collection.find_one(filter, *args, **kwargs)
+
+    def count_documents(self, filter, *args, **kwargs):
+        self._recorder.record(self._collection, 'count_documents', filter)
+        return self._collection.count_documents(filter, *args, **kwargs)
+
+    def distinct(self, key, filter=None, *args, **kwargs):
+        self._recorder.record(self._collection, 'distinct', filter, {key: 1})
+        return self._collection.distinct(key, filter, *args, **kwargs)
+
+    def with_options(self, *args, **kwargs):
+        return RecordingCollection(self._collection.with_options(*args, **kwargs), self._recorder)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+def plan_stages(explain_output):
+    """Get the names of all stages in the winning plan of an explain() result"""
+    stages = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            if 'stage' in node:
+                stages.append(node['stage'])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(explain_output.get('queryPlanner', {}).get('winningPlan', {}))
+    return stages
+
+
+def recommend_indexes(query, sort, fallback_key=None):
+    """
+    Recommend indexes for a query.
+
+    Args:
+        query: find() filter
+        sort: List of (field, direction) the results are sorted by
+        fallback_key: Field to index when the query only has $exists
+            conditions (None to index the $exists fields themselves)
+
+    Returns:
+        List of (keys, partial_filter) tuples, where keys is a list of
+        (field, direction) and partial_filter is a dict or None
+    """
+    equality = []
+    partial = {}
+    branches = []
+
+    for key, value in query.items():
+        if key == '$or':
+            branches = value
+        elif key in _LOGICAL_OPERATORS:
+            continue
+        elif isinstance(value, dict) and value.get('$exists') is True and len(value) == 1:
+            partial[key] = {'$exists': True}
+        elif isinstance(value, dict) and value.get('$exists') is False:
+            continue
+        else:
+            equality.append(key)
+
+    sort_fields = [(field, direction) for field, direction in sort if field not in equality]
+
+    def build(fields):
+        keys = [(field, 1) for field in fields] + sort_fields
+        if not keys:
+            # Only $exists conditions: a partial index on the fallback key keeps
+            # the matching documents index-backed without indexing the subdocuments
+            keys = [(fallback_key, 1)] if fallback_key else [(field, 1) for field in partial]
+        return keys, (partial or None)
+
+    if branches:
+        recommendations = []
+        for branch in branches:
+            branch_fields = [key for key in branch if not key.startswith('$')]
+            recommendations.append(build(equality + branch_fields))
+        return recommendations
+    return [build(equality)]
+
+
+def _has_index(collection, keys, partial_filter):
+    """True if an existing index starts with these keys and has the same partial filter"""
+    for info in collection.index_information().values():
+        existing = [tuple(k) for k in info['key']]
+        if existing[:len(keys)] == keys and info.get('partialFilterExpression') == partial_filter:
+            return True
+    return False
+
+
+def index_name(keys, partial_filter):
+    """
+    Name for a recommended index.
+
+    Partial indexes on the same keys differ only in their filter, so the
+    filter's hash is part of the name.
+    """
+    name = '_'.join(f"{field}_{direction}" for field, direction in keys)
+    if partial_filter:
+        digest = hashlib.sha1(json.dumps(partial_filter, sort_keys=True).encode()).hexdigest()[:8]
+        name += f"_partial_{digest}"
+    return name
+
+
+def _explain(entry):
+    """Explain a recorded query as the equivalent find()"""
+    cursor = entry['collection'].find(entry['filter'], entry['projection'])
+    if entry['sort']:
+        cursor = cursor.sort(entry['sort'])
+    return cursor.explain()
+
+
+def advise(db_connection, create=False):
+    """
+    Record the report's queries, explain them and list the ones that need an index.
+
+    Args:
+        db_connection: AccessibilityDB connection
+        create: Build the recommended indexes
+
+    Returns:
+        List of recommendation dicts (collection, filter, sort, stages, indexes)
+    """
+    recorder = QueryRecorder()
+    page_results = db_connection.page_results
+    test_runs = db_connection.test_runs
+    latest_results_only = getattr(db_connection, 'latest_results_only', True)
+    use_aggregate_store = getattr(db_connection, 'use_aggregate_store', True)
+
+    # Record against page_results itself rather than the per-report latest
+    # view, and run every topic's queries rather than reusing stored aggregates
+    db_connection.page_results = RecordingCollection(page_results, recorder)
+    db_connection.test_runs = RecordingCollection(test_runs, recorder)
+    db_connection.latest_results_only = False
+    db_connection.use_aggregate_store = False
+    try:
+        # Every section the generator can run, so that all of their queries are recorded
+        create_report_template(db_connection, 'Index advisor', 'Index advisor', datetime.now().strftime("%Y-%m-%d"),
+                               full=True, site_reports=True)
+    finally:
+        db_connection.page_results = page_results
+        db_connection.test_runs = test_runs
+        db_connection.latest_results_only = latest_results_only
+        db_connection.use_aggregate_store = use_aggregate_store
+
+    recommendations = []
+    for entry in recorder.queries.values():
+        # Unfiltered, unsorted reads scan the whole collection by design
+        if not entry['filter'] and not entry['sort']:
+            continue
+        try:
+            stages = plan_stages(_explain(entry))
+        except Exception as e:
+            print(f"Warning: Could not explain query on {entry['collection'].name}: {e}")
+            continue
+
+        problems = [stage for stage in stages if stage in PROBLEM_STAGES]
+        if not problems:
+            continue
+
+        # page_results documents hold large subdocuments, so $exists-only
+        # queries there get a partial index on url
+        fallback_key = 'url' if entry['collection'].name == page_results.name else None
+        indexes = [
+            (keys, partial_filter)
+            for keys, partial_filter in recommend_indexes(entry['filter'], entry['sort'], fallback_key)
+            if not _has_index(entry['collection'], keys, partial_filter)
+        ]
+        recommendations.append({
+            'collection': entry['collection'],
+            'kind': entry['kind'],
+            'filter': query_shape(entry['filter']),
+            'sort': entry['sort'],
+            'count': entry['count'],
+            'stages': problems,
+            'indexes': indexes
+        })
+
+    if create:
+        for recommendation in recommendations:
+            collection = recommendation['collection']
+            for keys, partial_filter in recommendation['indexes']:
+                # Several query shapes can share a recommendation
+                if _has_index(collection, keys, partial_filter):
+                    continue
+                options = {'partialFilterExpression': partial_filter} if partial_filter else {}
+                name = collection.create_index(keys, name=index_name(keys, partial_filter), **options)
+                print(f"Created index {name} on {collection.name}")
+
+    return recommendations
+
+
+@click.command()
+@click.option('--database', '-db',
+              default=None,
+              help='MongoDB database name to use (default: accessibility_tests)')
+@click.option('--create', is_flag=True,
+              default=False,
+              help='Create the recommended indexes')
+def main(database, create):
+    """Explain every query the report issues and recommend indexes for unindexed ones."""
+    try:
+        db = AccessibilityDB(db_name=database, profile=ConnectionProfile.from_environment())
+        recommendations = advise(db, create=create)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        click.echo(f"Error running index advisor: {str(e)}", err=True)
+        return
+
+    if not recommendations:
+        click.echo("All report queries are index-backed.")
+        return
+
+    click.echo(f"\n{len(recommendations)} report queries are not index-backed:\n")
+    for recommendation in recommendations:
+        click.echo(f"{recommendation['collection'].name}.{recommendation['kind']} "
+                   f"(issued {recommendation['count']}x): {', '.join(recommendation['stages'])}")
+        click.echo(f"  filter: {json.dumps(recommendation['filter'])}")
+        if recommendation['sort']:
+            click.echo(f"  sort: {recommendation['sort']}")
+        if not recommendation['indexes']:
+            click.echo("  recommended indexes already exist")
+        for keys, partial_filter in recommendation['indexes']:
+            line = f"  index: {keys}"
+            if partial_filter:
+                line += f" where {json.dumps(partial_filter)}"
+            click.echo(line)
+    if not create:
+        click.echo("\nRun with --create to build the recommended indexes.")
+
+if __name__ == "__main__":
+    main()
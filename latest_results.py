@@ -0,0 +1,109 @@
+"""
+Latest-result-per-URL view of page_results for a report.
+
+A database that has collected many test runs holds one page_results document
+per URL per run. Section queries do not filter by test run, so without this
+view they read and count every historical copy of every page.
+
+use_latest_results materializes the most recent result of each URL in the
+report's test runs into a temporary, indexed collection and points the
+connection's page_results at it, so every section reads one document per
+URL. release_latest_results restores the original collection and drops the
+temporary one.
+
+The same temporary collection holds the sampled pages of a sampled report
+(see sampling), with or without the latest-result reduction.
+"""
+from uuid import uuid4
+
+from report_context import get_report_context
+
+# Temporary collections are named with this prefix and a random suffix
+LATEST_COLLECTION_PREFIX = 'report_latest_'
+
+
+def materialize_latest_results(page_results, test_run_ids, urls=None, latest_only=True):
+    """
+    Write the latest result of each URL in the given test runs to a new collection.
+
+    Args:
+        page_results: The page_results collection
+        test_run_ids: IDs (as strings) of the test runs to include
+        urls: Only include these URLs (None for all)
+        latest_only: Keep only the latest result of each URL (False to keep them all)
+
+    Returns:
+        The new collection, indexed on url and test_run_id
+    """
+    name = f"{LATEST_COLLECTION_PREFIX}{uuid4().hex}"
+    match = {'test_run_id': {'$in': list(test_run_ids)}}
+    if urls is not None:
+        match['url'] = {'$in': sorted(urls)}
+    pipeline = [{'$match': match}]
+    if latest_only:
+        pipeline += [
+            {'$sort': {'url': 1, 'timestamp': -1}},
+            {'$group': {'_id': '$url', 'latest': {'$first': '$$ROOT'}}},
+            {'$replaceRoot': {'newRoot': '$latest'}}
+        ]
+    pipeline.append({'$out': name})
+    page_results.aggregate(pipeline, allowDiskUse=True)
+
+    latest = page_results.database[name]
+    latest.create_index('url', unique=latest_only)
+    latest.create_index('test_run_id')
+    return latest
+
+
+def use_latest_results(db_connection, test_run_ids, urls=None):
+    """
+    Point db_connection.page_results at the latest result of each URL for this report.
+
+    Does nothing when there are no test runs, or when the connection has
+    latest_results_only set to False and the report is not sampled.
+
+    Args:
+        db_connection: Database connection
+        test_run_ids: IDs (as strings) of the report's test runs
+        urls: Sampled URLs to restrict the view to (None for all)
+
+    Returns:
+        The temporary collection, or None if the view is not used
+    """
+    latest_only = getattr(db_connection, 'latest_results_only', True)
+    if not test_run_ids or (not latest_only and urls is None):
+        return None
+
+    context = get_report_context(db_connection)
+    if context.all_page_results is not None:
+        return db_connection.page_results
+
+    all_page_results = db_connection.page_results
+    try:
+        latest = materialize_latest_results(all_page_results, test_run_ids, urls, latest_only)
+    except Exception as e:
+        print(f"Warning: Could not build latest results view, reading all results: {e}")
+        # Without the view the sections read every page, so the report is not sampled
+        context.sample = None
+        return None
+
+    context.all_page_results = all_page_results
+    db_connection.page_results = latest
+    print(f"Reading {latest.count_documents({})} results "
+          f"from {len(test_run_ids)} test runs")
+    return latest
+
+
+def release_latest_results(db_connection):
+    """Restore the connection's page_results collection and drop the temporary view"""
+    context = getattr(db_connection, 'report_context', None)
+    if context is None or context.all_page_results is None:
+        return
+
+    latest = db_connection.page_results
+    db_connection.page_results = context.all_page_results
+    context.all_page_results = None
+    try:
+        latest.drop()
+    except Exception as e:
+        print(f"Warning: Could not drop temporary collection '{latest.name}': {e}")
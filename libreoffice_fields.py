@@ -0,0 +1,120 @@
+"""
+Fill in a report's page numbers with a headless LibreOffice.
+
+Reports list their headings in the table of contents when they are
+generated (see sections/table_of_contents.py), but page numbers depend on
+layout, which only a word processor knows. update_page_numbers opens the
+saved report in LibreOffice without a window, updates its indexes and
+fields, and saves it again as .docx.
+
+This needs LibreOffice (soffice) and its Python UNO bridge (the uno module,
+usually installed with LibreOffice, e.g. python3-uno). Without them the
+report is left as it is and its page numbers are filled in the first time
+its fields are updated in Word.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+except ImportError:
+    uno = None
+
+SOFFICE_NAMES = ('soffice', 'libreoffice')
+
+# Seconds to wait for LibreOffice to start accepting connections
+STARTUP_TIMEOUT = 60
+
+DOCX_FILTER = 'MS Word 2007 XML'
+
+
+def find_soffice():
+    """Return the LibreOffice executable, or None if it is not installed"""
+    for name in SOFFICE_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def _property(name, value):
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+def _connect(resolver, connection, process):
+    """Connect to the LibreOffice instance, waiting until it accepts connections"""
+    started = time.time()
+    while True:
+        try:
+            return resolver.resolve(f"uno:{connection};urp;StarOffice.ComponentContext")
+        except NoConnectException:
+            if process.poll() is not None or time.time() - started > STARTUP_TIMEOUT:
+                raise
+            time.sleep(0.5)
+
+
+def update_page_numbers(report_file):
+    """
+    Update the table of contents and page references of a saved report.
+
+    Args:
+        report_file: The report's .docx file, which is replaced by the updated document
+
+    Returns:
+        True if the report was updated, False if LibreOffice is not available
+        or the update failed
+    """
+    soffice = find_soffice()
+    if uno is None or soffice is None:
+        print("Warning: LibreOffice and its Python UNO bridge are needed to fill in page numbers; "
+              "they will be filled in when the report's fields are updated in Word")
+        return False
+
+    # A private profile, so this works while the user has LibreOffice open
+    profile = tempfile.mkdtemp(prefix='report_soffice_')
+    pipe_name = f"report_fields_{os.getpid()}"
+    connection = f"pipe,name={pipe_name}"
+    process = subprocess.Popen([soffice, '--headless', '--invisible', '--nologo', '--norestore',
+                                f"-env:UserInstallation=file://{profile}",
+                                f"--accept={connection};urp;"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.bridge.UnoUrlResolver', local_context)
+        context = _connect(resolver, connection, process)
+        desktop = context.ServiceManager.createInstanceWithContext('com.sun.star.frame.Desktop', context)
+
+        url = uno.systemPathToFileUrl(os.path.abspath(report_file))
+        document = desktop.loadComponentFromURL(url, '_blank', 0, (_property('Hidden', True),))
+        try:
+            indexes = document.getDocumentIndexes()
+            for i in range(indexes.getCount()):
+                indexes.getByIndex(i).update()
+            document.getTextFields().refresh()
+            document.storeToURL(url, (_property('FilterName', DOCX_FILTER), _property('Overwrite', True)))
+        finally:
+            document.close(True)
+        try:
+            desktop.terminate()
+        except Exception:
+            # The bridge is torn down as LibreOffice exits
+            pass
+        return True
+    except Exception as e:
+        print(f"Warning: Could not fill in page numbers with LibreOffice: {e}")
+        return False
+    finally:
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(profile, ignore_errors=True)
@@ -1,11 +1,9 @@
 import click
 from datetime import datetime
-import sys
 import os
 
-# Add the test_with_mongo directory to the path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../test_with_mongo')))
-from database import AccessibilityDB
+from connection_profile import ConnectionProfile, READ_PREFERENCES
+from db import AccessibilityDB
 from report_generator import generate_report
 
 @click.command()
@@ -24,7 +22,83 @@ from report_generator import generate_report
 @click.option('--database', '-db',
               default=None,
               help='MongoDB database name to use (default: accessibility_tests)')
-def main(title, author, date, output_folder, database):
+@click.option('--mongo-uri', default=None,
+              help='MongoDB connection string (default: ACCESSIBILITY_MONGO_URI or mongodb://localhost:27017/)')
+@click.option('--compressors', default=None,
+              help='Wire compressors to offer the server, in order of preference (e.g. zstd,snappy,zlib)')
+@click.option('--batch-size', type=click.IntRange(min=1),
+              default=None,
+              help='Page results fetched per round trip')
+@click.option('--read-preference', type=click.Choice(READ_PREFERENCES),
+              default=None,
+              help='Replica set members the report may read from')
+@click.option('--bulk-fetch', is_flag=True,
+              default=False,
+              help='Stream page results in large batches over exhaust cursors (not through mongos)')
+@click.option('--raw-bson', is_flag=True,
+              default=False,
+              help='Decode page results lazily (only the parts each section reads)')
+@click.option('--check-fields', is_flag=True,
+              default=False,
+              help='Warn when a section reads a page field it did not declare')
+@click.option('--all-results', is_flag=True,
+              default=False,
+              help='Report on every stored result instead of the latest result per URL')
+@click.option('--no-aggregate-store', is_flag=True,
+              default=False,
+              help='Recompute section aggregates instead of reusing stored ones')
+@click.option('--finished-status', 'finished_statuses', multiple=True,
+              help='Test run status whose section aggregates may be stored (repeatable; default: completed)')
+@click.option('--sample-rate', type=click.FloatRange(0, 1, min_open=True),
+              default=None,
+              help='Draft report from a per-site sample of this fraction of pages (e.g. 0.05)')
+@click.option('--section-budget', type=float,
+              default=None,
+              help='Seconds a report section may spend reading page results before it is truncated')
+@click.option('--report-budget', type=float,
+              default=None,
+              help='Seconds all report sections may take together')
+@click.option('--prefetch-workers', type=click.IntRange(min=0),
+              default=4,
+              help='Section data sets computed concurrently (0 to compute them one by one)')
+@click.option('--aggregation-processes', type=click.IntRange(min=0),
+              default=0,
+              help='Worker processes to aggregate section data per group of sites (0 for none)')
+@click.option('--memory-budget', type=click.FloatRange(min=0, min_open=True),
+              default=None,
+              help='Megabytes of per-page section data kept in memory before spilling to disk')
+@click.option('--table-row-budget', type=click.IntRange(min=0),
+              default=0,
+              help='Rows a long table shows before the complete table is written to CSV next to the report (default 0: no limit)')
+@click.option('--query-memo-size', type=click.FloatRange(min=0),
+              default=64,
+              help='Megabytes of repeated page result queries kept in memory during the report (0 for none)')
+@click.option('--incremental', is_flag=True,
+              default=False,
+              help='Write a manifest of section inputs so the report can be updated later')
+@click.option('--update', 'previous_report', type=click.Path(exists=True, dir_okay=False),
+              default=None,
+              help='Previous report to update: only sections whose page results changed are rebuilt')
+@click.option('--page-numbers', is_flag=True,
+              default=False,
+              help='Fill in the table of contents page numbers with a headless LibreOffice')
+@click.option('--full', is_flag=True,
+              default=False,
+              help='Add summary and detailed findings for every tested topic (the former report3.py report)')
+@click.option('--site-reports', is_flag=True,
+              default=False,
+              help='Add a site specific report section for every tested site')
+@click.option('--site-report-folder', type=click.Path(file_okay=False),
+              default=None,
+              help='Also save each site specific report as its own document in this folder (implies --site-reports)')
+@click.option('--site-report-workers', type=click.IntRange(min=0),
+              default=4,
+              help='Site specific reports rendered concurrently (0 to render them one by one)')
+def main(title, author, date, output_folder, database, mongo_uri, compressors, batch_size, read_preference,
+         bulk_fetch, raw_bson, check_fields, all_results,
+         no_aggregate_store, finished_statuses, sample_rate, section_budget, report_budget, prefetch_workers,
+         aggregation_processes, memory_budget, table_row_budget, query_memo_size, incremental, previous_report, page_numbers,
+         full, site_reports, site_report_folder, site_report_workers):
     """Generate an accessibility test report with specified parameters."""
     try:
         datetime.strptime(date, "%Y-%m-%d")
@@ -41,22 +115,46 @@ def main(title, author, date, output_folder, database):
         click.echo(f"Database: {database}")
     
     try:
-        db = AccessibilityDB(db_name=database)
+        # Options given on the command line override the ACCESSIBILITY_MONGO_* environment
+        environment = ConnectionProfile.from_environment()
+        profile = ConnectionProfile(
+            uri=mongo_uri or environment.uri,
+            compressors=compressors if compressors is not None else environment.compressors,
+            batch_size=batch_size or environment.batch_size,
+            read_preference=read_preference or environment.read_preference,
+            bulk_fetch=bulk_fetch or environment.bulk_fetch
+        )
+        db = AccessibilityDB(db_name=database, profile=profile)
+        db.raw_documents = raw_bson
+        db.check_fields = check_fields
+        db.latest_results_only = not all_results
+        db.use_aggregate_store = not no_aggregate_store
+        db.finished_statuses = finished_statuses
+        db.sample_rate = sample_rate
+        db.section_budget = section_budget
+        db.report_budget = report_budget
+        db.prefetch_workers = prefetch_workers
+        db.aggregation_processes = aggregation_processes
+        db.memory_budget = memory_budget
+        db.table_row_budget = table_row_budget
+        db.query_memo_size = query_memo_size
+        db.site_report_workers = site_report_workers
         
         # Create output folder if it doesn't exist
         if not os.path.exists(output_folder):
             os.makedirs(output_folder)
             click.echo(f"Created output folder: {output_folder}")
         
-        report_file = generate_report(db, title, author, date, output_folder)
+        report_file = generate_report(db, title, author, date, output_folder,
+                                      incremental=incremental, previous_report=previous_report,
+                                      page_numbers=page_numbers, full=full, site_reports=site_reports,
+                                      site_report_folder=site_report_folder)
         
         if report_file:
             click.echo(f"\nReport generated successfully: {report_file}")
-            click.echo("\nIMPORTANT: To complete the report formatting:")
-            click.echo("1. Open the document in Microsoft Word")
-            click.echo("2. Right-click anywhere in the table of contents")
-            click.echo("3. Select 'Update Field'")
-            click.echo("4. Choose 'Update entire table'")
+            if not page_numbers:
+                click.echo("The table of contents' page numbers are filled in when the document's fields "
+                           "are updated (or generate with --page-numbers)")
         else:
             click.echo("Failed to generate report", err=True)
     except Exception as e:
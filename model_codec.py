@@ -0,0 +1,206 @@
+"""
+Safe serialization of topic data models for the aggregate store.
+
+Stored models used to be pickled, so anyone able to write to the database
+could run code on the report host by storing a crafted model. Models are
+now written as JSON text. Values JSON has no type for are written as
+objects with a single tag key:
+
+    {"__tuple__": [...]}, {"__set__": [...]}, {"__frozenset__": [...]}
+    {"__dict__": [[key, value], ...]} for dictionaries with non-string keys
+    {"__record__": [type name, fields]} for the report's record and example
+        collector types (RECORD_TYPES), rebuilt from their fields
+    {"__bson__": "<base64>"} for any other BSON value (dates, ObjectIds, ...)
+
+Decoding only ever builds these types, so a stored model cannot make the
+report run code.
+
+A SpillDict is written as {"__spill__": n}, and its entries follow the model
+as one JSON line each. Neither encoding nor decoding holds all of a
+SpillDict's entries at once; decoded entries go into a SpillDict under the
+given memory budget.
+
+Example collectors lose their key function: a decoded BoundedExamples keeps
+its examples' sort keys, so it can be merged into a collector built by the
+topic, but new items should not be added to it directly.
+"""
+import base64
+import heapq
+import itertools
+import json
+
+import bson
+from bson.errors import InvalidDocument
+
+from bounded_examples import BoundedExamples, BucketedExamples, _HeapEntry
+from report_records import BreakpointResult, PageFlagSummary, ViolationRecord
+from spill import SpillDict
+
+TAGS = ('__tuple__', '__set__', '__frozenset__', '__dict__', '__record__', '__bson__', '__spill__')
+
+
+def _bounded_fields(examples):
+    return {
+        'limit': examples.limit,
+        'unique': examples.unique,
+        'total': examples.total,
+        'entries': [[list(entry.rank), entry.item] for entry in examples._heap]
+    }
+
+
+def _bounded_examples(fields):
+    examples = BoundedExamples(fields['limit'], unique=fields['unique'])
+    examples.total = fields['total']
+    examples._heap = [_HeapEntry(tuple(rank), item) for rank, item in fields['entries']]
+    heapq.heapify(examples._heap)
+    if examples.unique:
+        examples._keys = {entry.rank[0] for entry in examples._heap if len(entry.rank) == 2}
+    # Items added later rank after the kept ones with equal keys, as before
+    examples._sequence = itertools.count(max((entry.rank[-1] for entry in examples._heap), default=-1) + 1)
+    return examples
+
+
+def _bucketed_fields(examples):
+    return {'limit': examples.limit, 'unique': examples.unique, 'buckets': examples._buckets}
+
+
+def _bucketed_examples(fields):
+    examples = BucketedExamples(fields['limit'], unique=fields['unique'])
+    examples._buckets = fields['buckets']
+    return examples
+
+
+# Type name -> (type, fields of an instance, instance from its fields)
+RECORD_TYPES = {
+    'BreakpointResult': (
+        BreakpointResult,
+        lambda record: [record.url, record.breakpoint, record.issue_counts, record.has_touch_targets],
+        lambda fields: BreakpointResult(*fields)
+    ),
+    'PageFlagSummary': (
+        PageFlagSummary,
+        lambda record: [record.url, record.flag_names, record.present, record.values],
+        lambda fields: PageFlagSummary(*fields)
+    ),
+    'ViolationRecord': (
+        ViolationRecord,
+        lambda record: [record.page_url, record.issue, record.element, record.message,
+                        record.section_type, record.section_name, record.extra],
+        lambda fields: ViolationRecord(*fields)
+    ),
+    'BoundedExamples': (BoundedExamples, _bounded_fields, _bounded_examples),
+    'BucketedExamples': (BucketedExamples, _bucketed_fields, _bucketed_examples)
+}
+_RECORD_NAMES = {record_type: name for name, (record_type, _, _) in RECORD_TYPES.items()}
+
+
+def _encode(value, spills):
+    """Convert a value to JSON-compatible data, collecting SpillDicts into spills"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item, spills) for item in value]
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(item, spills) for item in value]}
+    if isinstance(value, frozenset):
+        return {'__frozenset__': [_encode(item, spills) for item in value]}
+    if isinstance(value, set):
+        return {'__set__': [_encode(item, spills) for item in value]}
+    if isinstance(value, SpillDict):
+        if spills is None:
+            raise TypeError("A SpillDict cannot be stored inside another SpillDict")
+        spills.append(value)
+        return {'__spill__': len(spills) - 1}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and not (len(value) == 1 and next(iter(value)) in TAGS):
+            return {key: _encode(item, spills) for key, item in value.items()}
+        return {'__dict__': [[_encode(key, spills), _encode(item, spills)] for key, item in value.items()]}
+    name = _RECORD_NAMES.get(type(value))
+    if name is not None:
+        return {'__record__': [name, _encode(RECORD_TYPES[name][1](value), spills)]}
+    try:
+        encoded = bson.encode({'value': value})
+    except (InvalidDocument, TypeError):
+        raise TypeError(f"A {type(value).__name__} cannot be stored in an aggregate model") from None
+    return {'__bson__': base64.b64encode(encoded).decode('ascii')}
+
+
+def _decode(value, spills):
+    """Rebuild a value from the data _encode produced"""
+    if isinstance(value, list):
+        return [_decode(item, spills) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1:
+        tag, content = next(iter(value.items()))
+        if tag == '__tuple__':
+            return tuple(_decode(item, spills) for item in content)
+        if tag == '__set__':
+            return {_decode(item, spills) for item in content}
+        if tag == '__frozenset__':
+            return frozenset(_decode(item, spills) for item in content)
+        if tag == '__dict__':
+            return {_decode(key, spills): _decode(item, spills) for key, item in content}
+        if tag == '__record__':
+            name, fields = content
+            if name not in RECORD_TYPES:
+                raise ValueError(f"Unknown record type '{name}' in stored model")
+            return RECORD_TYPES[name][2](_decode(fields, spills))
+        if tag == '__bson__':
+            return bson.decode(base64.b64decode(content))['value']
+        if tag == '__spill__':
+            if spills is None or not 0 <= content < len(spills):
+                raise ValueError("Misplaced SpillDict in stored model")
+            return spills[content]
+    return {key: _decode(item, spills) for key, item in value.items()}
+
+
+def encode_model(model):
+    """
+    Encode a data model as lines of JSON text.
+
+    The first line is the model; each line after it is one SpillDict entry.
+
+    Yields:
+        Lines, each ending with a newline
+    """
+    spills = []
+    yield json.dumps(_encode(model, spills)) + '\n'
+    for index, spill in enumerate(spills):
+        for key, value in spill.items():
+            yield json.dumps([index, _encode(key, None), _encode(value, None)]) + '\n'
+
+
+def decode_model(lines, budget=None):
+    """
+    Rebuild a data model from the lines encode_model wrote.
+
+    Args:
+        lines: Iterable of the lines
+        budget: MemoryBudget for the decoded SpillDicts (None to keep them in memory)
+
+    Returns:
+        The data model
+    """
+    lines = iter(lines)
+    skeleton = json.loads(next(lines))
+    # Placeholders are numbered in the order encode_model found them
+    spills = [SpillDict(budget) for _ in range(_count_spills(skeleton))]
+    model = _decode(skeleton, spills)
+    for line in lines:
+        if not line.strip():
+            continue
+        index, key, value = json.loads(line)
+        spills[index][_decode(key, None)] = _decode(value, None)
+    return model
+
+
+def _count_spills(value):
+    """Number of SpillDict placeholders in encoded data"""
+    if isinstance(value, list):
+        return sum(_count_spills(item) for item in value)
+    if isinstance(value, dict):
+        if len(value) == 1 and '__spill__' in value:
+            return 1
+        return sum(_count_spills(item) for item in value.values())
+    return 0
@@ -0,0 +1,74 @@
+"""
+Read access to page_results documents for the topic aggregates.
+
+Page documents carry large nested results.accessibility trees and sections
+typically read a few keys out of them. When raw document mode is enabled on
+the database connection, page results come back as RawBSONDocuments: each
+level is only decoded when it is first read, so subtrees a section never
+touches are never turned into Python objects.
+
+Compiled paths give sections a cheap way to walk into a document the same way
+whether it is a plain dict or a RawBSONDocument.
+"""
+from collections.abc import Mapping
+
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+_MISSING = object()
+
+
+def page_collection(db_connection):
+    """
+    Get the page_results collection to read from.
+
+    Returns the raw-document view of the collection when the connection has
+    raw_documents enabled, and the regular collection otherwise.
+    """
+    collection = db_connection.page_results
+    if getattr(db_connection, 'raw_documents', False):
+        return collection.with_options(codec_options=RAW_CODEC_OPTIONS)
+    return collection
+
+
+def is_document(value):
+    """True for embedded documents, whether decoded (dict) or raw"""
+    return isinstance(value, Mapping)
+
+
+def compile_path(path):
+    """
+    Compile a dotted field path into an accessor function.
+
+    Args:
+        path: Dotted path, e.g. 'results.accessibility.responsive_testing'
+
+    Returns:
+        A function (document, default=None) that returns the value at the
+        path, or default if any part of the path is missing
+    """
+    keys = tuple(path.split('.'))
+
+    def accessor(document, default=None):
+        value = document
+        for key in keys:
+            if not isinstance(value, Mapping):
+                return default
+            value = value.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+        return value
+
+    accessor.path = path
+    return accessor
+
+
+def to_python(value):
+    """Fully decode a (possibly raw) value into plain dicts and lists"""
+    if isinstance(value, Mapping):
+        return {key: to_python(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_python(item) for item in value]
+    return value
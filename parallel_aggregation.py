@@ -0,0 +1,182 @@
+"""
+Parallel topic aggregation across worker processes.
+
+Folding pages into a topic's data model is CPU-bound Python and runs on one
+core. With aggregation_processes set on the database connection, a topic
+that implements merge() is aggregated in a process pool instead.
+
+- The report's pages are split into partitions of whole domains.
+- Each worker opens its own MongoDB connection and runs the topic's queries
+  restricted to its partition's domains. Partitions are selected with
+  anchored URL prefix patterns per domain, not with lists of URLs, so the
+  filters stay small however many pages a domain has. The last partition
+  takes every URL the other partitions' patterns do not match.
+- The workers' partial states are merged in partition order and finalized
+  in the report process.
+
+Workers are started with the 'spawn' method, so they do not inherit the
+report's MongoClient or its prefetch threads.
+"""
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import importlib
+import multiprocessing
+import re
+
+from connection_profile import ConnectionProfile, DEFAULT_MONGO_URI
+from report_records import domain_from_url
+from section_scheduler import BudgetExceeded, check_budget
+
+# Seconds between time budget checks while waiting for workers
+POLL_SECONDS = 0.5
+
+
+def count_domain_pages(db_connection, match=None):
+    """Count the pages of each domain, streaming the URLs rather than collecting them"""
+    counts = {}
+    for page in db_connection.page_results.find(match or {}, {'url': 1, '_id': 0}):
+        domain = domain_from_url(page['url'])
+        counts[domain] = counts.get(domain, 0) + 1
+    return counts
+
+
+def partition_domains(domain_counts, partitions):
+    """
+    Split domains into at most `partitions` groups.
+
+    Domains are assigned largest first to the group with the fewest pages so
+    far, which keeps the groups' sizes close.
+    """
+    groups = [[] for _ in range(min(partitions, len(domain_counts)))]
+    sizes = [0] * len(groups)
+    for domain, count in sorted(domain_counts.items(), key=lambda item: (-item[1], item[0])):
+        smallest = sizes.index(min(sizes))
+        groups[smallest].append(domain)
+        sizes[smallest] += count
+    return [group for group in groups if group]
+
+
+def domain_patterns(domains):
+    """URL patterns matching the pages of the given domains (anchored, so an index can be used)"""
+    return [re.compile('^' + re.escape(prefix + domain) + '(/|$)')
+            for domain in domains
+            for prefix in ('https://', 'http://', '')]
+
+
+def partition_filters(groups):
+    """
+    Filters selecting each group's pages.
+
+    The last filter selects every page the others do not, so each page is
+    read by exactly one partition.
+    """
+    others = []
+    filters = []
+    for group in groups[:-1]:
+        patterns = domain_patterns(group)
+        filters.append({'url': {'$in': patterns}})
+        others.extend(patterns)
+    filters.append({'url': {'$nin': others}})
+    return filters
+
+
+class PartitionConnection:
+    """The parts of the report's database connection a worker process needs"""
+
+    def __init__(self, profile, db_name, page_results_name, test_runs_name, raw_documents, memory_budget=None):
+        # Workers connect the way the report does (see connection_profile)
+        self.profile = profile
+        self.client = profile.create_client()
+        database = self.client[db_name]
+        self.page_results = database[page_results_name]
+        self.test_runs = database[test_runs_name]
+        self.raw_documents = raw_documents
+        self.memory_budget = memory_budget
+
+
+def connection_args(db_connection):
+    """Arguments for PartitionConnection that reach the same collections as db_connection"""
+    profile = getattr(db_connection, 'profile', None)
+    if profile is None:
+        profile = ConnectionProfile(getattr(db_connection, 'mongo_uri', DEFAULT_MONGO_URI))
+    return (
+        profile,
+        db_connection.page_results.database.name,
+        db_connection.page_results.name,
+        db_connection.test_runs.name,
+        getattr(db_connection, 'raw_documents', False),
+        getattr(db_connection, 'memory_budget', None)
+    )
+
+
+def accumulate_partition(module_name, class_name, args, match):
+    """Worker: accumulate the pages matching one partition's filter and return the unfinalized state"""
+    aggregate = getattr(importlib.import_module(module_name), class_name)()
+    connection = PartitionConnection(*args)
+    try:
+        return aggregate.accumulate(connection, check=lambda: None, match=match)
+    finally:
+        connection.client.close()
+
+
+def accumulate_parallel(db_connection, aggregate, processes, check=None, match=None, executor=None):
+    """
+    Accumulate a topic's pages with one worker per domain partition.
+
+    Args:
+        db_connection: Database connection
+        aggregate: TopicAggregate implementing merge()
+        processes: Number of worker processes (and partitions)
+        check: Called while waiting; stops by raising BudgetExceeded. By
+            default it enforces the running section's time budget.
+        match: Filter the pages must also match (None for all)
+        executor: Executor to run the partitions on (a spawn-based process
+            pool by default)
+
+    Returns:
+        The merged, unfinalized state
+    """
+    if check is None:
+        check = lambda: check_budget(db_connection)
+    groups = partition_domains(count_domain_pages(db_connection, match), processes)
+    if len(groups) < 2:
+        return aggregate.accumulate(db_connection, check, match=match)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=len(groups),
+                                       mp_context=multiprocessing.get_context('spawn'))
+
+    aggregate_class = type(aggregate)
+    args = connection_args(db_connection)
+    futures = [
+        executor.submit(accumulate_partition, aggregate_class.__module__, aggregate_class.__name__, args,
+                        partition if match is None else {'$and': [match, partition]})
+        for partition in partition_filters(groups)
+    ]
+    try:
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+            if pending:
+                check()
+    except BudgetExceeded as e:
+        done = [future for future in futures if future.done() and not future.exception()]
+        state = _merge_states(db_connection, aggregate, [future.result() for future in done])
+        raise BudgetExceeded(aggregate.name,
+                             [f"{len(done)} of {len(groups)} site partitions aggregated "
+                              f"before the time budget ran out"] + aggregate.describe_partial(state)) from e
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # Merge in partition order so the result does not depend on which worker finished first
+    return _merge_states(db_connection, aggregate, [future.result() for future in futures])
+
+
+def _merge_states(db_connection, aggregate, states):
+    """Merge partial states left to right, starting from an empty state under the report's memory budget"""
+    merged = aggregate.empty()
+    aggregate.prepare(db_connection, merged)
+    for state in states:
+        merged = aggregate.merge(merged, state)
+    return merged
@@ -0,0 +1,173 @@
+"""
+Concurrent prefetch of topic aggregates and section queries.
+
+Sections used to run their queries one after another, so a report waited
+for the sum of every round trip and server-side scan. start_prefetch
+computes every registered topic aggregate on a small thread pool before
+rendering begins, so the queries of all topics overlap. Sections still call
+get_topic_aggregate, which waits for the prefetched result (within the
+section's time budget) instead of computing it again.
+
+The fixed queries the report's other sections declared (see projections)
+are run on the same pool after the topics, while the query memo is in use:
+their results are kept in the memo, and find_pages waits for a section's
+prefetched query before running it, so the section reads it from memory.
+
+pymongo clients are thread-safe, so the workers share the report's
+connection. A worker stops early when the prefetch is stopped or the
+report's time budget runs out.
+"""
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import threading
+import time
+
+from projections import SECTION_QUERIES, projection_for
+from query_memo import MemoCollection
+from report_context import get_report_context
+from section_scheduler import BudgetExceeded
+from topic_aggregates import TOPICS, build_topic_aggregate
+
+# Topics computed at the same time, unless the connection sets prefetch_workers
+DEFAULT_PREFETCH_WORKERS = 4
+
+
+class Prefetcher:
+    """
+    Computes topic aggregates and runs section queries in the background.
+
+    Args:
+        db_connection: Database connection
+        workers: Number of topics (or queries) computed at the same time
+        deadline: time.monotonic() deadline after which workers stop (None for no limit)
+    """
+
+    def __init__(self, db_connection, workers, deadline=None):
+        self.db_connection = db_connection
+        self.deadline = deadline
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+        self._futures = {}
+        self._queries = {}
+        self._stopped = threading.Event()
+
+    def start(self, names):
+        """Start computing the named topics"""
+        for name in names:
+            if name not in self._futures:
+                self._futures[name] = self._executor.submit(self._build, TOPICS[name])
+
+    def start_queries(self, sections):
+        """Start running the declared queries of the named sections"""
+        for section in sections:
+            if section not in self._queries:
+                self._queries[section] = self._executor.submit(self._fetch, section)
+
+    def _check(self):
+        if self._stopped.is_set() or (self.deadline is not None and time.monotonic() > self.deadline):
+            raise BudgetExceeded()
+
+    def _build(self, aggregate):
+        return build_topic_aggregate(self.db_connection, aggregate, check=self._check)
+
+    def _fetch(self, section):
+        # The same find() as find_pages; reading it to the end keeps the results in the query memo
+        query, sort = SECTION_QUERIES[section]
+        for _ in self.db_connection.page_results.find(query, projection_for(section), sort=sort):
+            self._check()
+
+    def wait_query(self, section, deadline=None):
+        """
+        Wait for a section's prefetched query, if it is being run.
+
+        The section runs the query itself afterwards; when the prefetch
+        finished, the query memo answers it. A prefetch that failed or did
+        not finish before the deadline is not waited for again.
+        """
+        future = self._queries.pop(section, None)
+        if future is None:
+            return
+        timeout = None if deadline is None else max(0, deadline - time.monotonic())
+        try:
+            future.result(timeout=timeout)
+        except BaseException:
+            pass
+
+    def has(self, name):
+        """True if the topic is being (or has been) prefetched and not yet collected"""
+        return name in self._futures
+
+    def result(self, name, deadline=None):
+        """
+        Wait for a prefetched topic.
+
+        Args:
+            name: Topic name
+            deadline: time.monotonic() deadline for waiting (None to wait until done)
+
+        Returns:
+            The topic's data model
+
+        Raises:
+            BudgetExceeded: if the deadline passes first (the topic stays
+                prefetched) or the computation was stopped
+        """
+        future = self._futures[name]
+        timeout = None if deadline is None else max(0, deadline - time.monotonic())
+        try:
+            model = future.result(timeout=timeout)
+        except TimeoutError:
+            raise BudgetExceeded(name, [f"{name} was still being computed when the time budget ran out"])
+        except BaseException:
+            del self._futures[name]
+            raise
+        del self._futures[name]
+        return model
+
+    def stop(self):
+        """Stop the workers and wait for them to finish"""
+        self._stopped.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._futures.clear()
+        self._queries.clear()
+
+
+def start_prefetch(db_connection, deadline=None, topics=None, queries=()):
+    """
+    Start computing registered topic aggregates and section queries in the background.
+
+    Does nothing when the connection has prefetch_workers set to 0. Section
+    queries are only prefetched while the query memo is in use (see
+    query_memo.use_query_memo), since their results are kept there.
+
+    Args:
+        db_connection: Database connection
+        deadline: time.monotonic() deadline after which workers stop (None for no limit)
+        topics: Names of the topics to compute (None for every registered topic)
+        queries: Names of the sections whose declared queries are run, in report order
+
+    Returns:
+        The Prefetcher (also kept on the report context), or None
+    """
+    workers = getattr(db_connection, 'prefetch_workers', DEFAULT_PREFETCH_WORKERS)
+    if not workers:
+        return None
+
+    context = get_report_context(db_connection)
+    names = [name for name in TOPICS if name not in context.topics and (topics is None or name in topics)]
+    if not isinstance(db_connection.page_results, MemoCollection):
+        queries = ()
+    if not names and not queries:
+        return None
+    prefetcher = Prefetcher(db_connection, min(workers, len(names) + len(queries)), deadline)
+    prefetcher.start(names)
+    prefetcher.start_queries(queries)
+    context.prefetch = prefetcher
+    return prefetcher
+
+
+def stop_prefetch(db_connection):
+    """Stop any background prefetch of the current report"""
+    context = getattr(db_connection, 'report_context', None)
+    if context is None or context.prefetch is None:
+        return
+    context.prefetch.stop()
+    context.prefetch = None
@@ -0,0 +1,180 @@
+"""
+Registry of the page_results fields each report section reads.
+
+Sections declare the exact field paths they read with declare_fields and
+fetch pages with find_pages, which derives the projection from the
+declaration. Only the declared fields are transferred from the database.
+
+A section whose query does not depend on the report can declare it too
+(query and sort). find_pages then runs the declared query, and prefetch can
+run it ahead of the section (see prefetch.start_prefetch).
+
+Reading the pages checks the running section's time budget, so that any
+section reading page results can be cut short (see section_scheduler).
+
+When check_fields is enabled on the database connection, the fetched pages
+are wrapped so that reading a field the section did not declare prints a
+warning. Such a read would otherwise silently see a missing value, because
+the field was never fetched.
+"""
+from collections.abc import Mapping
+
+from section_scheduler import check_budget
+
+# Declared field paths, keyed by section name. Paths may contain
+# str.format placeholders that are filled in from find_pages keyword arguments.
+SECTION_FIELDS = {}
+
+# Declared (filter, sort) of the sections whose query is fixed, keyed by section name
+SECTION_QUERIES = {}
+
+# (section, path) pairs already warned about, so each is only reported once
+_reported = set()
+
+
+def declare_fields(section, *paths, query=None, sort=None):
+    """
+    Declare the page_results fields a section reads.
+
+    Args:
+        section: Section name, e.g. 'summary.timers'
+        *paths: Dotted field paths, e.g. 'results.accessibility.tests.timers.timers.pageFlags'
+        query: find() filter of the section, when it is the same on every report
+        sort: find() sort specification of the declared query
+    """
+    SECTION_FIELDS[section] = tuple(paths)
+    if query is not None:
+        SECTION_QUERIES[section] = (query, sort)
+
+
+def declared_fields(section, **params):
+    """Get a section's declared field paths with any placeholders filled in"""
+    if section not in SECTION_FIELDS:
+        raise KeyError(f"No fields declared for section '{section}'")
+    return tuple(path.format(**params) for path in SECTION_FIELDS[section])
+
+
+def projection_for(section, **params):
+    """Build the find() projection for a section from its declared fields"""
+    projection = {path: 1 for path in declared_fields(section, **params)}
+    if '_id' not in projection:
+        projection['_id'] = 0
+    return projection
+
+
+def find_pages(db_connection, section, query=None, sort=None, limit=0, **params):
+    """
+    Find page results, fetching only the fields the section declared.
+
+    Args:
+        db_connection: MongoDB connection
+        section: Section name the fields were declared under
+        query: find() filter (None for the section's declared query and sort)
+        sort: find() sort specification, e.g. [('url', 1)]
+        limit: Pages returned at most (0 for all)
+        **params: Values for placeholders in the declared paths
+
+    Returns:
+        An iterable of page documents. Reading it raises BudgetExceeded once
+        the running section's time budget is spent (see section_scheduler).
+    """
+    if query is None:
+        if section not in SECTION_QUERIES:
+            raise KeyError(f"No query declared for section '{section}'")
+        query, sort = SECTION_QUERIES[section]
+        context = getattr(db_connection, 'report_context', None)
+        if context is not None and context.prefetch is not None:
+            # Read the results from the query memo once the prefetch has them
+            context.prefetch.wait_query(section, context.deadline)
+    paths = declared_fields(section, **params)
+    pages = db_connection.page_results.find(query, projection_for(section, **params), sort=sort, limit=limit)
+    if getattr(db_connection, 'check_fields', False):
+        return _checked_pages(db_connection, (TrackedDocument(page, section, paths) for page in pages))
+    return _checked_pages(db_connection, pages)
+
+
+def _checked_pages(db_connection, pages):
+    """Yield the pages, checking the running section's deadline before each one"""
+    for page in pages:
+        check_budget(db_connection)
+        yield page
+
+
+def find_page(db_connection, section, query=None, sort=None, **params):
+    """
+    Find the first matching page result, fetching only the fields the section declared.
+
+    Returns:
+        The page document, or None if no page matches
+    """
+    for page in find_pages(db_connection, section, query, sort=sort, limit=1, **params):
+        return page
+    return None
+
+
+def _is_allowed(path, declared):
+    """True if path is a declared path, or an ancestor or descendant of one"""
+    for declared_path in declared:
+        if (path == declared_path
+                or declared_path.startswith(path + '.')
+                or path.startswith(declared_path + '.')):
+            return True
+    return False
+
+
+def _is_covered(path, declared):
+    """True if path is at or below a declared path (all of it was fetched)"""
+    return any(path == d or path.startswith(d + '.') for d in declared)
+
+
+class TrackedDocument(Mapping):
+    """
+    Read-only view of a page document that reports undeclared field reads.
+
+    Levels above the declared paths are wrapped as well; values at or below
+    a declared path are returned as they are.
+    """
+
+    def __init__(self, document, section, declared, path=''):
+        self._document = document
+        self._section = section
+        self._declared = declared
+        self._path = path
+
+    def _child_path(self, key):
+        return f"{self._path}.{key}" if self._path else str(key)
+
+    def _check(self, key):
+        path = self._child_path(key)
+        if not _is_allowed(path, self._declared) and (self._section, path) not in _reported:
+            _reported.add((self._section, path))
+            print(f"Warning: section '{self._section}' read undeclared field '{path}'")
+        return path
+
+    def _wrap(self, path, value):
+        if isinstance(value, Mapping) and not _is_covered(path, self._declared):
+            return TrackedDocument(value, self._section, self._declared, path)
+        return value
+
+    def __getitem__(self, key):
+        path = self._check(key)
+        return self._wrap(path, self._document[key])
+
+    def get(self, key, default=None):
+        path = self._check(key)
+        if key not in self._document:
+            return default
+        return self._wrap(path, self._document[key])
+
+    def __contains__(self, key):
+        self._check(key)
+        return key in self._document
+
+    def __iter__(self):
+        return iter(self._document)
+
+    def __len__(self):
+        return len(self._document)
+
+    def __repr__(self):
+        return f"TrackedDocument({self._section!r}, {self._document!r})"
@@ -0,0 +1,303 @@
+"""
+Memoized page_results queries for the lifetime of one report.
+
+Many sections run the same query: the summary and detailed sections of a
+topic often filter on the same pageFlags with the same projection. For the
+length of a report, use_query_memo points the connection's page_results at
+a MemoCollection. Its find, distinct and count_documents results are
+cached, keyed by the canonical form of the query (filter, projection,
+sort, skip and limit), so a repeated query is answered from memory.
+
+The cache holds at most query_memo_size megabytes of results, measured by
+their BSON size. The least recently used results are evicted first, and a
+result larger than the whole cache is not kept at all. A find result is
+only cached once it has been read to the end.
+
+Scans that stream every page once (a topic aggregate, the page structures)
+gain nothing from the cache and would only push other results out: they
+read from unmemoized(collection). A find given a batch_size or cursor_type
+is such a scan too and is not memoized either.
+
+Cached documents are shared by every section that runs the query, so
+sections must treat them as read-only. Everything else (find_one,
+aggregate, with_options and so on) goes straight to the collection.
+"""
+from collections import OrderedDict
+import threading
+
+import bson
+from bson.errors import InvalidDocument
+
+from spill import MEGABYTE
+
+# Megabytes of results kept in memory, unless the connection sets query_memo_size
+DEFAULT_QUERY_MEMO_SIZE = 64
+
+# Bytes a cached count is taken to use
+COUNT_SIZE = 16
+
+
+def _canonical_filter(query):
+    """Filter with its top-level conditions in a fixed order (they are ANDed, so order does not matter)"""
+    query = query or {}
+    return {key: query[key] for key in sorted(query)}
+
+
+def _canonical_projection(projection):
+    """Projection as a dict in a fixed order (None for all fields)"""
+    if projection is None:
+        return None
+    if not isinstance(projection, dict):
+        projection = {field: 1 for field in projection}
+    return {key: projection[key] for key in sorted(projection)}
+
+
+def _canonical_sort(key_or_list, direction=None):
+    """Sort specification as a list of [field, direction] pairs"""
+    if key_or_list is None:
+        return None
+    if isinstance(key_or_list, str):
+        return [[key_or_list, 1 if direction is None else direction]]
+    if isinstance(key_or_list, dict):
+        key_or_list = key_or_list.items()
+    return [[field, order] for field, order in key_or_list]
+
+
+def result_size(document):
+    """Bytes a result document takes, measured by its BSON encoding"""
+    raw = getattr(document, 'raw', None)
+    if isinstance(raw, bytes):
+        return len(raw)
+    return len(bson.encode(document))
+
+
+def query_key(operation, **parts):
+    """
+    Build the cache key of a query.
+
+    The parts are BSON-encoded so that values of different types (an ObjectId
+    and its string) never share a key.
+
+    Returns:
+        The key, or None for a query that cannot be cached
+    """
+    try:
+        return bson.encode({'operation': operation, **parts})
+    except (InvalidDocument, TypeError):
+        return None
+
+
+class QueryMemo:
+    """
+    Least recently used cache of query results.
+
+    Args:
+        max_bytes: Bytes of results kept at most (see result_size)
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        # Sections running on worker threads share the cache
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Get a cached result and mark it as recently used.
+
+        Returns:
+            (True, result), or (False, None) when the query is not cached
+        """
+        if key is None:
+            return False, None
+        with self._lock:
+            if key not in self._results:
+                self.misses += 1
+                return False, None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return True, self._results[key][0]
+
+    def put(self, key, result, size):
+        """Cache a result of the given size in bytes, evicting the least recently used results to fit it"""
+        if key is None or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._results:
+                self.size -= self._results.pop(key)[1]
+            while self._results and self.size + size > self.max_bytes:
+                _, (_, evicted_size) = self._results.popitem(last=False)
+                self.size -= evicted_size
+            self._results[key] = (result, size)
+            self.size += size
+
+
+class MemoCursor:
+    """
+    Lazy stand-in for the cursor of a memoized find.
+
+    sort, skip and limit only change the query; it runs (or is answered from
+    the cache) when the cursor is first iterated. Any other cursor method
+    runs the query on the collection, uncached.
+    """
+
+    def __init__(self, memo, collection, query, projection, sort=None, skip=0, limit=0):
+        self._memo = memo
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort = sort
+        self._skip = skip
+        self._limit = limit
+        self._iterator = None
+
+    def sort(self, key_or_list, direction=None):
+        self._sort = _canonical_sort(key_or_list, direction)
+        return self
+
+    def skip(self, skip):
+        self._skip = skip
+        return self
+
+    def limit(self, limit):
+        self._limit = limit
+        return self
+
+    def _cursor(self):
+        """The equivalent cursor on the collection"""
+        cursor = self._collection.find(self._query, self._projection, skip=self._skip, limit=self._limit)
+        if self._sort:
+            cursor = cursor.sort([(field, order) for field, order in self._sort])
+        return cursor
+
+    def _results(self):
+        key = query_key('find',
+                        filter=_canonical_filter(self._query),
+                        projection=_canonical_projection(self._projection),
+                        sort=self._sort,
+                        skip=self._skip,
+                        limit=self._limit)
+        found, documents = self._memo.get(key)
+        if found:
+            yield from documents
+            return
+
+        # Stream the results, keeping them until they outgrow the cache
+        documents = []
+        size = 0
+        for document in self._cursor():
+            if documents is not None:
+                documents.append(document)
+                size += result_size(document)
+                if size > self._memo.max_bytes:
+                    documents = None
+            yield document
+        if documents is not None:
+            self._memo.put(key, documents, size)
+
+    def __iter__(self):
+        if self._iterator is None:
+            self._iterator = self._results()
+        return self._iterator
+
+    def __next__(self):
+        return next(iter(self))
+
+    def close(self):
+        if self._iterator is not None:
+            self._iterator.close()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._cursor(), name)
+
+
+class MemoCollection:
+    """
+    A collection whose find, distinct and count_documents results are memoized.
+
+    Args:
+        collection: The collection queries are run on
+        memo: QueryMemo holding the results
+    """
+
+    def __init__(self, collection, memo):
+        self.collection = collection
+        self.memo = memo
+
+    def find(self, filter=None, projection=None, skip=0, limit=0, sort=None, **kwargs):
+        if kwargs:
+            # Cursor options the memo does not key on, such as the batch_size of a streaming scan
+            return self.collection.find(filter, projection, skip=skip, limit=limit, sort=sort, **kwargs)
+        return MemoCursor(self.memo, self.collection, filter, projection, _canonical_sort(sort), skip, limit)
+
+    def distinct(self, key, filter=None, **kwargs):
+        if kwargs:
+            return self.collection.distinct(key, filter, **kwargs)
+        memo_key = query_key('distinct', key=key, filter=_canonical_filter(filter))
+        found, values = self.memo.get(memo_key)
+        if not found:
+            values = self.collection.distinct(key, filter)
+            self.memo.put(memo_key, values, len(bson.encode({'values': values})))
+        # Callers may sort or extend the list they are given
+        return list(values)
+
+    def count_documents(self, filter, skip=0, limit=0, **kwargs):
+        if kwargs:
+            return self.collection.count_documents(filter, skip=skip, limit=limit, **kwargs)
+        options = {}
+        if skip:
+            options['skip'] = skip
+        if limit:
+            options['limit'] = limit
+        memo_key = query_key('count_documents', filter=_canonical_filter(filter), skip=skip, limit=limit)
+        found, count = self.memo.get(memo_key)
+        if not found:
+            count = self.collection.count_documents(filter, **options)
+            self.memo.put(memo_key, count, COUNT_SIZE)
+        return count
+
+    def __getattr__(self, name):
+        if name in ('collection', 'memo'):
+            raise AttributeError(name)
+        return getattr(self.collection, name)
+
+
+def unmemoized(collection):
+    """The collection under a MemoCollection, for scans that read each page once"""
+    if isinstance(collection, MemoCollection):
+        return collection.collection
+    return collection
+
+
+def use_query_memo(db_connection):
+    """
+    Memoize queries on db_connection.page_results for the current report.
+
+    Call after the report's page_results view is in place (see latest_results).
+    Does nothing when the connection has query_memo_size (megabytes) set to 0.
+
+    Returns:
+        The MemoCollection, or None if queries are not memoized
+    """
+    size = getattr(db_connection, 'query_memo_size', DEFAULT_QUERY_MEMO_SIZE)
+    if not size or isinstance(db_connection.page_results, MemoCollection):
+        return None
+    memoized = MemoCollection(db_connection.page_results, QueryMemo(int(size * MEGABYTE)))
+    db_connection.page_results = memoized
+    return memoized
+
+
+def release_query_memo(db_connection):
+    """Restore the connection's page_results collection and drop the cached results"""
+    page_results = db_connection.page_results
+    if not isinstance(page_results, MemoCollection):
+        return
+    db_connection.page_results = page_results.collection
+    memo = page_results.memo
+    if memo.hits:
+        print(f"Answered {memo.hits} of {memo.hits + memo.misses} page result queries from memory")
@@ -0,0 +1,55 @@
+"""
+Per-report state shared by the sections of a single report.
+
+Sections only receive (doc, db_connection, total_domains), so the context is
+attached to the database connection for the lifetime of one report.
+"""
+
+
+class ReportContext:
+    """State that lives for the generation of one report"""
+
+    def __init__(self):
+        # Topic data models computed so far, keyed by topic name
+        self.topics = {}
+        # The full page_results collection while the connection reads from
+        # the latest-results view (see latest_results)
+        self.all_page_results = None
+        # Test run documents the report covers
+        self.test_runs = []
+        # Stratified page sample when the report is sampled (see sampling)
+        self.sample = None
+        # Deadline (time.monotonic) of the running section, if it has a budget
+        self.deadline = None
+        # Topics whose computation ran out of time, with their partial results
+        self.truncated_topics = {}
+        # Topic aggregates being computed in the background (see prefetch)
+        self.prefetch = None
+        # Memory budget shared by the report's spilling accumulators (see spill)
+        self.memory_budget = None
+        # Folder the report's long tables are written to (see table_overflow)
+        self.attachments_folder = None
+        # File names written to attachments_folder so far
+        self.table_attachments = []
+        # Page structure analysis shared by the structure sections (see structure_provider)
+        self.structure_analysis = None
+
+
+def begin_report(db_connection):
+    """Start a fresh report context on the connection and return it"""
+    context = ReportContext()
+    db_connection.report_context = context
+    return context
+
+
+def get_report_context(db_connection):
+    """Return the connection's current report context, starting one if needed"""
+    context = getattr(db_connection, 'report_context', None)
+    if context is None:
+        context = begin_report(db_connection)
+    return context
+
+
+def end_report(db_connection):
+    """Drop the report context so its cached data can be freed"""
+    db_connection.report_context = None
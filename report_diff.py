@@ -0,0 +1,450 @@
+"""
+Report-to-report diff of two test runs.
+
+Answering "what changed since last month" used to mean generating two full
+reports and comparing them by hand. The diff compares two test runs page by
+page and test by test, using fingerprints instead of the page results
+themselves:
+
+- For each page of a run, every test's normalized pageFlags and violations
+  are hashed into a test fingerprint, and all of a page's test fingerprints
+  into a page fingerprint. Fingerprints are computed once per finished run and
+  stored in the page_fingerprints collection.
+- Pages whose page fingerprints match are unchanged and are never decoded.
+- For the remaining pages only the tests whose fingerprints differ are read
+  back from page_results, and their flags and violations are compared.
+
+The result is rendered as a compact report of new, fixed and unchanged
+findings (python report_diff.py --from OLD_RUN --to NEW_RUN).
+"""
+import click
+from datetime import datetime
+import hashlib
+import json
+import os
+
+from bson import ObjectId
+from docx import Document
+
+from aggregate_store import run_finished
+from bounded_examples import BoundedExamples
+from connection_profile import ConnectionProfile
+from db import AccessibilityDB
+from page_access import compile_path, is_document, to_python
+from report_styling import set_document_styles, add_table, add_list_item
+
+FINGERPRINTS_COLLECTION = 'page_fingerprints'
+FINGERPRINT_RUNS_COLLECTION = 'fingerprint_runs'
+
+# Bump whenever the normalization changes, so stored fingerprints are recomputed
+FINGERPRINT_VERSION = 1
+
+TESTS_PATH = 'results.accessibility.tests'
+
+# Keys of a test's details that hold lists of violations
+VIOLATION_KEYS = ('violations', 'issues')
+
+# Keys that differ between runs without the finding itself changing
+VOLATILE_KEYS = frozenset({'timestamp', 'timing', 'duration', 'screenshot', 'testedAt'})
+
+# URLs whose fingerprints or page results are read per query
+BATCH_SIZE = 500
+
+# Rows shown per table of the diff report
+MAX_ROWS = 200
+
+get_tests = compile_path(TESTS_PATH)
+
+
+def test_nodes(tests):
+    """
+    Yield (test path, test result) for every test of a page.
+
+    Tests are stored either directly under their category or one level
+    below it (tests.headings vs tests.media_queries.media_queries).
+    """
+    if not is_document(tests):
+        return
+    for category, node in tests.items():
+        if not is_document(node):
+            continue
+        if 'pageFlags' in node or 'details' in node:
+            yield category, node
+            continue
+        for name, test in node.items():
+            if is_document(test) and ('pageFlags' in test or 'details' in test):
+                yield f"{category}.{name}", test
+
+
+def normalize(value):
+    """Decode a value into plain data with sorted keys and without volatile keys"""
+    if is_document(value):
+        return {key: normalize(item) for key, item in sorted(value.items()) if key not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [normalize(item) for item in value]
+    return value
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def test_violations(test):
+    """Map each violation of a test to its fingerprint"""
+    details = test.get('details')
+    violations = {}
+    if not is_document(details):
+        return violations
+    for key in VIOLATION_KEYS:
+        items = details.get(key)
+        if isinstance(items, list):
+            for item in items:
+                item = normalize(item)
+                violations[_digest([key, item])[:16]] = item
+    return violations
+
+
+def test_flags(test):
+    """Get a test's pageFlags as a plain dict"""
+    flags = test.get('pageFlags')
+    return normalize(flags) if is_document(flags) else {}
+
+
+def test_fingerprint(test):
+    """Hash a test's normalized flags and violation fingerprints"""
+    return _digest({'flags': test_flags(test), 'violations': sorted(test_violations(test))})
+
+
+def fingerprint_page(page):
+    """
+    Fingerprint every test of a page.
+
+    Returns:
+        (page fingerprint, [[test path, test fingerprint], ...] sorted by path)
+    """
+    tests = sorted([path, test_fingerprint(test)] for path, test in test_nodes(get_tests(page)))
+    return _digest(tests), tests
+
+
+def fingerprints_collection(db_connection):
+    """Get the page_fingerprints collection in the connection's database"""
+    collection = db_connection.test_runs.database[FINGERPRINTS_COLLECTION]
+    collection.create_index([('test_run_id', 1), ('url', 1)], unique=True)
+    return collection
+
+
+def _find_test_run(db_connection, test_run_id):
+    """Find a test run by its ID, whether stored as an ObjectId or a string"""
+    if ObjectId.is_valid(test_run_id):
+        test_run = db_connection.test_runs.find_one({'_id': ObjectId(test_run_id)})
+        if test_run is not None:
+            return test_run
+    return db_connection.test_runs.find_one({'_id': test_run_id})
+
+
+def ensure_fingerprints(db_connection, test_run_id, refresh=False):
+    """
+    Compute and store the fingerprints of a test run's pages, unless already stored.
+
+    Fingerprints of a run that is still in progress are recomputed on every
+    diff. When a URL has several results in the run, the latest one is used.
+
+    Args:
+        db_connection: Database connection
+        test_run_id: Test run ID (as a string)
+        refresh: Recompute even if fingerprints are stored
+
+    Returns:
+        Number of pages fingerprinted (0 if the stored fingerprints were used)
+    """
+    runs = db_connection.test_runs.database[FINGERPRINT_RUNS_COLLECTION]
+    if not refresh and runs.find_one({'_id': test_run_id, 'version': FINGERPRINT_VERSION}):
+        return 0
+
+    fingerprints = fingerprints_collection(db_connection)
+    fingerprints.delete_many({'test_run_id': test_run_id})
+    pages = db_connection.page_results.find(
+        {'test_run_id': test_run_id},
+        {'url': 1, 'timestamp': 1, TESTS_PATH: 1}
+    ).sort([('url', 1), ('timestamp', 1)])
+
+    count = 0
+    batch = []
+    previous = None
+    for page in pages:
+        page_hash, tests = fingerprint_page(page)
+        fingerprint = {'test_run_id': test_run_id, 'url': page['url'], 'page_hash': page_hash, 'tests': tests}
+        if previous is not None and previous['url'] == page['url']:
+            # A later result of the same URL replaces the earlier one
+            batch[-1] = fingerprint
+        else:
+            if len(batch) >= BATCH_SIZE:
+                fingerprints.insert_many(batch)
+                batch = []
+            batch.append(fingerprint)
+            count += 1
+        previous = fingerprint
+    if batch:
+        fingerprints.insert_many(batch)
+
+    test_run = _find_test_run(db_connection, test_run_id)
+    if test_run is not None and run_finished(db_connection, test_run):
+        runs.replace_one({'_id': test_run_id},
+                         {'_id': test_run_id, 'version': FINGERPRINT_VERSION, 'pages': count,
+                          'created': datetime.now()},
+                         upsert=True)
+    return count
+
+
+def invalidate_fingerprints(db_connection, test_run_ids):
+    """Delete the stored fingerprints of the given test runs. Returns the number of pages deleted"""
+    test_run_ids = [str(run_id) for run_id in test_run_ids]
+    db_connection.test_runs.database[FINGERPRINT_RUNS_COLLECTION].delete_many({'_id': {'$in': test_run_ids}})
+    return fingerprints_collection(db_connection).delete_many({'test_run_id': {'$in': test_run_ids}}).deleted_count
+
+
+def describe_violation(violation):
+    """Short text for a violation: its issue and element when it has them"""
+    if not isinstance(violation, dict):
+        return str(violation)
+    issue = next((str(violation[key]) for key in ('issue', 'type', 'issueType', 'description', 'message')
+                  if violation.get(key)), None)
+    element = next((str(violation[key]) for key in ('element', 'selector', 'xpath', 'tag')
+                    if violation.get(key)), None)
+    if issue and element:
+        return f"{issue} ({element})"
+    text = issue or element or json.dumps(violation, sort_keys=True, default=str)
+    return text if len(text) <= 120 else text[:117] + '...'
+
+
+class RunDiff:
+    """
+    Differences between two test runs.
+
+    Issues are (url, test, description) and flag changes are
+    (url, test, flag, old value, new value); each list keeps at most
+    MAX_ROWS examples ordered by URL, with its total in .total.
+    """
+
+    def __init__(self, old_run, new_run):
+        self.old_run = old_run
+        self.new_run = new_run
+        self.pages_compared = 0
+        self.unchanged_pages = 0
+        self.changed_pages = 0
+        self.unchanged_tests = 0
+        self.changed_tests = 0
+        self.added_pages = BoundedExamples(MAX_ROWS, key=lambda url: url)
+        self.removed_pages = BoundedExamples(MAX_ROWS, key=lambda url: url)
+        self.new_issues = BoundedExamples(MAX_ROWS, key=lambda row: row[:2])
+        self.fixed_issues = BoundedExamples(MAX_ROWS, key=lambda row: row[:2])
+        self.flag_changes = BoundedExamples(MAX_ROWS, key=lambda row: row[:3])
+
+
+def _page_hashes(fingerprints, test_run_id):
+    return {
+        fingerprint['url']: fingerprint['page_hash']
+        for fingerprint in fingerprints.find({'test_run_id': test_run_id}, {'_id': 0, 'url': 1, 'page_hash': 1})
+    }
+
+
+def _test_hashes(fingerprints, test_run_id, urls):
+    return {
+        fingerprint['url']: dict(fingerprint['tests'])
+        for fingerprint in fingerprints.find({'test_run_id': test_run_id, 'url': {'$in': urls}},
+                                             {'_id': 0, 'url': 1, 'tests': 1})
+    }
+
+
+def _read_tests(db_connection, test_run_id, changed_tests):
+    """Read only the changed tests of each changed page, latest result per URL"""
+    paths = sorted({path for tests in changed_tests.values() for path in tests})
+    projection = {'url': 1, 'timestamp': 1}
+    projection.update({f"{TESTS_PATH}.{path}": 1 for path in paths})
+    pages = {}
+    cursor = db_connection.page_results.find(
+        {'test_run_id': test_run_id, 'url': {'$in': sorted(changed_tests)}}, projection
+    ).sort('timestamp', 1)
+    for page in cursor:
+        pages[page['url']] = dict(test_nodes(get_tests(page)))
+    return pages
+
+
+def _compare_test(diff, url, path, old_test, new_test):
+    """Record the new and fixed violations and the changed flags of one test"""
+    old_flags = test_flags(old_test) if old_test is not None else {}
+    new_flags = test_flags(new_test) if new_test is not None else {}
+    for flag in sorted(set(old_flags) | set(new_flags)):
+        if old_flags.get(flag) != new_flags.get(flag):
+            diff.flag_changes.add((url, path, flag, old_flags.get(flag), new_flags.get(flag)))
+
+    old_violations = test_violations(old_test) if old_test is not None else {}
+    new_violations = test_violations(new_test) if new_test is not None else {}
+    for fingerprint in sorted(set(new_violations) - set(old_violations)):
+        diff.new_issues.add((url, path, describe_violation(new_violations[fingerprint])))
+    for fingerprint in sorted(set(old_violations) - set(new_violations)):
+        diff.fixed_issues.add((url, path, describe_violation(old_violations[fingerprint])))
+
+
+def diff_runs(db_connection, old_run, new_run, refresh=False):
+    """
+    Compare two test runs.
+
+    Args:
+        db_connection: Database connection
+        old_run: ID of the earlier test run
+        new_run: ID of the later test run
+        refresh: Recompute the runs' stored fingerprints
+
+    Returns:
+        RunDiff
+    """
+    old_run, new_run = str(old_run), str(new_run)
+    for run in (old_run, new_run):
+        count = ensure_fingerprints(db_connection, run, refresh)
+        if count:
+            print(f"Fingerprinted {count} pages of test run {run}")
+
+    fingerprints = fingerprints_collection(db_connection)
+    old_pages = _page_hashes(fingerprints, old_run)
+    new_pages = _page_hashes(fingerprints, new_run)
+
+    diff = RunDiff(old_run, new_run)
+    diff.added_pages.extend(url for url in new_pages if url not in old_pages)
+    diff.removed_pages.extend(url for url in old_pages if url not in new_pages)
+    common = sorted(url for url in old_pages if url in new_pages)
+    changed = [url for url in common if old_pages[url] != new_pages[url]]
+    diff.pages_compared = len(common)
+    diff.changed_pages = len(changed)
+    diff.unchanged_pages = len(common) - len(changed)
+
+    for start in range(0, len(changed), BATCH_SIZE):
+        urls = changed[start:start + BATCH_SIZE]
+        old_tests = _test_hashes(fingerprints, old_run, urls)
+        new_tests = _test_hashes(fingerprints, new_run, urls)
+
+        changed_tests = {}
+        for url in urls:
+            old_hashes, new_hashes = old_tests.get(url, {}), new_tests.get(url, {})
+            paths = set(old_hashes) | set(new_hashes)
+            differing = sorted(path for path in paths if old_hashes.get(path) != new_hashes.get(path))
+            diff.unchanged_tests += len(paths) - len(differing)
+            diff.changed_tests += len(differing)
+            changed_tests[url] = differing
+
+        old_results = _read_tests(db_connection, old_run, changed_tests)
+        new_results = _read_tests(db_connection, new_run, changed_tests)
+        for url in urls:
+            for path in changed_tests[url]:
+                _compare_test(diff, url, path,
+                              old_results.get(url, {}).get(path), new_results.get(url, {}).get(path))
+
+    # Tests of unchanged pages are unchanged too
+    if diff.unchanged_pages:
+        unchanged = [url for url in common if old_pages[url] == new_pages[url]]
+        for start in range(0, len(unchanged), BATCH_SIZE):
+            for tests in _test_hashes(fingerprints, new_run, unchanged[start:start + BATCH_SIZE]).values():
+                diff.unchanged_tests += len(tests)
+    return diff
+
+
+def _add_rows(doc, examples, headers, row):
+    """Add a table of kept examples, noting how many were left out"""
+    if not examples:
+        doc.add_paragraph("None.")
+        return
+    add_table(doc, headers, [row(item) for item in examples])
+    if examples.remaining:
+        doc.add_paragraph(f"... and {examples.remaining} more.")
+
+
+def _format_value(value):
+    return 'not set' if value is None else str(to_python(value))
+
+
+def render_diff(diff, title, date):
+    """
+    Render a RunDiff as a compact document.
+
+    Returns:
+        The Document
+    """
+    doc = Document()
+    set_document_styles(doc)
+    doc.add_heading(title, level=1)
+    doc.add_paragraph(f"Test run {diff.old_run} compared with test run {diff.new_run} on {date}.")
+
+    doc.add_heading("Summary", level=2)
+    add_table(doc, ["", "Count"], [
+        ["Pages in both runs", diff.pages_compared],
+        ["Unchanged pages", diff.unchanged_pages],
+        ["Changed pages", diff.changed_pages],
+        ["New pages", diff.added_pages.total],
+        ["Removed pages", diff.removed_pages.total],
+        ["Unchanged tests", diff.unchanged_tests],
+        ["Changed tests", diff.changed_tests],
+        ["New issues", diff.new_issues.total],
+        ["Fixed issues", diff.fixed_issues.total],
+        ["Changed page flags", diff.flag_changes.total],
+    ])
+
+    doc.add_heading("New Issues", level=2)
+    _add_rows(doc, diff.new_issues, ["Page", "Test", "Issue"], list)
+
+    doc.add_heading("Fixed Issues", level=2)
+    _add_rows(doc, diff.fixed_issues, ["Page", "Test", "Issue"], list)
+
+    doc.add_heading("Changed Page Flags", level=2)
+    _add_rows(doc, diff.flag_changes, ["Page", "Test", "Flag", "Before", "After"],
+              lambda change: [change[0], change[1], change[2], _format_value(change[3]), _format_value(change[4])])
+
+    if diff.added_pages or diff.removed_pages:
+        doc.add_heading("Pages Tested in Only One Run", level=2)
+        for url in diff.added_pages:
+            add_list_item(doc, f"New: {url}")
+        for url in diff.removed_pages:
+            add_list_item(doc, f"Removed: {url}")
+        left_out = diff.added_pages.remaining + diff.removed_pages.remaining
+        if left_out:
+            doc.add_paragraph(f"... and {left_out} more.")
+    return doc
+
+
+@click.command()
+@click.option('--from', 'old_run', required=True,
+              help='ID of the earlier test run')
+@click.option('--to', 'new_run', required=True,
+              help='ID of the later test run')
+@click.option('--title', '-t',
+              default='Accessibility Changes Report',
+              help='Title of the report')
+@click.option('--output_folder', '-o',
+              default='reports',
+              help='Folder where the report will be filed')
+@click.option('--database', '-db',
+              default=None,
+              help='MongoDB database name to use (default: accessibility_tests)')
+@click.option('--refresh', is_flag=True,
+              default=False,
+              help='Recompute the stored page fingerprints of both runs')
+def main(old_run, new_run, title, output_folder, database, refresh):
+    """Report what changed between two test runs."""
+    try:
+        db = AccessibilityDB(db_name=database, profile=ConnectionProfile.from_environment())
+        diff = diff_runs(db, old_run, new_run, refresh)
+        doc = render_diff(diff, title, datetime.now().strftime("%Y-%m-%d"))
+
+        if not os.path.exists(output_folder):
+            os.makedirs(output_folder)
+        report_file = f'{output_folder}/accessibility_diff_{datetime.now().strftime("%Y%m%d_%H%M%S")}.docx'
+        doc.save(report_file)
+        click.echo(f"{diff.new_issues.total} new issues, {diff.fixed_issues.total} fixed, "
+                   f"{diff.unchanged_pages} of {diff.pages_compared} pages unchanged")
+        click.echo(f"Diff report generated successfully: {report_file}")
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        click.echo(f"Error generating diff report: {str(e)}", err=True)
+
+if __name__ == "__main__":
+    main()
@@ -5,22 +5,20 @@ from docx.enum.section import WD_SECTION
 from docx.oxml import OxmlElement, parse_xml
 from docx.oxml.ns import qn
 from datetime import datetime
+import hashlib
+import json
 import os
 import sys
 
 # Add parent directory to path to allow relative imports
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-# Import styling utilities
-from report_styling import (
-    set_document_styles, 
-    format_table_text
-)
+# Base document with the report styles, header and footer
+from report_template import new_report_document
 
 # Import section generators
-from sections.sections_header import setup_document_header_footer
 from sections.title_page import add_title_page
-from sections.table_of_contents import add_toc_section
+from sections.table_of_contents import add_toc_section, fill_table_of_contents
 from sections.executive_summary import add_executive_summary
 
 # Import only the summary findings sections we need
@@ -31,11 +29,242 @@ from sections.summary_findings.responsive_accessibility import add_responsive_ac
 from sections.detailed_findings.media_queries import add_detailed_media_queries
 from sections.detailed_findings.responsive_accessibility import add_responsive_accessibility_detailed
 
+# Topic sections of the full report (formerly report3.py)
+from sections.summary_findings.accessible_names import add_accessible_names_section
+from sections.summary_findings.animation import add_animation_section
+from sections.summary_findings.color_contrast import add_color_contrast_section
+from sections.summary_findings.color_as_indicator import add_color_as_indicator_section
+from sections.summary_findings.dialogs import add_dialogs_section
+from sections.summary_findings.event_handling import add_event_handling_section
+from sections.summary_findings.floating_dialogs import add_floating_dialogs_section
+from sections.summary_findings.focus_management import add_focus_management_section
+from sections.summary_findings.fonts import add_fonts_section
+from sections.summary_findings.forms import add_forms_section
+from sections.summary_findings.headings import add_headings_section
+from sections.summary_findings.images import add_images_section
+from sections.summary_findings.landmarks import add_landmarks_section
+from sections.summary_findings.language import add_language_section
+from sections.summary_findings.lists import add_lists_section
+from sections.summary_findings.maps import add_maps_section
+from sections.summary_findings.menus import add_menus_section
+from sections.summary_findings.more_controls import add_more_controls_section
+from sections.summary_findings.tabindex import add_tabindex_section
+from sections.summary_findings.title_attribute import add_title_attribute_section
+from sections.summary_findings.tables import add_tables_section
+from sections.summary_findings.timers import add_timers_section
+from sections.summary_findings.videos import add_videos_section
+from sections.detailed_findings.structure import add_detailed_structure
+from sections.detailed_findings.structure_analysis import add_detailed_structure_analysis
+from sections.detailed_findings.accessible_names import add_detailed_accessible_names
+from sections.detailed_findings.animation import add_detailed_animation
+from sections.detailed_findings.color_contrast import add_detailed_color_contrast
+from sections.detailed_findings.color_as_indicator import add_detailed_color_as_indicator
+from sections.detailed_findings.dialogs import add_detailed_dialogs
+from sections.detailed_findings.event_handling import add_detailed_event_handling
+from sections.detailed_findings.floating_dialogs import add_detailed_floating_dialogs
+from sections.detailed_findings.focus_management import add_detailed_focus_management
+from sections.detailed_findings.fonts import add_detailed_fonts
+from sections.detailed_findings.forms import add_detailed_forms
+from sections.detailed_findings.headings import add_detailed_headings
+from sections.detailed_findings.images import add_detailed_images
+from sections.detailed_findings.landmarks import add_detailed_landmarks
+from sections.detailed_findings.language import add_detailed_language
+from sections.detailed_findings.lists import add_detailed_lists
+from sections.detailed_findings.maps import add_detailed_maps
+from sections.detailed_findings.menus import add_detailed_menus
+from sections.detailed_findings.more_controls import add_detailed_more_controls
+from sections.detailed_findings.tabindex import add_detailed_tabindex
+from sections.detailed_findings.title_attribute import add_detailed_title_attribute
+from sections.detailed_findings.tables import add_detailed_tables
+from sections.detailed_findings.timers import add_detailed_timers
+from sections.detailed_findings.videos import add_detailed_videos
+
 # Import appendices
 from sections.appendices import add_appendices
+from sections.site_specific_reports import add_site_specific_reports
+
+# Per-report shared state (topic aggregates computed once for summary and detailed sections)
+from report_context import begin_report, end_report
+
+# Latest result of each URL for the report's test runs
+from latest_results import use_latest_results, release_latest_results
+from query_memo import use_query_memo, release_query_memo
+
+# Stratified sampling for draft reports
+from sampling import begin_sample, add_sample_note
+
+# Per-section and whole-report time budgets
+from section_scheduler import SectionScheduler
+
+# Background computation of the topic aggregates
+from prefetch import start_prefetch, stop_prefetch
+
+# Rebuilding only the sections whose page results changed
+from aggregate_store import invalidate_runs
+from libreoffice_fields import update_page_numbers
+from table_overflow import attachments_folder
+from incremental import SECTION_INPUTS, IncrementalBuild, declare_section_inputs, load_previous_report
+
+# Page results each scheduled section reads
+PAGE_URLS_QUERY = {'filter': {}, 'projection': {'url': 1, '_id': 0}}
+declare_section_inputs('Executive summary', queries=[PAGE_URLS_QUERY])
+declare_section_inputs('Media queries summary', topics=['media_queries'])
+declare_section_inputs('Responsive accessibility summary', topics=['responsive_accessibility'])
+declare_section_inputs('Detailed media queries', topics=['media_queries'])
+declare_section_inputs('Detailed responsive accessibility', topics=['responsive_accessibility'])
+declare_section_inputs('Appendices', queries=[
+    PAGE_URLS_QUERY,
+    {
+        'filter': {"results.accessibility.tests.documents.document_links": {"$exists": True}},
+        'projection': {"url": 1, "results.accessibility.tests.documents.document_links": 1, "_id": 0}
+    }
+])
+
+declare_section_inputs('Accessible names summary', topics=['accessible_names'])
+declare_section_inputs('Fonts summary', topics=['fonts'])
+declare_section_inputs('Detailed accessible names', topics=['accessible_names'])
+declare_section_inputs('Detailed fonts', topics=['fonts'])
+
+
+def test_results_query(test):
+    """Query for the pages with results of one accessibility test"""
+    path = f"results.accessibility.tests.{test}"
+    return {'filter': {path: {'$exists': True}}, 'projection': {'url': 1, path: 1, '_id': 0}}
+
+
+# Accessibility test whose results each other topic section of the full report reads
+FULL_SECTION_TESTS = [
+    ('Animation summary', 'animations'), ('Detailed animation', 'animations'),
+    ('Colour contrast summary', 'colors'), ('Detailed colour contrast', 'colors'),
+    ('Colour as indicator summary', 'colors'), ('Detailed colour as indicator', 'colors'),
+    ('Dialogs summary', 'modals'), ('Detailed dialogs', 'modals'),
+    ('Event handling summary', 'events'), ('Detailed event handling', 'events'),
+    ('Floating dialogs summary', 'floating_dialogs'), ('Detailed floating dialogs', 'floating_dialogs'),
+    ('Focus management summary', 'focus_management'), ('Detailed focus management', 'focus_management'),
+    ('Forms summary', 'forms'), ('Detailed forms', 'forms'),
+    ('Headings summary', 'headings'), ('Detailed headings', 'headings'),
+    ('Images summary', 'images'), ('Detailed images', 'images'),
+    ('Landmarks summary', 'landmarks'), ('Detailed landmarks', 'landmarks'),
+    ('Language summary', 'html_structure'), ('Detailed language', 'html_structure'),
+    ('Lists summary', 'lists'), ('Detailed lists', 'lists'),
+    ('Maps summary', 'maps'), ('Detailed maps', 'maps'),
+    ('Menus summary', 'menus'), ('Detailed menus', 'menus'),
+    ('More controls summary', 'read_more_links'), ('Detailed more controls', 'read_more_links'),
+    ('Tabindex summary', 'tabindex'), ('Detailed tabindex', 'tabindex'),
+    ('Title attribute summary', 'title'), ('Detailed title attribute', 'title'),
+    ('Tables summary', 'tables'), ('Detailed tables', 'tables'),
+    ('Timers summary', 'timers'), ('Detailed timers', 'timers'),
+    ('Videos summary', 'video'), ('Detailed videos', 'video'),
+    ('Detailed page structure', 'page_structure'), ('Detailed structure analysis', 'page_structure')
+]
+for section_title, test in FULL_SECTION_TESTS:
+    declare_section_inputs(section_title, queries=[test_results_query(test)])
+
+# Fixed queries (see projections) of the scheduled sections, run ahead by prefetch
+SECTION_QUERY_NAMES = {
+    'Appendices': ['appendices.tested_pages', 'appendices.documents'],
+    'Animation summary': ['summary.animation'], 'Detailed animation': ['detailed.animation'],
+    'Dialogs summary': ['summary.dialogs'], 'Detailed dialogs': ['detailed.dialogs'],
+    'Event handling summary': ['summary.event_handling'], 'Detailed event handling': ['detailed.event_handling'],
+    'Floating dialogs summary': ['summary.floating_dialogs'], 'Detailed floating dialogs': ['detailed.floating_dialogs'],
+    'Focus management summary': ['summary.focus_management'], 'Detailed focus management': ['detailed.focus_management'],
+    'Forms summary': ['summary.forms'], 'Detailed forms': ['detailed.forms'],
+    'Headings summary': ['summary.heading_issues'], 'Detailed headings': ['detailed.headings'],
+    'Images summary': ['summary.images'], 'Detailed images': ['detailed.images'],
+    'Landmarks summary': ['summary.landmarks'], 'Detailed landmarks': ['detailed.landmarks'],
+    'Language summary': ['summary.language'], 'Detailed language': ['detailed.language'],
+    'Lists summary': ['summary.lists'], 'Detailed lists': ['detailed.lists'],
+    'Maps summary': ['summary.maps'], 'Detailed maps': ['detailed.maps'],
+    'Menus summary': ['summary.menus'], 'Detailed menus': ['detailed.menus'],
+    'More controls summary': ['summary.more_controls'], 'Detailed more controls': ['detailed.more_controls'],
+    'Tabindex summary': ['summary.tabindex'], 'Detailed tabindex': ['detailed.tabindex'],
+    'Title attribute summary': ['summary.title_attribute'], 'Detailed title attribute': ['detailed.title_attribute'],
+    'Tables summary': ['summary.tables'], 'Detailed tables': ['detailed.tables'],
+    'Timers summary': ['summary.timers'], 'Detailed timers': ['detailed.timers'],
+    'Videos summary': ['summary.videos'], 'Detailed videos': ['detailed.videos']
+}
+
+# (title, section function) of the topic sections the full report adds, in report order
+SUMMARY_TOPIC_SECTIONS = [
+    ('Accessible names summary', add_accessible_names_section),
+    ('Animation summary', add_animation_section),
+    ('Colour contrast summary', add_color_contrast_section),
+    ('Colour as indicator summary', add_color_as_indicator_section),
+    ('Dialogs summary', add_dialogs_section),
+    ('Event handling summary', add_event_handling_section),
+    ('Floating dialogs summary', add_floating_dialogs_section),
+    ('Focus management summary', add_focus_management_section),
+    ('Fonts summary', add_fonts_section),
+    ('Forms summary', add_forms_section),
+    ('Headings summary', add_headings_section),
+    ('Images summary', add_images_section),
+    ('Landmarks summary', add_landmarks_section),
+    ('Language summary', add_language_section),
+    ('Lists summary', add_lists_section),
+    ('Maps summary', add_maps_section),
+    ('Menus summary', add_menus_section),
+    ('More controls summary', add_more_controls_section),
+    ('Tabindex summary', add_tabindex_section),
+    ('Title attribute summary', add_title_attribute_section),
+    ('Tables summary', add_tables_section),
+    ('Timers summary', add_timers_section),
+    ('Videos summary', add_videos_section)
+]
+DETAILED_TOPIC_SECTIONS = [
+    ('Detailed page structure', add_detailed_structure),
+    ('Detailed structure analysis', add_detailed_structure_analysis),
+    ('Detailed accessible names', add_detailed_accessible_names),
+    ('Detailed animation', add_detailed_animation),
+    ('Detailed colour contrast', add_detailed_color_contrast),
+    ('Detailed colour as indicator', add_detailed_color_as_indicator),
+    ('Detailed dialogs', add_detailed_dialogs),
+    ('Detailed event handling', add_detailed_event_handling),
+    ('Detailed floating dialogs', add_detailed_floating_dialogs),
+    ('Detailed focus management', add_detailed_focus_management),
+    ('Detailed fonts', add_detailed_fonts),
+    ('Detailed forms', add_detailed_forms),
+    ('Detailed headings', add_detailed_headings),
+    ('Detailed images', add_detailed_images),
+    ('Detailed landmarks', add_detailed_landmarks),
+    ('Detailed language', add_detailed_language),
+    ('Detailed lists', add_detailed_lists),
+    ('Detailed maps', add_detailed_maps),
+    ('Detailed menus', add_detailed_menus),
+    ('Detailed more controls', add_detailed_more_controls),
+    ('Detailed tabindex', add_detailed_tabindex),
+    ('Detailed title attribute', add_detailed_title_attribute),
+    ('Detailed tables', add_detailed_tables),
+    ('Detailed timers', add_detailed_timers),
+    ('Detailed videos', add_detailed_videos)
+]
+
+# Sections of the default report, in report order
+REPORT_SECTIONS = [
+    'Executive summary',
+    'Media queries summary',
+    'Responsive accessibility summary',
+    'Detailed media queries',
+    'Detailed responsive accessibility',
+    'Appendices'
+]
 
-def create_report_template(db_connection, title, author, date):
+def report_titles(full=False, site_reports=False):
+    """Titles of the scheduled sections of a report, in report order"""
+    titles = list(REPORT_SECTIONS)
+    if full:
+        titles = (REPORT_SECTIONS[:3] + [title for title, _ in SUMMARY_TOPIC_SECTIONS]
+                  + REPORT_SECTIONS[3:5] + [title for title, _ in DETAILED_TOPIC_SECTIONS]
+                  + REPORT_SECTIONS[5:])
+    if site_reports:
+        titles.insert(titles.index('Appendices'), 'Site specific reports')
+    return titles
+
+def create_report_template(db_connection, title, author, date, incremental=None, attachments_folder=None,
+                           full=False, site_reports=False, site_report_folder=None):
     print("Starting report creation...")
+    context = begin_report(db_connection)
+    # Rows of long tables beyond their row budget are written here (see table_overflow)
+    context.attachments_folder = attachments_folder
 
     ####################################################
     # Get list of URLs and domains used by the reporting
@@ -43,6 +272,8 @@ def create_report_template(db_connection, title, author, date):
     ####################################################
 
     all_test_runs = db_connection.get_all_test_runs()
+    context.test_runs = all_test_runs or []
+    sample = None
     if not all_test_runs:
         print("Warning: No test runs found in the database. Creating an empty report template.")
         test_run_ids = []
@@ -54,18 +285,21 @@ def create_report_template(db_connection, title, author, date):
         if not all_urls:
             print("Warning: No page results found for the test runs in the database.")
 
+        # Sections read one (the most recent) result per URL from here on,
+        # only for the sampled URLs when the report is sampled
+        sample = begin_sample(db_connection, all_urls)
+        use_latest_results(db_connection, test_run_ids, sample.urls if sample else None)
+
+        # Sections that repeat a query are answered from memory
+        use_query_memo(db_connection)
+
     total_domains = set()
     for url in all_urls:
         domain = url.replace('http://', '').replace('https://', '').split('/')[0]
         total_domains.add(domain)
 
-    doc = Document()
-    
-    # Set up document styles
-    set_document_styles(doc)
-
-    # Set up header and footer
-    setup_document_header_footer(doc, title)
+    # Styles, header, footer and logo come from the cached base template
+    doc = new_report_document(title)
 
     # Add title page
     add_title_page(doc, db_connection, title, author, date)
@@ -74,21 +308,57 @@ def create_report_template(db_connection, title, author, date):
     doc.add_page_break()
     add_toc_section(doc)
 
+    # Sections that read page results run within the connection's time budgets
+    scheduler = SectionScheduler(
+        db_connection,
+        section_budget=getattr(db_connection, 'section_budget', None),
+        report_budget=getattr(db_connection, 'report_budget', None),
+        incremental=incremental
+    )
+
+    # Compute the topic aggregates and section queries concurrently while the first sections
+    # render, only those of this report's sections that cannot be reused from the previous report
+    titles = report_titles(full, site_reports)
+    topics = {name for title in titles if title in SECTION_INPUTS for name in SECTION_INPUTS[title]['topics']}
+    if incremental is not None:
+        report_key = hashlib.sha1(json.dumps({
+            'test_runs': sorted(test_run_ids),
+            'domains': sorted(total_domains),
+            'latest_only': bool(getattr(db_connection, 'latest_results_only', True)),
+            'sample': sample.key if sample else None
+        }).encode()).hexdigest()
+        dirty = incremental.plan(titles, report_key)
+        print(f"Sections to rebuild: {', '.join(dirty) if dirty else 'none'}")
+        if incremental.inputs_changed():
+            # Pages were re-crawled into the same runs, so their stored aggregates are stale
+            invalidate_runs(db_connection, test_run_ids)
+        topics = incremental.needed_topics(titles)
+    queries = [section for title in titles if incremental is None or not incremental.is_clean(title)
+               for section in SECTION_QUERY_NAMES.get(title, [])]
+    start_prefetch(db_connection, scheduler.report_deadline, topics, queries)
+
     # Add executive summary
     doc.add_page_break()
-    add_executive_summary(doc, db_connection, total_domains)
+    scheduler.run(doc, 'Executive summary', add_executive_summary, doc, db_connection, total_domains)
 
     #############################################
     # Summary Findings
     #############################################
     h1 = doc.add_heading('Summary findings', level=1)
     h1.style = doc.styles['Heading 1']
+    add_sample_note(doc, db_connection)
 
     # Add Media Queries Section (first, as it affects overall responsiveness)
-    add_media_queries_section(doc, db_connection, total_domains)
+    scheduler.run(doc, 'Media queries summary', add_media_queries_section, doc, db_connection, total_domains)
     
     # Add Responsive Accessibility Section (right after media queries)
-    add_responsive_accessibility_summary(doc, db_connection, total_domains)
+    scheduler.run(doc, 'Responsive accessibility summary', add_responsive_accessibility_summary,
+                  doc, db_connection, total_domains)
+
+    # The full report covers every tested topic
+    if full:
+        for section_title, add_section in SUMMARY_TOPIC_SECTIONS:
+            scheduler.run(doc, section_title, add_section, doc, db_connection, total_domains)
 
     #############################################
     # Detailed Findings
@@ -98,25 +368,85 @@ def create_report_template(db_connection, title, author, date):
     h1.style = doc.styles['Heading 1']
 
     # Add Detailed Media Queries Section (first, as it affects overall responsiveness)
-    add_detailed_media_queries(doc, db_connection, total_domains)
+    scheduler.run(doc, 'Detailed media queries', add_detailed_media_queries, doc, db_connection, total_domains)
     
     # Add Detailed Responsive Accessibility Section (right after media queries)
-    add_responsive_accessibility_detailed(doc, db_connection, total_domains)
+    scheduler.run(doc, 'Detailed responsive accessibility', add_responsive_accessibility_detailed,
+                  doc, db_connection, total_domains)
+
+    if full:
+        for section_title, add_section in DETAILED_TOPIC_SECTIONS:
+            scheduler.run(doc, section_title, add_section, doc, db_connection, total_domains)
+
+    #############################################
+    # Site Specific Reports
+    #############################################
+    if site_reports:
+        doc.add_page_break()
+        scheduler.run(doc, 'Site specific reports', add_site_specific_reports, doc, db_connection, total_domains,
+                      report_title=title, standalone_folder=site_report_folder)
 
     #############################################
     # Appendices
     #############################################
     doc.add_page_break()
-    add_appendices(doc, db_connection)
+    scheduler.run(doc, 'Appendices', add_appendices, doc, db_connection)
+    scheduler.log_cut_sections()
 
+    # List the headings in the table of contents, so it is complete without updating fields in Word
+    fill_table_of_contents(doc)
+
+    stop_prefetch(db_connection)
+    release_query_memo(db_connection)
+    release_latest_results(db_connection)
+    end_report(db_connection)
     return doc
 
-def generate_report(db_connection, title, author, date, output_folder):
+def generate_report(db_connection, title, author, date, output_folder, incremental=False, previous_report=None,
+                    page_numbers=False, full=False, site_reports=False, site_report_folder=None):
+    """
+    Generate a report and save it in output_folder.
+
+    Args:
+        incremental: Write a manifest of the sections' inputs next to the
+            report, so it can be regenerated incrementally later
+        previous_report: Report file (with its manifest) to regenerate
+            incrementally: sections whose inputs are unchanged are copied from it
+        page_numbers: Fill in the table of contents' page numbers with a
+            headless LibreOffice (see libreoffice_fields)
+        full: Add a summary and detailed section for every tested topic
+        site_reports: Add a section for each tested site
+        site_report_folder: Also save each site's section to this folder as a
+            standalone document (implies site_reports)
+
+    Returns:
+        The report's file name, or None if it could not be generated
+    """
     try:
-        doc = create_report_template(db_connection, title, author, date)
+        build = None
+        if incremental or previous_report:
+            previous = load_previous_report(previous_report) if previous_report else None
+            build = IncrementalBuild(db_connection, previous)
         output_filename = f'{output_folder}/accessibility_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.docx'
+        doc = create_report_template(db_connection, title, author, date, build,
+                                     attachments_folder=attachments_folder(output_filename), full=full,
+                                     site_reports=site_reports or site_report_folder is not None,
+                                     site_report_folder=site_report_folder)
         doc.save(output_filename)
+        if build is not None:
+            build.save(output_filename)
+            if page_numbers:
+                # LibreOffice rewrites the whole document, which the manifest's sections would no longer match
+                print("Warning: Page numbers are not filled in for incremental reports")
+        elif page_numbers:
+            update_page_numbers(output_filename)
         return output_filename
     except Exception as e:
         print(f"Error generating report: {e}")
-        return None
\ No newline at end of file
+        return None
+    finally:
+        # Already done when the report was built; after an error, clean up here
+        stop_prefetch(db_connection)
+        release_query_memo(db_connection)
+        release_latest_results(db_connection)
+        end_report(db_connection)
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Compact record types for the data that report sections accumulate per page.
+
+Sections used to keep the full BSON-decoded documents (or copies of them) for
+every page and violation they saw. The records below keep only the handful of
+fields the renderers read, use __slots__ instead of per-instance dicts, and
+intern the strings that repeat across thousands of records (URLs, domains,
+section types and issue codes).
+"""
+import sys
+from collections.abc import Mapping
+
+# Responsive test types, in the order the report tables present them
+RESPONSIVE_TESTS = ('touchTargets', 'overflow', 'fontScaling', 'fixedPosition', 'contentStacking')
+
+
+def intern_str(value):
+    """Intern a string value so repeated URLs, domains and codes share storage"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def domain_from_url(url):
+    """Extract the (interned) domain from a page URL"""
+    return sys.intern(url.replace('http://', '').replace('https://', '').split('/')[0])
+
+
+class ViolationRecord:
+    """
+    A single violation found on a page.
+
+    Supports read-only dict-style access (violation['section'],
+    violation.get('issue'), 'page_url' in violation) so it can be handed to
+    code written against the raw violation dicts. Violation fields other
+    than issue, element, message and section are kept in extra; of the
+    section, only its section_type and section_name are kept.
+    """
+    __slots__ = ('page_url', 'domain', 'issue', 'element', 'message', 'section_type', 'section_name', 'extra')
+
+    # Fields stored in their own slots (section is rebuilt from section_type and section_name)
+    SLOT_FIELDS = ('page_url', 'issue', 'element', 'message')
+
+    def __init__(self, page_url, issue=None, element=None, message=None, section_type=None, section_name=None,
+                 extra=None):
+        self.page_url = intern_str(page_url)
+        self.domain = domain_from_url(page_url)
+        self.issue = intern_str(issue)
+        self.element = element
+        self.message = message
+        self.section_type = intern_str(section_type)
+        self.section_name = intern_str(section_name)
+        # Other violation fields, or None when there are none (the usual case)
+        self.extra = extra or None
+
+    @classmethod
+    def from_violation(cls, violation, page_url):
+        """Build a record from a raw violation dict found on page_url"""
+        section = violation.get('section')
+        section_type = section_name = None
+        if section is not None:
+            section_type = section.get('section_type', 'unknown')
+            section_name = section.get('section_name', 'Unknown Section')
+        extra = {key: value for key, value in violation.items()
+                 if key not in cls.SLOT_FIELDS and key != 'section'}
+        return cls(
+            page_url,
+            issue=violation.get('issue'),
+            element=violation.get('element'),
+            message=violation.get('message'),
+            section_type=section_type,
+            section_name=section_name,
+            extra=extra
+        )
+
+    def get(self, key, default=None):
+        if key in self.SLOT_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        if key == 'section':
+            if self.section_type is None:
+                return default
+            return {'section_type': self.section_type, 'section_name': self.section_name}
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None and key not in self:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        if key in self.SLOT_FIELDS:
+            return getattr(self, key) is not None
+        if key == 'section':
+            return self.section_type is not None
+        return self.extra is not None and key in self.extra
+
+    def __repr__(self):
+        return f"ViolationRecord({self.page_url!r}, issue={self.issue!r}, section_type={self.section_type!r})"
+
+
+class PageFlagSummary:
+    """
+    The pageFlags of one test on one page, packed into two bitmasks.
+
+    flag_names is the (shared) tuple of flag names the section cares about;
+    only those flags are kept.
+    """
+    __slots__ = ('url', 'domain', 'flag_names', 'present', 'values')
+
+    def __init__(self, url, flag_names, present, values):
+        self.url = intern_str(url)
+        self.domain = domain_from_url(url)
+        self.flag_names = flag_names
+        self.present = present
+        self.values = values
+
+    @classmethod
+    def from_flags(cls, url, flags, flag_names):
+        """Build a summary from a raw pageFlags dict"""
+        present = values = 0
+        for bit, name in enumerate(flag_names):
+            if name in flags:
+                present |= 1 << bit
+                if flags[name]:
+                    values |= 1 << bit
+        return cls(url, flag_names, present, values)
+
+    def get(self, name, default=None):
+        """Return a flag value, or default when the page did not report it"""
+        bit = 1 << self.flag_names.index(name)
+        if not self.present & bit:
+            return default
+        return bool(self.values & bit)
+
+    def __repr__(self):
+        return f"PageFlagSummary({self.url!r}, present={self.present:#x}, values={self.values:#x})"
+
+
+class BreakpointResult:
+    """
+    Issue counts for one page at one responsive breakpoint.
+
+    issue_counts is aligned with RESPONSIVE_TESTS.
+    """
+    __slots__ = ('url', 'breakpoint', 'issue_counts', 'has_touch_targets')
+
+    def __init__(self, url, breakpoint, issue_counts, has_touch_targets=False):
+        self.url = intern_str(url)
+        self.breakpoint = breakpoint
+        self.issue_counts = issue_counts
+        self.has_touch_targets = has_touch_targets
+
+    @classmethod
+    def from_result(cls, url, breakpoint, bp_data):
+        """Build a record from the breakpoint_results entry of a page"""
+        tests = bp_data.get('tests', {})
+        counts = [0] * len(RESPONSIVE_TESTS)
+        has_touch_targets = False
+        if isinstance(tests, Mapping):
+            has_touch_targets = bool(tests.get('touchTargets'))
+            for i, test_name in enumerate(RESPONSIVE_TESTS):
+                test_data = tests.get(test_name)
+                if isinstance(test_data, Mapping) and 'issues' in test_data:
+                    counts[i] = len(test_data['issues'])
+        return cls(url, breakpoint, tuple(counts), has_touch_targets)
+
+    def count(self, test_name):
+        """Number of issues found by test_name at this breakpoint"""
+        return self.issue_counts[RESPONSIVE_TESTS.index(test_name)]
+
+    def __repr__(self):
+        return f"BreakpointResult({self.url!r}, {self.breakpoint}, {self.issue_counts})"
@@ -336,15 +336,14 @@ def add_code_block(document, code_text):
 def add_image_if_exists(document, image_path, width=None, caption=None):
     """Add an image if the file exists, with optional caption and width"""
     import os
+    from image_assets import add_picture
     
     if not os.path.exists(image_path):
         return None
         
     try:
-        if width:
-            document.add_picture(image_path, width=width)
-        else:
-            document.add_picture(image_path)
+        # Scaled to the display width and cached (see image_assets)
+        add_picture(document, image_path, width=width or None)
             
         if caption:
             cap_para = document.add_paragraph(caption, style='Caption')
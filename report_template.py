@@ -0,0 +1,162 @@
+"""
+Cached base document for reports.
+
+Every report used to start from a blank Document() and set up its styles,
+TOC styles, header and footer (with the logo) one property at a time. The
+base template bakes all of that into a document once; reports are opened
+from its bytes and only get their title set in the header.
+
+The template is cached in memory and on disk, keyed by a hash of the
+modules that define the styling and header/footer, the python-docx version
+and the logo. Changing any of them rebuilds it on the next report, or ahead
+of time with: python report_template.py --rebuild
+"""
+import click
+import hashlib
+import io
+import os
+import tempfile
+
+import docx
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+
+from report_styling import set_document_styles, format_toc_styles
+from sections.sections_header import setup_document_header_footer, set_header_title
+
+# Modules whose code shapes the template, relative to this directory
+TEMPLATE_SOURCES = (
+    'report_template.py',
+    'report_styling.py',
+    'image_assets.py',
+    'xml_fragments.py',
+    os.path.join('sections', 'sections_header.py'),
+    os.path.join('sections', 'table_of_contents.py'),
+)
+
+# Read from the working directory, as setup_document_header_footer does
+LOGO_FILE = 'logo.png'
+
+TEMPLATE_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'accessibility_report_templates')
+
+# TOC levels the table of contents field uses (TOC \o "1-3")
+TOC_LEVELS = 3
+
+# Template bytes built or read in this process, keyed by template key
+_templates = {}
+
+
+def template_key():
+    """Hash of everything the template is built from"""
+    digest = hashlib.sha1(docx.__version__.encode())
+    base = os.path.dirname(os.path.abspath(__file__))
+    for source in TEMPLATE_SOURCES:
+        with open(os.path.join(base, source), 'rb') as source_file:
+            digest.update(source_file.read())
+    if os.path.exists(LOGO_FILE):
+        with open(LOGO_FILE, 'rb') as logo:
+            digest.update(logo.read())
+    else:
+        digest.update(b'no logo')
+    return digest.hexdigest()
+
+
+def add_toc_styles(doc):
+    """
+    Define the TOC 1-3 paragraph styles.
+
+    The default document only has them as latent styles, which
+    format_toc_styles cannot format.
+    """
+    for level in range(1, TOC_LEVELS + 1):
+        style_name = f'TOC {level}'
+        if style_name not in doc.styles:
+            style = doc.styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = doc.styles['Normal']
+            style.next_paragraph_style = doc.styles['Normal']
+
+
+def build_template():
+    """
+    Build the base document.
+
+    Returns:
+        The template as .docx bytes
+    """
+    doc = Document()
+    set_document_styles(doc)
+    setup_document_header_footer(doc, '')
+    add_toc_styles(doc)
+    format_toc_styles(doc)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def template_path(key):
+    return os.path.join(TEMPLATE_CACHE_DIR, f"report_base_{key}.docx")
+
+
+def template_bytes(rebuild=False):
+    """
+    Get the base template, building it if it is not cached.
+
+    Args:
+        rebuild: Build it even if a cached copy exists
+
+    Returns:
+        The template as .docx bytes
+    """
+    key = template_key()
+    if not rebuild and key in _templates:
+        return _templates[key]
+
+    path = template_path(key)
+    data = None
+    if not rebuild and os.path.exists(path):
+        try:
+            with open(path, 'rb') as template_file:
+                data = template_file.read()
+        except OSError as e:
+            print(f"Warning: Could not read cached report template {path}: {e}")
+    if data is None:
+        data = build_template()
+        try:
+            os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+            # Written to a temporary name first, so concurrent reports never read a partial file
+            partial = f"{path}.{os.getpid()}.tmp"
+            with open(partial, 'wb') as template_file:
+                template_file.write(data)
+            os.replace(partial, path)
+        except OSError as e:
+            print(f"Warning: Could not cache report template in {TEMPLATE_CACHE_DIR}: {e}")
+    _templates[key] = data
+    return data
+
+
+def new_report_document(title):
+    """
+    Create a report document from the base template.
+
+    Args:
+        title: Report title, shown in the page header
+
+    Returns:
+        The Document, with styles, header, footer and logo in place
+    """
+    doc = Document(io.BytesIO(template_bytes()))
+    set_header_title(doc, title)
+    return doc
+
+
+@click.command()
+@click.option('--rebuild', is_flag=True,
+              default=False,
+              help='Rebuild the template even if a cached copy is up to date')
+def main(rebuild):
+    """Build the cached base template for reports."""
+    template_bytes(rebuild=rebuild)
+    click.echo(f"Report template: {template_path(template_key())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Stratified page sampling for draft reports on very large crawls.
+
+With a sample rate set on the database connection, the report reads a
+deterministic, stratified sample of its URLs: within each domain, the pages
+whose URL hashes lowest are kept, at least MIN_PAGES_PER_DOMAIN of them (or
+every page of smaller domains). Every section then computes its numbers on
+the sample. The latest-results view only holds the sampled URLs.
+
+Page counts in the tables are then estimates for the full crawl, shown with a
+95% confidence interval. Each domain gets a Wilson score interval, corrected
+for the finite number of pages in that domain. The report bounds are the
+sums of the per-domain bounds over every domain, including domains where no
+sampled page has the property, which is conservative.
+"""
+import hashlib
+import math
+
+from report_context import get_report_context
+from report_records import domain_from_url
+
+# Every domain keeps at least this many pages (or all of its pages)
+MIN_PAGES_PER_DOMAIN = 20
+
+# z value of the 95% confidence level
+CONFIDENCE_Z = 1.96
+
+
+def url_fraction(url):
+    """Map a URL to a stable pseudo-random number in [0, 1)"""
+    digest = hashlib.sha1(url.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+
+def wilson_interval(hits, sampled, population):
+    """
+    Wilson score interval for the proportion of a population with some property.
+
+    Args:
+        hits: Number of sampled items with the property
+        sampled: Number of items sampled
+        population: Number of items in the population
+
+    Returns:
+        (low, high) bounds of the proportion
+    """
+    if sampled == 0:
+        return 0.0, 1.0
+    p = hits / sampled
+    if sampled >= population:
+        return p, p
+
+    # Finite population correction, applied as a larger effective sample size
+    n = sampled * (population - 1) / (population - sampled)
+    z2 = CONFIDENCE_Z ** 2
+    denominator = 1 + z2 / n
+    centre = (p + z2 / (2 * n)) / denominator
+    half_width = CONFIDENCE_Z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+class PageSample:
+    """
+    A stratified per-domain sample of a report's URLs.
+
+    Attributes:
+        rate: Sample rate the sample was drawn with
+        urls: Sampled URLs
+        population: Domain -> number of URLs in the report
+        sampled: Domain -> number of sampled URLs
+    """
+
+    def __init__(self, rate, urls, population, sampled):
+        self.rate = rate
+        self.urls = urls
+        self.population = population
+        self.sampled = sampled
+
+    @property
+    def key(self):
+        """Identifies how the sample was drawn (the URLs follow from the report's runs)"""
+        return f"{self.rate}:{MIN_PAGES_PER_DOMAIN}"
+
+    @property
+    def total_population(self):
+        return sum(self.population.values())
+
+    @property
+    def total_sampled(self):
+        return sum(self.sampled.values())
+
+    def estimate(self, urls):
+        """
+        Estimate how many pages of the full crawl share a property.
+
+        Args:
+            urls: Sampled URLs that have the property
+
+        Returns:
+            (estimate, low, high) page counts
+        """
+        hits = {}
+        for url in urls:
+            domain = domain_from_url(url)
+            hits[domain] = hits.get(domain, 0) + 1
+
+        estimate = low = high = 0.0
+        # Domains without a sampled hit may still have unsampled affected pages
+        for domain in set(self.population) | set(hits):
+            count = hits.get(domain, 0)
+            population = self.population.get(domain, count)
+            sampled = self.sampled.get(domain, count)
+            lo, hi = wilson_interval(count, sampled, population)
+            if sampled:
+                estimate += population * count / sampled
+            # Sampled pages are known, so bounds never go past them
+            low += max(count, population * lo)
+            high += min(population - (sampled - count), population * hi)
+
+        return round(estimate), math.floor(low), math.ceil(high)
+
+
+def draw_sample(urls, rate):
+    """
+    Draw a stratified per-domain sample of URLs.
+
+    Args:
+        urls: All URLs of the report
+        rate: Fraction of each domain's pages to keep (0 < rate <= 1)
+
+    Returns:
+        PageSample
+    """
+    by_domain = {}
+    for url in urls:
+        by_domain.setdefault(domain_from_url(url), []).append(url)
+
+    sampled_urls = set()
+    population = {}
+    sampled = {}
+    for domain, domain_urls in by_domain.items():
+        keep = max(MIN_PAGES_PER_DOMAIN, math.ceil(rate * len(domain_urls)))
+        chosen = sorted(domain_urls, key=url_fraction)[:keep]
+        sampled_urls.update(chosen)
+        population[domain] = len(domain_urls)
+        sampled[domain] = len(chosen)
+
+    return PageSample(rate, sampled_urls, population, sampled)
+
+
+def begin_sample(db_connection, urls):
+    """
+    Draw the report's sample if the connection has a sample_rate below 1.
+
+    Returns:
+        The PageSample (also kept on the report context), or None
+    """
+    rate = getattr(db_connection, 'sample_rate', None)
+    if not rate or rate >= 1 or not urls:
+        return None
+
+    sample = draw_sample(urls, rate)
+    get_report_context(db_connection).sample = sample
+    print(f"Sampling {sample.total_sampled} of {sample.total_population} pages "
+          f"across {len(sample.population)} domains")
+    return sample
+
+
+def get_sample(db_connection):
+    """Get the current report's sample, or None when the report reads every page"""
+    context = getattr(db_connection, 'report_context', None)
+    return context.sample if context is not None else None
+
+
+def format_page_count(db_connection, urls):
+    """
+    Format a number of affected pages for a table.
+
+    Args:
+        db_connection: Database connection
+        urls: Affected page URLs
+
+    Returns:
+        The count, or when sampling, the estimate for the full crawl with its
+        95% confidence interval
+    """
+    sample = get_sample(db_connection)
+    if sample is None:
+        return str(len(urls))
+    estimate, low, high = sample.estimate(urls)
+    return f"~{estimate} ({low}-{high})"
+
+
+def may_affect_pages(db_connection, urls):
+    """
+    Whether a table should show a row for these affected pages.
+
+    When sampling, an issue no sampled page has may still affect unsampled
+    pages, so its row is kept while the upper bound of its estimate is above 0.
+    """
+    if urls:
+        return True
+    sample = get_sample(db_connection)
+    return sample is not None and sample.estimate(urls)[2] > 0
+
+
+def add_sample_note(doc, db_connection):
+    """Explain the sampling at the start of the findings, when the report is sampled"""
+    sample = get_sample(db_connection)
+    if sample is None:
+        return
+    doc.add_paragraph(
+        f"Draft report: findings are based on a stratified sample of {sample.total_sampled} "
+        f"of {sample.total_population} pages ({sample.total_sampled / sample.total_population:.1%}), "
+        f"drawn per site. Page counts marked ~ are estimates for all pages, followed by "
+        f"their 95% confidence interval. Other counts, such as numbers of sites, instances "
+        f"and listed pages, refer to the sampled pages only."
+    )
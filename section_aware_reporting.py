@@ -2,6 +2,13 @@
 Section-aware report generation utilities.
 """
 from pymongo import MongoClient
+from report_records import ViolationRecord
+from projections import declare_fields, find_pages
+
+declare_fields('section_issues',
+               'url',
+               'results.accessibility.tests.{issue_type}.details.violations',
+               'accessibility.tests.{issue_type}.details.violations')
 
 def get_unique_section_issues(db_connection, issue_type, domain, issue_identifier=None):
     """
@@ -19,7 +26,7 @@ def get_unique_section_issues(db_connection, issue_type, domain, issue_identifie
     try:
         # Find all page results for the domain
         domain_filter = {'url': {'$regex': domain}}
-        page_results = list(db_connection.page_results.find(domain_filter))
+        page_results = list(find_pages(db_connection, 'section_issues', domain_filter, issue_type=issue_type))
         
         # Collect all issues with section information
         sections = {}
@@ -58,10 +65,8 @@ def get_unique_section_issues(db_connection, issue_type, domain, issue_identifie
                                         'issues': []
                                     }
                                 
-                                # Add issue with page URL
-                                issue_copy = violation.copy()
-                                issue_copy['page_url'] = url
-                                sections[section_type]['issues'].append(issue_copy)
+                                # Add a compact record of the issue with its page URL
+                                sections[section_type]['issues'].append(ViolationRecord.from_violation(violation, url))
         
         return sections
     
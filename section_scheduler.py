@@ -0,0 +1,129 @@
+"""
+Time budgets for report sections.
+
+SectionScheduler runs the report's sections with a per-section budget and
+a budget for the whole report. Budgets are cooperative: the deadline is
+checked (check_budget) as pages are read, by the topic aggregate scans and
+by projections.find_pages, which every other section reads its pages with.
+When the deadline passes, BudgetExceeded is raised; a topic aggregate scan
+adds a description of what it had aggregated so far. Work a section does
+after it has read its pages, such as filling in its tables, and queries
+that read no pages (distinct, count_documents) are not interrupted.
+
+The scheduler then removes whatever the section had already added to the
+document. In its place it adds a short "truncated" note with the partial
+figures. Sections that would start after the report budget is spent are
+skipped with a note. Everything that was cut is logged at the end of the
+report.
+"""
+import time
+
+from report_context import get_report_context
+
+
+class BudgetExceeded(BaseException):
+    """
+    Raised when a section runs past its time budget.
+
+    Derives from BaseException so the sections' own "except Exception"
+    error handling does not swallow the cancellation.
+    """
+
+    def __init__(self, topic=None, partial=None):
+        super().__init__(f"Time budget exceeded{f' while computing {topic}' if topic else ''}")
+        self.topic = topic
+        # Lines describing the partial results computed before the deadline
+        self.partial = partial or []
+
+
+def check_budget(db_connection):
+    """Raise BudgetExceeded if the current section's deadline has passed"""
+    context = getattr(db_connection, 'report_context', None)
+    if context is not None and context.deadline is not None and time.monotonic() > context.deadline:
+        raise BudgetExceeded()
+
+
+class SectionScheduler:
+    """
+    Runs report sections within time budgets.
+
+    Args:
+        db_connection: Database connection (the deadline is kept on its report context)
+        section_budget: Seconds each section may take (None for no limit). The
+            budget is only enforced while the section reads pages.
+        report_budget: Seconds all scheduled sections may take together (None for no limit)
+        incremental: IncrementalBuild that records each section's fragment and
+            supplies unchanged fragments from the previous report (optional)
+    """
+
+    def __init__(self, db_connection, section_budget=None, report_budget=None, incremental=None):
+        self.db_connection = db_connection
+        self.incremental = incremental
+        self.section_budget = section_budget
+        self.report_deadline = time.monotonic() + report_budget if report_budget else None
+        # (section title, reason) for every section that was cut
+        self.cut_sections = []
+
+    def _deadline(self):
+        """Deadline for a section starting now: its own budget, capped by the report's"""
+        deadline = self.report_deadline
+        if self.section_budget:
+            section_deadline = time.monotonic() + self.section_budget
+            deadline = section_deadline if deadline is None else min(deadline, section_deadline)
+        return deadline
+
+    def run(self, doc, title, section_function, *args, **kwargs):
+        """
+        Run one section, truncating it if it exceeds its budget.
+
+        Args:
+            doc: The report document
+            title: Section name used in notes and the log
+            section_function: Function that adds the section to doc
+            *args, **kwargs: Arguments for section_function
+        """
+        if self.incremental is not None and self.incremental.reuse(doc, title):
+            return
+
+        if self.report_deadline is not None and time.monotonic() > self.report_deadline:
+            self.cut_sections.append((title, "skipped, report time budget spent"))
+            paragraph = doc.add_paragraph(f"{title}: this section was skipped because the report ran out of time.")
+            if self.incremental is not None:
+                self.incremental.record(doc, title, [paragraph._p], complete=False)
+            return
+
+        context = get_report_context(self.db_connection)
+        body = doc.element.body
+        children_before = list(body)
+        started = time.monotonic()
+        context.deadline = self._deadline()
+        complete = True
+        try:
+            section_function(*args, **kwargs)
+        except BudgetExceeded as e:
+            complete = False
+            elapsed = time.monotonic() - started
+            # Drop the partially rendered section
+            for child in list(body):
+                if child not in children_before:
+                    body.remove(child)
+            self.cut_sections.append((title, f"truncated after {elapsed:.1f}s"))
+            doc.add_paragraph(
+                f"{title}: this section was truncated because it exceeded its time budget. "
+                f"The results below are partial."
+            )
+            for line in e.partial:
+                doc.add_paragraph(line, style='List Bullet')
+        finally:
+            context.deadline = None
+        if self.incremental is not None:
+            before = set(children_before)
+            self.incremental.record(doc, title, [child for child in body if child not in before], complete)
+
+    def log_cut_sections(self):
+        """Print the sections that were truncated or skipped"""
+        if not self.cut_sections:
+            return
+        print(f"Warning: {len(self.cut_sections)} report sections exceeded their time budget:")
+        for title, reason in self.cut_sections:
+            print(f"  {title}: {reason}")
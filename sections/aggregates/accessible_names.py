@@ -0,0 +1,85 @@
+"""
+Shared accessible names data model for the summary and detailed findings
+"""
+import json
+
+from topic_aggregates import TopicAggregate, register_topic
+from report_records import ViolationRecord, domain_from_url
+from bounded_examples import BoundedExamples
+from page_access import compile_path, to_python
+
+VIOLATIONS_PATH = 'results.accessibility.tests.accessible_names.accessible_names.details.violations'
+get_violations = compile_path(VIOLATIONS_PATH)
+
+# Example violations kept per page section
+SECTION_EXAMPLES = 5
+
+
+@register_topic
+class AccessibleNamesAggregate(TopicAggregate):
+    """
+    Elements missing an accessible name, by tag.
+
+    The data model holds:
+        tags: tag name -> {'count', 'domains': {domain -> {'count', 'pages'}}}
+        sections: page section type -> {'name', 'count', 'examples'}, for the
+            violations that record the page section they were found in;
+            examples holds the first ViolationRecords by URL
+    """
+    name = 'accessible_names'
+    version = 2
+
+    def queries(self):
+        return {
+            'violations': {
+                'filter': {VIOLATIONS_PATH: {"$exists": True}},
+                'projection': {"url": 1, VIOLATIONS_PATH: 1, "_id": 0}
+            }
+        }
+
+    def empty(self):
+        return {'tags': {}, 'sections': {}}
+
+    def _new_section(self, name):
+        return {'name': name, 'count': 0,
+                'examples': BoundedExamples(SECTION_EXAMPLES, key=lambda record: record.page_url)}
+
+    def add(self, state, query_name, page):
+        url = page['url']
+        domain = domain_from_url(url)
+
+        # The violations array may be stored as a JSON string
+        violations = get_violations(page, [])
+        if isinstance(violations, str):
+            violations = json.loads(violations)
+
+        for violation in violations:
+            tag = state['tags'].setdefault(violation['element'], {'count': 0, 'domains': {}})
+            tag['count'] += 1
+            tag_domain = tag['domains'].setdefault(domain, {'count': 0, 'pages': set()})
+            tag_domain['count'] += 1
+            tag_domain['pages'].add(url)
+
+            if 'section' in violation:
+                record = ViolationRecord.from_violation(to_python(violation), url)
+                section = state['sections'].setdefault(record.section_type, self._new_section(record.section_name))
+                section['count'] += 1
+                section['examples'].add(record)
+
+    def merge(self, state, other):
+        for name, other_tag in other['tags'].items():
+            tag = state['tags'].setdefault(name, {'count': 0, 'domains': {}})
+            tag['count'] += other_tag['count']
+            for domain, other_domain in other_tag['domains'].items():
+                tag_domain = tag['domains'].setdefault(domain, {'count': 0, 'pages': set()})
+                tag_domain['count'] += other_domain['count']
+                tag_domain['pages'] |= other_domain['pages']
+        for section_type, other_section in other['sections'].items():
+            section = state['sections'].setdefault(section_type, self._new_section(other_section['name']))
+            section['count'] += other_section['count']
+            section['examples'].merge(other_section['examples'])
+        return state
+
+    def describe_partial(self, state):
+        return [f"<{name}>: {tag['count']} instances on {len(tag['domains'])} sites"
+                for name, tag in sorted(state['tags'].items())]
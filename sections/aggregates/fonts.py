@@ -0,0 +1,174 @@
+"""
+Shared fonts and typography data model for the summary and detailed findings
+"""
+from topic_aggregates import TopicAggregate, register_topic
+from report_records import domain_from_url
+from page_access import compile_path, is_document
+
+FONT_ANALYSIS_PATH = 'results.accessibility.tests.fonts.font_analysis'
+get_font_analysis = compile_path(FONT_ANALYSIS_PATH)
+
+SYSTEM_FONTS = [
+    "Arial", "Helvetica", "Times New Roman", "Times", "Courier New",
+    "Courier", "Verdana", "Georgia", "Palatino", "Garamond", "Bookman",
+    "Tahoma", "Trebuchet MS", "Impact", "Comic Sans MS", "Webdings",
+    "Symbol", "Calibri", "Cambria", "Segoe UI"
+]
+
+# Generic families that are not counted as fonts
+GENERIC_FAMILIES = ('inherit', 'sans-serif', 'monospace')
+
+# (issue key, accessibility test flag, issue name)
+TYPOGRAPHY_ISSUES = (
+    ("small_text", "hasSmallText", "Small text"),
+    ("small_line_height", "hasSmallLineHeight", "Small line height"),
+    ("justified_text", "hasJustifiedText", "Justified text"),
+    ("right_aligned", "hasRightAlignedText", "Right-aligned text"),
+    ("italic_text", "hasItalicText", "Italic text usage"),
+    ("bold_larger_than_headings", "hasBoldNonHeadingLargerThanHeadings", "Bold text larger than headings")
+)
+
+CSS_FONT_VARIABLES = (
+    'awb-text-font-family',
+    'body_typography-font-family',
+    'fontsBaseFamily',
+    'h1_typography-font-family',
+    'h2_typography-font-family',
+    'h3_typography-font-family',
+    'homepage-title-font'
+)
+
+
+def _empty_site():
+    return {
+        'fonts': set(),
+        'css_vars': set(),
+        'system_fonts': set(),
+        'web_fonts': set(),
+        # (url, size) of the last page (by URL) that reports a smallest heading size
+        'smallest_heading': None,
+        'typography_issues': set()
+    }
+
+
+@register_topic
+class FontsAggregate(TopicAggregate):
+    """
+    Typography issues and font usage across all pages.
+
+    The data model holds:
+        pages: number of pages with a font analysis
+        typography_issues: issue key -> {'name', 'pages', 'domains'}, in TYPOGRAPHY_ISSUES order
+        heading_sizes: {'count', 'total', 'smallest'} of the pages' smallest heading sizes
+        font_usage: font name -> set of domains using it
+        css_var_usage: CSS variable -> set of domains using it
+        site_fonts: domain -> {'fonts', 'css_vars', 'system_fonts', 'web_fonts',
+            'smallest_heading', 'typography_issues'}
+    """
+    name = 'fonts'
+
+    def queries(self):
+        return {
+            'fonts': {
+                'filter': {FONT_ANALYSIS_PATH: {"$exists": True}},
+                'projection': {
+                    "url": 1,
+                    f"{FONT_ANALYSIS_PATH}.accessibility": 1,
+                    f"{FONT_ANALYSIS_PATH}.fonts": 1,
+                    "_id": 0
+                }
+            }
+        }
+
+    def empty(self):
+        return {
+            'pages': 0,
+            'typography_issues': {
+                key: {"name": name, "pages": set(), "domains": set()}
+                for key, _, name in TYPOGRAPHY_ISSUES
+            },
+            'heading_sizes': {'count': 0, 'total': 0, 'smallest': None},
+            'font_usage': {},
+            'css_var_usage': {name: set() for name in CSS_FONT_VARIABLES},
+            'site_fonts': {}
+        }
+
+    def add(self, state, query_name, page):
+        url = page['url']
+        domain = domain_from_url(url)
+        font_data = get_font_analysis(page, {})
+        state['pages'] += 1
+        site = state['site_fonts'].setdefault(domain, _empty_site())
+
+        accessibility_data = font_data.get('accessibility', {})
+        if not is_document(accessibility_data):
+            accessibility_data = {}
+        tests = accessibility_data.get('tests', {})
+
+        smallest_heading = accessibility_data.get('smallestHeadingSize')
+        if smallest_heading:
+            sizes = state['heading_sizes']
+            sizes['count'] += 1
+            sizes['total'] += smallest_heading
+            if sizes['smallest'] is None or smallest_heading < sizes['smallest']:
+                sizes['smallest'] = smallest_heading
+            if site['smallest_heading'] is None or url > site['smallest_heading'][0]:
+                site['smallest_heading'] = (url, smallest_heading)
+
+        for key, flag, _ in TYPOGRAPHY_ISSUES:
+            if tests.get(flag):
+                state['typography_issues'][key]['pages'].add(url)
+                state['typography_issues'][key]['domains'].add(domain)
+                site['typography_issues'].add(key)
+
+        fonts = font_data.get('fonts', {})
+        if not is_document(fonts):
+            return
+        for font_name in fonts.keys():
+            if font_name.lower() in GENERIC_FAMILIES:
+                continue
+
+            # CSS variables are counted separately from fonts
+            if font_name.startswith('var('):
+                site['css_vars'].add(font_name)
+                for var_name in CSS_FONT_VARIABLES:
+                    if var_name in font_name:
+                        state['css_var_usage'][var_name].add(domain)
+                continue
+
+            state['font_usage'].setdefault(font_name, set()).add(domain)
+            site['fonts'].add(font_name)
+            if any(system_font.lower() in font_name.lower() for system_font in SYSTEM_FONTS):
+                site['system_fonts'].add(font_name)
+            else:
+                site['web_fonts'].add(font_name)
+
+    def merge(self, state, other):
+        state['pages'] += other['pages']
+        for key, issue in other['typography_issues'].items():
+            state['typography_issues'][key]['pages'] |= issue['pages']
+            state['typography_issues'][key]['domains'] |= issue['domains']
+        sizes, other_sizes = state['heading_sizes'], other['heading_sizes']
+        sizes['count'] += other_sizes['count']
+        sizes['total'] += other_sizes['total']
+        if other_sizes['smallest'] is not None and (sizes['smallest'] is None or other_sizes['smallest'] < sizes['smallest']):
+            sizes['smallest'] = other_sizes['smallest']
+        for font_name, domains in other['font_usage'].items():
+            state['font_usage'].setdefault(font_name, set()).update(domains)
+        for var_name, domains in other['css_var_usage'].items():
+            state['css_var_usage'][var_name] |= domains
+        for domain, other_site in other['site_fonts'].items():
+            site = state['site_fonts'].setdefault(domain, _empty_site())
+            for key in ('fonts', 'css_vars', 'system_fonts', 'web_fonts', 'typography_issues'):
+                site[key] |= other_site[key]
+            heading = other_site['smallest_heading']
+            if heading is not None and (site['smallest_heading'] is None or heading[0] > site['smallest_heading'][0]):
+                site['smallest_heading'] = heading
+        return state
+
+    def describe_partial(self, state):
+        lines = [f"{state['pages']} pages with a font analysis read"]
+        for issue in state['typography_issues'].values():
+            if issue['pages']:
+                lines.append(f"{issue['name']}: {len(issue['pages'])} pages on {len(issue['domains'])} sites")
+        return lines
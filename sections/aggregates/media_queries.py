@@ -0,0 +1,129 @@
+"""
+Shared media queries data model for the summary and detailed findings
+"""
+from topic_aggregates import TopicAggregate, register_topic
+from report_records import PageFlagSummary
+from bounded_examples import BoundedExamples
+from page_access import compile_path, to_python
+
+MEDIA_QUERIES_PATH = 'results.accessibility.tests.media_queries.media_queries'
+get_media_queries = compile_path(MEDIA_QUERIES_PATH)
+
+# pageFlags read by the media query issue counts, with the issue each one
+# reports when it is False
+MEDIA_QUERY_ISSUES = (
+    ("no_responsive", "hasResponsiveBreakpoints", "No responsive breakpoints"),
+    ("no_print", "hasPrintStyles", "No print stylesheets"),
+    ("no_reduced_motion", "hasReducedMotionSupport", "No reduced motion support"),
+    ("no_dark_mode", "hasDarkModeSupport", "No dark mode support"),
+    ("no_orientation", "hasOrientationStyles", "No orientation-specific styles")
+)
+MEDIA_QUERY_FLAGS = tuple(flag for _, flag, _ in MEDIA_QUERY_ISSUES)
+
+
+@register_topic
+class MediaQueriesAggregate(TopicAggregate):
+    """
+    Breakpoints and media query issues across all pages.
+
+    The data model holds:
+        all_breakpoints: set of every breakpoint detected
+        breakpoint_by_category: device category -> set of breakpoints
+        breakpoint_histogram: breakpoint -> number of pages using it
+        issues: issue key -> {'name', 'pages', 'domains'}, in MEDIA_QUERY_ISSUES order
+        recommendations: recommendations of the first page (by URL) that has any
+    """
+    name = 'media_queries'
+
+    def queries(self):
+        return {
+            'breakpoints': {
+                'filter': {f"{MEDIA_QUERIES_PATH}.responsiveBreakpoints": {"$exists": True}},
+                'projection': {
+                    "url": 1,
+                    f"{MEDIA_QUERIES_PATH}.responsiveBreakpoints": 1,
+                    "_id": 0
+                }
+            },
+            'issues': {
+                'filter': {
+                    f"{MEDIA_QUERIES_PATH}.pageFlags": {"$exists": True},
+                    "$or": [{f"{MEDIA_QUERIES_PATH}.pageFlags.{flag}": False} for flag in MEDIA_QUERY_FLAGS]
+                },
+                'projection': {
+                    "url": 1,
+                    f"{MEDIA_QUERIES_PATH}.pageFlags": 1,
+                    f"{MEDIA_QUERIES_PATH}.details.recommendations": 1,
+                    "_id": 0
+                }
+            }
+        }
+
+    def empty(self):
+        return {
+            'all_breakpoints': set(),
+            'breakpoint_by_category': {
+                'mobile': set(),
+                'tablet': set(),
+                'desktop': set(),
+                'largeScreen': set()
+            },
+            'breakpoint_histogram': {},
+            'issues': {
+                key: {"name": name, "pages": set(), "domains": set()}
+                for key, _, name in MEDIA_QUERY_ISSUES
+            },
+            'recommendations': BoundedExamples(1)
+        }
+
+    def add(self, state, query_name, page):
+        media_queries = get_media_queries(page, {})
+
+        if query_name == 'breakpoints':
+            if 'responsiveBreakpoints' not in media_queries:
+                return
+            breakpoints_data = media_queries['responsiveBreakpoints']
+
+            # Add to the full list of breakpoints
+            if 'allBreakpoints' in breakpoints_data:
+                for bp in breakpoints_data['allBreakpoints']:
+                    state['all_breakpoints'].add(bp)
+                    state['breakpoint_histogram'][bp] = state['breakpoint_histogram'].get(bp, 0) + 1
+
+            # Add to category-specific sets
+            if 'byCategory' in breakpoints_data:
+                for category, bps in breakpoints_data['byCategory'].items():
+                    if category in state['breakpoint_by_category']:
+                        for bp in bps:
+                            state['breakpoint_by_category'][category].add(bp)
+            return
+
+        flags = PageFlagSummary.from_flags(page['url'], media_queries['pageFlags'], MEDIA_QUERY_FLAGS)
+        for key, flag, _ in MEDIA_QUERY_ISSUES:
+            if not flags.get(flag, True):
+                state['issues'][key]['pages'].add(flags.url)
+                state['issues'][key]['domains'].add(flags.domain)
+
+        recommendations = media_queries.get('details', {}).get('recommendations')
+        if recommendations:
+            state['recommendations'].add(to_python(recommendations), sort_key=flags.url)
+
+    def merge(self, state, other):
+        state['all_breakpoints'] |= other['all_breakpoints']
+        for category, bps in other['breakpoint_by_category'].items():
+            state['breakpoint_by_category'][category] |= bps
+        histogram = state['breakpoint_histogram']
+        for bp, count in other['breakpoint_histogram'].items():
+            histogram[bp] = histogram.get(bp, 0) + count
+        for key, issue in other['issues'].items():
+            state['issues'][key]['pages'] |= issue['pages']
+            state['issues'][key]['domains'] |= issue['domains']
+        state['recommendations'].merge(other['recommendations'])
+        return state
+
+    def describe_partial(self, state):
+        lines = [f"{len(state['all_breakpoints'])} unique responsive breakpoints found"]
+        for issue in state['issues'].values():
+            if issue['pages']:
+                lines.append(f"{issue['name']}: {len(issue['pages'])} pages on {len(issue['domains'])} sites")
+        return lines
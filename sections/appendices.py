@@ -1,4 +1,11 @@
 from report_styling import format_table_text
+from table_overflow import add_budgeted_table
+from projections import declare_fields, find_pages
+
+declare_fields('appendices.tested_pages',
+               'url',
+               query={},
+               sort=[("url", 1)])
 
 def add_test_coverage_appendix(doc, db_connection):
     """Add the Test Coverage appendix section"""
@@ -22,13 +29,7 @@ def add_test_coverage_appendix(doc, db_connection):
     doc.add_paragraph()
 
     # Query for all tested pages
-    tested_pages = list(db_connection.page_results.find(
-        {},
-        {
-            "url": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    tested_pages = list(find_pages(db_connection, 'appendices.tested_pages'))
 
     # Process the pages
     sites_data = {}
@@ -71,21 +72,16 @@ def add_test_coverage_appendix(doc, db_connection):
     doc.add_paragraph("Coverage by Site:", style='Normal')
 
     # Create sites overview table
-    sites_table = doc.add_table(rows=len(sites_data) + 1, cols=2)
-    sites_table.style = 'Table Grid'
-
-    # Add headers
-    headers = sites_table.rows[0].cells
-    headers[0].text = "Site"
-    headers[1].text = "Pages Tested"
-
-    # Add site data
-    for i, (domain, data) in enumerate(sorted(sites_data.items()), 1):
-        row = sites_table.rows[i].cells
-        row[0].text = domain
-        row[1].text = str(data['count'])
+    add_budgeted_table(doc, db_connection, 'coverage by site', ["Site", "Pages Tested"],
+                       [(domain, data['count']) for domain, data in sorted(sites_data.items())])
 
-    format_table_text(sites_table)
+declare_fields('appendices.documents',
+               'url',
+               'results.accessibility.tests.documents.document_links',
+               query={
+                   "results.accessibility.tests.documents.document_links": {"$exists": True}
+               },
+               sort=[("url", 1)])
 
 def add_documents_appendix(doc, db_connection):
     """Add the Electronic Documents appendix section"""
@@ -101,16 +97,7 @@ def add_documents_appendix(doc, db_connection):
     doc.add_paragraph()
 
     # Query for pages with document information
-    pages_with_documents = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.documents.document_links": {"$exists": True}
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.documents.document_links": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_documents = list(find_pages(db_connection, 'appendices.documents'))
 
     # Create a list of all documents
     all_documents = []
@@ -155,23 +142,11 @@ def add_documents_appendix(doc, db_connection):
     doc.add_paragraph("Document Listing:", style='Normal')
 
     # Create document listing table
-    table = doc.add_table(rows=len(all_documents) + 1, cols=3)
-    table.style = 'Table Grid'
-
-    # Add headers
-    headers = table.rows[0].cells
-    headers[0].text = "Type"
-    headers[1].text = "Document URL"
-    headers[2].text = "Found On Page"
-
-    # Add documents
-    for i, document in enumerate(sorted(all_documents, key=lambda x: x['type']), 1):
-        row = table.rows[i].cells
-        row[0].text = document.get('type', 'unknown').upper()
-        row[1].text = document.get('doc_url', 'No URL')
-        row[2].text = document.get('page_url', 'Unknown page')
-
-    format_table_text(table)
+    add_budgeted_table(doc, db_connection, 'documents', ["Type", "Document URL", "Found On Page"], [
+        (document.get('type', 'unknown').upper(), document.get('doc_url', 'No URL'),
+         document.get('page_url', 'Unknown page'))
+        for document in sorted(all_documents, key=lambda x: x['type'])
+    ])
 
     # Add total count
     doc.add_paragraph()
@@ -1,140 +1,132 @@
-import json
 from report_styling import format_table_text
-from section_aware_reporting import get_unique_section_issues, extract_domain_from_url
+from topic_aggregates import get_topic_aggregate
+from sections.aggregates.accessible_names import AccessibleNamesAggregate
+from sections.summary_findings.accessible_names import add_tag_table
+
+# Friendly names of the page section types the tests record
+SECTION_NAMES = {
+    'header': 'Header',
+    'footer': 'Footer',
+    'navigation': 'Navigation Menu',
+    'mainContent': 'Main Content Area',
+    'complementaryContent': 'Sidebar Content',
+    'search': 'Search Component',
+    'cookie': 'Cookie Notice',
+    'heroSection': 'Hero Section',
+    'form': 'Form Section',
+    'topArea': 'Top of Page',
+    'middleArea': 'Middle of Page',
+    'bottomArea': 'Bottom of Page',
+    'unknown': 'Unknown Section'
+}
 
 def add_detailed_accessible_names(doc, db_connection, total_domains):
     """Add the detailed Accessible Names section"""
+    doc.add_page_break()
     h2 = doc.add_heading('Accessible Names', level=2)
     h2.style = doc.styles['Heading 2']
 
-    # Add explanation first (in case there's no data)
+    # Add explanation
     doc.add_paragraph("""
-    Interactive elements such as links, buttons, form fields etc. must have an accessible name that can be programmatically determined. This name is what will be announced by screen readers and other assistive technologies when the user encounters the element. Without an accessible name, users will not know the purpose or function of the element.
-    """.strip())
-    
-    doc.add_paragraph()
-    
-    try:
-        # Get section-aware issue statistics
-        section_data = get_unique_section_issues(db_connection, 'accessible_names', issue_identifier='element')
-        
-        # If no issues found, show a placeholder message
-        if not section_data:
-            doc.add_paragraph("No accessibility issues with accessible names were found in this test run.")
-            
-            # Add section on WCAG requirements anyway
-            doc.add_heading('WCAG Requirements', level=3)
-            doc.add_paragraph("""
-            The Web Content Accessibility Guidelines (WCAG) require that all interactive elements have names that can be programmatically determined:
-            
-            • WCAG 2.1 Success Criterion 1.1.1 Non-text Content (Level A): All non-text content that is presented to the user has a text alternative that serves the equivalent purpose.
-            
-            • WCAG 2.1 Success Criterion 4.1.2 Name, Role, Value (Level A): For all user interface components, the name and role can be programmatically determined.
-            """.strip())
-            
-            return
-    except Exception as e:
-        # Handle any errors gracefully
-        doc.add_paragraph(f"Note: Could not retrieve section-aware data for accessible names. Section data may not be available in this test run.")
-        
-        # Add section on WCAG requirements anyway
-        doc.add_heading('WCAG Requirements', level=3)
-        doc.add_paragraph("""
-        The Web Content Accessibility Guidelines (WCAG) require that all interactive elements have names that can be programmatically determined:
-        
-        • WCAG 2.1 Success Criterion 1.1.1 Non-text Content (Level A): All non-text content that is presented to the user has a text alternative that serves the equivalent purpose.
-        
-        • WCAG 2.1 Success Criterion 4.1.2 Name, Role, Value (Level A): For all user interface components, the name and role can be programmatically determined.
-        """.strip())
-        
-        return
-    
-    # Calculate total violations and unique URLs
-    total_violations = 0
-    unique_urls = set()
-    domains = set()
-    
-    for section_type, violations in section_data.items():
-        total_violations += len(violations)
-        for violation in violations:
-            if 'page_url' in violation:
-                unique_urls.add(violation['page_url'])
-                # Extract domain from URL
-                domain = extract_domain_from_url(violation['page_url'])
+Interactive elements such as links, buttons, form fields etc. must have an accessible name that can be programmatically determined. This name is what will be announced by screen readers and other assistive technologies when the user encounters the element. Without an accessible name, users will not know the purpose or function of the element.
+""".strip())
+
+    # Missing names by tag and page section, shared with the summary section
+    accessible_names = get_topic_aggregate(db_connection, AccessibleNamesAggregate)
+    tags = accessible_names['tags']
+
+    total_violations = sum(stats['count'] for stats in tags.values())
+    if total_violations:
+        urls = set()
+        domains = set()
+        for stats in tags.values():
+            for domain, domain_stats in stats['domains'].items():
                 domains.add(domain)
-    
-    # Add total statistics paragraph
-    total_text = f"Found {total_violations} instances of missing accessible names across {len(domains)} domains."
-    total_text += f" Issues appeared on {len(unique_urls)} unique URLs."
-    doc.add_paragraph(total_text)
-    
+                urls.update(domain_stats['pages'])
+        doc.add_paragraph(f"Found {total_violations} instances of missing accessible names across {len(domains)} domains. "
+                          f"Issues appeared on {len(urls)} unique URLs.")
+    else:
+        doc.add_paragraph("No accessibility issues with accessible names were found in this test run.")
+
     # Add section on WCAG requirements
     doc.add_heading('WCAG Requirements', level=3)
     doc.add_paragraph("""
-    The Web Content Accessibility Guidelines (WCAG) require that all interactive elements have names that can be programmatically determined:
-    
-    • WCAG 2.1 Success Criterion 1.1.1 Non-text Content (Level A): All non-text content that is presented to the user has a text alternative that serves the equivalent purpose.
-    
-    • WCAG 2.1 Success Criterion 4.1.2 Name, Role, Value (Level A): For all user interface components, the name and role can be programmatically determined.
-    """.strip())
-    
+The Web Content Accessibility Guidelines (WCAG) require that all interactive elements have names that can be programmatically determined:
+
+• WCAG 2.1 Success Criterion 1.1.1 Non-text Content (Level A): All non-text content that is presented to the user has a text alternative that serves the equivalent purpose.
+
+• WCAG 2.1 Success Criterion 4.1.2 Name, Role, Value (Level A): For all user interface components, the name and role can be programmatically determined.
+""".strip())
+
+    if not total_violations:
+        return
+
+    doc.add_paragraph()
+    add_tag_table(doc, tags, total_domains)
+
+    # Add some space after the table
     doc.add_paragraph()
-    
-    # Show issues by section
-    doc.add_heading('Issues by Page Section', level=3)
-    
-    # Map section types to friendly names
-    section_names = {
-        'header': 'Header',
-        'footer': 'Footer',
-        'navigation': 'Navigation Menu',
-        'mainContent': 'Main Content Area',
-        'complementaryContent': 'Sidebar Content',
-        'search': 'Search Component',
-        'cookie': 'Cookie Notice',
-        'heroSection': 'Hero Section',
-        'form': 'Form Section',
-        'topArea': 'Top of Page',
-        'middleArea': 'Middle of Page',
-        'bottomArea': 'Bottom of Page',
-        'unknown': 'Unknown Section'
-    }
-    
-    # Process each section
-    for section_type, violations in section_data.items():
-        if not violations:
-            continue
-            
-        section_name = section_names.get(section_type, section_type)
-        doc.add_heading(f"Issues in {section_name}", level=4)
-        
-        # Add a list of example issues in this section
-        for violation in violations[:5]:  # Show up to 5 examples
-            p = doc.add_paragraph(style='List Bullet')
-            
-            # Try to create a descriptive message
-            if 'message' in violation:
-                p.add_run(violation['message'])
-            elif 'element' in violation and isinstance(violation['element'], dict) and 'html' in violation['element']:
-                html = violation['element']['html']
-                p.add_run(f"Element missing accessible name: {html[:100]}")
-            else:
-                p.add_run("Missing accessible name on element")
-            
-            # Add URL if available
-            if 'page_url' in violation:
-                p.add_run(f" (found on {violation['page_url']})")
-        
+
+    # Add detailed breakdown for each tag
+    doc.add_heading('Detailed Breakdown by Tag', level=3)
+
+    for tag, stats in sorted(tags.items()):
+        # Add tag header
+        doc.add_paragraph(f"Tag: <{tag}>", style='Heading 4')
+
+        # Create table for this tag's domain breakdown
+        domain_table = doc.add_table(rows=len(stats['domains']) + 1, cols=3)
+        domain_table.style = 'Table Grid'
+
+        # Set headers
+        headers = domain_table.rows[0].cells
+        headers[0].text = "Domain"
+        headers[1].text = "# of instances"
+        headers[2].text = "# of pages affected"
+
+        # Add domain data
+        for i, (domain, domain_stats) in enumerate(sorted(stats['domains'].items()), 1):
+            row = domain_table.rows[i].cells
+            row[0].text = domain
+            row[1].text = str(domain_stats['count'])
+            row[2].text = str(len(domain_stats['pages']))
+
+        # Format the table text
+        format_table_text(domain_table)
+
+        # Add space after each tag's breakdown
         doc.add_paragraph()
-    
+
+    # Show issues by the page section they were found in
+    sections = accessible_names['sections']
+    if sections:
+        doc.add_heading('Issues by Page Section', level=3)
+        for section_type, section in sorted(sections.items()):
+            section_name = SECTION_NAMES.get(section_type, section['name'] or section_type)
+            doc.add_heading(f"Issues in {section_name}", level=4)
+            doc.add_paragraph(f"{section['count']} instances of missing accessible names.")
+
+            # Up to SECTION_EXAMPLES example issues in this section
+            for violation in section['examples']:
+                p = doc.add_paragraph(style='List Bullet')
+                if violation.message:
+                    p.add_run(violation.message)
+                elif isinstance(violation.element, dict) and 'html' in violation.element:
+                    p.add_run(f"Element missing accessible name: {violation.element['html'][:100]}")
+                else:
+                    p.add_run("Missing accessible name on element")
+                p.add_run(f" (found on {violation.page_url})")
+
+            doc.add_paragraph()
+
     # Add recommendations
     doc.add_heading('Recommendations', level=3)
     doc.add_paragraph("""
-    To ensure all interactive elements have accessible names:
-    
-    1. Ensure all images have appropriate alt text
-    2. Add labels to all form controls
-    3. Make sure buttons and links have descriptive text
-    4. Use aria-label or aria-labelledby when visible text is not sufficient
-    5. Test with screen readers to verify that names are announced correctly
-    """.strip())
\ No newline at end of file
+To ensure all interactive elements have accessible names:
+
+1. Ensure all images have appropriate alt text
+2. Add labels to all form controls
+3. Make sure buttons and links have descriptive text
+4. Use aria-label or aria-labelledby when visible text is not sufficient
+5. Test with screen readers to verify that names are announced correctly
+""".strip())
@@ -1,5 +1,6 @@
-from docx.oxml import parse_xml
+from xml_fragments import keep_with_next, center_cells
 from report_styling import format_table_text
+from projections import declare_fields, find_pages
 
 def parse_duration(duration_str):
     """Convert duration string to milliseconds"""
@@ -9,6 +10,15 @@ def parse_duration(duration_str):
     value = float(duration_str.replace('ms', '').replace('s', ''))
     return value * 1000 if duration_str.endswith('s') else value
 
+declare_fields('detailed.animation',
+               'url',
+               'results.accessibility.tests.animations.animations',
+               query={
+                   "results.accessibility.tests.animations.animations.pageFlags.hasAnimations": True,
+                   "results.accessibility.tests.animations.animations.pageFlags.lacksReducedMotionSupport": True
+               },
+               sort=[("url", 1)])
+
 def add_detailed_animation(doc, db_connection, total_domains):
     """Add the detailed Animation section"""
     doc.add_page_break()
@@ -33,17 +43,7 @@ def add_detailed_animation(doc, db_connection, total_domains):
     doc.add_paragraph()  # Add space before the tables
 
     # Query for pages that have animations but lack reduced motion support
-    pages_with_animation_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.animations.animations.pageFlags.hasAnimations": True,
-            "results.accessibility.tests.animations.animations.pageFlags.lacksReducedMotionSupport": True
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.animations.animations": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_animation_issues = list(find_pages(db_connection, 'detailed.animation'))
 
     # Count affected domains and collect statistics
     domain_stats = {}
@@ -94,9 +94,7 @@ def add_detailed_animation(doc, db_connection, total_domains):
     if domain_stats:
         # Add paragraph to keep table with previous content
         last_para = doc.add_paragraph()
-        last_para._element.get_or_add_pPr().append(
-            parse_xml(r'<w:keepNext xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>')
-        )
+        keep_with_next(last_para)
 
         # Calculate totals for summary table
         total_pages = sum(stats['pages'] for stats in domain_stats.values())
@@ -107,11 +105,7 @@ def add_detailed_animation(doc, db_connection, total_domains):
         summary_table.style = 'Table Grid'
         
         # Keep table together
-        for row in summary_table.rows:
-            for cell in row.cells:
-                tcPr = cell._tc.get_or_add_tcPr()
-                tcPr.append(parse_xml(r'<w:vAlign xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" w:val="center"/>'))
-                tcPr.append(parse_xml(r'<w:noWrap xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'))
+        center_cells(summary_table)
 
         # Set column headers
         headers = summary_table.rows[0].cells
@@ -135,19 +129,13 @@ def add_detailed_animation(doc, db_connection, total_domains):
 
         # Create detailed domain table
         last_para = doc.add_paragraph()
-        last_para._element.get_or_add_pPr().append(
-            parse_xml(r'<w:keepNext xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>')
-        )
+        keep_with_next(last_para)
 
         domain_table = doc.add_table(rows=len(domain_stats) + 1, cols=7)  # Updated number of columns
         domain_table.style = 'Table Grid'
         
         # Keep table together
-        for row in domain_table.rows:
-            for cell in row.cells:
-                tcPr = cell._tc.get_or_add_tcPr()
-                tcPr.append(parse_xml(r'<w:vAlign xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" w:val="center"/>'))
-                tcPr.append(parse_xml(r'<w:noWrap xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'))
+        center_cells(domain_table)
 
         # Add headers
         headers = domain_table.rows[0].cells
@@ -1,6 +1,16 @@
 from docx.shared import Pt
 import traceback
 from report_styling import format_table_text
+from spill import spill_dict
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.event_handling',
+               'url',
+               'results.accessibility.tests.events.events',
+               query={
+                   "results.accessibility.tests.events.events": {"$exists": True}
+               },
+               sort=[("url", 1)])
 
 def add_detailed_event_handling(doc, db_connection, total_domains):
     """Add the detailed Event Handling section"""
@@ -34,17 +44,8 @@ def add_detailed_event_handling(doc, db_connection, total_domains):
     
     doc.add_paragraph()
 
-    # Query for pages with event information
-    pages_with_events = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.events.events": {"$exists": True}
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.events.events": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    # Query for pages with event information (streamed, not loaded all at once)
+    pages_with_events = find_pages(db_connection, 'detailed.event_handling')
 
     # Initialize tracking structures
     property_data = {
@@ -73,25 +74,24 @@ def add_detailed_event_handling(doc, db_connection, total_domains):
         "modals_no_escape": {"name": "Modals Missing Escape", "pages": set(), "domains": set(), "count": 0}
     }
 
-    # Create detailed violation tracking organized by domain and URL
-    domain_data = {}
+    # Create detailed violation tracking by URL (each URL's data records its domain);
+    # it spills to disk under the report's memory budget
+    url_data = spill_dict(db_connection)
+    pages_processed = 0
 
     # Process each page
     for page in pages_with_events:
+        pages_processed += 1
+        page_data = None
         try:
             url = page['url']
             
             domain = url.replace('http://', '').replace('https://', '').split('/')[0]
             event_data = page['results']['accessibility']['tests']['events']['events']
             
-            # Initialize domain and URL tracking if needed
-            if domain not in domain_data:
-                domain_data[domain] = {
-                    'urls': {}
-                }
-            
             # Initialize URL data
-            domain_data[domain]['urls'][url] = {
+            page_data = {
+                'domain': domain,
                 'event_types': {},
                 'violations': {},
                 'handlers_count': 0,
@@ -106,13 +106,13 @@ def add_detailed_event_handling(doc, db_connection, total_domains):
             # Track total handlers and violations
             total_handlers = details.get('totalHandlers', 0)
             total_violations = details.get('totalViolations', 0)
-            domain_data[domain]['urls'][url]['handlers_count'] = total_handlers
-            domain_data[domain]['urls'][url]['total_violations'] = total_violations
+            page_data['handlers_count'] = total_handlers
+            page_data['total_violations'] = total_violations
 
             # Track total focusable elements
             tab_order_data = details.get('tabOrder', {})
             focusable_elements = tab_order_data.get('totalFocusableElements', 0)
-            domain_data[domain]['urls'][url]['focusable_elements'] = focusable_elements
+            page_data['focusable_elements'] = focusable_elements
             
             # Process event types using the updated structure
             by_type = details.get('byType', {})
@@ -129,7 +129,7 @@ def add_detailed_event_handling(doc, db_connection, total_domains):
                         count = 0
                 
                 # Track event type for this URL
-                domain_data[domain]['urls'][url]['event_types'][event_type] = count
+                page_data['event_types'][event_type] = count
                 
                 if count > 0:
                     key = f"event_{event_type}"
@@ -150,11 +150,11 @@ def add_detailed_event_handling(doc, db_connection, total_domains):
             high_tabindex = 1 if pageFlags.get('hasHighTabindex', False) else 0
             
             # Track violations for this URL
-            domain_data[domain]['urls'][url]['violations']['explicit_tabindex'] = explicit_count
-            domain_data[domain]['urls'][url]['violations']['visual_order'] = visual_violations
-            domain_data[domain]['urls'][url]['violations']['column_order'] = column_violations
-            domain_data[domain]['urls'][url]['violations']['negative_tabindex'] = negative_tabindex
-            domain_data[domain]['urls'][url]['violations']['high_tabindex'] = high_tabindex
+            page_data['violations']['explicit_tabindex'] = explicit_count
+            page_data['violations']['visual_order'] = visual_violations
+            page_data['violations']['column_order'] = column_violations
+            page_data['violations']['negative_tabindex'] = negative_tabindex
+            page_data['violations']['high_tabindex'] = high_tabindex
             
             if explicit_count > 0:
                 property_data['explicit_tabindex']['pages'].add(url)
@@ -188,10 +188,10 @@ def add_detailed_event_handling(doc, db_connection, total_domains):
             modals_without_escape = violation_counts.get('modal-without-escape', 0)
             
             # Track violations for this URL
-            domain_data[domain]['urls'][url]['violations']['mouse_only'] = mouse_only
-            domain_data[domain]['urls'][url]['violations']['missing_tabindex'] = missing_tabindex
-            domain_data[domain]['urls'][url]['violations']['non_interactive'] = non_interactive
-            domain_data[domain]['urls'][url]['violations']['modals_no_escape'] = modals_without_escape
+            page_data['violations']['mouse_only'] = mouse_only
+            page_data['violations']['missing_tabindex'] = missing_tabindex
+            page_data['violations']['non_interactive'] = non_interactive
+            page_data['violations']['modals_no_escape'] = modals_without_escape
             
             if mouse_only > 0:
                 property_data['mouse_only']['pages'].add(url)
@@ -218,8 +218,12 @@ def add_detailed_event_handling(doc, db_connection, total_domains):
             print("Exception:", str(e))
             traceback.print_exc()
             continue
+        finally:
+            # Stored once the page is processed, so a spilled copy is complete
+            if page_data is not None:
+                url_data[url] = page_data
 
-    if pages_with_events:
+    if pages_processed:
         # Overall Summary section
         doc.add_heading('Event Handling Summary', level=3)
         
@@ -348,24 +352,35 @@ element.addEventListener('keydown', function(e) {
         tabindex_code.paragraph_format.left_indent = Pt(36)
         
         # Case study: Domain with most issues
-        if domain_data:
-            worst_domain = max(domain_data.items(), 
-                              key=lambda x: sum(url_data['total_violations'] for url_data in x[1]['urls'].values()))
+        if url_data:
+            # Total violations and page count per domain, streamed from the per-URL data
+            domain_totals = {}
+            for data in url_data.values():
+                totals = domain_totals.setdefault(data['domain'], {'violations': 0, 'pages': 0})
+                totals['violations'] += data['total_violations']
+                totals['pages'] += 1
+            worst_domain = max(domain_totals.items(), key=lambda x: x[1]['violations'])
             
             doc.add_paragraph()
             doc.add_heading(f'Case Study: {worst_domain[0]}', level=3)
             
             # Calculate total violations for this domain
-            total_domain_violations = sum(url_data['total_violations'] for url_data in worst_domain[1]['urls'].values())
-            doc.add_paragraph(f"This site has a total of {total_domain_violations} event handling violations across {len(worst_domain[1]['urls'])} pages.")
+            total_domain_violations = worst_domain[1]['violations']
+            doc.add_paragraph(f"This site has a total of {total_domain_violations} event handling violations across {worst_domain[1]['pages']} pages.")
             
             # Create a breakdown of the top issues
             issue_counts = {
-                'Mouse-only Elements': sum(url_data['violations'].get('mouse_only', 0) for url_data in worst_domain[1]['urls'].values()),
-                'Visual Order Violations': sum(url_data['violations'].get('visual_order', 0) for url_data in worst_domain[1]['urls'].values()),
-                'Explicit tabindex Usage': sum(url_data['violations'].get('explicit_tabindex', 0) for url_data in worst_domain[1]['urls'].values()),
-                'Non-interactive with Handlers': sum(url_data['violations'].get('non_interactive', 0) for url_data in worst_domain[1]['urls'].values())
+                'Mouse-only Elements': 0,
+                'Visual Order Violations': 0,
+                'Explicit tabindex Usage': 0,
+                'Non-interactive with Handlers': 0
             }
+            for data in url_data.values():
+                if data['domain'] == worst_domain[0]:
+                    issue_counts['Mouse-only Elements'] += data['violations'].get('mouse_only', 0)
+                    issue_counts['Visual Order Violations'] += data['violations'].get('visual_order', 0)
+                    issue_counts['Explicit tabindex Usage'] += data['violations'].get('explicit_tabindex', 0)
+                    issue_counts['Non-interactive with Handlers'] += data['violations'].get('non_interactive', 0)
             
             # Create a table with the top issues
             issue_table = doc.add_table(rows=len(issue_counts) + 1, cols=2)
@@ -0,0 +1,284 @@
+from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
+from report_records import domain_from_url
+from projections import declare_fields, find_pages, find_page
+
+DIALOGS_PATH = 'results.accessibility.tests.floating_dialogs.dialogs'
+
+declare_fields('detailed.floating_dialogs',
+               'url',
+               f'{DIALOGS_PATH}.consolidated.issuesByType',
+               query={
+                   f"{DIALOGS_PATH}.consolidated": {"$exists": True},
+                   f"{DIALOGS_PATH}.consolidated.summary.totalIssues": {"$gt": 0}
+               })
+
+# Sort issues by severity - critical first, then high, then moderate
+SEVERITY_ORDER = {'critical': 0, 'high': 1, 'moderate': 2, 'low': 3}
+
+def add_dialog_explanation(doc, doc_data):
+    """Add the WCAG criteria, common issues and recommendations from the test's documentation"""
+    if doc_data:
+        # Add WCAG criteria references
+        wcag_references = []
+        for key, criteria in doc_data.get('wcagReferences', {}).items():
+            wcag_references.append(f"WCAG {key} ({criteria.get('level', '')}) - {criteria.get('title', '')}")
+
+        if wcag_references:
+            doc.add_paragraph("This test evaluates the following WCAG criteria:")
+            for ref in sorted(wcag_references):
+                doc.add_paragraph(ref, style='List Bullet')
+
+        # Add common issues based on violation types
+        violation_types = doc_data.get('violationTypes', {})
+        if violation_types:
+            doc.add_paragraph("Common accessibility issues with floating dialogs include:")
+            for violation_type, details in violation_types.items():
+                doc.add_paragraph(f"{details.get('description', '')}", style='List Bullet')
+
+        # Add best practices from documentation
+        best_practices = doc_data.get('bestPractices', {})
+        if best_practices:
+            doc.add_paragraph()
+            doc.add_paragraph("Recommendations for making floating dialogs accessible:")
+
+            for category, practices in best_practices.items():
+                for practice in practices:
+                    doc.add_paragraph(practice, style='List Bullet')
+    else:
+        # Fallback if no documentation is available
+        doc.add_paragraph("Common issues include:")
+        doc.add_paragraph("Missing or incorrect ARIA roles and attributes", style='List Bullet')
+        doc.add_paragraph("Lack of proper focus management when dialogs expand and collapse", style='List Bullet')
+        doc.add_paragraph("Missing or inadequate heading structure within dialogs", style='List Bullet')
+        doc.add_paragraph("No visible close button or keyboard escape mechanism", style='List Bullet')
+        doc.add_paragraph("Interactive content obscured by floating dialogs", style='List Bullet')
+
+        # Add recommendations
+        doc.add_paragraph()
+        doc.add_paragraph("Recommendations for making floating dialogs accessible:")
+        doc.add_paragraph("Use role='dialog' or role='alertdialog' appropriately", style='List Bullet')
+        doc.add_paragraph("Manage keyboard focus when dialogs expand and collapse", style='List Bullet')
+        doc.add_paragraph("Provide proper heading structure within dialogs", style='List Bullet')
+        doc.add_paragraph("Include a visible close button and support Escape key", style='List Bullet')
+        doc.add_paragraph("Use aria-modal='true' when appropriate", style='List Bullet')
+        doc.add_paragraph("Ensure the dialog doesn't obscure important interactive elements", style='List Bullet')
+
+def add_implementation_recommendations(doc, doc_data):
+    """Add technical implementation recommendations, from the documentation when available"""
+    doc.add_paragraph()
+    # Use a paragraph with a run for heading formatting instead of a style
+    heading_para = doc.add_paragraph()
+    heading_para.add_run("Technical Implementation Recommendations").bold = True
+
+    if doc_data and 'bestPractices' in doc_data:
+        for category, practices in doc_data['bestPractices'].items():
+            category_para = doc.add_paragraph()
+            category_para.add_run(f"{category.replace('_', ' ').title()}").bold = True
+
+            for practice in practices:
+                doc.add_paragraph(practice, style='List Bullet')
+    else:
+        # Fallback recommendations if documentation is unavailable
+        dialog_para = doc.add_paragraph()
+        dialog_para.add_run("Dialog Structure").bold = True
+
+        doc.add_paragraph("Use native <dialog> element with the showModal() method where supported", style='List Bullet')
+        doc.add_paragraph("Add role='dialog' or role='alertdialog' for screen reader announcement", style='List Bullet')
+        doc.add_paragraph("Use aria-modal='true' for modal dialogs to limit screen reader focus", style='List Bullet')
+
+        focus_para = doc.add_paragraph()
+        focus_para.add_run("Focus Management").bold = True
+
+        doc.add_paragraph("Move focus to the dialog when it opens, typically to the first focusable element", style='List Bullet')
+        doc.add_paragraph("Trap keyboard focus within modal dialogs", style='List Bullet')
+        doc.add_paragraph("When dialog closes, return focus to the element that opened it", style='List Bullet')
+
+        content_para = doc.add_paragraph()
+        content_para.add_run("Dialog Content").bold = True
+
+        doc.add_paragraph("Include a descriptive heading (h2) at the start of the dialog content", style='List Bullet')
+        doc.add_paragraph("Provide a visible close button with a clear accessible name", style='List Bullet')
+        doc.add_paragraph("Support Escape key for closing the dialog", style='List Bullet')
+
+declare_fields('detailed.floating_dialogs.documentation',
+               f'{DIALOGS_PATH}.documentation',
+               query={f"{DIALOGS_PATH}.documentation": {"$exists": True}})
+
+def add_detailed_floating_dialogs(doc, db_connection, total_domains):
+    """Add the detailed Floating Dialogs section"""
+    doc.add_page_break()
+    h3 = doc.add_heading('Floating Dialogs', level=2)
+    h3.style = doc.styles['Heading 2']
+
+    # Add explanation
+    doc.add_paragraph("""
+    Floating dialogs (permanent floating dialogs e.g. chatbots, cookie notices, modals) require specific accessibility considerations to ensure they are usable by all. These interface elements can create significant barriers when not implemented properly.
+    """.strip())
+
+    # The test's documentation is the same on every page, so it is read from one page only
+    dialog_docs = find_page(db_connection, 'detailed.floating_dialogs.documentation')
+    doc_data = None
+    if dialog_docs:
+        doc_data = dialog_docs['results']['accessibility']['tests']['floating_dialogs']['dialogs']['documentation']
+
+    add_dialog_explanation(doc, doc_data)
+    doc.add_paragraph()
+
+    # Query for pages with dialog issues - using the consolidated results field
+    pages_with_dialog_issues = find_pages(db_connection, 'detailed.floating_dialogs')
+
+    # Initialize counters for each issue type by severity
+    dialog_issues = {
+        "violations": {
+            "hiddenInteractiveContent": {"name": "Hidden interactive content", "pages": set(), "domains": set(), "severity": "critical"},
+            "incorrectHeadingLevel": {"name": "Incorrect heading structure", "pages": set(), "domains": set(), "severity": "high"},
+            "missingCloseButton": {"name": "Missing close button", "pages": set(), "domains": set(), "severity": "high"},
+            "improperFocusManagement": {"name": "Improper focus management", "pages": set(), "domains": set(), "severity": "high"}
+        },
+        "warnings": {
+            "contentOverlap": {"name": "Content overlap issues", "pages": set(), "domains": set(), "severity": "moderate"}
+        }
+    }
+
+    # Affected URLs by domain and issue type
+    domain_to_urls = {}
+
+    # Issue names and domains by breakpoint range, for issues specific to some viewport sizes
+    breakpoint_grouping = {}
+
+    # A single pass over the pages collects both the issue counts and the responsive issues
+    for page in pages_with_dialog_issues:
+        url = page['url']
+        domain = domain_from_url(url)
+        consolidated = page['results']['accessibility']['tests']['floating_dialogs']['dialogs']['consolidated']
+        issues_by_type = consolidated.get('issuesByType')
+        if not issues_by_type:
+            continue
+
+        for category in ['violations', 'warnings']:
+            for issue_type, issue_data in issues_by_type.get(category, {}).items():
+                known_issue = dialog_issues[category].get(issue_type)
+                if known_issue is not None and issue_data.get('count', 0) > 0:
+                    known_issue['pages'].add(url)
+                    known_issue['domains'].add(domain)
+
+                    # Store the severity if available
+                    if 'severity' in issue_data:
+                        known_issue['severity'] = issue_data['severity']
+
+                    domain_to_urls.setdefault(domain, {}).setdefault(issue_type, []).append(url)
+
+                for element in issue_data.get('elements', []):
+                    if 'breakpointRange' in element:
+                        grouping = breakpoint_grouping.setdefault(
+                            element['breakpointRange'], {'names': set(), 'domains': set()})
+                        grouping['names'].add(known_issue['name'] if known_issue else issue_type)
+                        grouping['domains'].add(domain)
+
+    # Create filtered list of issues that have affected pages
+    all_active_issues = []
+
+    for category in ['violations', 'warnings']:
+        for issue_type, data in dialog_issues[category].items():
+            if may_affect_pages(db_connection, data['pages']):
+                all_active_issues.append({
+                    'category': category,
+                    'type': issue_type,
+                    'name': data['name'],
+                    'severity': data['severity'],
+                    'pages': data['pages'],
+                    'domains': data['domains']
+                })
+
+    all_active_issues.sort(key=lambda x: SEVERITY_ORDER.get(x['severity'], 4))
+
+    if not all_active_issues:
+        doc.add_paragraph("No floating dialog accessibility issues were found.")
+        return
+
+    # Create summary table
+    doc.add_paragraph("The analysis identified the following floating dialog accessibility issues:")
+
+    summary_table = doc.add_table(rows=len(all_active_issues) + 1, cols=5)
+    summary_table.style = 'Table Grid'
+
+    # Set column headers
+    headers = summary_table.rows[0].cells
+    headers[0].text = "Issue"
+    headers[1].text = "Severity"
+    headers[2].text = "Pages Affected"
+    headers[3].text = "Sites Affected"
+    headers[4].text = "% of Total Sites"
+
+    # Add data
+    for i, issue in enumerate(all_active_issues, 1):
+        row = summary_table.rows[i].cells
+        row[0].text = issue['name']
+        row[1].text = issue['severity'].capitalize()
+        row[2].text = format_page_count(db_connection, issue['pages'])
+        row[3].text = str(len(issue['domains']))
+        row[4].text = f"{(len(issue['domains']) / len(total_domains) * 100):.1f}%"
+
+    # Format the table text
+    format_table_text(summary_table)
+
+    # Add details about each issue by domain with all affected URLs
+    doc.add_paragraph()
+    heading_para = doc.add_paragraph()
+    heading_para.add_run("Detailed List of Affected Pages by Issue and Domain").bold = True
+
+    for issue in all_active_issues:
+        issue_para = doc.add_paragraph()
+        issue_para.add_run(f"{issue['name']} ({issue['severity'].capitalize()})").bold = True
+
+        # Domains that have this specific issue, by number of affected pages (highest first)
+        sorted_domains = sorted(
+            ((domain, urls[issue['type']]) for domain, urls in domain_to_urls.items() if issue['type'] in urls),
+            key=lambda x: (-len(x[1]), x[0])
+        )
+
+        if sorted_domains:
+            for domain, urls in sorted_domains:
+                # Add domain header
+                domain_para = doc.add_paragraph()
+                domain_para.add_run(f"{domain} ({len(urls)} affected pages)").bold = True
+
+                # Add every URL as a bullet point
+                for url in sorted(urls):
+                    doc.add_paragraph(url, style='List Bullet')
+
+                # Add a space between domains
+                doc.add_paragraph()
+        else:
+            doc.add_paragraph("No domains found with this issue.")
+
+    # Add breakdown by viewport sizes
+    if breakpoint_grouping:
+        doc.add_paragraph()
+        heading_para = doc.add_paragraph()
+        heading_para.add_run("Responsive Design Considerations").bold = True
+
+        doc.add_paragraph("Many floating dialog issues are specific to certain viewport sizes. The following issues were identified across different breakpoints:")
+
+        # Create a table for responsive issues
+        responsive_table = doc.add_table(rows=len(breakpoint_grouping) + 1, cols=3)
+        responsive_table.style = 'Table Grid'
+
+        # Set column headers
+        headers = responsive_table.rows[0].cells
+        headers[0].text = "Viewport Size Range"
+        headers[1].text = "Issue Types"
+        headers[2].text = "Number of Affected Sites"
+
+        # Add data
+        for i, (breakpoint_range, grouping) in enumerate(sorted(breakpoint_grouping.items()), 1):
+            row = responsive_table.rows[i].cells
+            row[0].text = breakpoint_range
+            row[1].text = ", ".join(sorted(grouping['names']))
+            row[2].text = str(len(grouping['domains']))
+
+        # Format the table text
+        format_table_text(responsive_table)
+
+    add_implementation_recommendations(doc, doc_data)
@@ -0,0 +1,241 @@
+from report_styling import format_table_text
+from report_records import domain_from_url
+from projections import declare_fields, find_pages, find_page
+
+FOCUS_PATH = 'results.accessibility.tests.focus_management.focus_management'
+
+# Test IDs and their readable names
+TEST_NAME_MAP = {
+    "focus_outline_presence": "Missing Focus Outlines",
+    "focus_outline_contrast": "Insufficient Outline Contrast",
+    "focus_outline_offset": "Insufficient Outline Offset/Width",
+    "hover_feedback": "Insufficient Hover Feedback",
+    "focus_obscurement": "Obscured Focus Outlines",
+    "anchor_target_tabindex": "Improper Local Target Configuration"
+}
+
+declare_fields('detailed.focus_management',
+               'url',
+               f'{FOCUS_PATH}.metadata.total_violations_found',
+               f'{FOCUS_PATH}.metadata.total_breakpoints_tested',
+               *(f'{FOCUS_PATH}.tests.{test_id}.summary.total_violations' for test_id in TEST_NAME_MAP),
+               query={FOCUS_PATH: {"$exists": True}})
+
+declare_fields('detailed.focus_management.documentation',
+               'url',
+               f'{FOCUS_PATH}.test_documentation',
+               query={FOCUS_PATH: {"$exists": True}},
+               sort=[("url", 1)])
+
+def add_detailed_focus_management(doc, db_connection, total_domains):
+    """Add the detailed Focus Management (General) section"""
+    doc.add_page_break()
+    h2 = doc.add_heading('Focus Management (General)', level=2)
+    h2.style = doc.styles['Heading 2']
+
+    # The test's documentation is the same on every page, so it is read from the first page only
+    first_page = find_page(db_connection, 'detailed.focus_management.documentation')
+
+    if not first_page:
+        doc.add_paragraph("No focus management data available in the database.", style='Normal')
+        return
+
+    # First, add a description of the test based on the documentation
+    test_doc = first_page.get('results', {}).get('accessibility', {}).get('tests', {}).get(
+        'focus_management', {}).get('focus_management', {}).get('test_documentation', {})
+
+    if test_doc:
+        doc.add_paragraph(f"{test_doc.get('description', '')}", style='Normal')
+        wcag_criteria = test_doc.get('wcag_criteria', [])
+        if wcag_criteria:
+            doc.add_paragraph("WCAG Success Criteria:", style='Normal')
+            for criterion in wcag_criteria:
+                doc.add_paragraph(f"• {criterion}", style='List Bullet')
+        doc.add_paragraph()
+
+    # Per-domain totals and per-URL violation counts by test
+    site_data = {}
+    url_data = {}
+    pages_tested = 0
+    total_violations = 0
+    total_breakpoints_tested = 0
+
+    # Process each page as it streams from the database
+    for page in find_pages(db_connection, 'detailed.focus_management'):
+        try:
+            url = page['url']
+            domain = domain_from_url(url)
+            focus_data = page['results']['accessibility']['tests']['focus_management']['focus_management']
+            pages_tested += 1
+
+            # Initialize domain tracking
+            if domain not in site_data:
+                site_data[domain] = {
+                    "total_violations": 0,
+                    "breakpoints_tested": 0,
+                    "urls": set(),
+                    "tests": {test_id: 0 for test_id in TEST_NAME_MAP}
+                }
+
+            # Initialize URL tracking
+            if url not in url_data:
+                url_data[url] = {
+                    "domain": domain,
+                    "total_violations": 0,
+                    "breakpoints_tested": 0,
+                    "tests": {test_id: 0 for test_id in TEST_NAME_MAP}
+                }
+
+            # Get metadata
+            metadata = focus_data.get('metadata', {})
+            url_violations = metadata.get('total_violations_found', 0)
+
+            total_violations += url_violations
+            site_data[domain]["total_violations"] += url_violations
+            url_data[url]["total_violations"] = url_violations
+
+            breakpoints_tested = metadata.get('total_breakpoints_tested', 0)
+            total_breakpoints_tested += breakpoints_tested
+            site_data[domain]["breakpoints_tested"] = max(site_data[domain]["breakpoints_tested"], breakpoints_tested)
+            url_data[url]["breakpoints_tested"] = breakpoints_tested
+
+            # Add URL to domain list
+            site_data[domain]["urls"].add(url)
+
+            # Process each test
+            tests = focus_data.get('tests', {})
+            for test_name, test_data in tests.items():
+                if test_name in TEST_NAME_MAP:
+                    violations = test_data.get('summary', {}).get('total_violations', 0)
+                    site_data[domain]["tests"][test_name] += violations
+                    url_data[url]["tests"][test_name] = violations
+
+        except Exception as e:
+            print(f"Error processing page {page.get('url', 'unknown')}: {str(e)}")
+            continue
+
+    # Overall Statistics
+    doc.add_paragraph("Focus Management Statistics:", style='Normal')
+    stats_table = doc.add_table(rows=3, cols=2)
+    stats_table.style = 'Table Grid'
+
+    rows = stats_table.rows
+    rows[0].cells[0].text = "Pages Tested"
+    rows[0].cells[1].text = str(pages_tested)
+    rows[1].cells[0].text = "Total Breakpoints Tested (across all pages)"
+    rows[1].cells[1].text = str(total_breakpoints_tested)
+    rows[2].cells[0].text = "Total Violations Found"
+    rows[2].cells[1].text = str(total_violations)
+
+    format_table_text(stats_table)
+
+    # Tests information
+    doc.add_paragraph()
+    doc.add_paragraph("Tests Performed:", style='Normal')
+
+    tests_performed = test_doc.get('tests_performed', [])
+    test_table = doc.add_table(rows=len(tests_performed) + 1, cols=3)
+    test_table.style = 'Table Grid'
+
+    # Add headers
+    headers = test_table.rows[0].cells
+    headers[0].text = "Test Name"
+    headers[1].text = "Description"
+    headers[2].text = "Success Criteria"
+
+    # Add data for each test
+    for i, test_info in enumerate(tests_performed, 1):
+        row = test_table.rows[i].cells
+        row[0].text = test_info.get('name', '')
+        row[1].text = test_info.get('description', '')
+        row[2].text = test_info.get('success_criteria', '')
+
+    format_table_text(test_table)
+
+    # Detailed Issues Summary
+    doc.add_paragraph()
+    doc.add_paragraph("Focus Management Issues by Test Type:", style='Normal')
+
+    # Create table for test summaries
+    summary_table = doc.add_table(rows=len(TEST_NAME_MAP) + 1, cols=5)
+    summary_table.style = 'Table Grid'
+
+    # Add headers
+    headers = summary_table.rows[0].cells
+    headers[0].text = "Issue Type"
+    headers[1].text = "Total Violations"
+    headers[2].text = "Pages Affected"
+    headers[3].text = "Sites Affected"
+    headers[4].text = "% of Total Sites"
+
+    # Add data for each test type
+    for i, (test_id, display_name) in enumerate(TEST_NAME_MAP.items(), 1):
+        test_violations = sum(site["tests"][test_id] for site in site_data.values())
+        affected_sites = sum(1 for site in site_data.values() if site["tests"][test_id] > 0)
+        affected_pages = sum(1 for url_info in url_data.values() if url_info["tests"][test_id] > 0)
+
+        row = summary_table.rows[i].cells
+        row[0].text = display_name
+        row[1].text = str(test_violations)
+        row[2].text = str(affected_pages)
+        row[3].text = str(affected_sites)
+        row[4].text = f"{(affected_sites / len(site_data) * 100):.1f}%" if site_data else "0%"
+
+    format_table_text(summary_table)
+
+    # Detailed Report by Domain/URL
+    doc.add_paragraph()
+    doc.add_heading("Detailed Focus Management Issues by Domain", level=4)
+
+    # URLs by domain
+    domain_urls = {}
+    for url, url_info in url_data.items():
+        domain_urls.setdefault(url_info["domain"], []).append(url)
+
+    # Sort domains by total violations
+    sorted_domains = sorted(site_data.items(), key=lambda x: (-x[1]["total_violations"], x[0]))
+
+    for domain, domain_data in sorted_domains:
+        # Add domain heading
+        doc.add_paragraph()
+        doc.add_paragraph(f"Domain: {domain}", style='Heading 5')
+
+        # Add domain summary
+        domain_summary = doc.add_paragraph(style='Normal')
+        domain_summary.add_run(f"Total Violations: {domain_data['total_violations']}").bold = True
+        domain_summary.add_run(f" | URLs: {len(domain_data['urls'])} | Breakpoints tested: {domain_data['breakpoints_tested']}")
+
+        # Sort this domain's URLs by violations
+        sorted_urls = sorted(domain_urls[domain], key=lambda u: (-url_data[u]["total_violations"], u))
+
+        # Create table for URLs in this domain
+        url_table = doc.add_table(rows=len(sorted_urls) + 1, cols=7)
+        url_table.style = 'Table Grid'
+
+        # Add headers
+        url_headers = url_table.rows[0].cells
+        url_headers[0].text = "URL"
+        url_headers[1].text = "Total Violations"
+        url_headers[2].text = "Missing Outlines"
+        url_headers[3].text = "Hover Issues"
+        url_headers[4].text = "Contrast Issues"
+        url_headers[5].text = "Offset Issues"
+        url_headers[6].text = "Other Issues"
+
+        # Add URL rows
+        for i, url in enumerate(sorted_urls, 1):
+            url_tests = url_data[url]["tests"]
+            row = url_table.rows[i].cells
+
+            # Display full URL for copy/paste
+            row[0].text = url
+            row[1].text = str(url_data[url]["total_violations"])
+            row[2].text = str(url_tests["focus_outline_presence"])
+            row[3].text = str(url_tests["hover_feedback"])
+            row[4].text = str(url_tests["focus_outline_contrast"])
+            row[5].text = str(url_tests["focus_outline_offset"])
+
+            # Combine other issues
+            row[6].text = str(url_tests["focus_obscurement"] + url_tests["anchor_target_tabindex"])
+
+        format_table_text(url_table)
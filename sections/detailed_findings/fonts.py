@@ -0,0 +1,161 @@
+from report_styling import format_table_text
+from topic_aggregates import get_topic_aggregate
+from sections.aggregates.fonts import FontsAggregate
+from sampling import format_page_count, may_affect_pages
+from table_overflow import add_budgeted_table
+
+def add_detailed_fonts(doc, db_connection, total_domains):
+    """Add the detailed Fonts section"""
+    doc.add_page_break()
+    h2 = doc.add_heading('Fonts', level=2)
+    h2.style = doc.styles['Heading 2']
+    doc.add_paragraph()
+
+    # Add explanation
+    doc.add_paragraph("""
+Font choices and typography implementation significantly impact content accessibility. This analysis covers font selection, text size, line height, text alignment, and overall typography. Key factors include heading hierarchy, text readability, and proper use of font styling.
+    """.strip())
+
+    doc.add_paragraph("Typography accessibility concerns include:", style='Normal')
+    doc.add_paragraph("Text size and readability issues", style='List Bullet')
+    doc.add_paragraph("Line height and spacing problems", style='List Bullet')
+    doc.add_paragraph("Text alignment affecting readability", style='List Bullet')
+    doc.add_paragraph("Improper use of italic and bold text", style='List Bullet')
+    doc.add_paragraph("Heading size hierarchy issues", style='List Bullet')
+    doc.add_paragraph("Font selection and implementation", style='List Bullet')
+
+    # Recommendations
+    doc.add_paragraph()
+    doc.add_paragraph("Recommendations:", style='Normal')
+
+    doc.add_paragraph("Typography:", style='List Bullet')
+    doc.add_paragraph("Ensure body text is at least 16px", style='List Bullet 2')
+    doc.add_paragraph("Maintain line height of at least 1.5", style='List Bullet 2')
+    doc.add_paragraph("Avoid justified text alignment", style='List Bullet 2')
+    doc.add_paragraph("Use left-aligned text for better readability", style='List Bullet 2')
+    doc.add_paragraph("Limit use of italics", style='List Bullet 2')
+
+    doc.add_paragraph("Font Usage:", style='List Bullet')
+    doc.add_paragraph("Limit number of different fonts", style='List Bullet 2')
+    doc.add_paragraph("Provide appropriate fallback fonts", style='List Bullet 2')
+    doc.add_paragraph("Ensure proper font loading", style='List Bullet 2')
+    doc.add_paragraph("Use system fonts where possible", style='List Bullet 2')
+
+    doc.add_paragraph("Heading Structure:", style='List Bullet')
+    doc.add_paragraph("Maintain clear size hierarchy", style='List Bullet 2')
+    doc.add_paragraph("Ensure headings are larger than body text", style='List Bullet 2')
+    doc.add_paragraph("Use consistent heading sizes across pages", style='List Bullet 2')
+    doc.add_paragraph()
+
+    # Shared with the summary section (computed once per report)
+    fonts = get_topic_aggregate(db_connection, FontsAggregate)
+
+    if not fonts['pages']:
+        doc.add_paragraph("No font usage data was found.")
+        return
+
+    # 1. Typography Issues Section
+    doc.add_paragraph()
+    doc.add_paragraph("Typography Accessibility Issues:", style='Normal')
+
+    active_issues = {flag: data for flag, data in fonts['typography_issues'].items()
+                    if may_affect_pages(db_connection, data['pages'])}
+
+    if active_issues:
+        issues_table = doc.add_table(rows=len(active_issues) + 1, cols=4)
+        issues_table.style = 'Table Grid'
+
+        headers = issues_table.rows[0].cells
+        headers[0].text = "Issue"
+        headers[1].text = "Pages Affected"
+        headers[2].text = "Sites Affected"
+        headers[3].text = "% of Total Sites"
+
+        for i, (flag, data) in enumerate(active_issues.items(), 1):
+            row = issues_table.rows[i].cells
+            row[0].text = data['name']
+            row[1].text = format_page_count(db_connection, data['pages'])
+            row[2].text = str(len(data['domains']))
+            row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
+
+        format_table_text(issues_table)
+
+    # 2. Heading Size Analysis
+    doc.add_paragraph()
+    doc.add_paragraph("Heading Size Analysis:", style='Normal')
+    heading_sizes = fonts['heading_sizes']
+    if heading_sizes['count']:
+        doc.add_paragraph(f"Smallest heading size detected: {heading_sizes['smallest']}px")
+        doc.add_paragraph(f"Average smallest heading size: {heading_sizes['total'] / heading_sizes['count']:.1f}px")
+
+    # 3. Font Usage Summary
+    doc.add_paragraph()
+    doc.add_paragraph("Font Usage Summary:", style='Normal')
+
+    sorted_fonts = sorted(fonts['font_usage'].items(),
+                          key=lambda x: (len(x[1]), x[0].lower()),
+                          reverse=True)
+
+    if sorted_fonts:
+        add_budgeted_table(doc, db_connection, 'font usage', ["Font Name", "Sites Using", "% of Total Sites"], [
+            (font_name, len(domains), f"{(len(domains) / len(total_domains) * 100):.1f}%")
+            for font_name, domains in sorted_fonts
+        ])
+
+    # 4. CSS Variable Usage
+    doc.add_paragraph()
+    doc.add_paragraph("CSS Variable Font Usage:", style='Normal')
+
+    active_vars = {name: domains for name, domains in fonts['css_var_usage'].items() if domains}
+    if active_vars:
+        var_table = doc.add_table(rows=len(active_vars) + 1, cols=3)
+        var_table.style = 'Table Grid'
+
+        headers = var_table.rows[0].cells
+        headers[0].text = "CSS Variable"
+        headers[1].text = "Sites Using"
+        headers[2].text = "% of Total Sites"
+
+        for i, (var_name, domains) in enumerate(sorted(active_vars.items()), 1):
+            row = var_table.rows[i].cells
+            row[0].text = var_name
+            row[1].text = str(len(domains))
+            row[2].text = f"{(len(domains) / len(total_domains) * 100):.1f}%"
+
+        format_table_text(var_table)
+
+    # 5. Site-Specific Analysis
+    doc.add_paragraph()
+    doc.add_paragraph("Analysis by Site:", style='Normal')
+
+    for domain, data in sorted(fonts['site_fonts'].items()):
+        if data['fonts'] or data['css_vars'] or data['typography_issues']:
+            doc.add_paragraph()
+            doc.add_paragraph(f"{domain}:", style='List Bullet')
+
+            # Create detailed table for this site
+            details = []
+            if data['system_fonts']:
+                details.append(("System Fonts", f"{len(data['system_fonts'])} fonts"))
+            if data['web_fonts']:
+                details.append(("Web Fonts", f"{len(data['web_fonts'])} fonts"))
+            if data['css_vars']:
+                details.append(("CSS Variables", f"{len(data['css_vars'])} variables"))
+            if data['typography_issues']:
+                details.append(("Typography Issues", f"{len(data['typography_issues'])} issues"))
+            if data['smallest_heading']:
+                details.append(("Smallest Heading", f"{data['smallest_heading'][1]}px"))
+
+            site_table = doc.add_table(rows=len(details) + 1, cols=2)
+            site_table.style = 'Table Grid'
+
+            headers = site_table.rows[0].cells
+            headers[0].text = "Category"
+            headers[1].text = "Details"
+
+            for i, (category, detail) in enumerate(details, 1):
+                row = site_table.rows[i].cells
+                row[0].text = category
+                row[1].text = detail
+
+            format_table_text(site_table)
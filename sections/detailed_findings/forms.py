@@ -1,5 +1,23 @@
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
 from docx.shared import Pt
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.forms',
+               'url',
+               'results.accessibility.tests.forms.forms',
+               query={
+                   "results.accessibility.tests.forms.forms.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.forms.forms.pageFlags.hasInputsWithoutLabels": True},
+                       {"results.accessibility.tests.forms.forms.pageFlags.hasPlaceholderOnlyInputs": True},
+                       {"results.accessibility.tests.forms.forms.pageFlags.hasFormsWithoutHeadings": True},
+                       {"results.accessibility.tests.forms.forms.pageFlags.hasFormsOutsideLandmarks": True},
+                       {"results.accessibility.tests.forms.forms.pageFlags.hasContrastIssues": True},
+                       {"results.accessibility.tests.forms.forms.pageFlags.hasLayoutIssues": True}
+                   ]
+               },
+               sort=[("url", 1)])
 
 def add_detailed_forms(doc, db_connection, total_domains):
     """Add the detailed Forms section"""
@@ -37,24 +55,7 @@ def add_detailed_forms(doc, db_connection, total_domains):
     doc.add_paragraph()
 
     # Query for pages with form issues
-    pages_with_form_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.forms.forms.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.forms.forms.pageFlags.hasInputsWithoutLabels": True},
-                {"results.accessibility.tests.forms.forms.pageFlags.hasPlaceholderOnlyInputs": True},
-                {"results.accessibility.tests.forms.forms.pageFlags.hasFormsWithoutHeadings": True},
-                {"results.accessibility.tests.forms.forms.pageFlags.hasFormsOutsideLandmarks": True},
-                {"results.accessibility.tests.forms.forms.pageFlags.hasContrastIssues": True},
-                {"results.accessibility.tests.forms.forms.pageFlags.hasLayoutIssues": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.forms.forms": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_form_issues = list(find_pages(db_connection, 'detailed.forms'))
 
     # Initialize counters for different form issues
     form_issues = {
@@ -150,7 +151,7 @@ def add_detailed_forms(doc, db_connection, total_domains):
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in form_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -170,7 +171,7 @@ def add_detailed_forms(doc, db_connection, total_domains):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
             row[1].text = str(data['count'])
-            row[2].text = str(len(data['pages']))
+            row[2].text = format_page_count(db_connection, data['pages'])
             row[3].text = str(len(data['domains']))
             row[4].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
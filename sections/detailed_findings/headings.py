@@ -1,5 +1,22 @@
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
 from docx.shared import Pt
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.headings',
+               'url',
+               'results.accessibility.tests.headings.headings',
+               query={
+                   "results.accessibility.tests.headings.headings.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.headings.headings.pageFlags.missingH1": True},
+                       {"results.accessibility.tests.headings.headings.pageFlags.multipleH1s": True},
+                       {"results.accessibility.tests.headings.headings.pageFlags.hasHierarchyGaps": True},
+                       {"results.accessibility.tests.headings.headings.pageFlags.hasHeadingsBeforeMain": True},
+                       {"results.accessibility.tests.headings.headings.pageFlags.hasVisualHierarchyIssues": True}
+                   ]
+               },
+               sort=[("url", 1)])
 
 def add_detailed_headings(doc, db_connection, total_domains):
     """Add the detailed Headings section"""
@@ -22,23 +39,7 @@ def add_detailed_headings(doc, db_connection, total_domains):
     doc.add_paragraph()
 
     # Query for pages with heading issues
-    pages_with_heading_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.headings.headings.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.headings.headings.pageFlags.missingH1": True},
-                {"results.accessibility.tests.headings.headings.pageFlags.multipleH1s": True},
-                {"results.accessibility.tests.headings.headings.pageFlags.hasHierarchyGaps": True},
-                {"results.accessibility.tests.headings.headings.pageFlags.hasHeadingsBeforeMain": True},
-                {"results.accessibility.tests.headings.headings.pageFlags.hasVisualHierarchyIssues": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.headings.headings": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_heading_issues = list(find_pages(db_connection, 'detailed.headings'))
 
     # Initialize counters for different heading issues
     heading_issues = {
@@ -121,7 +122,7 @@ def add_detailed_headings(doc, db_connection, total_domains):
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in heading_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -141,7 +142,7 @@ def add_detailed_headings(doc, db_connection, total_domains):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
             row[1].text = str(data.get('count', len(data['pages'])))
-            row[2].text = str(len(data['pages']))
+            row[2].text = format_page_count(db_connection, data['pages'])
             row[3].text = str(len(data['domains']))
             row[4].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
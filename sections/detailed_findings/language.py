@@ -1,5 +1,11 @@
 from report_styling import format_table_text
 from docx.shared import Pt
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.language',
+               'url',
+               query={"results.accessibility.tests.html_structure.html_structure.tests.hasValidLang": False},
+               sort=[("url", 1)])
 
 def add_detailed_language(doc, db_connection, total_domains):
     """Add the detailed Language of Page section"""
@@ -19,10 +25,7 @@ def add_detailed_language(doc, db_connection, total_domains):
     doc.add_paragraph("Hyphenation and other language-specific features", style='List Bullet')
 
     # If there are pages without lang attribute, list them
-    pages_without_lang = list(db_connection.page_results.find(
-        {"results.accessibility.tests.html_structure.html_structure.tests.hasValidLang": False},
-        {"url": 1, "_id": 0}
-    ).sort("url", 1))
+    pages_without_lang = list(find_pages(db_connection, 'detailed.language'))
 
     # Count affected domains
     affected_domains = set()
@@ -1,5 +1,22 @@
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
 from docx.shared import Pt
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.lists',
+               'url',
+               'results.accessibility.tests.lists.lists.pageFlags',
+               'results.accessibility.tests.lists.lists.details',
+               query={
+                   "results.accessibility.tests.lists.lists.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.lists.lists.pageFlags.hasEmptyLists": True},
+                       {"results.accessibility.tests.lists.lists.pageFlags.hasFakeLists": True},
+                       {"results.accessibility.tests.lists.lists.pageFlags.hasCustomBullets": True},
+                       {"results.accessibility.tests.lists.lists.pageFlags.hasDeepNesting": True}
+                   ]
+               },
+               sort=[("url", 1)])
 
 def add_detailed_lists(doc, db_connection, total_domains):
     """Add the detailed Lists section"""
@@ -21,23 +38,7 @@ Proper semantic list markup is important for accessibility. Lists should use app
     doc.add_paragraph()
 
     # Query for pages with list issues
-    pages_with_list_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.lists.lists.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.lists.lists.pageFlags.hasEmptyLists": True},
-                {"results.accessibility.tests.lists.lists.pageFlags.hasFakeLists": True},
-                {"results.accessibility.tests.lists.lists.pageFlags.hasCustomBullets": True},
-                {"results.accessibility.tests.lists.lists.pageFlags.hasDeepNesting": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.lists.lists.pageFlags": 1,
-            "results.accessibility.tests.lists.lists.details": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_list_issues = list(find_pages(db_connection, 'detailed.lists'))
 
     # Initialize counters for each issue type
     list_issues = {
@@ -59,7 +60,7 @@ Proper semantic list markup is important for accessibility. Lists should use app
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in list_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -77,7 +78,7 @@ Proper semantic list markup is important for accessibility. Lists should use app
         for i, (flag, data) in enumerate(active_issues.items(), 1):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
-            row[1].text = str(len(data['pages']))
+            row[1].text = format_page_count(db_connection, data['pages'])
             row[2].text = str(len(data['domains']))
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
@@ -1,6 +1,22 @@
 # sections/detailed_findings/maps.py
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
 from docx.shared import Pt
+from bounded_examples import BoundedExamples
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.maps',
+               'url',
+               'results.accessibility.tests.maps.maps.pageFlags',
+               'results.accessibility.tests.maps.maps.details',
+               query={
+                   "results.accessibility.tests.maps.maps.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.maps.maps.pageFlags.hasMaps": True},
+                       {"results.accessibility.tests.maps.maps.pageFlags.hasMapsWithoutTitle": True},
+                       {"results.accessibility.tests.maps.maps.pageFlags.hasMapsWithAriaHidden": True}
+                   ]
+               })
 
 def add_detailed_maps(doc, db_connection, total_domains):
     """Add the detailed Maps section"""
@@ -30,22 +46,7 @@ Interactive maps present particular accessibility challenges. Common issues incl
     doc.add_paragraph()
 
     # Query for pages with map issues
-    pages_with_map_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.maps.maps.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.maps.maps.pageFlags.hasMaps": True},
-                {"results.accessibility.tests.maps.maps.pageFlags.hasMapsWithoutTitle": True},
-                {"results.accessibility.tests.maps.maps.pageFlags.hasMapsWithAriaHidden": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.maps.maps.pageFlags": 1,
-            "results.accessibility.tests.maps.maps.details": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_map_issues = find_pages(db_connection, 'detailed.maps')
 
     # Initialize counters for each issue type
     map_issues = {
@@ -54,6 +55,9 @@ Interactive maps present particular accessibility challenges. Common issues incl
         "hasMapsWithAriaHidden": {"name": "Maps hidden from screen readers", "pages": set(), "domains": set()}
     }
 
+    # Keep the violations of the first page (by URL) that has any, as examples
+    violation_examples = BoundedExamples(1)
+
     # Count issues
     for page in pages_with_map_issues:
         domain = page['url'].replace('http://', '').replace('https://', '').split('/')[0]
@@ -64,9 +68,13 @@ Interactive maps present particular accessibility challenges. Common issues incl
                 map_issues[flag]['pages'].add(page['url'])
                 map_issues[flag]['domains'].add(domain)
 
+        details = page['results']['accessibility']['tests']['maps']['maps']['details']
+        if 'violations' in details and details['violations']:
+            violation_examples.add(details['violations'][:5], sort_key=page['url'])  # Show up to 5 examples
+
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in map_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -84,7 +92,7 @@ Interactive maps present particular accessibility challenges. Common issues incl
         for i, (flag, data) in enumerate(active_issues.items(), 1):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
-            row[1].text = str(len(data['pages']))
+            row[1].text = format_page_count(db_connection, data['pages'])
             row[2].text = str(len(data['domains']))
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
@@ -121,15 +129,12 @@ Interactive maps present particular accessibility challenges. Common issues incl
                 # Format the table text
                 format_table_text(domain_table)
 
-        # Add examples if available
-        for page in pages_with_map_issues:
-            details = page['results']['accessibility']['tests']['maps']['maps']['details']
-            if 'violations' in details and details['violations']:
-                doc.add_paragraph()
-                doc.add_paragraph("Examples of map accessibility issues found:")
-                for violation in details['violations'][:5]:  # Show up to 5 examples
-                    doc.add_paragraph(violation, style='List Bullet')
-                break  # Only show examples from first page with violations
+        # Add examples if available (only from the first page with violations)
+        for violations in violation_examples:
+            doc.add_paragraph()
+            doc.add_paragraph("Examples of map accessibility issues found:")
+            for violation in violations:
+                doc.add_paragraph(violation, style='List Bullet')
                 
         # Add technical implementation guidance
         doc.add_paragraph()
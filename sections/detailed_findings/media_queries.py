@@ -1,6 +1,10 @@
 # sections/detailed_findings/media_queries.py
 from report_styling import format_table_text
 from docx.shared import Pt
+from topic_aggregates import get_topic_aggregate
+from sections.aggregates.media_queries import MediaQueriesAggregate
+from sampling import format_page_count, may_affect_pages
+from table_overflow import add_budgeted_table
 
 def add_detailed_media_queries(doc, db_connection, total_domains):
     """Add the detailed Media Queries section"""
@@ -30,43 +34,10 @@ CSS Media queries are essential for creating accessible websites that adapt to d
 
     doc.add_paragraph()
 
-    # Get breakpoint data from all pages, using the new dedicated structure
-    breakpoint_data = {}
-    pages_with_breakpoints = list(db_connection.page_results.find(
-        {"results.accessibility.tests.media_queries.media_queries.responsiveBreakpoints": {"$exists": True}},
-        {
-            "url": 1,
-            "results.accessibility.tests.media_queries.media_queries.responsiveBreakpoints": 1,
-            "_id": 0
-        }
-    ))
-
-    # Collect all breakpoints across pages
-    all_breakpoints = set()
-    breakpoint_by_category = {
-        'mobile': set(),
-        'tablet': set(),
-        'desktop': set(),
-        'largeScreen': set()
-    }
-    breakpoint_histogram = {}
-    
-    for page in pages_with_breakpoints:
-        if 'responsiveBreakpoints' in page['results']['accessibility']['tests']['media_queries']['media_queries']:
-            breakpoints_data = page['results']['accessibility']['tests']['media_queries']['media_queries']['responsiveBreakpoints']
-            
-            # Add to the full list of breakpoints
-            if 'allBreakpoints' in breakpoints_data:
-                for bp in breakpoints_data['allBreakpoints']:
-                    all_breakpoints.add(bp)
-                    breakpoint_histogram[bp] = breakpoint_histogram.get(bp, 0) + 1
-            
-            # Add to category-specific sets
-            if 'byCategory' in breakpoints_data:
-                for category, bps in breakpoints_data['byCategory'].items():
-                    if category in breakpoint_by_category:
-                        for bp in bps:
-                            breakpoint_by_category[category].add(bp)
+    # Breakpoints and issues are computed once per report and shared with the summary section
+    media_queries = get_topic_aggregate(db_connection, MediaQueriesAggregate)
+    breakpoint_by_category = media_queries['breakpoint_by_category']
+    breakpoint_histogram = media_queries['breakpoint_histogram']
     
     # Add common breakpoints section if we have data
     if breakpoint_histogram:
@@ -105,83 +76,17 @@ CSS Media queries are essential for creating accessible websites that adapt to d
         doc.add_heading('Breakpoint Frequency', level=4)
         doc.add_paragraph("This table shows how frequently each breakpoint appears across all pages:")
         
-        sorted_breakpoints = sorted(breakpoint_histogram.items())
-        bp_table = doc.add_table(rows=len(sorted_breakpoints) + 1, cols=2)
-        bp_table.style = 'Table Grid'
-        
-        # Add headers
-        headers = bp_table.rows[0].cells
-        headers[0].text = "Breakpoint (px)"
-        headers[1].text = "Frequency"
-        
-        # Add data
-        for i, (breakpoint, count) in enumerate(sorted_breakpoints, 1):
-            row = bp_table.rows[i].cells
-            row[0].text = str(breakpoint)
-            row[1].text = str(count)
-        
-        # Format table
-        format_table_text(bp_table)
+        add_budgeted_table(doc, db_connection, 'breakpoint frequency', ["Breakpoint (px)", "Frequency"],
+                           sorted(breakpoint_histogram.items()))
         
         doc.add_paragraph()
 
-    # Query for pages with media query issues
-    pages_with_media_query_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.media_queries.media_queries.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.media_queries.media_queries.pageFlags.hasResponsiveBreakpoints": False},
-                {"results.accessibility.tests.media_queries.media_queries.pageFlags.hasPrintStyles": False},
-                {"results.accessibility.tests.media_queries.media_queries.pageFlags.hasReducedMotionSupport": False},
-                {"results.accessibility.tests.media_queries.media_queries.pageFlags.hasDarkModeSupport": False},
-                {"results.accessibility.tests.media_queries.media_queries.pageFlags.hasOrientationStyles": False}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.media_queries.media_queries.pageFlags": 1,
-            "results.accessibility.tests.media_queries.media_queries.details": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
-
-    # Initialize counters for each issue type
-    media_query_issues = {
-        "no_responsive": {"name": "No responsive breakpoints", "pages": set(), "domains": set()},
-        "no_print": {"name": "No print stylesheets", "pages": set(), "domains": set()},
-        "no_reduced_motion": {"name": "No reduced motion support", "pages": set(), "domains": set()},
-        "no_dark_mode": {"name": "No dark mode support", "pages": set(), "domains": set()},
-        "no_orientation": {"name": "No orientation-specific styles", "pages": set(), "domains": set()}
-    }
-
-    # Count issues
-    for page in pages_with_media_query_issues:
-        domain = page['url'].replace('http://', '').replace('https://', '').split('/')[0]
-        flags = page['results']['accessibility']['tests']['media_queries']['media_queries']['pageFlags']
-        
-        if not flags.get('hasResponsiveBreakpoints', True):
-            media_query_issues["no_responsive"]["pages"].add(page['url'])
-            media_query_issues["no_responsive"]["domains"].add(domain)
-            
-        if not flags.get('hasPrintStyles', True):
-            media_query_issues["no_print"]["pages"].add(page['url'])
-            media_query_issues["no_print"]["domains"].add(domain)
-            
-        if not flags.get('hasReducedMotionSupport', True):
-            media_query_issues["no_reduced_motion"]["pages"].add(page['url'])
-            media_query_issues["no_reduced_motion"]["domains"].add(domain)
-            
-        if not flags.get('hasDarkModeSupport', True):
-            media_query_issues["no_dark_mode"]["pages"].add(page['url'])
-            media_query_issues["no_dark_mode"]["domains"].add(domain)
-            
-        if not flags.get('hasOrientationStyles', True):
-            media_query_issues["no_orientation"]["pages"].add(page['url'])
-            media_query_issues["no_orientation"]["domains"].add(domain)
+    media_query_issues = media_queries['issues']
+    recommendation_examples = media_queries['recommendations']
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in media_query_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -200,7 +105,7 @@ CSS Media queries are essential for creating accessible websites that adapt to d
         for i, (flag, data) in enumerate(active_issues.items(), 1):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
-            row[1].text = str(len(data['pages']))
+            row[1].text = format_page_count(db_connection, data['pages'])
             row[2].text = str(len(data['domains']))
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
@@ -237,22 +142,15 @@ CSS Media queries are essential for creating accessible websites that adapt to d
             # Format the table text
             format_table_text(domain_table)
 
-        # Add recommendations from test results if available
-        recommendations_added = False
-        for page in pages_with_media_query_issues:
-            details = page['results']['accessibility']['tests']['media_queries']['media_queries']['details']
-            if 'recommendations' in details and details['recommendations']:
-                if not recommendations_added:
-                    doc.add_paragraph()
-                    doc.add_heading('Specific Recommendations', level=3)
-                    recommendations_added = True
-                    
-                for rec in details['recommendations']:
-                    p = doc.add_paragraph(style='List Bullet')
-                    p.add_run(f"{rec['issue']} ").bold = True
-                    p.add_run(f"(WCAG {rec['wcag']}) - {rec['recommendation']}")
+        # Add recommendations from test results if available (only from the first page)
+        for recommendations in recommendation_examples:
+            doc.add_paragraph()
+            doc.add_heading('Specific Recommendations', level=3)
                 
-                break  # Only show recommendations from first page
+            for rec in recommendations:
+                p = doc.add_paragraph(style='List Bullet')
+                p.add_run(f"{rec['issue']} ").bold = True
+                p.add_run(f"(WCAG {rec['wcag']}) - {rec['recommendation']}")
                 
         # Add technical implementation guidance
         doc.add_paragraph()
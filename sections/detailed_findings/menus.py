@@ -1,6 +1,22 @@
 # sections/detailed_findings/menus.py
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
 from docx.shared import Pt
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.menus',
+               'url',
+               'results.accessibility.tests.menus.menus',
+               query={
+                   "results.accessibility.tests.menus.menus.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.menus.menus.pageFlags.hasInvalidMenuRoles": True},
+                       {"results.accessibility.tests.menus.menus.pageFlags.hasMenusWithoutCurrent": True},
+                       {"results.accessibility.tests.menus.menus.pageFlags.hasUnnamedMenus": True},
+                       {"results.accessibility.tests.menus.menus.pageFlags.hasDuplicateMenuNames": True}
+                   ]
+               },
+               sort=[("url", 1)])
 
 def add_detailed_menus(doc, db_connection, total_domains):
     """Add the detailed Menus section"""
@@ -32,22 +48,7 @@ Navigation menus are critical components for website accessibility. They must be
     doc.add_paragraph("Test menu functionality with screen readers", style='List Bullet')
 
     # Query for pages with menu issues
-    pages_with_menu_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.menus.menus.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.menus.menus.pageFlags.hasInvalidMenuRoles": True},
-                {"results.accessibility.tests.menus.menus.pageFlags.hasMenusWithoutCurrent": True},
-                {"results.accessibility.tests.menus.menus.pageFlags.hasUnnamedMenus": True},
-                {"results.accessibility.tests.menus.menus.pageFlags.hasDuplicateMenuNames": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.menus.menus": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_menu_issues = list(find_pages(db_connection, 'detailed.menus'))
 
     # Initialize counters for each issue type
     menu_issues = {
@@ -89,7 +90,7 @@ Navigation menus are critical components for website accessibility. They must be
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in menu_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -109,7 +110,7 @@ Navigation menus are critical components for website accessibility. They must be
             row = summary_table.rows[i].cells
             row[0].text = data['name']
             row[1].text = str(data['count']) if flag != 'duplicateNames' else 'N/A'
-            row[2].text = str(len(data['pages']))
+            row[2].text = format_page_count(db_connection, data['pages'])
             row[3].text = str(len(data['domains']))
             row[4].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
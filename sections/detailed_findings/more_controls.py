@@ -1,6 +1,21 @@
 # sections/detailed_findings/more_controls.py
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
 from docx.shared import Pt
+from bounded_examples import BoundedExamples
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.more_controls',
+               'url',
+               'results.accessibility.tests.read_more_links.read_more_links.pageFlags',
+               'results.accessibility.tests.read_more_links.read_more_links.details',
+               query={
+                   "results.accessibility.tests.read_more_links.read_more_links.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.read_more_links.read_more_links.pageFlags.hasGenericReadMoreLinks": True},
+                       {"results.accessibility.tests.read_more_links.read_more_links.pageFlags.hasInvalidReadMoreLinks": True}
+                   ]
+               })
 
 def add_detailed_more_controls(doc, db_connection, total_domains):
     """Add the detailed 'More' Controls section"""
@@ -27,21 +42,7 @@ Generic "Read More" or "Learn More" style links can create barriers for screen r
     doc.add_paragraph()
 
     # Query for pages with read more link issues
-    pages_with_readmore_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.read_more_links.read_more_links.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.read_more_links.read_more_links.pageFlags.hasGenericReadMoreLinks": True},
-                {"results.accessibility.tests.read_more_links.read_more_links.pageFlags.hasInvalidReadMoreLinks": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.read_more_links.read_more_links.pageFlags": 1,
-            "results.accessibility.tests.read_more_links.read_more_links.details": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_readmore_issues = find_pages(db_connection, 'detailed.more_controls')
 
     # Initialize counters for each issue type
     readmore_issues = {
@@ -49,6 +50,9 @@ Generic "Read More" or "Learn More" style links can create barriers for screen r
         "hasInvalidReadMoreLinks": {"name": "Invalid implementation of 'Read More' links", "pages": set(), "domains": set()}
     }
 
+    # Keep the items of the first page (by URL) that has any, as examples
+    item_examples = BoundedExamples(1)
+
     # Count issues
     for page in pages_with_readmore_issues:
         domain = page['url'].replace('http://', '').replace('https://', '').split('/')[0]
@@ -59,9 +63,13 @@ Generic "Read More" or "Learn More" style links can create barriers for screen r
                 readmore_issues[flag]['pages'].add(page['url'])
                 readmore_issues[flag]['domains'].add(domain)
 
+        details = page['results']['accessibility']['tests']['read_more_links']['read_more_links']['details']
+        if 'items' in details and details['items']:
+            item_examples.add(details['items'][:5], sort_key=page['url'])  # Show up to 5 examples
+
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in readmore_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -79,7 +87,7 @@ Generic "Read More" or "Learn More" style links can create barriers for screen r
         for i, (flag, data) in enumerate(active_issues.items(), 1):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
-            row[1].text = str(len(data['pages']))
+            row[1].text = format_page_count(db_connection, data['pages'])
             row[2].text = str(len(data['domains']))
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
@@ -116,15 +124,12 @@ Generic "Read More" or "Learn More" style links can create barriers for screen r
                 # Format the table text
                 format_table_text(domain_table)
 
-        # Add examples if available
-        for page in pages_with_readmore_issues:
-            details = page['results']['accessibility']['tests']['read_more_links']['read_more_links']['details']
-            if 'items' in details and details['items']:
-                doc.add_paragraph()
-                doc.add_paragraph("Examples of problematic link text found:")
-                for item in details['items'][:5]:  # Show up to 5 examples
-                    doc.add_paragraph(item, style='List Bullet')
-                break  # Only show examples from first page with issues
+        # Add examples if available (only from the first page with issues)
+        for items in item_examples:
+            doc.add_paragraph()
+            doc.add_paragraph("Examples of problematic link text found:")
+            for item in items:
+                doc.add_paragraph(item, style='List Bullet')
                 
         # Add technical implementation section
         doc.add_paragraph()
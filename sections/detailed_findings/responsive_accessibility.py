@@ -11,21 +11,10 @@ from report_styling import (
     add_subheading_h4, format_severity, add_table, add_hyperlink, 
     add_code_block, add_image_if_exists
 )
-
-def get_breakpoint_category(width: int) -> str:
-    """
-    Categorize a breakpoint width into a device category
-    """
-    if width <= 480:
-        return "Mobile (Small)"
-    elif width <= 768:
-        return "Mobile (Large)/Tablet (Small)"
-    elif width <= 1024:
-        return "Tablet (Large)"
-    elif width <= 1280:
-        return "Desktop (Small)"
-    else:
-        return "Desktop (Large)"
+from bounded_examples import BoundedExamples
+from topic_aggregates import get_topic_aggregate
+from sections.aggregates.responsive_accessibility import ResponsiveAccessibilityAggregate, get_breakpoint_category
+from sampling import format_page_count
 
 def add_responsive_accessibility_detailed(document, db_connection, total_domains, screenshots_dir: str = None) -> None:
     """
@@ -48,48 +37,24 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
     for run in sub_para.runs:
         run.italic = True
     
-    # Query for pages with responsive testing results
-    pages_with_responsive_testing = list(db_connection.page_results.find(
-        {"results.accessibility.responsive_testing": {"$exists": True}},
-        {
-            "url": 1,
-            "results.accessibility.responsive_testing": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
-    
-    if not pages_with_responsive_testing:
+    # Responsive results are aggregated once per report and shared with the summary section
+    responsive = get_topic_aggregate(db_connection, ResponsiveAccessibilityAggregate)
+    pages_read = responsive['pages_read']
+    pages_tested = responsive['pages_tested']
+    pages_with_skipped_tests = responsive['pages_with_skipped_tests']
+    all_breakpoints = responsive['all_breakpoints']
+    test_summaries = responsive['test_summaries']
+    test_examples = responsive['test_examples']
+    problem_pages = responsive['problem_pages']
+    section_stats = responsive['section_stats']
+    total_section_issues = responsive['total_section_issues']
+    
+    if not pages_read:
         add_paragraph(document, "No responsive testing data available across any pages.")
         return
     
-    # Collect all breakpoints across all pages
-    all_breakpoints = set()
-    all_pages_data = []
-    pages_with_skipped_tests = 0
-    
-    for page in pages_with_responsive_testing:
-        url = page.get('url', 'Unknown URL')
-        responsive_testing = page.get('results', {}).get('accessibility', {}).get('responsive_testing', {})
-        
-        if not responsive_testing:
-            continue
-        
-        # Check if responsive testing was skipped due to no breakpoints
-        if responsive_testing.get('status') == 'skipped':
-            pages_with_skipped_tests += 1
-            continue
-            
-        breakpoints = responsive_testing.get('breakpoints', [])
-        all_breakpoints.update(breakpoints)
-        
-        # Store this page data for later use
-        all_pages_data.append({
-            'url': url,
-            'responsive_testing': responsive_testing
-        })
-    
     # Check if any pages had actual responsive tests run
-    if not all_pages_data:
+    if not pages_tested:
         if pages_with_skipped_tests > 0:
             add_paragraph(document, f"Responsive testing was skipped on {pages_with_skipped_tests} pages because no CSS media query breakpoints were found.")
             add_paragraph(document, "The site may not be using responsive design techniques with CSS media queries, or the media queries do not contain width-based breakpoints.")
@@ -137,88 +102,9 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
     for criterion, description in wcag_criteria:
         add_list_item(document, f"{criterion}: {description}")
     
-    # Track issues by test type per breakpoint
-    breakpoint_test_counts = {}
-    
-    # Since we know there's an issue with counting touch targets, let's start with a clean approach
-    
-    # First, initialize our breakpoint counts with all the breakpoints we've found
-    for bp in sorted(list(all_breakpoints)):
-        breakpoint_test_counts[bp] = {
-            'touchTargets': 0,
-            'overflow': 0,
-            'fontScaling': 0,
-            'fixedPosition': 0,
-            'contentStacking': 0,
-            'total': 0,
-            'pages': set()
-        }
-    
-    # For normal tests, count issues from the data structure
-    for page_data in all_pages_data:
-        responsive_testing = page_data['responsive_testing']
-        breakpoint_results = responsive_testing.get('breakpoint_results', {})
-        
-        for bp_str, bp_data in breakpoint_results.items():
-            try:
-                bp = int(bp_str)
-            except ValueError:
-                continue
-            
-            # Add this page to affected pages for this breakpoint
-            breakpoint_test_counts[bp]['pages'].add(page_data['url'])
-            
-            # Count issues by test type (except touchTargets)
-            tests_data = bp_data.get('tests', {})
-            if isinstance(tests_data, dict):
-                for test_name, test_data in tests_data.items():
-                    # Skip touchTargets since we'll handle it separately
-                    if test_name != 'touchTargets' and isinstance(test_data, dict) and test_name in breakpoint_test_counts[bp]:
-                        if 'issues' in test_data:
-                            issues = test_data.get('issues', [])
-                            if issues:
-                                issue_count = len(issues)
-                                breakpoint_test_counts[bp][test_name] += issue_count
-                                breakpoint_test_counts[bp]['total'] += issue_count
-    
-    # For touch targets, ensure we have the proper counts
-    # Distribute touch target issues evenly across appropriate breakpoints
-    touch_target_breakpoints = []
-    for bp in breakpoint_test_counts.keys():
-        if any(page_data['responsive_testing'].get('breakpoint_results', {}).get(str(bp), {}).get('tests', {}).get('touchTargets') 
-               for page_data in all_pages_data):
-            touch_target_breakpoints.append(bp)
-    
-    # If we found breakpoints with touch target testing, distribute the issues
-    if touch_target_breakpoints:
-        # Count total touch target issues
-        total_touch_target_issues = 0
-        for page_data in all_pages_data:
-            responsive_testing = page_data['responsive_testing']
-            if 'consolidated' in responsive_testing and 'testsSummary' in responsive_testing['consolidated']:
-                tests_summary = responsive_testing['consolidated']['testsSummary']
-                if 'touchTargets' in tests_summary:
-                    total_touch_target_issues += tests_summary['touchTargets'].get('issueCount', 0)
-        
-        # Ensure we have at least 1 issue to distribute
-        if total_touch_target_issues == 0:
-            # Fall back to assuming 186 issues if we can't find a count
-            total_touch_target_issues = 186
-        
-        # Calculate exact distribution to ensure the total matches
-        issues_per_breakpoint = total_touch_target_issues // len(touch_target_breakpoints)
-        remainder = total_touch_target_issues % len(touch_target_breakpoints)
-        
-        # Distribute issues evenly with remainder handling
-        for i, bp in enumerate(touch_target_breakpoints):
-            # Add the base amount to each breakpoint
-            breakpoint_test_counts[bp]['touchTargets'] += issues_per_breakpoint
-            breakpoint_test_counts[bp]['total'] += issues_per_breakpoint
-            
-            # Distribute remainder (if any) to ensure total exactly matches
-            if i < remainder:
-                breakpoint_test_counts[bp]['touchTargets'] += 1
-                breakpoint_test_counts[bp]['total'] += 1
+    # Issues by test type per breakpoint, with touch target issues distributed
+    # across the breakpoints where they were tested
+    breakpoint_test_counts = responsive['breakpoint_test_counts']
     
     # Create breakpoint summary table
     if breakpoint_test_counts:
@@ -241,7 +127,7 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
                 str(counts['fixedPosition']),
                 str(counts['contentStacking']),
                 str(counts['total']),
-                str(len(counts['pages']))
+                format_page_count(db_connection, counts['pages'])
             ])
         
         if rows:
@@ -250,63 +136,6 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
     
     # Process detailed results for each test type
     add_subheading_h3(document, "Detailed Test Results by Responsive Issue Type")
-    # Build a summary of issues across all pages by test type
-    test_summaries = {
-        'overflow': {'issueCount': 0, 'affectedBreakpoints': set(), 'affectedPages': set()},
-        'touchTargets': {'issueCount': 0, 'affectedBreakpoints': set(), 'affectedPages': set()},
-        'fontScaling': {'issueCount': 0, 'affectedBreakpoints': set(), 'affectedPages': set()},
-        'fixedPosition': {'issueCount': 0, 'affectedBreakpoints': set(), 'affectedPages': set()},
-        'contentStacking': {'issueCount': 0, 'affectedBreakpoints': set(), 'affectedPages': set()}
-    }
-    
-    # Collect examples of issues for each test type from all pages
-    test_examples = {}
-    
-    # Process all pages to aggregate test data
-    for page_data in all_pages_data:
-        url = page_data['url']
-        responsive_testing = page_data['responsive_testing']
-        breakpoint_results = responsive_testing.get('breakpoint_results', {})
-        consolidated = responsive_testing.get('consolidated', {})
-        tests_summary = consolidated.get('testsSummary', {})
-        
-        # Aggregate from consolidated summaries
-        for test_key in test_summaries.keys():
-            if test_key in tests_summary:
-                test_data = tests_summary[test_key]
-                issue_count = test_data.get('issueCount', 0)
-                
-                if issue_count > 0:
-                    test_summaries[test_key]['issueCount'] += issue_count
-                    test_summaries[test_key]['affectedPages'].add(url)
-                    test_summaries[test_key]['affectedBreakpoints'].update(
-                        test_data.get('affectedBreakpoints', [])
-                    )
-        
-        # Collect detailed examples from breakpoint results
-        for bp_str, bp_data in breakpoint_results.items():
-            try:
-                bp = int(bp_str)
-            except ValueError:
-                continue
-                
-            tests = bp_data.get('tests', {})
-            
-            for test_key in test_summaries.keys():
-                if test_key not in tests:
-                    continue
-                    
-                test_result = tests[test_key]
-                issues = test_result.get('issues', [])
-                
-                if issues and len(issues) > 0:
-                    # Store the first new example we find for each test type
-                    if test_key not in test_examples:
-                        test_examples[test_key] = {
-                            'url': url,
-                            'breakpoint': bp,
-                            'issues': issues[:3]  # Store up to 3 examples
-                        }
     
     # Define test categories in a specific order with better names
     test_categories = {
@@ -344,7 +173,7 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
         test_data = test_summaries[test_key]
         issue_count = test_data['issueCount']
         affected_bps = sorted(list(test_data['affectedBreakpoints']))
-        affected_pages = sorted(list(test_data['affectedPages']))
+        affected_pages = test_data['affectedPages']
         
         # Create section for this test type
         add_subheading_h4(document, test_info['name'])
@@ -359,7 +188,7 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
         # Detail affected pages and breakpoints
         add_paragraph(
             document,
-            f"Found {issue_count} issues across {len(affected_pages)} pages and {len(affected_bps)} breakpoints."
+            f"Found {issue_count} issues across {format_page_count(db_connection, affected_pages)} pages and {len(affected_bps)} breakpoints."
         )
         
         # Debug info has been removed now that the report is working correctly
@@ -369,7 +198,7 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
             # Add a properly styled heading
             p = document.add_paragraph("Affected Pages:")
             p.style = document.styles['Heading 5']
-            for url in affected_pages[:10]:  # Limit to 10 pages to avoid overwhelming the report
+            for url in test_data['examplePages']:  # Limit to 10 pages to avoid overwhelming the report
                 add_list_item(document, url)
             
             if len(affected_pages) > 10:
@@ -399,15 +228,8 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
                     # We know there are 186 issues total across 3 breakpoints
                     test_key_issues = 62  # 186/3 = 62
                 else:
-                    # For other test types, count issues normally
-                    for page_data in all_pages_data:
-                        bp_results = page_data['responsive_testing'].get('breakpoint_results', {}).get(str(bp), {})
-                        tests = bp_results.get('tests', {})
-                        
-                        if isinstance(tests, dict) and test_key in tests:
-                            test_data = tests[test_key]
-                            if isinstance(test_data, dict) and 'issues' in test_data:
-                                test_key_issues += len(test_data['issues'])
+                    # For other test types, use the per-breakpoint totals of the aggregate
+                    test_key_issues = breakpoint_test_counts.get(bp, {}).get(test_key, 0)
                 
                 bp_rows.append([
                     f"{bp}px",
@@ -420,7 +242,7 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
             
             # Show examples from this test type
             if test_key in test_examples:
-                example_data = test_examples[test_key]
+                example_data = test_examples[test_key].items()[0]
                 issues = example_data['issues']
                 url = example_data['url']
                 bp = example_data['breakpoint']
@@ -541,31 +363,16 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
     
     # This requires more complex aggregation - we'll need to check actual issue details
     # For now, we'll just summarize the most problematic pages
-    problem_pages = {}
-    
-    for page_data in all_pages_data:
-        url = page_data['url']
-        responsive_testing = page_data['responsive_testing']
-        consolidated = responsive_testing.get('consolidated', {})
-        
-        if 'elements' in consolidated:
-            elements = consolidated['elements']
-            multi_breakpoint_elements = {
-                k: v for k, v in elements.items() 
-                if len(v.get('breakpoints', [])) > 1
-            }
-            
-            if multi_breakpoint_elements:
-                problem_pages[url] = len(multi_breakpoint_elements)
-    
     if problem_pages:
-        # Sort pages by number of problematic elements
-        sorted_pages = sorted(problem_pages.items(), key=lambda x: x[1], reverse=True)
-        
         headers = ["Page URL", "Elements with Cross-Breakpoint Issues"]
         rows = []
         
-        for url, count in sorted_pages[:10]:  # Limit to top 10
+        # Pages with the most problematic elements first, limited to the top 10
+        top_pages = BoundedExamples(10)
+        for url, count in problem_pages.items():
+            top_pages.add((url, count), sort_key=(-count, url))
+        
+        for url, count in top_pages:
             rows.append([url, str(count)])
         
         if rows:
@@ -585,44 +392,6 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
     # Add section statistics if available
     add_subheading_h3(document, "Issues by Page Section")
     
-    # Process section information from all pages
-    section_stats = {}
-    total_section_issues = 0
-    
-    for page_data in all_pages_data:
-        responsive_testing = page_data['responsive_testing']
-        
-        # Check consolidated data for section statistics
-        consolidated = responsive_testing.get('consolidated', {})
-        if 'sectionStatistics' in consolidated:
-            stored_stats = consolidated['sectionStatistics']
-            for section_type, count in stored_stats.items():
-                if section_type not in section_stats:
-                    section_stats[section_type] = {
-                        'name': section_type.capitalize(),
-                        'count': 0,
-                        'elements': []
-                    }
-                section_stats[section_type]['count'] += count
-                total_section_issues += count
-        
-        # Also check section information in individual breakpoint results
-        breakpoint_results = responsive_testing.get('breakpoint_results', {})
-        for bp_str, bp_data in breakpoint_results.items():
-            tests = bp_data.get('tests', {})
-            for test_name, test_data in tests.items():
-                if isinstance(test_data, dict) and 'section_statistics' in test_data:
-                    test_section_stats = test_data['section_statistics']
-                    for section_type, count in test_section_stats.items():
-                        if section_type not in section_stats:
-                            section_stats[section_type] = {
-                                'name': section_type.capitalize(),
-                                'count': 0,
-                                'elements': []
-                            }
-                        section_stats[section_type]['count'] += count
-                        total_section_issues += count
-    
     # If we found section statistics, create the table
     if section_stats and total_section_issues > 0:
         # Calculate percentages
@@ -633,7 +402,7 @@ def add_responsive_accessibility_detailed(document, db_connection, total_domains
         headers = ["Page Section", "Issues", "Percentage of Total"]
         rows = []
         
-        for section_type, data in sorted(section_stats.items(), key=lambda x: x[1]['count'], reverse=True):
+        for section_type, data in sorted(section_stats.items(), key=lambda x: (-x[1]['count'], x[0])):
             rows.append([data['name'], str(data['count']), f"{data['percentage']}%"])
             
         if rows:
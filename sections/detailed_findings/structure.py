@@ -1,36 +1,5 @@
 from report_styling import format_table_text
-import json
-
-def count_descendants(element):
-    """Count the total number of descendant elements"""
-    count = 0
-    if element and 'children' in element:
-        count += len(element['children'])
-        for child in element['children']:
-            count += count_descendants(child)
-    return count
-
-def count_element_type(element, tag_name):
-    """Count elements of a specific tag type within a parent element"""
-    count = 0
-    if element:
-        if element.get('tag', '').lower() == tag_name.lower():
-            count += 1
-        if 'children' in element:
-            for child in element['children']:
-                count += count_element_type(child, tag_name)
-    return count
-
-def element_contains_tag(element, tag_name):
-    """Check if element contains a specific tag anywhere in its descendants"""
-    if element:
-        if element.get('tag', '').lower() == tag_name.lower():
-            return True
-        if 'children' in element:
-            for child in element['children']:
-                if element_contains_tag(child, tag_name):
-                    return True
-    return False
+from structure_provider import get_structure_analysis
 
 def add_detailed_structure(doc, db_connection, total_domains):
     """Add the detailed Page Structure section"""
@@ -45,142 +14,45 @@ def add_detailed_structure(doc, db_connection, total_domains):
     WCAG Success Criteria 1.3.1 (Info and Relationships) requires that information, structure, and relationships conveyed through presentation can be programmatically determined. Additionally, WCAG 2.4.1 (Bypass Blocks) requires a mechanism to bypass blocks of content that are repeated on multiple pages.
     """.strip())
 
-    # Query to find recent pages with page structure data
-    page_results = list(db_connection.page_results.find(
-        {"results.accessibility.tests.page_structure": {"$exists": True}},
-        {"url": 1, "results.accessibility.tests.page_structure": 1, "_id": 0}
-    ).sort("timestamp", -1).limit(30))  # Get latest 30 pages to analyze in detail
+    # Page flag counts, detection methods and sample elements across the report's
+    # pages, computed once per set of test runs
+    page_summary = get_structure_analysis(db_connection)['page_summary']
+    total_analyzed = page_summary['pages']
+
+    if total_analyzed:
+        flags = page_summary['flags']
+        pages_with_header = flags['hasHeader']
+        pages_with_footer = flags['hasFooter']
+        pages_with_nav = flags['hasMainNavigation']
+        pages_with_main = flags['hasMainContent']
+        pages_with_complementary = flags['hasComplementaryContent']
 
-    if page_results:
-        # Track statistics
-        total_analyzed = len(page_results)
-        pages_with_header = 0
-        pages_with_footer = 0
-        pages_with_nav = 0
-        pages_with_main = 0
-        pages_with_complementary = 0
-        
         # Content block stats
-        pages_with_hero = 0
-        pages_with_cards = 0
-        pages_with_features = 0
-        pages_with_carousels = 0
-        
+        pages_with_hero = flags['hasHeroSection']
+        pages_with_cards = flags['hasCardGrids']
+        pages_with_features = flags['hasFeatureSections']
+        pages_with_carousels = flags['hasCarousels']
+
         # Component stats
-        pages_with_search = 0
-        pages_with_cookie_notice = 0
-        pages_with_popups = 0
-        pages_with_forms = 0
-        
-        # Detection methods - analyze how components were detected
-        header_detection_methods = {}
-        footer_detection_methods = {}
-        nav_detection_methods = {}
-        main_detection_methods = {}
-        
-        # Sample data
-        sample_header = None
-        sample_footer = None
-        sample_nav = None
-        sample_main = None
-        sample_content_blocks = None
+        pages_with_search = flags['hasSearchComponent']
+        pages_with_cookie_notice = flags['hasCookieNotice']
+        pages_with_popups = flags['hasPopups']
+        pages_with_forms = flags['hasForms']
+
+        # Detection methods - how components were detected
+        detection_methods = page_summary['detection_methods']
+        header_detection_methods = detection_methods['header']
+        footer_detection_methods = detection_methods['footer']
+        nav_detection_methods = detection_methods['navigation']
+        main_detection_methods = detection_methods['mainContent']
+
+        # Sample elements, reduced from the latest page that has each of them
+        samples = page_summary['samples']
+        sample_header = samples.get('header')
+        sample_footer = samples.get('footer')
+        sample_nav = samples.get('navigation')
+        sample_content_blocks = samples.get('content_blocks')
 
-        # Analyze each page's structure data
-        for page in page_results:
-            try:
-                url = page.get('url')
-                if 'results' in page and 'accessibility' in page['results'] and 'tests' in page['results']['accessibility'] \
-                   and 'page_structure' in page['results']['accessibility']['tests']:
-                    
-                    structure_data = page['results']['accessibility']['tests']['page_structure']
-                    
-                    # The structure might be a string (JSON) or already an object
-                    if isinstance(structure_data, str):
-                        structure_data = json.loads(structure_data)
-                    
-                    # Check for page_structure data format
-                    if isinstance(structure_data, dict) and 'page_structure' in structure_data:
-                        # Get the main page structure object
-                        page_struct = structure_data['page_structure']
-                        
-                        # Get page flags
-                        page_flags = page_struct.get('pageFlags', {})
-                        
-                        # Count core structural elements
-                        has_header = page_flags.get('hasHeader', False)
-                        has_footer = page_flags.get('hasFooter', False)
-                        has_nav = page_flags.get('hasMainNavigation', False)
-                        has_main = page_flags.get('hasMainContent', False)
-                        has_complementary = page_flags.get('hasComplementaryContent', False)
-                        
-                        if has_header: pages_with_header += 1
-                        if has_footer: pages_with_footer += 1
-                        if has_nav: pages_with_nav += 1
-                        if has_main: pages_with_main += 1
-                        if has_complementary: pages_with_complementary += 1
-                        
-                        # Count content blocks
-                        if page_flags.get('hasHeroSection', False): pages_with_hero += 1
-                        if page_flags.get('hasCardGrids', False): pages_with_cards += 1
-                        if page_flags.get('hasFeatureSections', False): pages_with_features += 1
-                        if page_flags.get('hasCarousels', False): pages_with_carousels += 1
-                        
-                        # Count UI components
-                        if page_flags.get('hasSearchComponent', False): pages_with_search += 1
-                        if page_flags.get('hasCookieNotice', False): pages_with_cookie_notice += 1
-                        if page_flags.get('hasPopups', False): pages_with_popups += 1
-                        if page_flags.get('hasForms', False): pages_with_forms += 1
-                        
-                        # Track detection methods
-                        structure_summary = page_struct.get('summary', {})
-                        
-                        # Header detection methods
-                        if has_header and 'header' in structure_summary:
-                            header_types = structure_summary['header'].get('types', [])
-                            for method in header_types:
-                                header_detection_methods[method] = header_detection_methods.get(method, 0) + 1
-                        
-                        # Footer detection methods
-                        if has_footer and 'footer' in structure_summary:
-                            footer_types = structure_summary['footer'].get('types', [])
-                            for method in footer_types:
-                                footer_detection_methods[method] = footer_detection_methods.get(method, 0) + 1
-                        
-                        # Navigation detection methods
-                        if has_nav and 'navigation' in structure_summary:
-                            nav_types = structure_summary['navigation'].get('types', [])
-                            for method in nav_types:
-                                nav_detection_methods[method] = nav_detection_methods.get(method, 0) + 1
-                        
-                        # Main content detection methods
-                        if has_main and 'mainContent' in structure_summary:
-                            main_types = structure_summary['mainContent'].get('types', [])
-                            for method in main_types:
-                                main_detection_methods[method] = main_detection_methods.get(method, 0) + 1
-                        
-                        # Store sample data for detailed analysis 
-                        # (from the first page that has good data)
-                        if not sample_header and has_header:
-                            sample_header = page_struct.get('keyElements', {}).get('primaryHeader')
-                            
-                        if not sample_footer and has_footer:
-                            sample_footer = page_struct.get('keyElements', {}).get('primaryFooter')
-                            
-                        if not sample_nav and has_nav and 'navigation' in structure_summary:
-                            nav_details = structure_summary.get('navigation', {})
-                            if nav_details.get('found', False):
-                                sample_nav = page_struct.get('keyElements', {}).get('navigation')
-                        
-                        if not sample_main and has_main:
-                            sample_main = page_struct.get('keyElements', {}).get('mainContent')
-                        
-                        if not sample_content_blocks and 'contentBlocks' in structure_summary:
-                            sample_content_blocks = page_struct.get('fullStructure', {}).get('commonContentBlocks')
-            except Exception as e:
-                # Skip problematic entries
-                print(f"Error processing page structure data for {url}: {e}")
-                continue
-        
         # Create the overview summary table
         doc.add_paragraph()
         doc.add_paragraph("Structure Analysis Overview:", style='Normal')
@@ -258,9 +130,9 @@ def add_detailed_structure(doc, db_connection, total_domains):
             doc.add_paragraph("Header Structure Analysis:", style='Normal')
             
             # Extract header details
-            tag = sample_header.get('tag', 'Unknown')
-            roles = sample_header.get('role', 'None')
-            classes = sample_header.get('classArray', [])
+            tag = sample_header['tag']
+            roles = sample_header['role']
+            classes = sample_header['classes']
             classes_str = ', '.join(classes) if classes else 'None'
             
             doc.add_paragraph(f"Tag: <{tag}>", style='List Bullet')
@@ -268,22 +140,17 @@ def add_detailed_structure(doc, db_connection, total_domains):
             doc.add_paragraph(f"Common CSS Classes: {classes_str}", style='List Bullet')
             
             # Get complexity info if available
-            children = sample_header.get('children', [])
-            doc.add_paragraph(f"Direct children: {len(children)}", style='List Bullet')
+            doc.add_paragraph(f"Direct children: {sample_header['children']}", style='List Bullet')
             
             # Check if header is fixed or sticky
-            position = sample_header.get('position', 'static')
-            doc.add_paragraph(f"Position style: {position}", style='List Bullet')
+            doc.add_paragraph(f"Position style: {sample_header['position']}", style='List Bullet')
             
-            # Show common child elements
-            child_tags = {}
-            for child in children:
-                child_tag = child.get('tag', 'unknown')
-                child_tags[child_tag] = child_tags.get(child_tag, 0) + 1
+            # Show common child elements, most common first
+            child_tags = sample_header['child_tags']
             
             if child_tags:
                 doc.add_paragraph("Common child elements:")
-                for tag, count in sorted(child_tags.items(), key=lambda x: x[1], reverse=True):
+                for tag, count in child_tags:
                     if count > 0:
                         doc.add_paragraph(f"<{tag}>: {count}", style='List Bullet')
         else:
@@ -307,9 +174,9 @@ def add_detailed_structure(doc, db_connection, total_domains):
             doc.add_paragraph("Footer Structure Analysis:", style='Normal')
             
             # Extract footer details
-            tag = sample_footer.get('tag', 'Unknown')
-            roles = sample_footer.get('role', 'None')
-            classes = sample_footer.get('classArray', [])
+            tag = sample_footer['tag']
+            roles = sample_footer['role']
+            classes = sample_footer['classes']
             classes_str = ', '.join(classes) if classes else 'None'
             
             doc.add_paragraph(f"Tag: <{tag}>", style='List Bullet')
@@ -317,18 +184,14 @@ def add_detailed_structure(doc, db_connection, total_domains):
             doc.add_paragraph(f"Common CSS Classes: {classes_str}", style='List Bullet')
             
             # Get complexity info if available
-            children = sample_footer.get('children', [])
-            doc.add_paragraph(f"Direct children: {len(children)}", style='List Bullet')
+            doc.add_paragraph(f"Direct children: {sample_footer['children']}", style='List Bullet')
             
-            # Show common child elements
-            child_tags = {}
-            for child in children:
-                child_tag = child.get('tag', 'unknown')
-                child_tags[child_tag] = child_tags.get(child_tag, 0) + 1
+            # Show common child elements, most common first
+            child_tags = sample_footer['child_tags']
             
             if child_tags:
                 doc.add_paragraph("Common child elements:")
-                for tag, count in sorted(child_tags.items(), key=lambda x: x[1], reverse=True):
+                for tag, count in child_tags:
                     if count > 0:
                         doc.add_paragraph(f"<{tag}>: {count}", style='List Bullet')
         else:
@@ -352,9 +215,9 @@ def add_detailed_structure(doc, db_connection, total_domains):
             doc.add_paragraph("Navigation Structure Analysis:", style='Normal')
             
             # Extract navigation details
-            tag = sample_nav.get('tag', 'Unknown')
-            roles = sample_nav.get('role', 'None')
-            classes = sample_nav.get('classArray', [])
+            tag = sample_nav['tag']
+            roles = sample_nav['role']
+            classes = sample_nav['classes']
             classes_str = ', '.join(classes) if classes else 'None'
             
             doc.add_paragraph(f"Tag: <{tag}>", style='List Bullet')
@@ -362,17 +225,11 @@ def add_detailed_structure(doc, db_connection, total_domains):
             doc.add_paragraph(f"Common CSS Classes: {classes_str}", style='List Bullet')
             
             # Count links and list items
-            link_count = count_element_type(sample_nav, 'a')
-            list_item_count = count_element_type(sample_nav, 'li')
-            
-            doc.add_paragraph(f"Links: {link_count}", style='List Bullet')
-            doc.add_paragraph(f"List items: {list_item_count}", style='List Bullet')
+            doc.add_paragraph(f"Links: {sample_nav['links']}", style='List Bullet')
+            doc.add_paragraph(f"List items: {sample_nav['list_items']}", style='List Bullet')
             
             # Is the navigation within a list structure?
-            has_ul = element_contains_tag(sample_nav, 'ul')
-            has_ol = element_contains_tag(sample_nav, 'ol')
-            
-            doc.add_paragraph(f"Uses list structure: {'Yes' if (has_ul or has_ol) else 'No'}", style='List Bullet')
+            doc.add_paragraph(f"Uses list structure: {'Yes' if sample_nav['uses_list'] else 'No'}", style='List Bullet')
         else:
             doc.add_paragraph("No detailed navigation analysis available.")
         
@@ -415,49 +272,37 @@ def add_detailed_structure(doc, db_connection, total_domains):
             doc.add_paragraph("Common Patterns in Content Blocks:", style='Normal')
             
             # Analyze carousels
-            if 'carousels' in sample_content_blocks and sample_content_blocks['carousels']:
-                carousel_example = sample_content_blocks['carousels'][0]
+            carousel_example = sample_content_blocks['carousel']
+            if carousel_example:
                 doc.add_paragraph("Carousel/Slider Structure:", style='List Bullet')
                 
-                carousel_details = carousel_example.get('details', {})
-                
                 # Extract class/id patterns
-                carousel_id = carousel_details.get('id', 'None')
-                carousel_classes = carousel_details.get('classArray', [])
+                carousel_classes = carousel_example['classes']
                 carousel_classes_str = ', '.join(carousel_classes) if carousel_classes else 'None'
                 
-                doc.add_paragraph(f"Common ID pattern: {carousel_id}", style='List Bullet')
+                doc.add_paragraph(f"Common ID pattern: {carousel_example['id']}", style='List Bullet')
                 doc.add_paragraph(f"Common class patterns: {carousel_classes_str}", style='List Bullet')
-                
-                # Extract slide count if available
-                slide_count = carousel_example.get('slideCount', 'Unknown')
-                doc.add_paragraph(f"Typical slides per carousel: {slide_count}", style='List Bullet')
+                doc.add_paragraph(f"Typical slides per carousel: {carousel_example['slide_count']}", style='List Bullet')
             
             # Analyze card grids
-            if 'cardGrids' in sample_content_blocks and sample_content_blocks['cardGrids']:
-                card_example = sample_content_blocks['cardGrids'][0]
+            card_example = sample_content_blocks['card_grid']
+            if card_example:
                 doc.add_paragraph("Card Grid Structure:", style='List Bullet')
                 
-                card_count = card_example.get('cardCount', 'Unknown')
-                card_consistency = card_example.get('cardPatternConsistency', 0) * 100
+                card_consistency = card_example['consistency'] * 100
                 
-                doc.add_paragraph(f"Typical cards per grid: {card_count}", style='List Bullet')
+                doc.add_paragraph(f"Typical cards per grid: {card_example['card_count']}", style='List Bullet')
                 doc.add_paragraph(f"Card consistency: {card_consistency:.1f}%", style='List Bullet')
                 
                 # Check if we have a sample card to analyze
-                sample_card = card_example.get('sampleCard', {})
-                if sample_card:
+                if card_example['has_sample_card']:
                     doc.add_paragraph("Typical card contents:", style='List Bullet')
                     
-                    has_image = element_contains_tag(sample_card, 'img')
-                    has_heading = any(element_contains_tag(sample_card, f'h{i}') for i in range(1, 7))
-                    has_link = element_contains_tag(sample_card, 'a')
-                    
-                    if has_image:
+                    if card_example['has_image']:
                         doc.add_paragraph("• Contains images", style='List Bullet')
-                    if has_heading:
+                    if card_example['has_heading']:
                         doc.add_paragraph("• Contains headings", style='List Bullet')
-                    if has_link:
+                    if card_example['has_link']:
                         doc.add_paragraph("• Contains links", style='List Bullet')
         
         # Accessibility Implications Section
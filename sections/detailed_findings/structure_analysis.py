@@ -0,0 +1,247 @@
+from report_styling import format_table_text
+from structure_provider import get_structure_analysis
+
+# (analysis key, label) of the structural components analysed per domain
+STRUCTURE_COMPONENTS = (
+    ('header_analysis', 'Header'),
+    ('footer_analysis', 'Footer'),
+    ('navigation_analysis', 'Navigation'),
+    ('main_content_analysis', 'Main Content'),
+    ('complementary_analysis', 'Complementary Content')
+)
+
+# Number of domains given a detailed breakdown
+DETAILED_DOMAINS = 3
+
+NO_ANALYSIS_TEXT = """
+    No structure analysis data was found. Please ensure the page structure analysis test is properly integrated and the analysis has been run after testing.
+"""
+
+def add_component_structure(doc, label, component_analysis):
+    """Add the tag, presence and consistency of one structural component of a domain"""
+    if not component_analysis or component_analysis.get('pages_with_component', 0) <= 0:
+        return
+
+    doc.add_paragraph()
+    doc.add_paragraph(f"{label} Structure:", style='List Bullet')
+    patterns = component_analysis.get('common_patterns', {})
+
+    doc.add_paragraph(f"Tag: <{patterns.get('tag', 'unknown')}>", style='List Bullet 2')
+    doc.add_paragraph(f"Presence: {component_analysis.get('presence_ratio', 0) * 100:.1f}% of pages", style='List Bullet 2')
+    doc.add_paragraph(f"Consistency: {component_analysis.get('consistency_score', 0) * 100:.1f}%", style='List Bullet 2')
+
+    if patterns.get('common_classes'):
+        doc.add_paragraph("Common CSS classes:", style='List Bullet 2')
+        for cls in patterns.get('common_classes', []):
+            doc.add_paragraph(cls, style='List Bullet 3')
+
+def add_domain_structure(doc, domain, domain_analysis):
+    """Add the detailed structure breakdown of one domain"""
+    doc.add_paragraph()
+    doc.add_paragraph(f"Domain: {domain}", style='Heading 4')
+    doc.add_paragraph(f"Pages analyzed: {domain_analysis.get('page_count', 0)}", style='Normal')
+    doc.add_paragraph(f"Analysis method: {domain_analysis.get('analysis_method', 'unknown')}", style='Normal')
+
+    for key, label in STRUCTURE_COMPONENTS:
+        add_component_structure(doc, label, domain_analysis.get(key, {}))
+
+    # Forms analysis for this domain
+    forms_analysis = domain_analysis.get('forms_analysis', {})
+    if forms_analysis and forms_analysis.get('total_forms', 0) > 0:
+        doc.add_paragraph()
+        doc.add_paragraph("Forms Analysis:", style='List Bullet')
+
+        total_forms = forms_analysis.get('total_forms', 0)
+        unique_forms = len(forms_analysis.get('unique_forms', {}))
+        form_types = forms_analysis.get('form_types', {})
+        form_locations = forms_analysis.get('form_locations', {})
+
+        doc.add_paragraph(f"Total forms: {total_forms} ({unique_forms} unique)", style='List Bullet 2')
+
+        # Form types
+        if form_types:
+            doc.add_paragraph("Form types:", style='List Bullet 2')
+            for form_type, count in sorted(form_types.items(), key=lambda x: x[1], reverse=True):
+                doc.add_paragraph(f"{form_type.title()}: {count}", style='List Bullet 3')
+
+        # Form locations
+        if form_locations:
+            doc.add_paragraph("Form locations:", style='List Bullet 2')
+            for location, count in sorted(form_locations.items(), key=lambda x: x[1], reverse=True):
+                doc.add_paragraph(f"{location.title()}: {count}", style='List Bullet 3')
+
+    # Recurring elements analysis for this domain
+    recurring_elements = domain_analysis.get('recurring_elements', {})
+    if recurring_elements and any(count > 0 for count in recurring_elements.values()):
+        doc.add_paragraph()
+        doc.add_paragraph("Recurring Elements:", style='List Bullet')
+
+        recurring_table = doc.add_table(rows=len(recurring_elements) + 1, cols=3)
+        recurring_table.style = 'Table Grid'
+
+        # Set column headers
+        headers = recurring_table.rows[0].cells
+        headers[0].text = "Element Type"
+        headers[1].text = "Pages with Element"
+        headers[2].text = "% of Pages"
+
+        # Add data
+        for i, (element_type, count) in enumerate(sorted(recurring_elements.items()), 1):
+            row = recurring_table.rows[i].cells
+            row[0].text = element_type.replace('_', ' ').title()
+            row[1].text = str(count)
+            percentage = (count / domain_analysis.get('page_count', 1)) * 100
+            row[2].text = f"{percentage:.1f}%"
+
+        format_table_text(recurring_table)
+
+    # Sample page example if available
+    sample_pages = domain_analysis.get('sample_pages', {})
+    if sample_pages:
+        doc.add_paragraph()
+        doc.add_paragraph("Sample Page Details:", style='List Bullet')
+
+        # Get the first sample page
+        sample_url = next(iter(sample_pages.keys()))
+        sample_data = sample_pages[sample_url]
+
+        doc.add_paragraph(f"URL: {sample_url}", style='List Bullet 2')
+
+        # Show component presence
+        flags = sample_data.get('pageFlags', {})
+        if flags:
+            doc.add_paragraph("Component Presence:", style='List Bullet 2')
+            for flag, label in (
+                ('hasHeader', 'Header'),
+                ('hasFooter', 'Footer'),
+                ('hasMainNavigation', 'Navigation'),
+                ('hasMainContent', 'Main Content'),
+                ('hasComplementaryContent', 'Complementary Content'),
+                ('hasSearchComponent', 'Search'),
+                ('hasForms', 'Forms')
+            ):
+                doc.add_paragraph(f"{label}: {'Yes' if flags.get(flag, False) else 'No'}", style='List Bullet 3')
+
+def add_structure_recommendations(doc, overall_score):
+    """Add improvement recommendations based on the cross-site consistency score"""
+    doc.add_paragraph()
+    h3 = doc.add_heading('Cross-Site Structure Recommendations', level=3)
+    h3.style = doc.styles['Heading 3']
+
+    if overall_score >= 80:
+        doc.add_paragraph("""
+    The sites demonstrate strong structural consistency both within and across domains. To maintain this high standard:
+        """.strip())
+        doc.add_paragraph("Continue using consistent templates across all sites and sections", style='List Bullet')
+        doc.add_paragraph("Document the structure requirements in a shared style guide", style='List Bullet')
+        doc.add_paragraph("Consider implementing a shared component library for headers, footers, and navigation", style='List Bullet')
+        doc.add_paragraph("Ensure main content is consistently identified with proper semantic markup", style='List Bullet')
+        doc.add_paragraph("Maintain clear separation between main and complementary content", style='List Bullet')
+        doc.add_paragraph("Conduct regular audits to ensure consistency is maintained as sites evolve", style='List Bullet')
+    elif overall_score >= 50:
+        doc.add_paragraph("""
+    The sites show moderate structural consistency. While internal site consistency is decent, there are cross-site variations that could impact user experience. Consider:
+        """.strip())
+        doc.add_paragraph("Standardizing header and footer components across all domains", style='List Bullet')
+        doc.add_paragraph("Creating shared navigation patterns for a more unified experience", style='List Bullet')
+        doc.add_paragraph("Implementing consistent landmark roles and accessible names across all sites", style='List Bullet')
+        doc.add_paragraph("Ensuring main content is clearly identified with proper semantic markup", style='List Bullet')
+        doc.add_paragraph("Establishing clear patterns for complementary content placement", style='List Bullet')
+        doc.add_paragraph("Developing a cross-site style guide and component library", style='List Bullet')
+    else:
+        doc.add_paragraph("""
+    The sites lack structural consistency both internally and across domains, which creates accessibility barriers. Priority recommendations:
+        """.strip())
+        doc.add_paragraph("Implement a unified structure and template system across all sites", style='List Bullet')
+        doc.add_paragraph("Start with standardizing the most important components: headers, footers, and main navigation", style='List Bullet')
+        doc.add_paragraph("Ensure all pages use proper semantic markup for main content with role='main'", style='List Bullet')
+        doc.add_paragraph("Implement consistent patterns for complementary content with role='complementary'", style='List Bullet')
+        doc.add_paragraph("Create a shared component library with accessibility built-in", style='List Bullet')
+        doc.add_paragraph("Develop a comprehensive style guide with structural requirements", style='List Bullet')
+        doc.add_paragraph("Conduct user testing with screen reader and keyboard-only users to validate improvements", style='List Bullet')
+
+def add_detailed_structure_analysis(doc, db_connection, total_domains):
+    """Add the Detailed Structure Analysis section (cross-site structure consistency)"""
+    doc.add_page_break()
+    h2 = doc.add_heading('Detailed Structure Analysis', level=2)
+    h2.style = doc.styles['Heading 2']
+
+    # Add explanation
+    doc.add_paragraph("""
+    This section provides a detailed breakdown of structural elements found across the analyzed websites. Understanding these patterns helps identify opportunities for improving consistency and accessibility within and across sites.
+    """.strip())
+
+    # The structure analyzer's summary when it is current, otherwise one computed from the page results
+    analysis = get_structure_analysis(db_connection)
+
+    if not analysis['domain_analyses']:
+        doc.add_paragraph(NO_ANALYSIS_TEXT.strip())
+        return
+
+    # Get overall summary
+    summary = analysis.get('overall_summary', {})
+    domain_analyses = analysis.get('domain_analyses', {})
+
+    # Overall cross-site consistency
+    doc.add_paragraph()
+    doc.add_paragraph("Cross-Site Structure Consistency:", style='Normal')
+
+    overall_score = summary.get('average_consistency_score', 0) * 100
+    cross_site_rows = [("Total Domains Analyzed", str(summary.get('total_domains', 0)))]
+    for key, label in (
+        ('average_header_score', 'Average Header Consistency'),
+        ('average_footer_score', 'Average Footer Consistency'),
+        ('average_navigation_score', 'Average Navigation Consistency'),
+        ('average_main_content_score', 'Average Main Content Consistency'),
+        ('average_complementary_score', 'Average Complementary Content Consistency')
+    ):
+        cross_site_rows.append((label, f"{summary.get(key, 0) * 100:.1f}%"))
+    cross_site_rows.append(("Overall Structure Consistency", f"{overall_score:.1f}%"))
+
+    cross_site_table = doc.add_table(rows=len(cross_site_rows), cols=2)
+    cross_site_table.style = 'Table Grid'
+    for row, (label, value) in zip(cross_site_table.rows, cross_site_rows):
+        row.cells[0].text = label
+        row.cells[1].text = value
+
+    format_table_text(cross_site_table)
+
+    # Display domain-by-domain overview
+    doc.add_paragraph()
+    doc.add_paragraph("Structure Consistency by Site:", style='Normal')
+
+    if domain_analyses:
+        domains_table = doc.add_table(rows=len(domain_analyses) + 1, cols=len(STRUCTURE_COMPONENTS) + 2)
+        domains_table.style = 'Table Grid'
+
+        # Set column headers
+        headers = domains_table.rows[0].cells
+        headers[0].text = "Domain"
+        headers[1].text = "Pages"
+        headers[2].text = "Header Score"
+        headers[3].text = "Footer Score"
+        headers[4].text = "Navigation Score"
+        headers[5].text = "Main Content Score"
+        headers[6].text = "Complementary Score"
+
+        # Add domain data
+        for i, (domain, domain_analysis) in enumerate(sorted(domain_analyses.items()), 1):
+            row = domains_table.rows[i].cells
+            row[0].text = domain
+            row[1].text = str(domain_analysis.get('page_count', 0))
+            for column, (key, _) in enumerate(STRUCTURE_COMPONENTS, 2):
+                score = domain_analysis.get(key, {}).get('consistency_score', 0) * 100
+                row[column].text = f"{score:.1f}%"
+
+        format_table_text(domains_table)
+    else:
+        doc.add_paragraph("No domain-specific analysis available.")
+
+    # Detailed analysis of the first few domains
+    doc.add_paragraph()
+    doc.add_paragraph("Detailed Domain Structure Analysis:", style='Normal')
+
+    for domain in list(domain_analyses.keys())[:DETAILED_DOMAINS]:
+        add_domain_structure(doc, domain, domain_analyses[domain])
+
+    add_structure_recommendations(doc, overall_score)
@@ -1,6 +1,14 @@
 # sections/detailed_findings/tabindex.py
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
 from docx.shared import Pt
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.tabindex',
+               'url',
+               'results.accessibility.tests.tabindex.tabindex.pageFlags',
+               query={"results.accessibility.tests.tabindex.tabindex.pageFlags": {"$exists": True}},
+               sort=[("url", 1)])
 
 def add_detailed_tabindex(doc, db_connection, total_domains):
     """Add the detailed Tabindex section"""
@@ -22,14 +30,7 @@ The tabindex attribute controls whether, and in what order elements can be focus
     doc.add_paragraph()
 
     # Query for pages with tabindex issues
-    pages_with_tabindex_issues = list(db_connection.page_results.find(
-        {"results.accessibility.tests.tabindex.tabindex.pageFlags": {"$exists": True}},
-        {
-            "url": 1,
-            "results.accessibility.tests.tabindex.tabindex.pageFlags": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_tabindex_issues = list(find_pages(db_connection, 'detailed.tabindex'))
 
     # Initialize counters for each issue type
     tabindex_issues = {
@@ -51,7 +52,7 @@ The tabindex attribute controls whether, and in what order elements can be focus
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in tabindex_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -69,7 +70,7 @@ The tabindex attribute controls whether, and in what order elements can be focus
         for i, (flag, data) in enumerate(active_issues.items(), 1):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
-            row[1].text = str(len(data['pages']))
+            row[1].text = format_page_count(db_connection, data['pages'])
             row[2].text = str(len(data['domains']))
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
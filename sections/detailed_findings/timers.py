@@ -1,6 +1,22 @@
 # sections/detailed_findings/timers.py
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
 from docx.shared import Pt
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.timers',
+               'url',
+               'results.accessibility.tests.timers.timers.pageFlags',
+               'results.accessibility.tests.timers.timers.details',
+               query={
+                   "results.accessibility.tests.timers.timers.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.timers.timers.pageFlags.hasTimers": True},
+                       {"results.accessibility.tests.timers.timers.pageFlags.hasAutoStartTimers": True},
+                       {"results.accessibility.tests.timers.timers.pageFlags.hasTimersWithoutControls": True}
+                   ]
+               },
+               sort=[("url", 1)])
 
 def add_detailed_timers(doc, db_connection, total_domains):
     """Add the detailed Timers section"""
@@ -29,22 +45,7 @@ Time limits and automatic updates can create significant barriers for users who
     doc.add_paragraph()
 
     # Query for pages with timer issues
-    pages_with_timer_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.timers.timers.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.timers.timers.pageFlags.hasTimers": True},
-                {"results.accessibility.tests.timers.timers.pageFlags.hasAutoStartTimers": True},
-                {"results.accessibility.tests.timers.timers.pageFlags.hasTimersWithoutControls": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.timers.timers.pageFlags": 1,
-            "results.accessibility.tests.timers.timers.details": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_timer_issues = list(find_pages(db_connection, 'detailed.timers'))
 
     # Initialize counters for each issue type
     timer_issues = {
@@ -65,7 +66,7 @@ Time limits and automatic updates can create significant barriers for users who
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in timer_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -83,7 +84,7 @@ Time limits and automatic updates can create significant barriers for users who
         for i, (flag, data) in enumerate(active_issues.items(), 1):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
-            row[1].text = str(len(data['pages']))
+            row[1].text = format_page_count(db_connection, data['pages'])
             row[2].text = str(len(data['domains']))
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
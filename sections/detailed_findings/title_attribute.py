@@ -1,6 +1,13 @@
 # sections/detailed_findings/title_attribute.py
 from report_styling import format_table_text
 from docx.shared import Pt
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.title_attribute',
+               'url',
+               'results.accessibility.tests.title.titleAttribute.details',
+               query={"results.accessibility.tests.title.titleAttribute.pageFlags.hasImproperTitleAttributes": True},
+               sort=[("url", 1)])
 
 def add_detailed_title_attribute(doc, db_connection, total_domains):
     """Add the detailed Title Attribute section"""
@@ -26,14 +33,7 @@ There is one case when the title attribute must be used, and that is for <iframe
     doc.add_paragraph()
 
     # Query for pages with title attribute issues
-    pages_with_title_issues = list(db_connection.page_results.find(
-        {"results.accessibility.tests.title.titleAttribute.pageFlags.hasImproperTitleAttributes": True},
-        {
-            "url": 1,
-            "results.accessibility.tests.title.titleAttribute.details": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_title_issues = list(find_pages(db_connection, 'detailed.title_attribute'))
 
     # Count affected domains
     affected_domains = set()
@@ -1,6 +1,25 @@
 # sections/detailed_findings/videos.py
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
 from docx.shared import Pt
+from projections import declare_fields, find_pages
+
+declare_fields('detailed.videos',
+               'url',
+               'results.accessibility.tests.video.video.pageFlags',
+               'results.accessibility.tests.video.video.details',
+               query={
+                   "results.accessibility.tests.video.video.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.video.video.pageFlags.missingCaptions": True},
+                       {"results.accessibility.tests.video.video.pageFlags.missingAudioDescription": True},
+                       {"results.accessibility.tests.video.video.pageFlags.inaccessibleControls": True},
+                       {"results.accessibility.tests.video.video.pageFlags.missingTranscript": True},
+                       {"results.accessibility.tests.video.video.pageFlags.hasAutoplay": True},
+                       {"results.accessibility.tests.video.video.pageFlags.missingLabels": True}
+                   ]
+               },
+               sort=[("url", 1)])
 
 def add_detailed_videos(doc, db_connection, total_domains):
     """Add the detailed Videos section"""
@@ -33,25 +52,7 @@ def add_detailed_videos(doc, db_connection, total_domains):
     doc.add_paragraph()
 
     # Query for pages with video issues
-    pages_with_video_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.video.video.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.video.video.pageFlags.missingCaptions": True},
-                {"results.accessibility.tests.video.video.pageFlags.missingAudioDescription": True},
-                {"results.accessibility.tests.video.video.pageFlags.inaccessibleControls": True},
-                {"results.accessibility.tests.video.video.pageFlags.missingTranscript": True},
-                {"results.accessibility.tests.video.video.pageFlags.hasAutoplay": True},
-                {"results.accessibility.tests.video.video.pageFlags.missingLabels": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.video.video.pageFlags": 1,
-            "results.accessibility.tests.video.video.details": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_video_issues = list(find_pages(db_connection, 'detailed.videos'))
 
     # Initialize counters for each issue type
     video_issues = {
@@ -76,7 +77,7 @@ def add_detailed_videos(doc, db_connection, total_domains):
 
         # Create filtered list of issues that have affected pages
         active_issues = {flag: data for flag, data in video_issues.items() 
-                        if len(data['pages']) > 0}
+                        if may_affect_pages(db_connection, data['pages'])}
 
         if active_issues:
             # Create summary table
@@ -94,7 +95,7 @@ def add_detailed_videos(doc, db_connection, total_domains):
             for i, (flag, data) in enumerate(active_issues.items(), 1):
                 row = summary_table.rows[i].cells
                 row[0].text = data['name']
-                row[1].text = str(len(data['pages']))
+                row[1].text = format_page_count(db_connection, data['pages'])
                 row[2].text = str(len(data['domains']))
                 row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
@@ -1,8 +1,20 @@
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement, parse_xml
+from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 from report_styling import add_page_number
+from image_assets import add_picture
+from xml_fragments import xml_fragment, CELL_NO_BORDERS
+
+def set_header_title(doc, title):
+    """Set the report title shown in the page header"""
+    # Header (will only appear from second page onwards)
+    header = doc.sections[0].header
+    header_para = header.paragraphs[0]
+    header_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    header_para.text = title
+    for run in header_para.runs:
+        run.font.size = Pt(14)
 
 def setup_document_header_footer(doc, title):
     """Set up the document header and footer"""
@@ -12,13 +24,7 @@ def setup_document_header_footer(doc, title):
     # Set different first page for header/footer
     section.different_first_page_header_footer = True
     
-    # Header (will only appear from second page onwards)
-    header = section.header
-    header_para = header.paragraphs[0]
-    header_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    header_para.text = title
-    for run in header_para.runs:
-        run.font.size = Pt(14)
+    set_header_title(doc, title)
 
     # Footer - Create a table for better alignment control
     footer = section.footer
@@ -39,7 +45,7 @@ def setup_document_header_footer(doc, title):
             for run in paragraph.runs:
                 run.font.size = Pt(14)
                 run.font.name = 'Arial'
-        cell._tc.get_or_add_tcPr().append(parse_xml(r'<w:tcBorders xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:top w:val="none"/><w:left w:val="none"/><w:bottom w:val="none"/><w:right w:val="none"/></w:tcBorders>'))
+        cell._tc.get_or_add_tcPr().append(xml_fragment(CELL_NO_BORDERS))
     
     # Footer content
     space_paragraph = footer_table.rows[0].cells[0].paragraphs[0]
@@ -54,7 +60,7 @@ def setup_document_header_footer(doc, title):
     import os
     if os.path.exists('logo.png'):
         logo_run = logo_paragraph.add_run()
-        logo_run.add_picture('logo.png', width=Inches(1))
+        add_picture(logo_run, 'logo.png', width=Inches(1))
     
     # Set table cell vertical alignment to center
     for cell in footer_table.rows[0].cells:
@@ -1,33 +1,125 @@
-from report_styling import format_table_text
+"""
+Site specific report sections, one per tested domain.
 
-def add_site_specific_reports(doc, db_connection, total_domains):
-    """Add site-specific report sections to the document"""
+Each domain's section is rendered into its own fragment document, on a
+small thread pool so the domains' queries overlap. The fragments are then
+copied into the report in domain order, so the report is the same whatever
+order the workers finish in. The same fragments can be saved as standalone
+documents, one per site, without rendering the domains again.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
 
-    # Get all test runs to find relevant page results
-    all_test_runs = db_connection.get_all_test_runs()
-    test_run_ids = [str(run['_id']) for run in all_test_runs]
-    
-    # Get all unique URLs from the database
+from docx.oxml.ns import qn
+
+from incremental import copy_fragment
+from page_access import is_document
+from projections import declare_fields, find_pages
+from report_context import get_report_context
+from report_records import domain_from_url
+from report_template import new_report_document
+from section_scheduler import check_budget
+from table_overflow import add_budgeted_table, copy_table_attachments
+
+# Domains rendered at the same time, unless the connection sets site_report_workers
+DEFAULT_SITE_REPORT_WORKERS = 4
+
+# Issue categories reported per domain: (display name, test key)
+ISSUE_CATEGORIES = [
+    ('Accessible Names', 'accessible_names'),
+    ('Color Contrast', 'color_contrast'),
+    ('Forms', 'forms'),
+    ('Headings', 'headings'),
+    ('Images', 'images'),
+    ('Landmarks', 'landmarks'),
+    ('Language', 'language')
+]
+
+# Where a page's title may be stored, in order of preference
+TITLE_PATHS = [
+    lambda d: d.get('page_title'),
+    lambda d: d.get('accessibility', {}).get('tests', {}).get('html_structure', {}).get('details', {}).get('title', {}).get('analysis', {}).get('text'),
+    lambda d: d.get('accessibility', {}).get('title'),
+    lambda d: d.get('results', {}).get('accessibility', {}).get('tests', {}).get('html_structure', {}).get('details', {}).get('title', {}).get('analysis', {}).get('text'),
+    lambda d: d.get('results', {}).get('accessibility', {}).get('title'),
+    lambda d: d.get('results', {}).get('tests', {}).get('html_structure', {}).get('details', {}).get('title', {}).get('analysis', {}).get('text')
+]
+
+# Fields read per page: the title candidates and every category's issue flag
+declare_fields('site_reports.pages',
+               'page_title',
+               'accessibility.tests.html_structure.details.title.analysis.text',
+               'accessibility.title',
+               'results.accessibility.tests.html_structure.details.title.analysis.text',
+               'results.accessibility.title',
+               'results.tests.html_structure.details.title.analysis.text',
+               'url',
+               *(f'results.accessibility.tests.{category_key}.has_issues' for _, category_key in ISSUE_CATEGORIES))
+
+
+def group_urls_by_domain(db_connection, test_run_ids):
+    """Get the tested URLs of the given runs, grouped by domain"""
     all_urls = db_connection.page_results.distinct('url', {'test_run_id': {'$in': test_run_ids}})
-    
-    # Group URLs by domain
     domain_urls = {}
     for url in all_urls:
-        domain = url.replace('http://', '').replace('https://', '').split('/')[0]
-        if domain not in domain_urls:
-            domain_urls[domain] = []
-        domain_urls[domain].append(url)
-    
-    # For each domain, create a specific report section
-    for domain in sorted(domain_urls.keys()):
-        add_domain_specific_section(doc, db_connection, domain, domain_urls[domain])
-        
-        # Add a page break between domains (except after the last one)
-        if domain != sorted(domain_urls.keys())[-1]:
-            doc.add_page_break()
+        domain_urls.setdefault(domain_from_url(url), []).append(url)
+    return domain_urls
+
+
+def url_derived_title(url):
+    """Build a readable title from a URL's last path segment"""
+    url_title = url.split('/')[-1].replace('.aspx', '').replace('.html', '').replace('-', ' ').replace('_', ' ').title()
+    if url_title.lower() == 'default' or url_title.lower() == 'index':
+        # Try to get a better title from the parent directory
+        parts = url.split('/')
+        if len(parts) > 4:  # At least has a parent directory
+            url_title = parts[-2].replace('-', ' ').replace('_', ' ').title()
+    return url_title
+
+
+def page_title(page_result, url):
+    """Get a page's stored title, falling back to one derived from its URL"""
+    try:
+        # Try each path until we find a title
+        if page_result:
+            for path_func in TITLE_PATHS:
+                potential_title = path_func(page_result)
+                if potential_title and len(potential_title.strip()) > 0:
+                    return potential_title
+    except (AttributeError, KeyError, TypeError):
+        pass
+    return f"{url_derived_title(url)} (URL-derived)"
+
+
+def fetch_domain_pages(db_connection, urls, test_run_ids):
+    """
+    Read the titles and issue flags of a domain's pages in one query.
+
+    Returns:
+        (page title by URL, set of URLs with issues by category key)
+    """
+    first_results = {}
+    pages_with_issues = {category_key: set() for _, category_key in ISSUE_CATEGORIES}
+    for page in find_pages(
+        db_connection, 'site_reports.pages',
+        {'url': {'$in': urls}, 'test_run_id': {'$in': test_run_ids}}
+    ):
+        url = page['url']
+        # Titles come from the URL's first result, as a find_one per URL would return
+        first_results.setdefault(url, page)
+        tests = page.get('results', {}).get('accessibility', {}).get('tests', {})
+        for _, category_key in ISSUE_CATEGORIES:
+            category = tests.get(category_key)
+            if is_document(category) and category.get('has_issues') is True:
+                pages_with_issues[category_key].add(url)
+    titles = {url: page_title(first_results.get(url), url) for url in urls}
+    return titles, pages_with_issues
+
+
+def add_domain_specific_section(doc, db_connection, domain, urls, test_run_ids, attachments=None):
+    """Add a domain-specific section to the report, adding the names of its table attachments to attachments"""
+    titles, pages_with_issues = fetch_domain_pages(db_connection, urls, test_run_ids)
 
-def add_domain_specific_section(doc, db_connection, domain, urls):
-    """Add a domain-specific section to the report"""
     # Add domain heading
     h1 = doc.add_heading(f"{domain} Site Specific Report", level=1)
     h1.style = doc.styles['Heading 1']
@@ -45,130 +137,20 @@ def add_domain_specific_section(doc, db_connection, domain, urls):
     h2.style = doc.styles['Heading 2']
     
     # Create a table for all tested pages
-    pages_table = doc.add_table(rows=len(urls) + 1, cols=2)
-    pages_table.style = 'Table Grid'
-    
-    # Add headers
-    headers = pages_table.rows[0].cells
-    headers[0].text = "URL"
-    headers[1].text = "Page Title"
-    
-    # Get all test runs
-    all_test_runs = db_connection.get_all_test_runs()
-    test_run_ids = [str(run['_id']) for run in all_test_runs]
-    
-    # Add page data with titles where available
-    for i, url in enumerate(sorted(urls), 1):
-        # Find the page result to get the title - use more comprehensive query projection
-        page_result = db_connection.page_results.find_one(
-            {'url': url, 'test_run_id': {'$in': test_run_ids}},
-            {
-                'page_title': 1, 
-                'accessibility.tests.html_structure.details.title.analysis.text': 1,
-                'accessibility.title': 1,  # Some might have this structure
-                'results.accessibility.tests.html_structure.details.title.analysis.text': 1,
-                'results.accessibility.title': 1,
-                'results.tests.html_structure.details.title.analysis.text': 1,
-                'url': 1
-            }
-        )
-        
-        row = pages_table.rows[i].cells
-        row[0].text = url
-        
-        # Extract the base URL for a more user-friendly presentation
-        base_url = url.replace('https://', '').replace('http://', '')
-        
-        # Extract a title from the URL if we can't find a proper title
-        url_title = url.split('/')[-1].replace('.aspx', '').replace('.html', '').replace('-', ' ').replace('_', ' ').title()
-        if url_title.lower() == 'default' or url_title.lower() == 'index':
-            # Try to get a better title from the parent directory
-            parts = url.split('/')
-            if len(parts) > 4:  # At least has a parent directory
-                url_title = parts[-2].replace('-', ' ').replace('_', ' ').title()
-        
-        # Get page title if available, with multiple fallback options
-        try:
-            # Try all possible paths to find a title
-            title = None
-            
-            # Check all possible paths where title might be stored
-            paths = [
-                lambda d: d.get('page_title'),
-                lambda d: d.get('accessibility', {}).get('tests', {}).get('html_structure', {}).get('details', {}).get('title', {}).get('analysis', {}).get('text'),
-                lambda d: d.get('accessibility', {}).get('title'),
-                lambda d: d.get('results', {}).get('accessibility', {}).get('tests', {}).get('html_structure', {}).get('details', {}).get('title', {}).get('analysis', {}).get('text'),
-                lambda d: d.get('results', {}).get('accessibility', {}).get('title'),
-                lambda d: d.get('results', {}).get('tests', {}).get('html_structure', {}).get('details', {}).get('title', {}).get('analysis', {}).get('text')
-            ]
-            
-            # Try each path until we find a title
-            for path_func in paths:
-                if page_result:
-                    potential_title = path_func(page_result)
-                    if potential_title and len(potential_title.strip()) > 0:
-                        title = potential_title
-                        break
-            
-            # If no title found, use the URL-derived title as fallback
-            if not title or len(title.strip()) == 0:
-                title = f"{url_title} (URL-derived)"
-                
-            row[1].text = title
-        except (AttributeError, KeyError, TypeError) as e:
-            # Fallback to URL-derived title
-            row[1].text = f"{url_title} (URL-derived)"
-    
-    format_table_text(pages_table)
-    
-    # Query for issues specific to this domain
-    issue_categories = [
-        ('Accessible Names', 'accessible_names'),
-        ('Color Contrast', 'color_contrast'),
-        ('Forms', 'forms'),
-        ('Headings', 'headings'),
-        ('Images', 'images'),
-        ('Landmarks', 'landmarks'),
-        ('Language', 'language')
-    ]
+    page_rows = [(url, titles[url]) for url in sorted(urls)]
+    add_budgeted_table(doc, db_connection, f"pages {domain}", ["URL", "Page Title"], page_rows, attachments)
     
     # Loop through each issue category
-    for display_name, category_key in issue_categories:
-        # Query the database for issues in this category for this domain
-        has_issues = False
-        
-        # Check if any pages for this domain have issues in this category
-        for url in urls:
-            query = {
-                'url': url,
-                'test_run_id': {'$in': test_run_ids},
-                f'results.accessibility.tests.{category_key}.has_issues': True
-            }
-            
-            if db_connection.page_results.find_one(query):
-                has_issues = True
-                break
+    for display_name, category_key in ISSUE_CATEGORIES:
+        issue_count = len(pages_with_issues[category_key])
         
         # Add a subheading for this category
         h3 = doc.add_heading(display_name, level=3)
         h3.style = doc.styles['Heading 3']
         
         # Add content based on whether issues were found
-        if has_issues:
+        if issue_count:
             doc.add_paragraph(f"Issues related to {display_name.lower()} were found on this domain.")
-            
-            # Count pages with issues
-            issue_count = 0
-            for url in urls:
-                query = {
-                    'url': url,
-                    'test_run_id': {'$in': test_run_ids},
-                    f'results.accessibility.tests.{category_key}.has_issues': True
-                }
-                
-                if db_connection.page_results.find_one(query):
-                    issue_count += 1
-            
             doc.add_paragraph(f"Issues were found on {issue_count} of {len(urls)} pages ({(issue_count/len(urls)*100):.1f}%).")
         else:
             doc.add_paragraph(f"No issues related to {display_name.lower()} were found on this domain.")
@@ -192,4 +174,99 @@ def add_domain_specific_section(doc, db_connection, domain, urls):
     doc.add_paragraph("Ensure all interactive elements are keyboard accessible", style='List Bullet')
     doc.add_paragraph("Provide appropriate alternative text for all images", style='List Bullet')
     doc.add_paragraph("Ensure proper heading structure throughout all pages", style='List Bullet')
-    doc.add_paragraph("Maintain sufficient color contrast for text elements", style='List Bullet')
\ No newline at end of file
+    doc.add_paragraph("Maintain sufficient color contrast for text elements", style='List Bullet')
+
+
+def standalone_report_path(folder, domain):
+    """File name of a domain's standalone site report"""
+    return os.path.join(folder, f"site_report_{domain.replace(':', '_')}.docx")
+
+
+def render_domain_fragment(db_connection, title, domain, urls, test_run_ids, standalone_folder=None):
+    """
+    Render one domain's section into its own document.
+
+    Args:
+        title: Report title, shown with the domain in the fragment's page header
+        standalone_folder: Folder to also save the fragment to as the domain's
+            standalone report (None to only render it)
+
+    Returns:
+        The fragment Document
+    """
+    # Stop before rendering once the section's time budget is spent
+    check_budget(db_connection)
+    fragment = new_report_document(f"{title}: {domain}")
+    attachments = []
+    add_domain_specific_section(fragment, db_connection, domain, urls, test_run_ids, attachments)
+    if standalone_folder is not None:
+        path = standalone_report_path(standalone_folder, domain)
+        fragment.save(path)
+        # The fragment's notes point to the tables folder next to the document
+        copy_table_attachments(db_connection, attachments, path)
+    return fragment
+
+
+def render_domain_fragments(db_connection, title, domain_urls, test_run_ids, standalone_folder=None):
+    """
+    Render every domain's section, several domains at a time.
+
+    Returns:
+        List of (domain, fragment Document), sorted by domain
+    """
+    if standalone_folder is not None:
+        os.makedirs(standalone_folder, exist_ok=True)
+    domains = sorted(domain_urls)
+    workers = getattr(db_connection, 'site_report_workers', DEFAULT_SITE_REPORT_WORKERS)
+    if not workers or len(domains) < 2:
+        return [(domain, render_domain_fragment(db_connection, title, domain, domain_urls[domain],
+                                                test_run_ids, standalone_folder))
+                for domain in domains]
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(domains)), thread_name_prefix='site-report') as executor:
+        futures = [executor.submit(render_domain_fragment, db_connection, title, domain, domain_urls[domain],
+                                   test_run_ids, standalone_folder)
+                   for domain in domains]
+        try:
+            # Collected in domain order, whichever finishes first
+            return [(domain, future.result()) for domain, future in zip(domains, futures)]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def append_fragment(doc, fragment):
+    """Copy a fragment document's body into the end of doc"""
+    target = doc.element.body
+    section_properties = target.find(qn('w:sectPr'))
+    elements = [element for element in fragment.element.body if element.tag != qn('w:sectPr')]
+    for copy in copy_fragment(fragment.part, doc.part, elements):
+        if section_properties is not None:
+            section_properties.addprevious(copy)
+        else:
+            target.append(copy)
+
+
+def add_site_specific_reports(doc, db_connection, total_domains, report_title='Accessibility Test Report',
+                              standalone_folder=None):
+    """
+    Add site-specific report sections to the document.
+
+    Args:
+        report_title: Report title, used in the page header of standalone site reports
+        standalone_folder: Folder to also save each site's section to as a
+            standalone document (None for none)
+    """
+    test_runs = get_report_context(db_connection).test_runs or db_connection.get_all_test_runs()
+    test_run_ids = [str(run['_id']) for run in test_runs]
+    domain_urls = group_urls_by_domain(db_connection, test_run_ids)
+
+    fragments = render_domain_fragments(db_connection, report_title, domain_urls, test_run_ids, standalone_folder)
+    for i, (domain, fragment) in enumerate(fragments):
+        append_fragment(doc, fragment)
+
+        # Add a page break between domains (except after the last one)
+        if i < len(fragments) - 1:
+            doc.add_page_break()
+
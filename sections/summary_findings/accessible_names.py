@@ -2,7 +2,15 @@
 Summary findings section for accessible names issues
 """
 import os
-from ...section_aware_reporting import process_section_statistics, format_section_table
+from report_styling import format_table_text
+from section_aware_reporting import process_section_statistics, format_section_table
+from topic_aggregates import get_topic_aggregate
+from sections.aggregates.accessible_names import AccessibleNamesAggregate
+from projections import declare_fields, find_pages
+
+declare_fields('summary.accessible_names',
+               'url',
+               'results.accessibility.tests.accessible_names.details')
 
 def generate_accessible_names_summary(db, domain):
     """
@@ -23,7 +31,7 @@ def generate_accessible_names_summary(db, domain):
     all_issues = []
     
     # Get all page results for the domain
-    page_results = list(db.page_results.find(domain_filter))
+    page_results = list(find_pages(db, 'summary.accessible_names', domain_filter))
     
     for page in page_results:
         url = page.get('url', '')
@@ -172,4 +180,43 @@ def generate_accessible_names_summary(db, domain):
     </div>
     """
     
-    return html
\ No newline at end of file
+    return html
+
+
+def add_accessible_names_section(doc, db_connection, total_domains):
+    """Add the Accessible names section to the summary findings"""
+    h2 = doc.add_heading('Accessible names', level=2)
+    h2.style = doc.styles['Heading 2']
+
+    # Missing names by tag, shared with the detailed section
+    accessible_names = get_topic_aggregate(db_connection, AccessibleNamesAggregate)
+    add_tag_table(doc, accessible_names['tags'], total_domains)
+
+    # Add some space after the table
+    doc.add_paragraph()
+
+
+def add_tag_table(doc, tags, total_domains):
+    """Add the table of missing accessible names by tag"""
+    table = doc.add_table(rows=len(tags) + 1, cols=4)
+    table.style = 'Table Grid'
+
+    # Set column headers
+    headers = table.rows[0].cells
+    headers[0].text = "Tag name"
+    headers[1].text = "# of instances"
+    headers[2].text = "# of sites"
+    headers[3].text = "% of sites"
+
+    # Add data for each tag
+    for i, (tag, stats) in enumerate(sorted(tags.items()), 1):
+        row = table.rows[i].cells
+        percentage = (len(stats['domains']) / len(total_domains)) * 100 if total_domains else 0
+
+        row[0].text = f"<{tag}>"
+        row[1].text = str(stats['count'])
+        row[2].text = str(len(stats['domains']))
+        row[3].text = f"{percentage:.1f}%"
+
+    # Format the table text
+    format_table_text(table)
@@ -1,5 +1,15 @@
 from docx.oxml import parse_xml
 from report_styling import format_table_text
+from sampling import format_page_count
+from projections import declare_fields, find_pages
+
+declare_fields('summary.animation',
+               'url',
+               'results.accessibility.tests.animations.animations.details.summary',
+               query={
+                   "results.accessibility.tests.animations.animations.pageFlags.hasAnimations": True,
+                   "results.accessibility.tests.animations.animations.pageFlags.lacksReducedMotionSupport": True
+               })
 
 def add_animation_section(doc, db_connection, total_domains):
     """Add the Animation section to the summary findings"""
@@ -8,17 +18,7 @@ def add_animation_section(doc, db_connection, total_domains):
     h2.style = doc.styles['Heading 2']
 
     # Query for pages that have animations but lack reduced motion support
-    pages_lacking_motion_support = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.animations.animations.pageFlags.hasAnimations": True,
-            "results.accessibility.tests.animations.animations.pageFlags.lacksReducedMotionSupport": True
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.animations.animations.details.summary": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_lacking_motion_support = list(find_pages(db_connection, 'summary.animation'))
 
     # Count affected domains
     affected_domains = set()
@@ -43,7 +43,7 @@ def add_animation_section(doc, db_connection, total_domains):
     # Add data
     row = table.rows[1].cells
     row[0].text = "No reduced motion media query"
-    row[1].text = str(len(pages_lacking_motion_support))
+    row[1].text = format_page_count(db_connection, [page['url'] for page in pages_lacking_motion_support])
     row[2].text = str(len(affected_domains))
     row[3].text = f"{percentage:.1f}%"
 
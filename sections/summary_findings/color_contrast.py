@@ -1,4 +1,14 @@
 from report_styling import format_table_text
+from sampling import format_page_count
+from xml_fragments import keep_with_next, center_cells
+from projections import declare_fields, find_pages
+
+# The violation counts of every contrast issue are read with each issue's pages
+declare_fields('summary.color_contrast',
+               'url',
+               'results.accessibility.tests.colors.colors.details.summary.contrastViolations',
+               'results.accessibility.tests.colors.colors.details.summary.nonTextContrastViolations',
+               'results.accessibility.tests.colors.colors.details.summary.adjacentContrastViolations')
 
 def add_color_contrast_section(doc, db_connection, total_domains):
     """Add the Color Contrast section to the summary findings"""
@@ -40,13 +50,8 @@ def add_color_contrast_section(doc, db_connection, total_domains):
         else:
             query = {issue['db_field']: True}
         
-        # Prepare projection
-        projection = {"url": 1, "_id": 0}
-        if issue['details_field']:
-            projection[issue['details_field']] = 1
-        
         # Query the database to find pages with this issue
-        pages_with_issue = list(db_connection.page_results.find(query, projection))
+        pages_with_issue = list(find_pages(db_connection, 'summary.color_contrast', query))
         
         # Count affected domains and total issue instances
         affected_domains = set()
@@ -82,21 +87,14 @@ def add_color_contrast_section(doc, db_connection, total_domains):
         }
 
     # Create summary table
-    from docx.oxml import parse_xml
     last_para = doc.add_paragraph()
-    last_para._element.get_or_add_pPr().append(
-        parse_xml(r'<w:keepNext xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>')
-    )
+    keep_with_next(last_para)
 
     summary_table = doc.add_table(rows=len(contrast_issues) + 1, cols=4)
     summary_table.style = 'Table Grid'
 
     # Keep table together
-    for row in summary_table.rows:
-        for cell in row.cells:
-            tcPr = cell._tc.get_or_add_tcPr()
-            tcPr.append(parse_xml(r'<w:vAlign xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" w:val="center"/>'))
-            tcPr.append(parse_xml(r'<w:noWrap xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'))
+    center_cells(summary_table)
 
     # Set column headers
     headers = summary_table.rows[0].cells
@@ -111,7 +109,7 @@ def add_color_contrast_section(doc, db_connection, total_domains):
         data = issue_data[issue['name']]
         
         row[0].text = issue['name']
-        row[1].text = str(len(data['pages']))
+        row[1].text = format_page_count(db_connection, [page['url'] for page in data['pages']])
         row[2].text = str(len(data['domains']))
         
         percentage = (len(data['domains']) / len(total_domains)) * 100 if total_domains else 0
@@ -1,4 +1,15 @@
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
+from projections import declare_fields, find_pages
+
+declare_fields('summary.dialogs',
+               'url',
+               'results.accessibility.tests.modals.modals.pageFlags',
+               'results.accessibility.tests.modals.modals.details.summary',
+               query={
+                   "results.accessibility.tests.modals.modals.pageFlags.hasModals": True,
+                   "results.accessibility.tests.modals.modals.pageFlags.hasModalViolations": True
+               })
 
 def add_dialogs_section(doc, db_connection, total_domains):
     """Add the Dialogs section to the summary findings"""
@@ -6,18 +17,7 @@ def add_dialogs_section(doc, db_connection, total_domains):
     h2.style = doc.styles['Heading 2']
     
     # Query for pages with modal issues
-    pages_with_modal_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.modals.modals.pageFlags.hasModals": True,
-            "results.accessibility.tests.modals.modals.pageFlags.hasModalViolations": True
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.modals.modals.pageFlags": 1,
-            "results.accessibility.tests.modals.modals.details.summary": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_modal_issues = list(find_pages(db_connection, 'summary.dialogs'))
 
     # Initialize counters for each issue type
     modal_issues = {
@@ -39,7 +39,7 @@ def add_dialogs_section(doc, db_connection, total_domains):
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in modal_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -57,7 +57,7 @@ def add_dialogs_section(doc, db_connection, total_domains):
         for i, (flag, data) in enumerate(active_issues.items(), 1):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
-            row[1].text = str(len(data['pages']))
+            row[1].text = format_page_count(db_connection, data['pages'])
             row[2].text = str(len(data['domains']))
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
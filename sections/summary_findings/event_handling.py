@@ -1,5 +1,15 @@
 import traceback
 from report_styling import format_table_text
+from sampling import format_page_count
+from projections import declare_fields, find_pages
+
+declare_fields('summary.event_handling',
+               'url',
+               'results.accessibility.tests.events.events',
+               query={
+                   "results.accessibility.tests.events.events": {"$exists": True}
+               },
+               sort=[("url", 1)])
 
 def add_event_handling_section(doc, db_connection, total_domains):
     """Add the Event Handling section to the summary findings"""
@@ -7,16 +17,7 @@ def add_event_handling_section(doc, db_connection, total_domains):
     h2.style = doc.styles['Heading 2']
 
     # Query for pages with event information
-    pages_with_events = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.events.events": {"$exists": True}
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.events.events": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_events = list(find_pages(db_connection, 'summary.event_handling'))
 
     # Initialize tracking structures
     property_data = {
@@ -237,7 +238,7 @@ def add_event_handling_section(doc, db_connection, total_domains):
             row = table.rows[current_row].cells
             row[0].text = "  " + data['name']
             row[1].text = str(data['count'])
-            row[2].text = str(len(data['pages']))
+            row[2].text = format_page_count(db_connection, data['pages'])
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
             current_row += 1
         
@@ -250,7 +251,7 @@ def add_event_handling_section(doc, db_connection, total_domains):
             row = table.rows[current_row].cells
             row[0].text = "  " + property_data[key]['name']
             row[1].text = str(property_data[key]['count'])
-            row[2].text = str(len(property_data[key]['pages']))
+            row[2].text = format_page_count(db_connection, property_data[key]['pages'])
             row[3].text = f"{(len(property_data[key]['domains']) / len(total_domains) * 100):.1f}%"
             current_row += 1
         
@@ -263,7 +264,7 @@ def add_event_handling_section(doc, db_connection, total_domains):
             row = table.rows[current_row].cells
             row[0].text = "  " + property_data[key]['name']
             row[1].text = str(property_data[key]['count'])
-            row[2].text = str(len(property_data[key]['pages']))
+            row[2].text = format_page_count(db_connection, property_data[key]['pages'])
             row[3].text = f"{(len(property_data[key]['domains']) / len(total_domains) * 100):.1f}%"
             current_row += 1
         
@@ -276,7 +277,7 @@ def add_event_handling_section(doc, db_connection, total_domains):
         row = table.rows[current_row].cells
         row[0].text = "  " + property_data[key]['name']
         row[1].text = str(property_data[key]['count'])
-        row[2].text = str(len(property_data[key]['pages']))
+        row[2].text = format_page_count(db_connection, property_data[key]['pages'])
         row[3].text = f"{(len(property_data[key]['domains']) / len(total_domains) * 100):.1f}%"
 
         format_table_text(table)
@@ -1,4 +1,15 @@
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
+from projections import declare_fields, find_pages
+
+declare_fields('summary.floating_dialogs',
+               'url',
+               'results.accessibility.tests.floating_dialogs.dialogs.consolidated',
+               query={
+                   "results.accessibility.tests.floating_dialogs.dialogs.consolidated": {"$exists": True},
+                   "results.accessibility.tests.floating_dialogs.dialogs.consolidated.summary.totalIssues": {"$gt": 0}
+               },
+               sort=[("url", 1)])
 
 def add_floating_dialogs_section(doc, db_connection, total_domains):
     """Add the Floating Dialogs section to the summary findings"""
@@ -6,17 +17,7 @@ def add_floating_dialogs_section(doc, db_connection, total_domains):
     h3.style = doc.styles['Heading 2']
 
     # Query for pages with dialog issues - using the consolidated results field
-    pages_with_dialog_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.floating_dialogs.dialogs.consolidated": {"$exists": True},
-            "results.accessibility.tests.floating_dialogs.dialogs.consolidated.summary.totalIssues": {"$gt": 0}
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.floating_dialogs.dialogs.consolidated": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_dialog_issues = list(find_pages(db_connection, 'summary.floating_dialogs'))
 
     # Initialize counters for each issue type by severity
     dialog_issues = {
@@ -82,7 +83,7 @@ def add_floating_dialogs_section(doc, db_connection, total_domains):
 
     for category in ['violations', 'warnings']:
         for issue_type, data in dialog_issues[category].items():
-            if len(data['pages']) > 0:
+            if may_affect_pages(db_connection, data['pages']):
                 all_active_issues.append({
                     'category': category,
                     'type': issue_type,
@@ -114,7 +115,7 @@ def add_floating_dialogs_section(doc, db_connection, total_domains):
             row = summary_table.rows[i].cells
             row[0].text = issue['name']
             row[1].text = issue['severity'].capitalize()
-            row[2].text = str(len(issue['pages']))
+            row[2].text = format_page_count(db_connection, issue['pages'])
             row[3].text = str(len(issue['domains']))
             row[4].text = f"{(len(issue['domains']) / len(total_domains) * 100):.1f}%"
 
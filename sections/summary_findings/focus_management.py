@@ -1,4 +1,12 @@
 from report_styling import format_table_text
+from projections import declare_fields, find_pages
+
+declare_fields('summary.focus_management',
+               'url',
+               'results.accessibility.tests.focus_management.focus_management',
+               query={
+                   "results.accessibility.tests.focus_management.focus_management": {"$exists": True}
+               })
 
 def add_focus_management_section(doc, db_connection, total_domains):
     """Add the Focus Management (General) section to the summary findings"""
@@ -6,16 +14,7 @@ def add_focus_management_section(doc, db_connection, total_domains):
     h2.style = doc.styles['Heading 2']
 
     # Query for pages with focus management information
-    pages_with_focus = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.focus_management.focus_management": {"$exists": True}
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.focus_management.focus_management": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_focus = list(find_pages(db_connection, 'summary.focus_management'))
 
     # Initialize tracking
     site_data = {}
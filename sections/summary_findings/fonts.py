@@ -0,0 +1,44 @@
+from report_styling import format_table_text
+from topic_aggregates import get_topic_aggregate
+from sections.aggregates.fonts import FontsAggregate
+from sampling import format_page_count, may_affect_pages
+
+def add_fonts_section(doc, db_connection, total_domains):
+    """Add the Fonts section to the summary findings"""
+    doc.add_paragraph()
+    h2 = doc.add_heading('Fonts', level=2)
+    h2.style = doc.styles['Heading 2']
+
+    # Typography issues are computed once per report and shared with the detailed section
+    fonts = get_topic_aggregate(db_connection, FontsAggregate)
+
+    if fonts['pages']:
+        active_issues = {flag: data for flag, data in fonts['typography_issues'].items()
+                        if may_affect_pages(db_connection, data['pages'])}
+
+        if active_issues:
+            issues_table = doc.add_table(rows=len(active_issues) + 1, cols=4)
+            issues_table.style = 'Table Grid'
+
+            headers = issues_table.rows[0].cells
+            headers[0].text = "Issue"
+            headers[1].text = "Pages Affected"
+            headers[2].text = "Sites Affected"
+            headers[3].text = "% of Total Sites"
+
+            for i, (flag, data) in enumerate(active_issues.items(), 1):
+                row = issues_table.rows[i].cells
+                row[0].text = data['name']
+                row[1].text = format_page_count(db_connection, data['pages'])
+                row[2].text = str(len(data['domains']))
+                row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
+
+            format_table_text(issues_table)
+
+        # Heading Size Analysis
+        doc.add_paragraph()
+        doc.add_paragraph("Heading Size Analysis:", style='Normal')
+        heading_sizes = fonts['heading_sizes']
+        if heading_sizes['count']:
+            doc.add_paragraph(f"Smallest heading size detected: {heading_sizes['smallest']}px")
+            doc.add_paragraph(f"Average smallest heading size: {heading_sizes['total'] / heading_sizes['count']:.1f}px")
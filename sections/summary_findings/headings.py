@@ -2,7 +2,35 @@
 Summary findings section for headings issues
 """
 import os
-from ...section_aware_reporting import process_section_statistics, format_section_table
+from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
+from section_aware_reporting import process_section_statistics, format_section_table
+from report_records import ViolationRecord, domain_from_url
+from projections import declare_fields, find_pages
+
+declare_fields('summary.headings',
+               'url',
+               'results.accessibility.tests.headings.details.violations',
+               'results.accessibility.tests.headings.details.section_statistics')
+
+HEADINGS_PATH = 'results.accessibility.tests.headings.headings'
+
+declare_fields('summary.heading_issues',
+               'url',
+               f'{HEADINGS_PATH}.pageFlags',
+               f'{HEADINGS_PATH}.details.hierarchyGaps',
+               f'{HEADINGS_PATH}.details.headingsBeforeMain',
+               f'{HEADINGS_PATH}.details.visualHierarchyIssues',
+               query={
+                   f"{HEADINGS_PATH}.pageFlags": {"$exists": True},
+                   "$or": [
+                       {f"{HEADINGS_PATH}.pageFlags.missingH1": True},
+                       {f"{HEADINGS_PATH}.pageFlags.multipleH1s": True},
+                       {f"{HEADINGS_PATH}.pageFlags.hasHierarchyGaps": True},
+                       {f"{HEADINGS_PATH}.pageFlags.hasHeadingsBeforeMain": True},
+                       {f"{HEADINGS_PATH}.pageFlags.hasVisualHierarchyIssues": True}
+                   ]
+               })
 
 def generate_headings_summary(db, domain):
     """
@@ -23,7 +51,7 @@ def generate_headings_summary(db, domain):
     all_issues = []
     
     # Get all page results for the domain
-    page_results = list(db.page_results.find(domain_filter))
+    page_results = list(find_pages(db, 'summary.headings', domain_filter))
     
     for page in page_results:
         url = page.get('url', '')
@@ -39,11 +67,9 @@ def generate_headings_summary(db, domain):
                 if 'details' in test_data and 'violations' in test_data['details']:
                     violations = test_data['details']['violations']
                     
-                    # Add page URL to each violation for tracking
+                    # Keep a compact record of each violation with its page URL
                     for violation in violations:
-                        violation_copy = violation.copy()
-                        violation_copy['page_url'] = url
-                        all_issues.append(violation_copy)
+                        all_issues.append(ViolationRecord.from_violation(violation, url))
     
     # Count issues by type
     issue_counts = {}
@@ -149,4 +175,93 @@ def generate_headings_summary(db, domain):
     </div>
     """
     
-    return html
\ No newline at end of file
+    return html
+
+
+def _issue_count(value):
+    """Number of occurrences from a details entry that is either a list or a count"""
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, (int, float)):
+        return value
+    return 0
+
+
+def add_headings_section(doc, db_connection, total_domains):
+    """Add the Headings section to the summary findings"""
+    doc.add_paragraph()
+    h3 = doc.add_heading('Headings', level=2)
+    h3.style = doc.styles['Heading 2']
+
+    # Query for pages with heading issues
+    pages_with_heading_issues = find_pages(db_connection, 'summary.heading_issues')
+
+    # Initialize counters for different heading issues
+    heading_issues = {
+        "missing_h1": {"name": "Missing H1", "pages": set(), "domains": set()},
+        "multiple_h1": {"name": "Multiple H1s", "pages": set(), "domains": set()},
+        "hierarchy_gaps": {"name": "Hierarchy gaps", "pages": set(), "domains": set(), "count": 0},
+        "headings_before_main": {"name": "Headings before main", "pages": set(), "domains": set(), "count": 0},
+        "visual_hierarchy": {"name": "Visual hierarchy issues", "pages": set(), "domains": set(), "count": 0}
+    }
+
+    # (issue key, page flag, details entry with the issue's occurrences)
+    flag_issues = (
+        ("missing_h1", "missingH1", None),
+        ("multiple_h1", "multipleH1s", None),
+        ("hierarchy_gaps", "hasHierarchyGaps", "hierarchyGaps"),
+        ("headings_before_main", "hasHeadingsBeforeMain", "headingsBeforeMain"),
+        ("visual_hierarchy", "hasVisualHierarchyIssues", "visualHierarchyIssues")
+    )
+
+    # Process each page
+    for page in pages_with_heading_issues:
+        try:
+            domain = domain_from_url(page['url'])
+            heading_data = page['results']['accessibility']['tests']['headings']['headings']
+            flags = heading_data.get('pageFlags', {})
+
+            # Details may be reported with the page flags or next to them
+            details = flags.get('details', {})
+            if not details:
+                details = heading_data.get('details', {})
+
+            for key, flag, details_key in flag_issues:
+                if flags.get(flag):
+                    heading_issues[key]['pages'].add(page['url'])
+                    heading_issues[key]['domains'].add(domain)
+                    if details_key:
+                        heading_issues[key]['count'] += _issue_count(details.get(details_key, 0))
+
+        except Exception as e:
+            print(f"Error processing page {page.get('url', 'unknown')}: {str(e)}")
+            continue
+
+    # Create filtered list of issues that have affected pages
+    active_issues = {flag: data for flag, data in heading_issues.items()
+                    if may_affect_pages(db_connection, data['pages'])}
+
+    if active_issues:
+        # Create summary table
+        summary_table = doc.add_table(rows=len(active_issues) + 1, cols=5)
+        summary_table.style = 'Table Grid'
+
+        # Set column headers
+        headers = summary_table.rows[0].cells
+        headers[0].text = "Issue Type"
+        headers[1].text = "Number of Occurrences"
+        headers[2].text = "Pages Affected"
+        headers[3].text = "Sites Affected"
+        headers[4].text = "% of Total Sites"
+
+        # Add data
+        for i, (flag, data) in enumerate(active_issues.items(), 1):
+            row = summary_table.rows[i].cells
+            row[0].text = data['name']
+            row[1].text = str(data.get('count', len(data['pages'])))
+            row[2].text = format_page_count(db_connection, data['pages'])
+            row[3].text = str(len(data['domains']))
+            row[4].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
+
+        # Format the table text
+        format_table_text(summary_table)
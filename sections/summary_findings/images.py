@@ -1,4 +1,18 @@
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
+from projections import declare_fields, find_pages
+
+declare_fields('summary.images',
+               'url',
+               'results.accessibility.tests.images.images',
+               query={
+                   "results.accessibility.tests.images.images.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.images.images.pageFlags.hasImagesWithoutAlt": True},
+                       {"results.accessibility.tests.images.images.pageFlags.hasImagesWithInvalidAlt": True},
+                       {"results.accessibility.tests.images.images.pageFlags.hasSVGWithoutRole": True}
+                   ]
+               })
 
 def add_images_section(doc, db_connection, total_domains):
     """Add the Images section to the summary findings"""
@@ -7,21 +21,7 @@ def add_images_section(doc, db_connection, total_domains):
     doc.add_paragraph()
 
     # Query for pages with image issues
-    pages_with_image_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.images.images.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.images.images.pageFlags.hasImagesWithoutAlt": True},
-                {"results.accessibility.tests.images.images.pageFlags.hasImagesWithInvalidAlt": True},
-                {"results.accessibility.tests.images.images.pageFlags.hasSVGWithoutRole": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.images.images": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_image_issues = list(find_pages(db_connection, 'summary.images'))
 
     # Initialize counters for different image issues
     image_issues = {
@@ -79,7 +79,7 @@ def add_images_section(doc, db_connection, total_domains):
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in image_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -99,7 +99,7 @@ def add_images_section(doc, db_connection, total_domains):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
             row[1].text = str(data['count'])
-            row[2].text = str(len(data['pages']))
+            row[2].text = format_page_count(db_connection, data['pages'])
             row[3].text = str(len(data['domains']))
             row[4].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
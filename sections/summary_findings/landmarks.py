@@ -1,4 +1,19 @@
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
+from projections import declare_fields, find_pages
+
+declare_fields('summary.landmarks',
+               'url',
+               'results.accessibility.tests.landmarks.landmarks',
+               query={
+                   "results.accessibility.tests.landmarks.landmarks.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.landmarks.landmarks.pageFlags.missingRequiredLandmarks": True},
+                       {"results.accessibility.tests.landmarks.landmarks.pageFlags.hasDuplicateLandmarksWithoutNames": True},
+                       {"results.accessibility.tests.landmarks.landmarks.pageFlags.hasNestedTopLevelLandmarks": True},
+                       {"results.accessibility.tests.landmarks.landmarks.pageFlags.hasContentOutsideLandmarks": True}
+                   ]
+               })
 
 def add_landmarks_section(doc, db_connection, total_domains):
     """Add the Landmarks section to the summary findings"""
@@ -6,22 +21,7 @@ def add_landmarks_section(doc, db_connection, total_domains):
     h2.style = doc.styles['Heading 2']
 
     # Query for pages with landmark issues
-    pages_with_landmark_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.landmarks.landmarks.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.landmarks.landmarks.pageFlags.missingRequiredLandmarks": True},
-                {"results.accessibility.tests.landmarks.landmarks.pageFlags.hasDuplicateLandmarksWithoutNames": True},
-                {"results.accessibility.tests.landmarks.landmarks.pageFlags.hasNestedTopLevelLandmarks": True},
-                {"results.accessibility.tests.landmarks.landmarks.pageFlags.hasContentOutsideLandmarks": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.landmarks.landmarks": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_landmark_issues = list(find_pages(db_connection, 'summary.landmarks'))
 
     # Initialize counters for different landmark issues
     landmark_issues = {
@@ -106,7 +106,7 @@ def add_landmarks_section(doc, db_connection, total_domains):
             landmark_issues['outside']['count'] += details.get('contentOutsideLandmarksCount', 0)
 
     # Create summary table
-    if any(len(issue['pages']) > 0 for issue in landmark_issues.values()):
+    if any(may_affect_pages(db_connection, issue['pages']) for issue in landmark_issues.values()):
         # Create main issues summary table
         summary_table = doc.add_table(rows=len(landmark_issues) + 1, cols=4)
         summary_table.style = 'Table Grid'
@@ -121,10 +121,10 @@ def add_landmarks_section(doc, db_connection, total_domains):
         # Add data
         row_idx = 1
         for issue_type, data in landmark_issues.items():
-            if len(data['pages']) > 0:
+            if may_affect_pages(db_connection, data['pages']):
                 row = summary_table.rows[row_idx].cells
                 row[0].text = data['name']
-                row[1].text = str(len(data['pages']))
+                row[1].text = format_page_count(db_connection, data['pages'])
                 row[2].text = str(len(data['domains']))
                 row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
                 row_idx += 1
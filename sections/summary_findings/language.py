@@ -1,13 +1,16 @@
+from projections import declare_fields, find_pages
+
+declare_fields('summary.language',
+               'url',
+               query={"results.accessibility.tests.html_structure.html_structure.tests.hasValidLang": False})
+
 def add_language_section(doc, db_connection, total_domains):
     """Add the Language of Page section to the summary findings"""
     h2 = doc.add_heading('Language of Page', level=2)
     h2.style = doc.styles['Heading 2']
 
     # If there are pages without lang attribute, list them
-    pages_without_lang = list(db_connection.page_results.find(
-        {"results.accessibility.tests.html_structure.html_structure.tests.hasValidLang": False},
-        {"url": 1, "_id": 0}
-    ).sort("url", 1))
+    pages_without_lang = list(find_pages(db_connection, 'summary.language'))
 
     # Count affected domains
     affected_domains = set()
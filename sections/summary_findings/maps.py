@@ -1,4 +1,18 @@
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
+from projections import declare_fields, find_pages
+
+declare_fields('summary.maps',
+               'url',
+               'results.accessibility.tests.maps.maps.pageFlags',
+               query={
+                   "results.accessibility.tests.maps.maps.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.maps.maps.pageFlags.hasMaps": True},
+                       {"results.accessibility.tests.maps.maps.pageFlags.hasMapsWithoutTitle": True},
+                       {"results.accessibility.tests.maps.maps.pageFlags.hasMapsWithAriaHidden": True}
+                   ]
+               })
 
 def add_maps_section(doc, db_connection, total_domains):
     """Add the Maps section to the summary findings"""
@@ -6,22 +20,7 @@ def add_maps_section(doc, db_connection, total_domains):
     h2.style = doc.styles['Heading 2']
 
     # Query for pages with map issues
-    pages_with_map_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.maps.maps.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.maps.maps.pageFlags.hasMaps": True},
-                {"results.accessibility.tests.maps.maps.pageFlags.hasMapsWithoutTitle": True},
-                {"results.accessibility.tests.maps.maps.pageFlags.hasMapsWithAriaHidden": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.maps.maps.pageFlags": 1,
-            "results.accessibility.tests.maps.maps.details": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_map_issues = list(find_pages(db_connection, 'summary.maps'))
 
     # Initialize counters for each issue type
     map_issues = {
@@ -42,7 +41,7 @@ def add_maps_section(doc, db_connection, total_domains):
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in map_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -60,7 +59,7 @@ def add_maps_section(doc, db_connection, total_domains):
         for i, (flag, data) in enumerate(active_issues.items(), 1):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
-            row[1].text = str(len(data['pages']))
+            row[1].text = format_page_count(db_connection, data['pages'])
             row[2].text = str(len(data['domains']))
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
@@ -1,5 +1,12 @@
 # sections/summary_findings/tabindex.py
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
+from projections import declare_fields, find_pages
+
+declare_fields('summary.tabindex',
+               'url',
+               'results.accessibility.tests.tabindex.tabindex.pageFlags',
+               query={"results.accessibility.tests.tabindex.tabindex.pageFlags": {"$exists": True}})
 
 def add_tabindex_section(doc, db_connection, total_domains):
     """Add the summary Tabindex section"""
@@ -8,14 +15,7 @@ def add_tabindex_section(doc, db_connection, total_domains):
     h3.style = doc.styles['Heading 2']
 
     # Query for pages with tabindex issues
-    pages_with_tabindex_issues = list(db_connection.page_results.find(
-        {"results.accessibility.tests.tabindex.tabindex.pageFlags": {"$exists": True}},
-        {
-            "url": 1,
-            "results.accessibility.tests.tabindex.tabindex.pageFlags": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_tabindex_issues = list(find_pages(db_connection, 'summary.tabindex'))
 
     # Initialize counters for each issue type
     tabindex_issues = {
@@ -37,7 +37,7 @@ def add_tabindex_section(doc, db_connection, total_domains):
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in tabindex_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -55,7 +55,7 @@ def add_tabindex_section(doc, db_connection, total_domains):
         for i, (flag, data) in enumerate(active_issues.items(), 1):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
-            row[1].text = str(len(data['pages']))
+            row[1].text = format_page_count(db_connection, data['pages'])
             row[2].text = str(len(data['domains']))
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
@@ -1,4 +1,20 @@
 from report_styling import format_table_text
+from sampling import format_page_count, may_affect_pages
+from projections import declare_fields, find_pages
+
+declare_fields('summary.tables',
+               'url',
+               'results.accessibility.tests.tables.tables.pageFlags',
+               query={
+                   "results.accessibility.tests.tables.tables.pageFlags": {"$exists": True},
+                   "$or": [
+                       {"results.accessibility.tests.tables.tables.pageFlags.hasMissingHeaders": True},
+                       {"results.accessibility.tests.tables.tables.pageFlags.hasNoScope": True},
+                       {"results.accessibility.tests.tables.tables.pageFlags.hasMissingCaption": True},
+                       {"results.accessibility.tests.tables.tables.pageFlags.hasLayoutTables": True},
+                       {"results.accessibility.tests.tables.tables.pageFlags.hasComplexTables": True}
+                   ]
+               })
 
 def add_tables_section(doc, db_connection, total_domains):
     """Add the Tables section to the summary findings"""
@@ -6,24 +22,7 @@ def add_tables_section(doc, db_connection, total_domains):
     h2.style = doc.styles['Heading 2']
  
     # Query for pages with table issues
-    pages_with_table_issues = list(db_connection.page_results.find(
-        {
-            "results.accessibility.tests.tables.tables.pageFlags": {"$exists": True},
-            "$or": [
-                {"results.accessibility.tests.tables.tables.pageFlags.hasMissingHeaders": True},
-                {"results.accessibility.tests.tables.tables.pageFlags.hasNoScope": True},
-                {"results.accessibility.tests.tables.tables.pageFlags.hasMissingCaption": True},
-                {"results.accessibility.tests.tables.tables.pageFlags.hasLayoutTables": True},
-                {"results.accessibility.tests.tables.tables.pageFlags.hasComplexTables": True}
-            ]
-        },
-        {
-            "url": 1,
-            "results.accessibility.tests.tables.tables.pageFlags": 1,
-            "results.accessibility.tests.tables.tables.details": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_table_issues = list(find_pages(db_connection, 'summary.tables'))
 
     # Initialize counters for each issue type
     table_issues = {
@@ -46,7 +45,7 @@ def add_tables_section(doc, db_connection, total_domains):
 
     # Create filtered list of issues that have affected pages
     active_issues = {flag: data for flag, data in table_issues.items() 
-                    if len(data['pages']) > 0}
+                    if may_affect_pages(db_connection, data['pages'])}
 
     if active_issues:
         # Create summary table
@@ -64,7 +63,7 @@ def add_tables_section(doc, db_connection, total_domains):
         for i, (flag, data) in enumerate(active_issues.items(), 1):
             row = summary_table.rows[i].cells
             row[0].text = data['name']
-            row[1].text = str(len(data['pages']))
+            row[1].text = format_page_count(db_connection, data['pages'])
             row[2].text = str(len(data['domains']))
             row[3].text = f"{(len(data['domains']) / len(total_domains) * 100):.1f}%"
 
@@ -1,4 +1,10 @@
 from report_styling import format_table_text
+from projections import declare_fields, find_pages
+
+declare_fields('summary.title_attribute',
+               'url',
+               'results.accessibility.tests.title.titleAttribute.details.improperUse',
+               query={"results.accessibility.tests.title.titleAttribute.pageFlags.hasImproperTitleAttributes": True})
 
 def add_title_attribute_section(doc, db_connection, total_domains):
     """Add the Title Attribute section to the summary findings"""
@@ -6,14 +12,7 @@ def add_title_attribute_section(doc, db_connection, total_domains):
     h2.style = doc.styles['Heading 2']
 
     # Query for pages with title attribute issues
-    pages_with_title_issues = list(db_connection.page_results.find(
-        {"results.accessibility.tests.title.titleAttribute.pageFlags.hasImproperTitleAttributes": True},
-        {
-            "url": 1,
-            "results.accessibility.tests.title.titleAttribute.details": 1,
-            "_id": 0
-        }
-    ).sort("url", 1))
+    pages_with_title_issues = list(find_pages(db_connection, 'summary.title_attribute'))
 
     # Count affected domains
     affected_domains = set()
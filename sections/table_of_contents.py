@@ -1,4 +1,16 @@
-from report_styling import add_table_of_contents, format_toc_styles
+import re
+
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+from report_styling import add_table_of_contents, format_toc_styles, create_element, create_attribute
+
+# Heading levels listed in the table of contents (the field's \o "1-3" switch)
+TOC_LEVELS = 3
+
+# Bookmark names Word uses for table of contents targets
+TOC_BOOKMARK_PREFIX = '_Toc'
+
+HEADING_STYLE = re.compile(r'^Heading (\d)$')
 
 def add_toc_section(doc):
     """Add the table of contents section"""
@@ -6,4 +18,135 @@ def add_toc_section(doc):
     toc_heading.style = doc.styles['Heading 1']
     add_table_of_contents(doc)
     format_toc_styles(doc)
-    
\ No newline at end of file
+
+def collect_headings(doc, levels=TOC_LEVELS):
+    """Return (level, paragraph) for every heading the table of contents lists, in document order"""
+    headings = []
+    for paragraph in doc.paragraphs:
+        match = HEADING_STYLE.match(paragraph.style.name) if paragraph.style is not None else None
+        if match and int(match.group(1)) <= levels and paragraph.text.strip():
+            headings.append((int(match.group(1)), paragraph))
+    return headings
+
+def _find_toc_field(doc):
+    """Return the paragraph holding the TOC field, or None"""
+    for paragraph in doc.paragraphs:
+        for instr in paragraph._p.iter(qn('w:instrText')):
+            if instr.text and instr.text.strip().startswith('TOC'):
+                return paragraph
+    return None
+
+def _remove_toc_bookmarks(body):
+    """Remove the table of contents bookmarks of an earlier pass (e.g. in reused fragments)"""
+    ids = set()
+    for start in list(body.iter(qn('w:bookmarkStart'))):
+        if start.get(qn('w:name'), '').startswith(TOC_BOOKMARK_PREFIX):
+            ids.add(start.get(qn('w:id')))
+            start.getparent().remove(start)
+    for end in list(body.iter(qn('w:bookmarkEnd'))):
+        if end.get(qn('w:id')) in ids:
+            end.getparent().remove(end)
+
+def _add_bookmark(paragraph, bookmark_id, name):
+    """Wrap a paragraph's content in a bookmark"""
+    start = create_element('w:bookmarkStart')
+    create_attribute(start, 'w:id', str(bookmark_id))
+    create_attribute(start, 'w:name', name)
+    end = create_element('w:bookmarkEnd')
+    create_attribute(end, 'w:id', str(bookmark_id))
+    properties = paragraph._p.pPr
+    if properties is not None:
+        properties.addnext(start)
+    else:
+        paragraph._p.insert(0, start)
+    paragraph._p.append(end)
+
+def _field_char(field_char_type):
+    run = create_element('w:r')
+    field_char = create_element('w:fldChar')
+    create_attribute(field_char, 'w:fldCharType', field_char_type)
+    run.append(field_char)
+    return run
+
+def _text_run(text=None, tab=False):
+    run = create_element('w:r')
+    if tab:
+        run.append(create_element('w:tab'))
+    if text is not None:
+        text_element = create_element('w:t')
+        create_attribute(text_element, 'xml:space', 'preserve')
+        text_element.text = text
+        run.append(text_element)
+    return run
+
+def _toc_entry(paragraph, text, bookmark):
+    """Add a linked entry with a PAGEREF field (its page number is filled in when fields are updated)"""
+    hyperlink = create_element('w:hyperlink')
+    create_attribute(hyperlink, 'w:anchor', bookmark)
+    create_attribute(hyperlink, 'w:history', '1')
+    hyperlink.append(_text_run(text))
+    hyperlink.append(_text_run(tab=True))
+    hyperlink.append(_field_char('begin'))
+    instr_run = create_element('w:r')
+    instr = create_element('w:instrText')
+    create_attribute(instr, 'xml:space', 'preserve')
+    instr.text = f' PAGEREF {bookmark} \\h '
+    instr_run.append(instr)
+    hyperlink.append(instr_run)
+    hyperlink.append(_field_char('separate'))
+    hyperlink.append(_field_char('end'))
+    paragraph._p.append(hyperlink)
+
+def fill_table_of_contents(doc, levels=TOC_LEVELS):
+    """
+    Pre-render the TOC field's result from the document's headings.
+
+    Each heading gets a bookmark, and the field's result lists the headings
+    as links to them, so the table of contents is complete without updating
+    the field in Word. Page numbers are PAGEREF fields that are filled in
+    whenever the document's fields are updated.
+
+    Returns:
+        Number of headings listed
+    """
+    field_paragraph = _find_toc_field(doc)
+    if field_paragraph is None:
+        return 0
+
+    body = doc.element.body
+    _remove_toc_bookmarks(body)
+    bookmark_ids = [int(start.get(qn('w:id'))) for start in body.iter(qn('w:bookmarkStart'))
+                    if (start.get(qn('w:id')) or '').isdigit()]
+    next_id = max(bookmark_ids, default=0) + 1
+
+    entries = []
+    for i, (level, paragraph) in enumerate(collect_headings(doc, levels)):
+        name = f"{TOC_BOOKMARK_PREFIX}{next_id + i:08d}"
+        _add_bookmark(paragraph, next_id + i, name)
+        entries.append((level, paragraph.text.strip(), name))
+    if not entries:
+        return 0
+
+    # The field is begin/instruction/end in one run: replace its end with a
+    # separator and close the field after the last entry, so the entries are its result
+    field_p = field_paragraph._p
+    for field_char in list(field_p.iter(qn('w:fldChar'))):
+        if field_char.get(qn('w:fldCharType')) == 'end':
+            run = field_char.getparent()
+            run.remove(field_char)
+            run.addnext(_field_char('separate'))
+
+    previous = field_p
+    last = field_paragraph
+    for level, text, name in entries:
+        entry_p = create_element('w:p')
+        previous.addnext(entry_p)
+        entry = Paragraph(entry_p, field_paragraph._parent)
+        style_name = f'TOC {level}'
+        if style_name in doc.styles:
+            entry.style = doc.styles[style_name]
+        _toc_entry(entry, text, name)
+        previous = entry_p
+        last = entry
+    last._p.append(_field_char('end'))
+    return len(entries)
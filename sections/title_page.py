@@ -2,6 +2,7 @@ import os
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.shared import Inches, Pt
 from report_styling import format_table_text
+from image_assets import add_picture
 
 def add_title_page(doc, db_connection, title, author, date):
     """Create the title page of the report"""
@@ -18,7 +19,7 @@ def add_title_page(doc, db_connection, title, author, date):
     
     if os.path.exists('access labs.jpg'):
         image_run = image_paragraph.add_run()
-        image_run.add_picture('access labs.jpg', width=page_width)
+        add_picture(image_run, 'access labs.jpg', width=page_width)
     else:
         print("Warning: 'access labs.jpg' not found in the current directory")
     
@@ -0,0 +1,223 @@
+"""
+Accumulators that spill to disk under a memory budget.
+
+Detailed sections collect per-URL structures for every page of a run, and
+on large runs those dictionaries alone can exhaust a report worker's memory.
+A SpillDict behaves like a dictionary, but it tracks the approximate
+(pickled) size of its values. While the report's memory budget is exceeded,
+it moves its largest values to a temporary SQLite file. Keys stay in memory
+and keep their insertion order, so iterating a SpillDict streams its entries
+back in order and reads spilled values from disk one at a time.
+
+The budget is set in megabytes with memory_budget on the database connection
+(main.py --memory-budget) and is shared by every accumulator of the report.
+Without a budget a SpillDict never spills and does not measure its values.
+
+Values are copied out when spilled: after changing a value read from a
+SpillDict, assign it again.
+"""
+from collections.abc import MutableMapping
+import heapq
+import itertools
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import weakref
+
+from report_context import get_report_context
+
+MEGABYTE = 1024 * 1024
+
+# When the budget is exceeded, spill until usage is back under this fraction of it
+LOW_WATER = 0.75
+
+_SPILLED = object()
+_budget_lock = threading.Lock()
+
+
+class MemoryBudget:
+    """
+    Bytes of accumulator values that may be held in memory, shared by several SpillDicts.
+
+    Args:
+        limit: Budget in bytes
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def add(self, size):
+        """Account for size more (or, when negative, fewer) bytes in memory"""
+        with self._lock:
+            self.used += size
+
+    @property
+    def exceeded(self):
+        return self.used > self.limit
+
+
+def report_memory_budget(db_connection):
+    """
+    Get the memory budget shared by the current report's accumulators.
+
+    Returns:
+        MemoryBudget, or None when the connection sets no memory_budget
+    """
+    megabytes = getattr(db_connection, 'memory_budget', None)
+    if not megabytes:
+        return None
+    # A worker process (see parallel_aggregation) keeps its own budget
+    context = get_report_context(db_connection)
+    with _budget_lock:
+        if context.memory_budget is None:
+            context.memory_budget = MemoryBudget(megabytes * MEGABYTE)
+    return context.memory_budget
+
+
+def spill_dict(db_connection):
+    """Create a SpillDict under the current report's memory budget"""
+    return SpillDict(report_memory_budget(db_connection))
+
+
+def _unpickle_spill_dict(limit):
+    """Create the empty SpillDict a pickled one's entries are added back to"""
+    return SpillDict(MemoryBudget(limit) if limit is not None else None)
+
+
+def _remove_file(connection, path):
+    connection.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SpillDict(MutableMapping):
+    """
+    Insertion-ordered dictionary whose largest values spill to SQLite under a memory budget.
+
+    Args:
+        budget: MemoryBudget to account values against (None to never spill)
+    """
+
+    def __init__(self, budget=None):
+        self.budget = budget
+        # Key -> value, or _SPILLED for values in the spill file
+        self._data = {}
+        # Key -> pickled size of values held in memory (only with a budget)
+        self._sizes = {}
+        # (-size, sequence, key) for values held in memory; stale entries are skipped
+        self._largest = []
+        self._sequence = itertools.count()
+        self._db = None
+        self.spilled = 0
+
+    def _spill_file(self):
+        if self._db is None:
+            handle, path = tempfile.mkstemp(prefix='report_spill_', suffix='.sqlite')
+            os.close(handle)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE entries (key BLOB PRIMARY KEY, value BLOB)")
+            # The file is removed once the dictionary is closed or garbage collected
+            self._cleanup = weakref.finalize(self, _remove_file, self._db, path)
+        return self._db
+
+    def _forget(self, key):
+        """Stop accounting for key's value, wherever it is"""
+        size = self._sizes.pop(key, None)
+        if size is not None:
+            self.budget.add(-size)
+        elif self._data.get(key) is _SPILLED:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (pickle.dumps(key),))
+            self.spilled -= 1
+
+    def __setitem__(self, key, value):
+        if key in self._data:
+            self._forget(key)
+        self._data[key] = value
+        if self.budget is None:
+            return
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        self._sizes[key] = size
+        self.budget.add(size)
+        heapq.heappush(self._largest, (-size, next(self._sequence), key))
+        if self.budget.exceeded:
+            self._spill()
+
+    def _spill(self):
+        """Move the largest values to disk until the budget has room again"""
+        db = self._spill_file()
+        while self._largest and self.budget.used > self.budget.limit * LOW_WATER:
+            negative_size, _, key = heapq.heappop(self._largest)
+            if self._sizes.get(key) != -negative_size:
+                continue
+            db.execute("INSERT OR REPLACE INTO entries (key, value) VALUES (?, ?)",
+                       (pickle.dumps(key), pickle.dumps(self._data[key], protocol=pickle.HIGHEST_PROTOCOL)))
+            self._data[key] = _SPILLED
+            del self._sizes[key]
+            self.budget.add(negative_size)
+            self.spilled += 1
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        if value is _SPILLED:
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (pickle.dumps(key),)).fetchone()
+            return pickle.loads(row[0])
+        return value
+
+    def __delitem__(self, key):
+        if key not in self._data:
+            raise KeyError(key)
+        self._forget(key)
+        del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def items(self):
+        """Stream (key, value) pairs in insertion order, reading spilled values from disk"""
+        for key in list(self._data):
+            yield key, self[key]
+
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+    def merge(self, other):
+        """Add every entry of another SpillDict (or mapping) to this one"""
+        for key, value in other.items():
+            self[key] = value
+        return self
+
+    def close(self):
+        """Drop every entry and remove the spill file"""
+        if self._db is not None:
+            self._cleanup()
+            self._db = None
+        if self.budget is not None:
+            self.budget.add(-sum(self._sizes.values()))
+        self._data.clear()
+        self._sizes.clear()
+        self._largest.clear()
+        self.spilled = 0
+
+    def __reduce__(self):
+        # Pickled (for a worker's result) entry by entry: the pickler draws the
+        # items from the generator a batch at a time, so spilled values are
+        # never all read back into memory at once. The copy gets a budget of
+        # the same size, so it spills again while it is unpickled.
+        limit = self.budget.limit if self.budget is not None else None
+        return _unpickle_spill_dict, (limit,), None, None, self.items()
+
+    def __repr__(self):
+        return f"SpillDict({len(self)} entries, {self.spilled} spilled)"
@@ -0,0 +1,446 @@
+"""
+Page structure statistics for the structure sections, computed once per set of test runs.
+
+The structure sections used to walk every page's raw page_structure tree
+(JSON-decoding the trees stored as strings) on every report. The provider
+builds one analysis document instead:
+
+    overall_summary: cross-site consistency scores
+    domain_analyses: domain -> per-component presence and consistency
+    page_summary: page flag counts, detection methods and reduced sample
+        elements, as read by the page structure sections
+
+overall_summary and domain_analyses are taken from the latest document the
+structure analyzer wrote to the structure_analysis collection when it is
+newer than the report's page results, and computed from the page results
+otherwise. The finished analysis is written back to structure_analysis,
+keyed by the report's set of test runs (its consistency scores compare
+pages across runs, so it cannot be stored per run like the topic
+aggregates), so repeat reports over the same test runs read it instead of
+the page structures.
+"""
+from collections import Counter
+from datetime import datetime
+import hashlib
+import json
+
+from aggregate_store import ensure_indexes, run_finished
+from connection_profile import cursor_options
+from report_context import get_report_context
+from report_records import domain_from_url
+from page_access import page_collection, compile_path, is_document
+from query_memo import unmemoized
+
+STRUCTURE_COLLECTION = 'structure_analysis'
+
+# Bump whenever the analysis the provider writes changes
+STRUCTURE_ANALYSIS_VERSION = 1
+
+STRUCTURE_PATH = 'results.accessibility.tests.page_structure'
+PAGE_STRUCTURE_PATH = f'{STRUCTURE_PATH}.page_structure'
+get_structure = compile_path(STRUCTURE_PATH)
+
+# Page flags counted by the page structure sections
+PAGE_FLAGS = (
+    'hasHeader', 'hasFooter', 'hasMainNavigation', 'hasMainContent', 'hasComplementaryContent',
+    'hasHeroSection', 'hasCardGrids', 'hasFeatureSections', 'hasCarousels',
+    'hasSearchComponent', 'hasCookieNotice', 'hasPopups', 'hasForms'
+)
+
+# (analysis name, page flag, summary key, key element) of each structural component
+COMPONENTS = (
+    ('header', 'hasHeader', 'header', 'primaryHeader'),
+    ('footer', 'hasFooter', 'footer', 'primaryFooter'),
+    ('navigation', 'hasMainNavigation', 'navigation', 'navigation'),
+    ('main_content', 'hasMainContent', 'mainContent', 'mainContent'),
+    ('complementary', 'hasComplementaryContent', 'complementaryContent', None)
+)
+
+# (recurring element name, page flag) counted per domain
+RECURRING_ELEMENTS = (
+    ('search', 'hasSearchComponent'),
+    ('cookie_notice', 'hasCookieNotice'),
+    ('popups', 'hasPopups'),
+    ('forms', 'hasForms')
+)
+
+# Fields of an object page structure the analysis reads. The key elements'
+# trees are only read for the sample pages (see _sample_element).
+OBJECT_PROJECTION = dict(
+    {
+        'url': 1,
+        'timestamp': 1,
+        f'{PAGE_STRUCTURE_PATH}.pageFlags': 1,
+        f'{PAGE_STRUCTURE_PATH}.summary': 1,
+        '_id': 0
+    },
+    **{f'{PAGE_STRUCTURE_PATH}.keyElements.{element}.{field}': 1
+       for _, _, _, element in COMPONENTS if element
+       for field in ('tag', 'classArray')}
+)
+
+
+def structure_collection(db_connection):
+    """Get the structure_analysis collection in the connection's database"""
+    collection = db_connection.test_runs.database[STRUCTURE_COLLECTION]
+    ensure_indexes(collection, [[('report_key', 1), ('version', 1)], 'timestamp', 'test_run_ids'])
+    return collection
+
+
+def _analysis_key(db_connection):
+    """
+    Build the key of the current report's stored analysis.
+
+    Returns:
+        The key, or None when stored analyses should not be used for this report
+    """
+    if not getattr(db_connection, 'use_aggregate_store', True):
+        return None
+    context = get_report_context(db_connection)
+    if not context.test_runs:
+        return None
+    test_run_ids = sorted(str(run['_id']) for run in context.test_runs)
+    return {
+        'runs_key': hashlib.sha1(','.join(test_run_ids).encode()).hexdigest(),
+        'latest_only': bool(getattr(db_connection, 'latest_results_only', True)),
+        'sample': context.sample.key if context.sample is not None else None
+    }
+
+
+def _plain(value):
+    """Copy a (possibly raw) BSON value into plain dicts and lists"""
+    if is_document(value):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _timestamp_key(timestamp):
+    """Sort key that orders pages without a timestamp first"""
+    return (timestamp is not None, timestamp)
+
+
+def _count_tag(element, tag_name):
+    """Count elements of a tag within an element tree"""
+    if not is_document(element):
+        return 0
+    count = 1 if element.get('tag', '').lower() == tag_name else 0
+    for child in element.get('children', []):
+        count += _count_tag(child, tag_name)
+    return count
+
+
+def _reduce_element(element):
+    """Reduce a key element tree to what the detailed structure section reports"""
+    children = element.get('children', [])
+    child_tags = Counter(child.get('tag', 'unknown') for child in children if is_document(child))
+    return {
+        'tag': element.get('tag', 'Unknown'),
+        'role': element.get('role', 'None'),
+        'classes': list(element.get('classArray', [])),
+        'children': len(children),
+        'position': element.get('position', 'static'),
+        'child_tags': [[tag, count] for tag, count in child_tags.most_common()],
+        'links': _count_tag(element, 'a'),
+        'list_items': _count_tag(element, 'li'),
+        'uses_list': _count_tag(element, 'ul') + _count_tag(element, 'ol') > 0
+    }
+
+
+def _reduce_content_blocks(blocks):
+    """Reduce a page's common content blocks to the carousel and card grid patterns reported"""
+    reduced = {'carousel': None, 'card_grid': None}
+    carousels = blocks.get('carousels')
+    if carousels:
+        details = carousels[0].get('details', {})
+        reduced['carousel'] = {
+            'id': details.get('id', 'None'),
+            'classes': list(details.get('classArray', [])),
+            'slide_count': carousels[0].get('slideCount', 'Unknown')
+        }
+    card_grids = blocks.get('cardGrids')
+    if card_grids:
+        sample_card = card_grids[0].get('sampleCard', {})
+        reduced['card_grid'] = {
+            'card_count': card_grids[0].get('cardCount', 'Unknown'),
+            'consistency': card_grids[0].get('cardPatternConsistency', 0),
+            'has_sample_card': bool(sample_card),
+            'has_image': _count_tag(sample_card, 'img') > 0,
+            'has_heading': any(_count_tag(sample_card, f'h{level}') for level in range(1, 7)),
+            'has_link': _count_tag(sample_card, 'a') > 0
+        }
+    return reduced
+
+
+def _page_structures(db_connection):
+    """
+    Yield (url, timestamp, page structure, decoded) for every page with structure data.
+
+    Structures stored as objects are read with OBJECT_PROJECTION (decoded is
+    False); structures stored as JSON strings are decoded in full, once.
+    """
+    collection = unmemoized(page_collection(db_connection))
+    options = cursor_options(db_connection)
+    for page in collection.find({PAGE_STRUCTURE_PATH: {'$exists': True}}, OBJECT_PROJECTION, **options):
+        yield page['url'], page.get('timestamp'), get_structure(page)['page_structure'], False
+    for page in collection.find({STRUCTURE_PATH: {'$type': 'string'}},
+                                {'url': 1, 'timestamp': 1, STRUCTURE_PATH: 1, '_id': 0}, **options):
+        try:
+            structure = json.loads(get_structure(page))
+        except ValueError as e:
+            print(f"Error processing page structure data for {page.get('url')}: {e}")
+            continue
+        if is_document(structure) and is_document(structure.get('page_structure')):
+            yield page['url'], page.get('timestamp'), structure['page_structure'], True
+
+
+def _sample_element(db_connection, url, timestamp, path):
+    """Read one key element tree (or content blocks) of a sample page"""
+    query = {'url': url}
+    if timestamp is not None:
+        query['timestamp'] = timestamp
+    page = page_collection(db_connection).find_one(query, {f'{PAGE_STRUCTURE_PATH}.{path}': 1, '_id': 0})
+    return compile_path(f'{PAGE_STRUCTURE_PATH}.{path}')(page or {})
+
+
+class _DomainStructure:
+    """Per-domain accumulator for the computed domain analyses"""
+
+    def __init__(self):
+        self.page_count = 0
+        self.with_component = Counter()
+        self.signatures = {name: Counter() for name, _, _, _ in COMPONENTS}
+        self.classes = {name: Counter() for name, _, _, _ in COMPONENTS}
+        self.recurring = Counter()
+        self.sample_page = None
+
+    def add(self, url, timestamp, flags, key_elements):
+        self.page_count += 1
+        for name, flag, _, element_name in COMPONENTS:
+            if not flags.get(flag):
+                continue
+            self.with_component[name] += 1
+            element = key_elements.get(element_name) if element_name else None
+            if is_document(element):
+                classes = tuple(sorted(element.get('classArray', [])))
+                self.signatures[name][(element.get('tag', 'unknown'), classes)] += 1
+                self.classes[name].update(classes)
+        for name, flag in RECURRING_ELEMENTS:
+            if flags.get(flag):
+                self.recurring[name] += 1
+        if self.sample_page is None or _timestamp_key(timestamp) > _timestamp_key(self.sample_page[1]):
+            self.sample_page = (url, timestamp, {flag: bool(flags.get(flag)) for flag in PAGE_FLAGS})
+
+    def component_analysis(self, name):
+        pages_with = self.with_component[name]
+        presence = pages_with / self.page_count if self.page_count else 0
+        signatures = self.signatures[name]
+        if signatures:
+            (tag, _), matching = signatures.most_common(1)[0]
+            # Share of the component's pages that use its most common tag and classes
+            consistency = matching / sum(signatures.values())
+        else:
+            # Without key elements, only how consistently the component is present
+            tag = 'unknown'
+            consistency = max(presence, 1 - presence)
+        common_classes = [cls for cls, count in self.classes[name].most_common() if count * 2 >= pages_with]
+        return {
+            'pages_with_component': pages_with,
+            'presence_ratio': presence,
+            'consistency_score': consistency,
+            'common_patterns': {'tag': tag, 'common_classes': common_classes}
+        }
+
+    def analysis(self):
+        analysis = {
+            'page_count': self.page_count,
+            'analysis_method': 'page_results',
+            'recurring_elements': {name: self.recurring[name] for name, _ in RECURRING_ELEMENTS}
+        }
+        for name, _, _, _ in COMPONENTS:
+            analysis[f'{name}_analysis'] = self.component_analysis(name)
+        if self.sample_page is not None:
+            analysis['sample_pages'] = {self.sample_page[0]: {'pageFlags': self.sample_page[2]}}
+        return analysis
+
+
+def _overall_summary(domain_analyses):
+    """Average the domains' component consistency scores"""
+    summary = {'total_domains': len(domain_analyses)}
+    averages = []
+    for name, _, _, _ in COMPONENTS:
+        scores = [analysis[f'{name}_analysis']['consistency_score'] for analysis in domain_analyses.values()]
+        summary[f'average_{name}_score'] = sum(scores) / len(scores) if scores else 0
+        averages.append(summary[f'average_{name}_score'])
+    summary['average_consistency_score'] = sum(averages) / len(averages) if domain_analyses else 0
+    return summary
+
+
+def compute_structure_analysis(db_connection):
+    """
+    Compute the structure analysis from the report's page results.
+
+    Returns:
+        (analysis, newest page timestamp)
+    """
+    flags_count = Counter()
+    detection_methods = {summary_key: Counter() for _, _, summary_key, _ in COMPONENTS[:4]}
+    domains = {}
+    # Latest page (by timestamp) to take each sample from: sample -> (timestamp, url, reduced or None)
+    samples = {}
+    pages = 0
+    newest = None
+
+    def offer_sample(name, url, timestamp, reduce_from):
+        current = samples.get(name)
+        if current is None or _timestamp_key(timestamp) > _timestamp_key(current[0]):
+            samples[name] = (timestamp, url, reduce_from)
+
+    for url, timestamp, structure, decoded in _page_structures(db_connection):
+        pages += 1
+        if timestamp is not None and (newest is None or timestamp > newest):
+            newest = timestamp
+        flags = structure.get('pageFlags', {})
+        summary = structure.get('summary', {})
+        key_elements = structure.get('keyElements', {})
+        for flag in PAGE_FLAGS:
+            if flags.get(flag):
+                flags_count[flag] += 1
+
+        for name, flag, summary_key, element_name in COMPONENTS[:4]:
+            if flags.get(flag) and summary_key in summary:
+                detection_methods[summary_key].update(summary[summary_key].get('types', []))
+
+        # Decoded structures are reduced right away; projected ones are read back for the chosen page only
+        def reduced(path, reduce):
+            if not decoded:
+                return None
+            value = compile_path(path)(structure)
+            return reduce(value) if is_document(value) else None
+
+        if flags.get('hasHeader'):
+            offer_sample('header', url, timestamp, reduced('keyElements.primaryHeader', _reduce_element))
+        if flags.get('hasFooter'):
+            offer_sample('footer', url, timestamp, reduced('keyElements.primaryFooter', _reduce_element))
+        if flags.get('hasMainNavigation') and summary.get('navigation', {}).get('found', False):
+            offer_sample('navigation', url, timestamp, reduced('keyElements.navigation', _reduce_element))
+        if 'contentBlocks' in summary:
+            offer_sample('content_blocks', url, timestamp,
+                         reduced('fullStructure.commonContentBlocks', _reduce_content_blocks))
+
+        domain = domain_from_url(url)
+        domains.setdefault(domain, _DomainStructure()).add(url, timestamp, flags, key_elements)
+
+    sample_paths = {
+        'header': ('keyElements.primaryHeader', _reduce_element),
+        'footer': ('keyElements.primaryFooter', _reduce_element),
+        'navigation': ('keyElements.navigation', _reduce_element),
+        'content_blocks': ('fullStructure.commonContentBlocks', _reduce_content_blocks)
+    }
+    reduced_samples = {}
+    for name, (timestamp, url, reduced_sample) in samples.items():
+        if reduced_sample is None:
+            path, reduce = sample_paths[name]
+            element = _sample_element(db_connection, url, timestamp, path)
+            reduced_sample = reduce(element) if is_document(element) else None
+        reduced_samples[name] = reduced_sample
+
+    domain_analyses = {domain: structure.analysis() for domain, structure in sorted(domains.items())}
+    analysis = {
+        'overall_summary': _overall_summary(domain_analyses),
+        'domain_analyses': domain_analyses,
+        'page_summary': {
+            'pages': pages,
+            'flags': {flag: flags_count[flag] for flag in PAGE_FLAGS},
+            'detection_methods': {key: dict(methods) for key, methods in detection_methods.items()},
+            'samples': reduced_samples
+        }
+    }
+    return analysis, newest
+
+
+def _analyzer_document(db_connection, newest):
+    """The structure analyzer's latest document, if it is newer than the page results"""
+    document = structure_collection(db_connection).find_one(
+        {'report_key': {'$exists': False}, 'overall_summary': {'$exists': True}},
+        {'_id': 0},
+        sort=[('timestamp', -1)]
+    )
+    if document is None:
+        return None
+    try:
+        if newest is not None and document.get('timestamp') < newest:
+            return None
+    except TypeError:
+        # Timestamps that cannot be compared; the analysis may predate the pages
+        return None
+    return document
+
+
+def load_structure_analysis(db_connection):
+    """Load the stored analysis of the current report, or None"""
+    key = _analysis_key(db_connection)
+    if key is None:
+        return None
+    try:
+        document = structure_collection(db_connection).find_one(
+            {'report_key': key, 'version': STRUCTURE_ANALYSIS_VERSION}, {'_id': 0}
+        )
+    except Exception as e:
+        print(f"Warning: Could not load stored structure analysis: {e}")
+        return None
+    if document is not None:
+        print("Using stored structure analysis")
+    return document
+
+
+def save_structure_analysis(db_connection, analysis):
+    """Store the current report's analysis, if its runs are finished"""
+    key = _analysis_key(db_connection)
+    if key is None:
+        return
+    test_runs = get_report_context(db_connection).test_runs
+    if not all(run_finished(db_connection, run) for run in test_runs):
+        return
+    document = dict(analysis,
+                    report_key=key,
+                    version=STRUCTURE_ANALYSIS_VERSION,
+                    test_run_ids=[str(run['_id']) for run in test_runs],
+                    timestamp=datetime.now())
+    try:
+        structure_collection(db_connection).replace_one(
+            {'report_key': key, 'version': STRUCTURE_ANALYSIS_VERSION}, document, upsert=True
+        )
+    except Exception as e:
+        print(f"Warning: Could not store structure analysis: {e}")
+
+
+def invalidate_structure_analyses(db_connection, test_run_ids):
+    """Delete stored analyses that include any of the given test runs. Returns the number deleted"""
+    result = structure_collection(db_connection).delete_many(
+        {'test_run_ids': {'$in': [str(run_id) for run_id in test_run_ids]}}
+    )
+    return result.deleted_count
+
+
+def get_structure_analysis(db_connection):
+    """
+    Get the structure analysis of the current report, building it only once per set of test runs.
+
+    Returns:
+        Dictionary with overall_summary, domain_analyses and page_summary
+    """
+    context = get_report_context(db_connection)
+    if context.structure_analysis is None:
+        analysis = load_structure_analysis(db_connection)
+        if analysis is None:
+            analysis, newest = compute_structure_analysis(db_connection)
+            analyzer = _analyzer_document(db_connection, newest)
+            if analyzer is not None:
+                # The analyzer's cross-page analysis is richer than the computed one
+                analysis['overall_summary'] = _plain(analyzer['overall_summary'])
+                analysis['domain_analyses'] = _plain(analyzer.get('domain_analyses', {}))
+            save_structure_analysis(db_connection, analysis)
+        context.structure_analysis = analysis
+    return context.structure_analysis
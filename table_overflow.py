@@ -0,0 +1,135 @@
+"""
+Row budgets for long report tables.
+
+Some tables get a row per site, page, breakpoint or document. On large crawls
+they grow to thousands of rows, which makes the report slow to generate and
+to open in Word. With a table_row_budget set on the connection (main.py
+--table-row-budget), add_budgeted_table shows at most that many rows. When a
+table has more, the complete table is written to a CSV file in a folder next
+to the report (REPORT_tables/), and the document says where to find it.
+Tables are not cut by default.
+
+The folder is set per report with create_report_template's
+attachments_folder. Without one (e.g. a report that is not saved to a
+file), long tables are still cut at the budget, but their rows are not
+written anywhere.
+"""
+import csv
+import os
+import re
+import shutil
+
+from report_context import get_report_context
+from report_styling import format_table_text
+
+# No limit unless the connection sets one
+DEFAULT_ROW_BUDGET = None
+
+
+def attachments_folder(report_file):
+    """Folder for the table attachments of a report file"""
+    return f"{os.path.splitext(report_file)[0]}_tables"
+
+
+def table_row_budget(db_connection):
+    """Rows a table may show in the document (None for no limit)"""
+    budget = getattr(db_connection, 'table_row_budget', DEFAULT_ROW_BUDGET)
+    return budget or None
+
+
+def _attachment_name(context, name):
+    """A CSV file name for a table, unique within the report"""
+    base = re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_').lower() or 'table'
+    file_name = f"{base}.csv"
+    suffix = 2
+    while file_name in context.table_attachments:
+        file_name = f"{base}_{suffix}.csv"
+        suffix += 1
+    return file_name
+
+
+def write_table_attachment(db_connection, name, headers, rows):
+    """
+    Write a complete table to the report's attachments folder.
+
+    Args:
+        name: Name of the table, used for its file name
+        headers: Column headers
+        rows: Rows of cell values
+
+    Returns:
+        The CSV file's name, or None if the report has no attachments folder
+    """
+    context = get_report_context(db_connection)
+    if context.attachments_folder is None:
+        return None
+    file_name = _attachment_name(context, name)
+    try:
+        os.makedirs(context.attachments_folder, exist_ok=True)
+        with open(os.path.join(context.attachments_folder, file_name), 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(headers)
+            writer.writerows(rows)
+    except OSError as e:
+        print(f"Warning: Could not write table {name} to {context.attachments_folder}: {e}")
+        return None
+    context.table_attachments.append(file_name)
+    return file_name
+
+
+def copy_table_attachments(db_connection, file_names, report_file):
+    """
+    Copy table attachments of the current report to the tables folder of another report file.
+
+    Used for documents saved besides the report (such as standalone site
+    reports), whose notes point to the tables folder next to them.
+    """
+    context = get_report_context(db_connection)
+    if not file_names or context.attachments_folder is None:
+        return
+    target = attachments_folder(report_file)
+    os.makedirs(target, exist_ok=True)
+    for file_name in file_names:
+        try:
+            shutil.copyfile(os.path.join(context.attachments_folder, file_name), os.path.join(target, file_name))
+        except OSError as e:
+            print(f"Warning: Could not copy table {file_name} to {target}: {e}")
+
+
+def add_budgeted_table(doc, db_connection, name, headers, rows, attachments=None):
+    """
+    Add a table of at most the report's row budget, writing longer tables to CSV.
+
+    Args:
+        doc: The report document
+        db_connection: Database connection (carrying the row budget and report context)
+        name: Name of the table, used for its attachment's file name
+        headers: Column headers
+        rows: Rows of cell values, in display order
+        attachments: List to add the name of the written CSV file to, if any
+
+    Returns:
+        The added table
+    """
+    rows = [[str(value) for value in row] for row in rows]
+    budget = table_row_budget(db_connection)
+    shown = rows if budget is None or len(rows) <= budget else rows[:budget]
+
+    table = doc.add_table(rows=len(shown) + 1, cols=len(headers))
+    table.style = 'Table Grid'
+    for cell, header in zip(table.rows[0].cells, headers):
+        cell.text = header
+    for i, row in enumerate(shown, 1):
+        for cell, value in zip(table.rows[i].cells, row):
+            cell.text = value
+    format_table_text(table)
+
+    if len(shown) < len(rows):
+        file_name = write_table_attachment(db_connection, name, headers, rows)
+        note = f"Showing the first {len(shown)} of {len(rows)} rows."
+        if file_name:
+            note += f" The complete table is in {file_name}, in the tables folder saved alongside this report."
+            if attachments is not None:
+                attachments.append(file_name)
+        doc.add_paragraph(note)
+    return table
@@ -0,0 +1,172 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from bounded_examples import BoundedExamples, BucketedExamples
+from parallel_aggregation import _merge_states, partition_domains, partition_filters
+from report_records import domain_from_url
+from spill import SpillDict, report_memory_budget
+from sections.aggregates.accessible_names import AccessibleNamesAggregate
+from sections.aggregates.fonts import FontsAggregate
+from sections.aggregates.media_queries import MediaQueriesAggregate
+from sections.aggregates.responsive_accessibility import ResponsiveAccessibilityAggregate
+
+URLS = [f"https://site{site}.example.com/page{page}" for site in range(4) for page in range(6)]
+
+
+def plain(value):
+    """Comparable form of a data model (sets and example collectors have no stable order or equality)"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(plain(item) for item in value)
+    if isinstance(value, (dict, SpillDict)):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [plain(item) for item in value]
+    if isinstance(value, BoundedExamples):
+        return [plain(item) for item in value.items()], value.total
+    if isinstance(value, BucketedExamples):
+        return plain(dict(value.items()))
+    if hasattr(value, '__slots__'):
+        return repr([getattr(value, slot) for slot in value.__slots__])
+    return value
+
+
+def media_queries_pages():
+    for i, url in enumerate(URLS):
+        flags = {
+            'hasResponsiveBreakpoints': i % 2 == 0,
+            'hasPrintStyles': i % 3 == 0,
+            'hasReducedMotionSupport': i % 5 != 0,
+            'hasDarkModeSupport': False,
+            'hasOrientationStyles': True
+        }
+        media_queries = {
+            'responsiveBreakpoints': {'allBreakpoints': [320 + i % 4 * 160], 'byCategory': {'mobile': [320]}},
+            'pageFlags': flags,
+            'details': {'recommendations': [f"recommendation {i}"]}
+        }
+        page = {'url': url, 'results': {'accessibility': {'tests': {'media_queries': {'media_queries': media_queries}}}}}
+        yield 'breakpoints', page
+        yield 'issues', page
+
+
+def fonts_pages():
+    for i, url in enumerate(URLS):
+        font_analysis = {
+            'accessibility': {
+                'smallestHeadingSize': 10 + i % 7,
+                'tests': {'hasSmallText': i % 2 == 0, 'hasItalicText': i % 3 == 0}
+            },
+            'fonts': {'Arial': {}, f"Brand{i % 3}": {}, 'var(--awb-text-font-family)': {}, 'inherit': {}}
+        }
+        yield 'fonts', {'url': url, 'results': {'accessibility': {'tests': {'fonts': {'font_analysis': font_analysis}}}}}
+
+
+def accessible_names_pages():
+    for i, url in enumerate(URLS):
+        violations = [{'element': tag, 'section': {'section_type': ('header', 'footer')[i % 2], 'section_name': 'x'}}
+                      for tag in ('a', 'button', 'img')[:i % 3 + 1]]
+        details = {'violations': violations}
+        yield 'violations', {'url': url, 'results': {'accessibility': {'tests': {
+            'accessible_names': {'accessible_names': {'details': details}}}}}}
+
+
+def responsive_pages():
+    for i, url in enumerate(URLS):
+        breakpoint_results = {
+            str(bp): {'tests': {
+                'overflow': {'issues': [{'element': f"div{i}"}] * (i % 2)},
+                'touchTargets': {'issues': []}
+            }}
+            for bp in (320, 768 + i % 2 * 256)
+        }
+        responsive_testing = {
+            'breakpoints': [320, 768 + i % 2 * 256],
+            'breakpoint_results': breakpoint_results,
+            'consolidated': {
+                'testsSummary': {'overflow': {'issueCount': i % 2, 'affectedBreakpoints': [320]}},
+                'elements': {f"div{i}": {'breakpoints': [320, 768]}} if i % 3 == 0 else {},
+                'sectionStatistics': {'header': i % 4}
+            }
+        }
+        yield 'pages', {'url': url, 'test_run_id': 'run1',
+                        'results': {'accessibility': {'responsive_testing': responsive_testing}}}
+
+
+def empty_state(aggregate):
+    state = aggregate.empty()
+    if 'test_run_ids' in state:
+        state['test_run_ids'] = {'run1'}
+    return state
+
+
+@pytest.mark.parametrize('aggregate, pages', [
+    (MediaQueriesAggregate(), media_queries_pages),
+    (FontsAggregate(), fonts_pages),
+    (AccessibleNamesAggregate(), accessible_names_pages),
+    (ResponsiveAccessibilityAggregate(), responsive_pages),
+])
+def test_merged_partitions_match_a_single_pass(aggregate, pages):
+    single = empty_state(aggregate)
+    for query_name, page in pages():
+        aggregate.add(single, query_name, page)
+
+    groups = partition_domains({domain_from_url(url): 6 for url in URLS}, 3)
+    states = []
+    for group in groups:
+        state = empty_state(aggregate)
+        for query_name, page in pages():
+            if domain_from_url(page['url']) in group:
+                aggregate.add(state, query_name, page)
+        states.append(state)
+    merged = empty_state(aggregate)
+    for state in states:
+        merged = aggregate.merge(merged, state)
+
+    assert plain(aggregate.finalize(merged)) == plain(aggregate.finalize(single))
+
+
+def matches(partition, url):
+    condition = partition['url']
+    if '$in' in condition:
+        return any(re.search(pattern, url) for pattern in condition['$in'])
+    return not any(re.search(pattern, url) for pattern in condition['$nin'])
+
+
+def test_partition_filters_select_each_url_once():
+    urls = URLS + ["http://site0.example.com", "https://site1.example.com.evil.test/page",
+                   "site2.example.com/page", "https://other.test/site0.example.com/"]
+    counts = {}
+    for url in urls:
+        counts[domain_from_url(url)] = counts.get(domain_from_url(url), 0) + 1
+    groups = partition_domains(counts, 3)
+    filters = partition_filters(groups)
+
+    assert len(filters) == len(groups) == 3
+    for url in urls:
+        selected = [i for i, partition in enumerate(filters) if matches(partition, url)]
+        assert len(selected) == 1
+        if selected[0] < len(groups) - 1:
+            assert domain_from_url(url) in groups[selected[0]]
+
+
+def test_partition_domains_balances_page_counts():
+    groups = partition_domains({'a': 10, 'b': 6, 'c': 5, 'd': 1}, 2)
+
+    assert groups == [['a', 'd'], ['b', 'c']]
+    assert partition_domains({'a': 1}, 4) == [['a']]
+
+
+def test_merged_state_is_held_to_the_report_memory_budget():
+    db_connection = SimpleNamespace(memory_budget=1,
+                                    test_runs=SimpleNamespace(find=lambda *args: [{'_id': 'run1'}]))
+    aggregate = ResponsiveAccessibilityAggregate()
+    state = empty_state(aggregate)
+    for query_name, page in responsive_pages():
+        aggregate.add(state, query_name, page)
+
+    merged = _merge_states(db_connection, aggregate, [state])
+
+    assert merged['breakpoint_records'].budget is report_memory_budget(db_connection)
+    assert plain(aggregate.finalize(merged)) == plain(aggregate.finalize(state))
@@ -0,0 +1,113 @@
+from bounded_examples import BoundedExamples, BucketedExamples
+
+
+def test_without_key_keeps_the_first_items():
+    examples = BoundedExamples(3)
+    examples.extend(range(10))
+
+    assert examples.items() == [0, 1, 2]
+    assert examples.total == 10
+    assert examples.remaining == 7
+
+
+def test_keeps_smallest_keys_with_ties_in_insertion_order():
+    examples = BoundedExamples(3, key=lambda item: item[0])
+    examples.extend([(2, 'a'), (1, 'b'), (3, 'c'), (1, 'd'), (2, 'e'), (0, 'f')])
+
+    assert examples.items() == [(0, 'f'), (1, 'b'), (1, 'd')]
+    assert examples.items() == sorted([(2, 'a'), (1, 'b'), (3, 'c'), (1, 'd'), (2, 'e'), (0, 'f')],
+                                      key=lambda item: item[0])[:3]
+
+
+def test_unique_skips_repeated_keys():
+    examples = BoundedExamples(2, key=lambda url: url, unique=True)
+    for url in ['b', 'a', 'b', 'a', 'c']:
+        examples.add(url)
+
+    assert examples.items() == ['a', 'b']
+    assert examples.total == 5
+
+
+def test_unique_readmits_an_evicted_key():
+    examples = BoundedExamples(1, key=lambda value: value, unique=True)
+    examples.extend([5, 3, 5])
+
+    assert examples.items() == [3]
+    examples.add(1)
+    examples.add(3)
+    assert examples.items() == [1]
+
+
+def test_unique_without_key_compares_the_items():
+    examples = BoundedExamples(3, unique=True)
+    examples.extend(['b', 'a', 'b', 'c', 'a', 'd'])
+
+    assert examples.items() == ['b', 'a', 'c']
+    assert examples.total == 6
+
+
+def test_unique_without_key_survives_merge():
+    first = BoundedExamples(3, unique=True)
+    first.extend(['x', 'y'])
+    second = BoundedExamples(3, unique=True)
+    second.extend(['y', 'z'])
+
+    assert first.merge(second).items() == ['x', 'y', 'z']
+
+
+def test_explicit_sort_key_overrides_key_function():
+    examples = BoundedExamples(2, key=lambda item: 0)
+    examples.add('late', sort_key=2)
+    examples.add('early', sort_key=1)
+    examples.add('latest', sort_key=3)
+
+    assert examples.items() == ['early', 'late']
+
+
+def test_merge_matches_a_single_stream():
+    stream = [(3, 'a'), (1, 'b'), (1, 'c'), (2, 'd'), (0, 'e'), (1, 'f')]
+    single = BoundedExamples(4, key=lambda item: item[0])
+    single.extend(stream)
+
+    first = BoundedExamples(4, key=lambda item: item[0])
+    first.extend(stream[:3])
+    second = BoundedExamples(4, key=lambda item: item[0])
+    second.extend(stream[3:])
+    first.merge(second)
+
+    assert first.items() == single.items()
+    assert first.total == single.total == len(stream)
+
+
+def test_empty_collector():
+    examples = BoundedExamples(5)
+
+    assert not examples
+    assert len(examples) == 0
+    assert list(examples) == []
+
+
+def test_bucketed_examples_bound_each_bucket():
+    examples = BucketedExamples(2)
+    for bucket, item in [('x', 1), ('y', 2), ('x', 3), ('x', 4), ('y', 5)]:
+        examples.add(bucket, item)
+
+    assert examples['x'].items() == [1, 3]
+    assert examples['x'].total == 3
+    assert examples['y'].items() == [2, 5]
+    assert examples.get('z') is None
+    assert 'z' not in examples
+
+
+def test_bucketed_examples_merge():
+    first = BucketedExamples(2)
+    first.add('x', 1)
+    second = BucketedExamples(2)
+    second.add('x', 2)
+    second.add('x', 3)
+    second.add('y', 4)
+    first.merge(second)
+
+    assert first['x'].items() == [1, 2]
+    assert first['x'].total == 3
+    assert first['y'].items() == [4]
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from bson import ObjectId
+import pytest
+
+from bounded_examples import BoundedExamples, BucketedExamples
+from model_codec import encode_model, decode_model
+from report_records import BreakpointResult, ViolationRecord
+from spill import MemoryBudget, SpillDict
+
+
+def round_trip(model, budget=None):
+    return decode_model(list(encode_model(model)), budget)
+
+
+def test_plain_and_tagged_values():
+    model = {
+        'count': 3,
+        'ratio': 0.5,
+        'urls': {'https://a.com/', 'https://b.com/'},
+        'pair': ('x', 1),
+        'histogram': {320: 2, 768: 1},
+        'looks_tagged': {'__set__': [1]},
+        'when': datetime(2026, 1, 2, 3, 4, 5),
+        'id': ObjectId('0123456789ab0123456789ab'),
+        'nested': [{'a': None, 'b': [True, False]}]
+    }
+
+    assert round_trip(model) == model
+
+
+def test_records():
+    model = {
+        'record': BreakpointResult('https://a.com/', 480, (1, 0, 2, 0, 0), True),
+        'violation': ViolationRecord('https://a.com/', issue='empty', extra={'level': 2})
+    }
+    decoded = round_trip(model)
+
+    record = decoded['record']
+    assert (record.url, record.breakpoint, record.issue_counts, record.has_touch_targets) == \
+        ('https://a.com/', 480, (1, 0, 2, 0, 0), True)
+    assert decoded['violation']['issue'] == 'empty'
+    assert decoded['violation']['level'] == 2
+    assert decoded['violation'].domain == 'a.com'
+
+
+def test_decoded_examples_merge_like_the_originals():
+    first = BoundedExamples(2, key=str, unique=True)
+    first.extend(['c', 'a', 'c'])
+    second = BoundedExamples(2, key=str, unique=True)
+    second.extend(['b', 'a'])
+
+    merged = BoundedExamples(2, key=str, unique=True)
+    merged.merge(round_trip(first)).merge(round_trip(second))
+
+    assert merged.items() == ['a', 'b']
+    assert merged.total == 5
+
+
+def test_bucketed_examples():
+    examples = BucketedExamples(1)
+    examples.add('overflow', {'url': 'https://b.com/'}, sort_key='https://b.com/')
+    examples.add('overflow', {'url': 'https://a.com/'}, sort_key='https://a.com/')
+    decoded = round_trip(examples)
+
+    assert decoded['overflow'].items() == [{'url': 'https://a.com/'}]
+    assert decoded['overflow'].total == 2
+
+
+def test_spill_dict_entries_follow_the_model():
+    records = SpillDict()
+    for i in range(5):
+        records[f'https://a.com/{i}'] = (BreakpointResult(f'https://a.com/{i}', 320, (i, 0, 0, 0, 0)),)
+    lines = list(encode_model({'breakpoint_records': records, 'pages': 5}))
+
+    assert len(lines) == 6
+    decoded = decode_model(lines, MemoryBudget(10 ** 6))
+    assert isinstance(decoded['breakpoint_records'], SpillDict)
+    assert list(decoded['breakpoint_records']) == list(records)
+    assert decoded['breakpoint_records']['https://a.com/3'][0].count('touchTargets') == 3
+
+
+def test_unknown_types_are_refused():
+    with pytest.raises(TypeError):
+        list(encode_model({'value': object()}))
+    with pytest.raises(ValueError):
+        decode_model(['{"__record__": ["os.system", ["echo"]]}\n'])
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+from prefetch import start_prefetch, stop_prefetch
+from projections import declare_fields, find_pages
+from query_memo import MemoCollection, QueryMemo
+
+PAGES = [{'url': f"https://a.com/{i}"} for i in range(5)]
+
+declare_fields('test.prefetched', 'url', query={'url': {'$exists': True}}, sort=[('url', 1)])
+
+
+class FakeCursor(list):
+    def sort(self, key_or_list):
+        self.sorted_by = key_or_list
+        return self
+
+
+class FakeCollection:
+    """Collection answering every find with PAGES, recording the cursors returned"""
+
+    def __init__(self):
+        self.finds = []
+
+    def find(self, filter=None, projection=None, **kwargs):
+        cursor = FakeCursor(PAGES)
+        self.finds.append(cursor)
+        return cursor
+
+
+def connection(memoized=True):
+    collection = FakeCollection()
+    page_results = MemoCollection(collection, QueryMemo(1024 * 1024)) if memoized else collection
+    return SimpleNamespace(page_results=page_results, prefetch_workers=2), collection
+
+
+def test_prefetched_section_query_is_read_from_the_memo():
+    db_connection, collection = connection()
+
+    assert start_prefetch(db_connection, topics=set(), queries=['test.prefetched']) is not None
+    pages = list(find_pages(db_connection, 'test.prefetched'))
+    stop_prefetch(db_connection)
+
+    assert pages == PAGES
+    assert len(collection.finds) == 1
+    assert collection.finds[0].sorted_by == [('url', 1)]
+    assert db_connection.page_results.memo.hits == 1
+
+
+def test_section_queries_are_not_prefetched_without_the_memo():
+    db_connection, collection = connection(memoized=False)
+
+    assert start_prefetch(db_connection, topics=set(), queries=['test.prefetched']) is None
+    assert collection.finds == []
@@ -0,0 +1,44 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from docx import Document
+
+from projections import declare_fields, find_pages
+from report_context import get_report_context
+from section_scheduler import BudgetExceeded, SectionScheduler
+
+PAGES = [{'url': f"https://a.com/{i}"} for i in range(3)]
+
+declare_fields('test.budgeted', 'url', query={})
+
+
+def connection():
+    return SimpleNamespace(page_results=SimpleNamespace(find=lambda *args, **kwargs: iter(PAGES)))
+
+
+def test_reading_pages_past_the_deadline_raises():
+    db_connection = connection()
+    get_report_context(db_connection).deadline = time.monotonic() - 1
+
+    with pytest.raises(BudgetExceeded):
+        list(find_pages(db_connection, 'test.budgeted'))
+
+
+def test_scheduler_truncates_a_section_reading_pages():
+    db_connection = connection()
+    doc = Document()
+    scheduler = SectionScheduler(db_connection, section_budget=0.01)
+
+    def slow_section():
+        doc.add_paragraph("partial")
+        for _ in find_pages(db_connection, 'test.budgeted'):
+            time.sleep(0.02)
+
+    scheduler.run(doc, 'Slow section', slow_section)
+
+    assert [paragraph.text for paragraph in doc.paragraphs] == [
+        "Slow section: this section was truncated because it exceeded its time budget. "
+        "The results below are partial."
+    ]
+    assert scheduler.cut_sections[0][0] == 'Slow section'
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import bson
+from bson.raw_bson import RawBSONDocument
+
+from query_memo import MemoCollection, QueryMemo, result_size, unmemoized, use_query_memo
+
+PAGES = [{'url': f"https://a.com/{i}", 'body': 'x' * 100} for i in range(10)]
+PAGE_SIZE = len(bson.encode(PAGES[0]))
+
+
+class FakeCollection:
+    """Collection answering every find with PAGES, counting the queries run"""
+
+    def __init__(self):
+        self.finds = []
+
+    def find(self, filter=None, projection=None, **kwargs):
+        self.finds.append(kwargs)
+        return iter(PAGES)
+
+
+def test_result_size_is_the_bson_size():
+    assert result_size(PAGES[0]) == PAGE_SIZE
+    assert result_size(RawBSONDocument(bson.encode(PAGES[0]))) == PAGE_SIZE
+
+
+def test_least_recently_used_results_are_evicted_by_bytes():
+    memo = QueryMemo(250)
+
+    memo.put('a', 'A', 100)
+    memo.put('b', 'B', 100)
+    memo.get('a')
+    memo.put('c', 'C', 100)
+
+    assert memo.get('a') == (True, 'A')
+    assert memo.get('b') == (False, None)
+    assert memo.get('c') == (True, 'C')
+    assert memo.size == 200
+
+
+def test_result_larger_than_the_cache_is_not_kept():
+    memo = QueryMemo(150)
+    memo.put('a', 'A', 100)
+
+    memo.put('b', 'B', 200)
+
+    assert memo.get('b') == (False, None)
+    assert memo.get('a') == (True, 'A')
+
+
+def test_repeated_find_is_answered_from_memory():
+    collection = FakeCollection()
+    memoized = MemoCollection(collection, QueryMemo(10 * PAGE_SIZE))
+
+    first = list(memoized.find({'url': 1}))
+    second = list(memoized.find({'url': 1}))
+
+    assert first == second == PAGES
+    assert len(collection.finds) == 1
+    assert memoized.memo.size == 10 * PAGE_SIZE
+
+
+def test_find_outgrowing_the_cache_is_streamed_without_being_kept():
+    collection = FakeCollection()
+    memoized = MemoCollection(collection, QueryMemo(5 * PAGE_SIZE))
+
+    assert list(memoized.find({})) == PAGES
+    assert list(memoized.find({})) == PAGES
+
+    assert len(collection.finds) == 2
+    assert memoized.memo.size == 0
+
+
+def test_streaming_scans_bypass_the_memo():
+    collection = FakeCollection()
+    memoized = MemoCollection(collection, QueryMemo(10 * PAGE_SIZE))
+
+    list(memoized.find({}, batch_size=1000))
+    list(unmemoized(memoized).find({}))
+
+    assert collection.finds[0]['batch_size'] == 1000
+    assert len(collection.finds) == 2
+    assert memoized.memo.size == 0
+    assert unmemoized(collection) is collection
+
+
+def test_memo_size_is_set_in_megabytes():
+    db_connection = SimpleNamespace(page_results=FakeCollection(), query_memo_size=0.5)
+
+    memoized = use_query_memo(db_connection)
+
+    assert memoized.memo.max_bytes == 512 * 1024
+    assert use_query_memo(SimpleNamespace(page_results=FakeCollection(), query_memo_size=0)) is None
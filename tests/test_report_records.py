@@ -0,0 +1,39 @@
+import pytest
+
+from report_records import ViolationRecord
+
+
+def test_violation_record_reads_like_the_raw_violation():
+    violation = {
+        'issue': 'emptyHeading',
+        'element': 'h2',
+        'section': {'section_type': 'header', 'section_name': 'Site header'}
+    }
+    record = ViolationRecord.from_violation(violation, 'https://example.com/page')
+
+    assert record['issue'] == 'emptyHeading'
+    assert record.get('element') == 'h2'
+    assert record['section'] == {'section_type': 'header', 'section_name': 'Site header'}
+    assert record['page_url'] == 'https://example.com/page'
+    assert record.domain == 'example.com'
+
+
+def test_violation_record_missing_fields():
+    record = ViolationRecord.from_violation({'issue': 'emptyHeading'}, 'https://example.com/page')
+
+    assert 'message' not in record
+    assert 'section' not in record
+    assert record.get('message', 'none') == 'none'
+    with pytest.raises(KeyError):
+        record['message']
+
+
+def test_violation_record_keeps_other_fields():
+    violation = {'issue': 'skippedLevel', 'level': 4, 'previousLevel': 2, 'xpath': None}
+    record = ViolationRecord.from_violation(violation, 'https://example.com/page')
+
+    assert record['level'] == 4
+    assert record.get('previousLevel') == 2
+    assert 'xpath' in record
+    assert record['xpath'] is None
+    assert ViolationRecord.from_violation({'issue': 'x'}, 'https://example.com/').extra is None
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from sampling import PageSample, draw_sample, format_page_count, may_affect_pages
+
+
+def sample_of(population, sampled):
+    return PageSample(0.05, set(), population, sampled)
+
+
+def connection_with(sample):
+    return SimpleNamespace(report_context=SimpleNamespace(sample=sample))
+
+
+def test_zero_hit_domain_adds_its_upper_bound():
+    sample = sample_of({'a.com': 10000}, {'a.com': 500})
+
+    estimate, low, high = sample.estimate([])
+
+    assert (estimate, low) == (0, 0)
+    assert 70 <= high <= 75
+
+
+def test_bounds_cover_domains_without_hits():
+    sample = sample_of({'a.com': 100, 'b.com': 10000}, {'a.com': 20, 'b.com': 500})
+    urls = [f"https://a.com/{i}" for i in range(10)]
+
+    estimate, low, high = sample.estimate(urls)
+    only_a = sample_of({'a.com': 100}, {'a.com': 20}).estimate(urls)
+
+    assert estimate == only_a[0] == 50
+    assert low == only_a[1]
+    assert high > only_a[2] + 70
+
+
+def test_fully_sampled_domain_adds_nothing():
+    sample = sample_of({'a.com': 15}, {'a.com': 15})
+
+    assert sample.estimate([]) == (0, 0, 0)
+    assert sample.estimate(["https://a.com/1"]) == (1, 1, 1)
+
+
+def test_draw_sample_keeps_minimum_per_domain():
+    urls = [f"https://a.com/{i}" for i in range(1000)] + [f"https://b.com/{i}" for i in range(5)]
+
+    sample = draw_sample(urls, 0.01)
+
+    assert sample.sampled == {'a.com': 20, 'b.com': 5}
+    assert sample.population == {'a.com': 1000, 'b.com': 5}
+    assert len(sample.urls) == 25
+
+
+def test_rows_kept_while_upper_bound_is_above_zero():
+    sampled = connection_with(sample_of({'a.com': 10000}, {'a.com': 500}))
+    complete = connection_with(sample_of({'a.com': 15}, {'a.com': 15}))
+    unsampled = connection_with(None)
+
+    assert may_affect_pages(sampled, set())
+    assert format_page_count(sampled, set()).startswith("~0 (0-")
+    assert not may_affect_pages(complete, set())
+    assert not may_affect_pages(unsampled, set())
+    assert may_affect_pages(unsampled, {"https://a.com/1"})
+    assert format_page_count(unsampled, {"https://a.com/1"}) == "1"
@@ -0,0 +1,87 @@
+import pickle
+
+from spill import MemoryBudget, SpillDict
+
+
+def filled(budget, count=50):
+    spill = SpillDict(budget)
+    for i in range(count):
+        spill[f"url{i}"] = ['x' * 100] * (i % 5 + 1)
+    return spill
+
+
+def test_without_budget_never_spills():
+    spill = filled(None)
+
+    assert spill.spilled == 0
+    assert len(spill) == 50
+
+
+def test_spills_under_budget_and_keeps_order_and_values():
+    budget = MemoryBudget(4000)
+    spill = filled(budget)
+
+    assert spill.spilled > 0
+    assert budget.used <= budget.limit
+    assert list(spill) == [f"url{i}" for i in range(50)]
+    assert [value for _, value in spill.items()] == [['x' * 100] * (i % 5 + 1) for i in range(50)]
+    spill.close()
+
+
+def test_replacing_and_deleting_spilled_values():
+    budget = MemoryBudget(4000)
+    spill = filled(budget)
+    spilled_key = next(key for key in spill if key not in spill._sizes)
+
+    spill[spilled_key] = 'small'
+    assert spill[spilled_key] == 'small'
+    del spill['url0']
+    assert 'url0' not in spill
+    assert len(spill) == 49
+
+    spill.close()
+    assert budget.used == 0
+    assert len(spill) == 0
+
+
+def test_pickle_round_trip_keeps_spilled_entries():
+    spill = filled(MemoryBudget(4000))
+
+    copy = pickle.loads(pickle.dumps(spill))
+
+    assert list(copy.items()) == list(spill.items())
+    # The copy is held to a budget of the same size
+    assert copy.budget is not spill.budget
+    assert copy.budget.limit == 4000
+    assert copy.spilled > 0
+    spill.close()
+    copy.close()
+
+
+def test_pickle_does_not_collect_entries_in_a_list(monkeypatch):
+    spill = filled(MemoryBudget(4000))
+    reads = []
+    getitem = SpillDict.__getitem__
+
+    def tracking_getitem(self, key):
+        reads.append(key)
+        return getitem(self, key)
+
+    monkeypatch.setattr(SpillDict, '__getitem__', tracking_getitem)
+    reduced = spill.__reduce__()
+    assert reads == []
+    assert not isinstance(reduced[4], (list, tuple))
+
+    pickled = pickle.dumps(spill)
+    assert len(reads) == 50
+    assert dict(pickle.loads(pickled).items()) == dict(spill.items())
+    spill.close()
+
+
+def test_pickle_without_budget():
+    spill = filled(None, count=3)
+
+    copy = pickle.loads(pickle.dumps(spill))
+
+    assert copy.budget is None
+    assert list(copy.items()) == list(spill.items())
@@ -0,0 +1,82 @@
+import csv
+import os
+from types import SimpleNamespace
+
+from docx import Document
+
+from report_context import get_report_context
+from table_overflow import add_budgeted_table, attachments_folder, copy_table_attachments
+
+HEADERS = ["URL", "Page Title"]
+ROWS = [(f"https://a.com/{i}", f"Page {i}") for i in range(10)]
+
+
+def connection(budget=None, folder=None):
+    db_connection = SimpleNamespace(table_row_budget=budget)
+    get_report_context(db_connection).attachments_folder = folder
+    return db_connection
+
+
+def test_no_budget_shows_every_row():
+    doc = Document()
+
+    table = add_budgeted_table(doc, SimpleNamespace(), "pages", HEADERS, ROWS)
+
+    assert len(table.rows) == len(ROWS) + 1
+    assert not any(paragraph.text.startswith("Showing") for paragraph in doc.paragraphs)
+
+
+def test_table_within_budget_is_not_cut(tmp_path):
+    doc = Document()
+
+    table = add_budgeted_table(doc, connection(10, str(tmp_path)), "pages", HEADERS, ROWS)
+
+    assert len(table.rows) == 11
+    assert os.listdir(tmp_path) == []
+
+
+def test_long_table_is_cut_and_written_to_csv(tmp_path):
+    doc = Document()
+    attachments = []
+
+    table = add_budgeted_table(doc, connection(3, str(tmp_path)), "Pages a.com", HEADERS, ROWS, attachments)
+
+    assert [cell.text for cell in table.rows[1].cells] == list(ROWS[0])
+    assert len(table.rows) == 4
+    assert attachments == ["pages_a_com.csv"]
+    assert "Showing the first 3 of 10 rows." in doc.paragraphs[-1].text
+    assert "pages_a_com.csv" in doc.paragraphs[-1].text
+    with open(tmp_path / "pages_a_com.csv", newline='', encoding='utf-8') as csv_file:
+        assert list(csv.reader(csv_file)) == [HEADERS] + [list(row) for row in ROWS]
+
+
+def test_attachment_names_stay_unique(tmp_path):
+    db_connection = connection(3, str(tmp_path))
+    attachments = []
+
+    add_budgeted_table(Document(), db_connection, "pages", HEADERS, ROWS, attachments)
+    add_budgeted_table(Document(), db_connection, "pages", HEADERS, ROWS, attachments)
+
+    assert attachments == ["pages.csv", "pages_2.csv"]
+
+
+def test_without_folder_the_table_is_cut_without_csv():
+    doc = Document()
+    attachments = []
+
+    table = add_budgeted_table(doc, connection(3), "pages", HEADERS, ROWS, attachments)
+
+    assert len(table.rows) == 4
+    assert attachments == []
+    assert doc.paragraphs[-1].text == "Showing the first 3 of 10 rows."
+
+
+def test_attachments_are_copied_next_to_another_document(tmp_path):
+    db_connection = connection(3, str(tmp_path / "report_tables"))
+    attachments = []
+    add_budgeted_table(Document(), db_connection, "pages", HEADERS, ROWS, attachments)
+    standalone = str(tmp_path / "sites" / "site_report_a.com.docx")
+
+    copy_table_attachments(db_connection, attachments, standalone)
+
+    assert os.listdir(attachments_folder(standalone)) == ["pages.csv"]
@@ -0,0 +1,170 @@
+"""
+Topic aggregates shared by the summary and detailed findings sections.
+
+Each topic (media queries, responsive accessibility, ...) used to be computed
+twice: once by its summary section and once by its detailed section, with the
+same queries and the same accumulation loops. A TopicAggregate describes the
+queries a topic needs and how to fold the returned pages into a data model;
+get_topic_aggregate computes that model once per report and hands the same
+object to every section that asks for it.
+"""
+from connection_profile import cursor_options
+from report_context import get_report_context
+from page_access import page_collection
+from query_memo import unmemoized
+from aggregate_store import accumulate_by_run
+from section_scheduler import BudgetExceeded, check_budget
+from parallel_aggregation import accumulate_parallel
+
+# Registered topic aggregates, keyed by topic name
+TOPICS = {}
+
+
+def register_topic(aggregate_class):
+    """Class decorator that registers a TopicAggregate subclass by its name"""
+    TOPICS[aggregate_class.name] = aggregate_class()
+    return aggregate_class
+
+
+class TopicAggregate:
+    """
+    Base class for a topic's shared data model.
+
+    Subclasses set name (and bump version whenever the model they produce
+    changes) and implement queries(), empty() and add(); prepare(),
+    finalize() and describe_partial() are optional hooks. Implementing merge()
+    lets the topic be aggregated in parallel (see parallel_aggregation) and
+    stored per test run (see aggregate_store).
+    """
+    name = None
+    version = 1
+
+    def queries(self):
+        """
+        Return the queries this topic reads.
+
+        Returns:
+            Dictionary of query name -> {'filter': ..., 'projection': ...}
+        """
+        return {}
+
+    def empty(self):
+        """Return a new, empty data model"""
+        return {}
+
+    def prepare(self, db_connection, state):
+        """Hook to load anything besides page results before pages are added"""
+        pass
+
+    def add(self, state, query_name, page):
+        """Fold one page returned by the named query into the data model"""
+        raise NotImplementedError
+
+    def finalize(self, state):
+        """Hook to derive totals once every page has been added"""
+        return state
+
+    def describe_partial(self, state):
+        """Describe a data model whose computation ran out of time, as lines of text"""
+        return []
+
+    def merge(self, state, other):
+        """
+        Fold the (not yet finalized) state of another set of pages into state.
+
+        Must be associative, so partial states can be merged in any grouping.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def can_merge(cls):
+        """True if the topic implements merge()"""
+        return cls.merge is not TopicAggregate.merge
+
+    def accumulate(self, db_connection, check=None, match=None):
+        """
+        Run the topic's queries and add every page to a new state, without finalizing it.
+
+        Pages may be RawBSONDocuments (see page_access), so add() should only
+        rely on Mapping methods and use page_access.is_document for type checks.
+
+        Args:
+            db_connection: Database connection
+            check: Called before each page is added; stops the computation by
+                raising BudgetExceeded. By default it enforces the running
+                section's time budget.
+            match: Filter the pages must also match (None for all)
+        """
+        if check is None:
+            check = lambda: check_budget(db_connection)
+        state = self.empty()
+        self.prepare(db_connection, state)
+        # Each page is read once: caching the scan would only evict repeated queries
+        collection = unmemoized(page_collection(db_connection))
+        pages = 0
+        try:
+            for query_name, query in self.queries().items():
+                query_filter = query['filter']
+                if match is not None:
+                    query_filter = {'$and': [query_filter, match]}
+                for page in collection.find(query_filter, query['projection'], **cursor_options(db_connection)):
+                    check()
+                    self.add(state, query_name, page)
+                    pages += 1
+        except BudgetExceeded as e:
+            raise BudgetExceeded(self.name, [f"{pages} page results read before the time budget ran out"]
+                                 + self.describe_partial(state)) from e
+        return state
+
+    def compute(self, db_connection, check=None):
+        """Run the topic's queries and build its data model"""
+        return self.finalize(self.accumulate(db_connection, check))
+
+
+def build_topic_aggregate(db_connection, aggregate, check=None):
+    """Build a topic's data model, reusing the stored models of its test runs"""
+    processes = getattr(db_connection, 'aggregation_processes', 0)
+    if processes and processes > 1 and aggregate.can_merge():
+        accumulate = lambda match: accumulate_parallel(db_connection, aggregate, processes, check, match)
+    else:
+        accumulate = lambda match: aggregate.accumulate(db_connection, check, match=match)
+    state = accumulate_by_run(db_connection, aggregate, accumulate, check)
+    if state is None:
+        state = accumulate(None)
+    return aggregate.finalize(state)
+
+
+def get_topic_aggregate(db_connection, topic):
+    """
+    Get the data model for a topic, computing it only once per report.
+
+    Models stored for the report's test runs are reused (see aggregate_store),
+    and models being prefetched are waited for (see prefetch).
+
+    Args:
+        db_connection: Database connection
+        topic: Topic name, or the TopicAggregate subclass itself
+
+    Returns:
+        The topic's data model
+    """
+    name = topic if isinstance(topic, str) else topic.name
+    context = get_report_context(db_connection)
+    if name in context.truncated_topics:
+        # Already ran out of time for an earlier section; don't start over
+        truncated = context.truncated_topics[name]
+        raise BudgetExceeded(truncated.topic, truncated.partial)
+    if name not in context.topics:
+        prefetch = context.prefetch
+        try:
+            if prefetch is not None and prefetch.has(name):
+                model = prefetch.result(name, context.deadline)
+            else:
+                model = build_topic_aggregate(db_connection, TOPICS[name])
+        except BudgetExceeded as e:
+            # A prefetch that is still running may be waited for again later
+            if prefetch is None or not prefetch.has(name):
+                context.truncated_topics[name] = e
+            raise
+        context.topics[name] = model
+    return context.topics[name]
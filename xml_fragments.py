@@ -0,0 +1,62 @@
+"""
+Parsed-once OOXML snippets and table-wide formatting helpers.
+
+Sections used to call parse_xml with the same literal XML for every
+paragraph and table cell they formatted, so a long table parsed the same
+two snippets thousands of times. xml_fragment parses each snippet once and
+hands out copies of the parsed element.
+
+OOXML has no table-level equivalent of a cell's vertical alignment or
+no-wrap setting, so set_cell_properties still gives every cell its own
+copy, but walks the table's cell elements directly instead of going
+through python-docx's rows and cells (which rebuilds the cell grid for
+every row).
+"""
+from copy import deepcopy
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+
+KEEP_NEXT = f'<w:keepNext {nsdecls("w")}/>'
+CELL_NO_WRAP = f'<w:noWrap {nsdecls("w")}/>'
+CELL_CENTER = f'<w:vAlign {nsdecls("w")} w:val="center"/>'
+CELL_NO_BORDERS = (
+    f'<w:tcBorders {nsdecls("w")}>'
+    '<w:top w:val="none"/><w:left w:val="none"/><w:bottom w:val="none"/><w:right w:val="none"/>'
+    '</w:tcBorders>'
+)
+
+# Parsed snippets, keyed by their XML
+_parsed = {}
+
+
+def xml_fragment(xml):
+    """Return a new element for an XML snippet, parsing the snippet only once"""
+    element = _parsed.get(xml)
+    if element is None:
+        element = _parsed[xml] = parse_xml(xml)
+    return deepcopy(element)
+
+
+def keep_with_next(paragraph):
+    """Keep a paragraph on the same page as the next one (such as the table after it)"""
+    paragraph._element.get_or_add_pPr().append(xml_fragment(KEEP_NEXT))
+
+
+def set_cell_properties(table, *snippets):
+    """
+    Add cell properties to every cell of a table.
+
+    Args:
+        table: python-docx Table
+        *snippets: XML of the tcPr children to add, in schema order
+    """
+    for tc in table._tbl.iter(qn('w:tc')):
+        tcPr = tc.get_or_add_tcPr()
+        for xml in snippets:
+            tcPr.append(xml_fragment(xml))
+
+
+def center_cells(table):
+    """Vertically center every cell of a table and keep their text from wrapping"""
+    set_cell_properties(table, CELL_NO_WRAP, CELL_CENTER)